@@ -1649,6 +1649,9 @@ class MainDockWindow(QtWidgets.QWidget):
         self.childs = []
         self.script_jobs = []
 
+        # picker items by associated control, for the selection check
+        self.selection_items = {}
+
         __EDIT_MODE__.set_init(edit)
         self.is_dockable = dockable
 
@@ -2101,6 +2104,7 @@ class MainDockWindow(QtWidgets.QWidget):
             self.make_node_active(current_node)
 
         # Refresh selection check
+        self.update_selection_index()
         self.selection_change_event()
 
         # Force view resize
@@ -2226,6 +2230,7 @@ class MainDockWindow(QtWidgets.QWidget):
         self.tab_widget.fit_contents()
 
         # Update selection states
+        self.update_selection_index()
         self.selection_change_event()
 
     def save_character(self):
@@ -2280,7 +2285,28 @@ class MainDockWindow(QtWidgets.QWidget):
                                            self.selection_change_event)
         # Add scene open event
         self.cb_manager.newSceneCB("anim_picker_newScene",
-                                   self.selection_change_event)
+                                   self.new_scene_event)
+
+    def new_scene_event(self, *args):
+        '''Event called from maya on new scene, the controls are resolved again
+        '''
+        self.update_selection_index()
+        self.selection_change_event()
+
+    def update_selection_index(self):
+        '''
+        Will index all the picker items by associated control, so selection
+        changes only update the items of the controls that changed
+        '''
+        self.selection_items = {}
+        for item in self.get_all_picker_items():
+            # Selection state is only shown for single control pickers
+            controls = item.get_controls()
+            if not len(controls) == 1:
+                continue
+            self.selection_items.setdefault(controls[0], []).append(item)
+
+        __SELECTION__.set_nodes(list(self.selection_items))
 
     def selection_change_event(self, *args):
         '''
@@ -2293,7 +2319,7 @@ class MainDockWindow(QtWidgets.QWidget):
             return
 
         # Update selection data
-        __SELECTION__.update()
+        changed_nodes = __SELECTION__.update()
 
         # sync with namespce
         if not __EDIT_MODE__.get():
@@ -2306,9 +2332,10 @@ class MainDockWindow(QtWidgets.QWidget):
                         if ns in str(n):
                             self.char_selector_cb.setCurrentIndex(i)
                             break
-        # Update controls for active tab
-        for item in self.get_picker_items():
-            item.run_selection_check()
+        # Update picker items of the controls whose state changed
+        for node in changed_nodes:
+            for item in self.selection_items.get(node, []):
+                item.run_selection_check()
 
 
 # version of the anim picker ui that uses MayaQWidgetDockableMixin for docking
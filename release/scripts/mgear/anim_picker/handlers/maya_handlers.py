@@ -133,16 +133,93 @@ def reset_node_attributes(node, attr="rigBindPose"):
 
 
 class SelectionCheck(object):
+    '''Selection index of the picker controls
+
+    Control names are resolved to MObjectHandles once, when the nodes are
+    indexed, and the selection is stored as a set of handles hash codes. On
+    selection change the previous and current sets are compared, so only the
+    controls whose state changed have to be repainted.
+    '''
+
     def __init__(self):
         self.sel = OpenMaya.MSelectionList()
 
+        # MObjectHandle by node name, None for nodes not found
+        self.handles = {}
+
+        # node names by MObjectHandle hash code
+        self.nodes = {}
+
+        # hash codes of the selected nodes
+        self.selected = set()
+
+        # nodes to report as changed on next update
+        self.dirty = set()
+
+    def set_nodes(self, nodes):
+        '''Will index the given nodes, to be checked on selection updates
+        '''
+        self.handles = {}
+        self.nodes = {}
+        for node in nodes:
+            self.get_node_handle(node)
+
+        # Report all nodes on next update
+        self.dirty = set(self.handles)
+
+    def get_node_handle(self, node):
+        '''Return the node MObjectHandle, resolved once per node name
+        '''
+        handle = self.handles.get(node)
+        if handle and handle.isValid():
+            return handle
+
+        # Resolve node
+        handle = None
+        mobject = self.get_node_mobject(node)
+        if mobject and mobject.hasFn(OpenMaya.MFn.kDagNode):
+            handle = OpenMaya.MObjectHandle(mobject)
+            self.nodes.setdefault(handle.hashCode(), set()).add(node)
+
+        self.handles[node] = handle
+        return handle
+
     def update(self):
         '''Will update selection data
+
+        Returns:
+            set: indexed nodes whose selection state may have changed
         '''
         # Get current selection
         self.sel.clear()
         OpenMaya.MGlobal.getActiveSelectionList(self.sel)
 
+        selected = set()
+        mobject = OpenMaya.MObject()
+        for i in range(self.sel.length()):
+            self.sel.getDependNode(i, mobject)
+            hash_code = OpenMaya.MObjectHandle(mobject).hashCode()
+            selected.add(hash_code)
+
+            # Indexed node re-created since it was resolved
+            if hash_code in self.nodes or hash_code in self.selected:
+                continue
+            if not mobject.hasFn(OpenMaya.MFn.kDagNode):
+                continue
+            dag_path = OpenMaya.MDagPath.getAPathTo(mobject)
+            if dag_path.partialPathName() in self.handles:
+                self.get_node_handle(dag_path.partialPathName())
+
+        # Compare with previous selection
+        changed = self.dirty
+        for hash_code in selected.symmetric_difference(self.selected):
+            changed.update(self.nodes.get(hash_code, ()))
+
+        self.selected = selected
+        self.dirty = set()
+
+        return changed
+
     @staticmethod
     def get_node_mobject(node):
         '''Will return node mobject if possible
@@ -177,10 +254,10 @@ class SelectionCheck(object):
     def is_selected(self, node):
         '''Will check if node is currently selected
         '''
-        # Get node MDagPath
-        node = self.get_node_mdagpath(node)
-        if not node:
+        # Get node cached handle
+        handle = self.get_node_handle(node)
+        if not handle:
             return False
 
-        # Check if node is in selection lest
-        return self.sel.hasItem(node)
+        # Check if node is in selection
+        return handle.hashCode() in self.selected
@@ -118,6 +118,20 @@ class ChannelMaster(
         self.cb_manager.selectionChangedCB(
             "Channel_Master_selection_CB", self.selection_change
         )
+        # anim curves cached by the tables
+        self.cb_manager.animCurveEditedCB(
+            "Channel_Master_animCurveEdited_CB", self.anim_curves_changed
+        )
+        self.cb_manager.nodeAddedCB(
+            "Channel_Master_animCurveAdded_CB",
+            self.anim_curves_changed,
+            "animCurve",
+        )
+        self.cb_manager.nodeRemovedCB(
+            "Channel_Master_animCurveRemoved_CB",
+            self.anim_curves_changed,
+            "animCurve",
+        )
         # self.cb_manager.userTimeChangedCB("Channel_Master_userTimeChange_CB",
         #                                   self.time_changed)
 
@@ -824,6 +838,15 @@ class ChannelMaster(
         if not self.lock_button.isChecked():
             self.update_main_table()
 
+    def anim_curves_changed(self, *args):
+        """Callback triggered when anim curves are edited, added or removed
+
+        Args:
+            *args: Description
+        """
+        for table in self.get_all_tables():
+            table.anim_cache.invalidate()
+
     def time_changed(self, *args):
         """Callback triger when time change
 
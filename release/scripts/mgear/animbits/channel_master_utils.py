@@ -1,4 +1,8 @@
+import bisect
+
 import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
 import pymel.core as pm
 
 from mgear.core import attribute
@@ -7,6 +11,16 @@ from mgear.core import attribute
 ATTR_SLIDER_TYPES = ["long", "float", "double", "doubleLinear", "doubleAngle"]
 DEFAULT_RANGE = 1000
 
+# key button states
+KEY_STATIC = "static"  # channel without animation
+KEY_ON_FRAME = "keyed"  # key on the current frame
+KEY_ANIMATED = "animated"  # value from the animation, no key on the frame
+KEY_CHANGED = "changed"  # value different from the animation
+
+# tolerance to compare the key times and the values with the animation
+TIME_TOLERANCE = 1e-4
+VALUE_TOLERANCE = 1e-6
+
 
 # TODO: filter channel by color. By right click menu in a channel with color
 
@@ -334,3 +348,230 @@ def value_equal_keyvalue(attr, current_time=False):
         val = cmds.getAttr(attr)
     if anim_val == val:
         return True
+
+
+def get_key_state(attr, current_time=False):
+    """Get the key button state of a given attribute
+
+    Args:
+        attr (str): the attribute fullName
+        current_time (bool or float, optional): time to evaluate the value
+
+    Returns:
+        str: KEY_STATIC, KEY_ON_FRAME, KEY_ANIMATED or KEY_CHANGED
+    """
+    if not channel_has_animation(attr):
+        return KEY_STATIC
+    if not value_equal_keyvalue(attr, current_time):
+        return KEY_CHANGED
+    if current_frame_has_key(attr):
+        return KEY_ON_FRAME
+    return KEY_ANIMATED
+
+
+def get_key_state_from_keys(key_times, time, value, anim_value):
+    """Get the key button state from the animation data of a channel
+
+    Args:
+        key_times (list): sorted key times, None if the channel has no
+            animation
+        time (float): current time
+        value (float): channel value at the current time
+        anim_value (float): animation value at the current time
+
+    Returns:
+        str: KEY_STATIC, KEY_ON_FRAME, KEY_ANIMATED or KEY_CHANGED
+    """
+    if not key_times:
+        return KEY_STATIC
+    if abs(value - anim_value) > VALUE_TOLERANCE:
+        return KEY_CHANGED
+
+    i = bisect.bisect_left(key_times, time - TIME_TOLERANCE)
+    if i < len(key_times) and key_times[i] <= time + TIME_TOLERANCE:
+        return KEY_ON_FRAME
+    return KEY_ANIMATED
+
+
+class AnimationCache(object):
+    """Animation data cache of the channels of a table
+
+    The plug and the anim curve of each channel, with its sorted key times,
+    are resolved once. The curves are kept until invalidate is called, from
+    the anim curves edited callbacks. The values of all the channels are read
+    in one pass with the Maya API, instead of one getAttr per channel.
+    """
+
+    def __init__(self):
+        self.plugs = {}
+        self.curves = {}
+
+    def invalidate(self, *args):
+        """Clear the cached anim curves
+
+        Args:
+            *args: callback arguments
+        """
+        self.curves = {}
+
+    def get_plug(self, attr):
+        """Get the cached plug of the attribute
+
+        Args:
+            attr (str): the attribute fullName
+
+        Returns:
+            MPlug: the attribute plug, None if not found
+        """
+        plug, handle = self.plugs.get(attr, (None, None))
+        if handle and handle.isValid():
+            return plug
+
+        plug = handle = None
+        sel = om2.MSelectionList()
+        try:
+            sel.add(attr)
+            plug = sel.getPlug(0)
+            handle = om2.MObjectHandle(plug.node())
+        except (RuntimeError, TypeError):
+            pass
+        self.plugs[attr] = (plug, handle)
+        return plug
+
+    def get_curve(self, attr):
+        """Get the cached anim curve of the attribute
+
+        Args:
+            attr (str): the attribute fullName
+
+        Returns:
+            tuple: anim curve function set and sorted key times, None if the
+                channel has no animation
+        """
+        if attr in self.curves:
+            return self.curves[attr]
+
+        curve = None
+        names = cmds.keyframe(attr, query=True, name=True)
+        if names:
+            sel = om2.MSelectionList()
+            sel.add(names[0])
+            fn_curve = oma2.MFnAnimCurve(sel.getDependNode(0))
+            unit = om2.MTime.uiUnit()
+            key_times = sorted(
+                fn_curve.input(i).asUnits(unit)
+                for i in range(fn_curve.numKeys)
+            )
+            if key_times:
+                curve = (fn_curve, key_times)
+        self.curves[attr] = curve
+        return curve
+
+    def get_values(self, attrs, current_time=False):
+        """Get the values and key states of the attributes
+
+        Args:
+            attrs (list): the attributes fullName
+            current_time (bool or float, optional): time to evaluate the
+                values. The current time if False
+
+        Returns:
+            list, list: values in UI units and key states. The value and
+                state are None for the attributes not found
+        """
+        if current_time is False:
+            time = cmds.currentTime(query=True)
+        else:
+            time = float(current_time)
+        mtime = om2.MTime(time, om2.MTime.uiUnit())
+
+        plugs = [self.get_plug(attr) for attr in attrs]
+
+        # reads all the values in the same context
+        context = []
+        guard = None
+        if current_time is not False:
+            context = [om2.MDGContext(mtime)]
+            if hasattr(om2, "MDGContextGuard"):
+                guard = om2.MDGContextGuard(context.pop())
+        try:
+            raw_values = [_read_plug(plug, *context) for plug in plugs]
+        finally:
+            del guard
+
+        values = []
+        states = []
+        for attr, plug, raw_value in zip(attrs, plugs, raw_values):
+            if raw_value is None:
+                values.append(None)
+                states.append(None)
+                continue
+
+            values.append(_to_ui_value(plug, raw_value))
+            curve = self.get_curve(attr)
+            if curve:
+                anim_value = curve[0].evaluate(mtime)
+                states.append(
+                    get_key_state_from_keys(
+                        curve[1], time, raw_value, anim_value
+                    )
+                )
+            else:
+                states.append(KEY_STATIC)
+
+        return values, states
+
+
+def _read_plug(plug, *context):
+    """Read a plug value in internal units
+
+    Args:
+        plug (MPlug): the attribute plug, or None
+        *context: MDGContext to evaluate the plug, if not using a guard
+
+    Returns:
+        float: the value, None if the plug can not be read
+    """
+    if plug is None:
+        return None
+    try:
+        return plug.asDouble(*context)
+    except RuntimeError:
+        return None
+
+
+def _to_ui_value(plug, value):
+    """Convert a plug value from internal units to the UI value type
+
+    Args:
+        plug (MPlug): the attribute plug
+        value (float): value in internal units
+
+    Returns:
+        bool, int or float: the value as returned by getAttr
+    """
+    attribute = plug.attribute()
+    if attribute.hasFn(om2.MFn.kUnitAttribute):
+        unit_type = om2.MFnUnitAttribute(attribute).unitType()
+        if unit_type == om2.MFnUnitAttribute.kAngle:
+            return om2.MAngle(value).asUnits(om2.MAngle.uiUnit())
+        if unit_type == om2.MFnUnitAttribute.kDistance:
+            return om2.MDistance(value).asUnits(om2.MDistance.uiUnit())
+        return value
+
+    if attribute.hasFn(om2.MFn.kEnumAttribute):
+        return int(round(value))
+
+    if attribute.hasFn(om2.MFn.kNumericAttribute):
+        numeric_type = om2.MFnNumericAttribute(attribute).numericType()
+        if numeric_type == om2.MFnNumericData.kBoolean:
+            return bool(value)
+        if numeric_type in (
+            om2.MFnNumericData.kByte,
+            om2.MFnNumericData.kChar,
+            om2.MFnNumericData.kShort,
+            om2.MFnNumericData.kInt,
+        ):
+            return int(round(value))
+
+    return value
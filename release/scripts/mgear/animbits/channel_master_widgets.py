@@ -29,6 +29,14 @@ CHECKBOX_STYLE = """
         """
 
 
+KEY_STATE_COLORS = {
+    cmu.KEY_ON_FRAME: "#ce5846",
+    cmu.KEY_ANIMATED: "#89bf72",
+    cmu.KEY_CHANGED: "#ddd87c",
+    cmu.KEY_STATIC: "#ABA8A6",
+}
+
+
 ##################
 # Helper functions
 ##################
@@ -41,21 +49,22 @@ def refresh_key_button_color(button, attr, current_time=False):
         button (QPushButton): The button to update the color
         attr (str): the attribute fullName
     """
-    if cmu.channel_has_animation(attr):
-        if cmu.value_equal_keyvalue(attr, current_time):
-            if cmu.current_frame_has_key(attr):
-                button.setStyleSheet(
-                    "QPushButton {background-color: #ce5846;}"
-                )
-            else:
-                button.setStyleSheet(
-                    "QPushButton {background-color: #89bf72;}"
-                )
-        else:
-            button.setStyleSheet("QPushButton {background-color: #ddd87c;}")
+    set_key_button_state(button, cmu.get_key_state(attr, current_time))
 
-    else:
-        button.setStyleSheet("QPushButton {background-color: #ABA8A6;}")
+
+def set_key_button_state(button, state):
+    """Set the key button color from the key state, if the state changed
+
+    Args:
+        button (QPushButton): The button to update the color
+        state (str): key state. See channel_master_utils.get_key_state
+    """
+    if button.property("key_state") == state:
+        return
+    button.setProperty("key_state", state)
+    button.setStyleSheet(
+        "QPushButton {{background-color: {};}}".format(KEY_STATE_COLORS[state])
+    )
 
 
 def random_color(min_val=0.01, max_val=0.6):
@@ -119,6 +128,7 @@ class ChannelTable(QtWidgets.QTableWidget):
         self.trigger_value_update = True
         self.namespace = namespace
         self.track_widgets = []
+        self.anim_cache = cmu.AnimationCache()
         self.create_menu()
         self.setup_table()
         self.config_table()
@@ -507,39 +517,33 @@ class ChannelTable(QtWidgets.QTableWidget):
     def refresh_channels_values(self, current_time=False):
         """refresh the channel values of the table"""
         self.trigger_value_update = False
-        for i in range(self.rowCount()):
+        configs = [
+            self.item(i, 0).data(QtCore.Qt.UserRole)
+            for i in range(self.rowCount())
+        ]
+        # Note: with a current time the values are evaluated in that time
+        # context, which forces the evaluation on the animation curve and not
+        # in the current attribute value
+        values, states = self.anim_cache.get_values(
+            [self.namespace_sync(attr["fullName"]) for attr in configs],
+            current_time,
+        )
+        for i, attr in enumerate(configs):
+            val = values[i]
+            if val is None:
+                continue
             ch_item = self.cellWidget(i, 2)
-            item = self.item(i, 0)
-            attr = item.data(QtCore.Qt.UserRole)
-            try:
-                if current_time:
-                    # Note: we can not set time to False because looks like
-                    # having this flag force the evaluation on the animation
-                    # curve and not in the current attribute value
-                    val = cmds.getAttr(
-                        self.namespace_sync(attr["fullName"]),
-                        time=current_time,
-                    )
-                else:
-                    val = cmds.getAttr(self.namespace_sync(attr["fullName"]))
-                if attr["type"] in cmu.ATTR_SLIDER_TYPES:
-                    ch_item.setValue(val)
-                elif attr["type"] == "bool":
-                    # if val:
-                    cbox = ch_item.findChildren(QtWidgets.QCheckBox)[0]
-                    cbox.setChecked(val)
-                elif attr["type"] == "enum":
-                    ch_item.setCurrentIndex(val)
-
-                # refresh button color
-                button_item = self.cellWidget(i, 1)
-                refresh_key_button_color(
-                    button_item,
-                    self.namespace_sync(attr["fullName"]),
-                    current_time,
-                )
-            except ValueError:
-                pass
+            if attr["type"] in cmu.ATTR_SLIDER_TYPES:
+                ch_item.setValue(val)
+            elif attr["type"] == "bool":
+                # if val:
+                cbox = ch_item.findChildren(QtWidgets.QCheckBox)[0]
+                cbox.setChecked(val)
+            elif attr["type"] == "enum":
+                ch_item.setCurrentIndex(val)
+
+            # refresh button color, only if the key state changed
+            set_key_button_state(self.cellWidget(i, 1), states[i])
 
         self.trigger_value_update = True
 
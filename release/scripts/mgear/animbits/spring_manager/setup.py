@@ -10,8 +10,10 @@ from mgear.core import primitive
 from mgear.core import applyop
 from mgear.core import icon
 from mgear.core import node as cNode
+from mgear.core import anim_bake
 from mgear import rigbits
 from mgear.core.utils import one_undo, viewport_off
+from mgear.animbits.spring_manager import simulator
 
 SPRING_ATTRS = [
     "springTotalIntensity",
@@ -640,6 +642,9 @@ def bake(nodes=None):
     Bakes the animation of all selected objects within the current time range
     using specific settings.
 
+    If NumPy is available the springs are simulated offline with
+    spring_manager.simulator, otherwise the scene is evaluated frame by frame.
+
     Returns:
         bool: True if successful, False otherwise.
     """
@@ -647,8 +652,6 @@ def bake(nodes=None):
     start_time = pm.playbackOptions(query=True, minTime=True)
     end_time = pm.playbackOptions(query=True, maxTime=True)
 
-    pm.currentTime(start_time)
-
     if not nodes:
         # Get selected objects
         nodes = pm.selected()
@@ -660,23 +663,30 @@ def bake(nodes=None):
 
     # Perform the bake operation with explicit settings
     try:
-        pm.bakeResults(
-            nodes,
-            time=(start_time, end_time),
-            simulation=True,
-            sampleBy=1,
-            oversamplingRate=1,
-            disableImplicitControl=True,
-            preserveOutsideKeys=True,
-            sparseAnimCurveBake=False,
-            removeBakedAttributeFromLayer=False,
-            removeBakedAnimFromLayer=False,
-            bakeOnOverrideLayer=False,
-            minimizeRotation=True,
-            controlPoints=False,
-            shape=True,
-        )
-        delete_spring_setup(nodes, transfer_animation=False)
+        if simulator.NUMPY_AVAILABLE:
+            frames = list(range(int(start_time), int(end_time) + 1))
+            values = simulator.get_baked_channels(nodes, frames)
+            delete_spring_setup(nodes, transfer_animation=False)
+            anim_bake.key_channels(nodes, frames, values, simulator.CHANNELS)
+        else:
+            pm.currentTime(start_time)
+            pm.bakeResults(
+                nodes,
+                time=(start_time, end_time),
+                simulation=True,
+                sampleBy=1,
+                oversamplingRate=1,
+                disableImplicitControl=True,
+                preserveOutsideKeys=True,
+                sparseAnimCurveBake=False,
+                removeBakedAttributeFromLayer=False,
+                removeBakedAnimFromLayer=False,
+                bakeOnOverrideLayer=False,
+                minimizeRotation=True,
+                controlPoints=False,
+                shape=True,
+            )
+            delete_spring_setup(nodes, transfer_animation=False)
         for node in nodes:
             remove_settings_attr(node)
         print("Successfully baked selected objects.")
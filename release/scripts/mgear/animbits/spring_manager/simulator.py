@@ -0,0 +1,506 @@
+"""Offline spring simulation.
+
+NumPy implementation of the mgear_springNode integration, used to bake the
+spring setups created by spring_manager.setup.create_spring without
+stepping the scene time.
+
+The inputs of all the setups (root, aim and up vector matrices, spring
+settings and scale) are sampled over the frame range with DG context
+evaluation, with mgear.core.anim_bake. Then the springs are stepped frame
+by frame, all the setups at the same depth of the hierarchy together, and
+the aim constraint and parent constraint of each setup are solved in
+NumPy. Setups parented under other spring setups use the simulated world
+matrix of the parent setup.
+
+Note:
+    The spring nodes of the setups are not evaluated, the simulation always
+    starts at rest at the first frame.
+"""
+
+import maya.api.OpenMaya as om2
+from maya import cmds
+
+from mgear.core import anim_bake
+
+np = anim_bake.np
+NUMPY_AVAILABLE = anim_bake.NUMPY_AVAILABLE
+
+# channels driven by the spring setup parent constraint
+CHANNELS = ["tx", "ty", "tz", "rx", "ry", "rz"]
+
+# springSetupMembers order
+MEMBERS = ["root", "trans", "aim_root", "aim_goal", "driver"]
+
+# aimConstraint worldUpType enum index
+WORLD_UP_OBJECT_ROTATION = 2
+
+
+######################################
+# Spring solver
+######################################
+
+
+def _column(values):
+    return np.asarray(values, dtype=float)[..., None]
+
+
+class SpringState(object):
+    """State of mgear_springNode solvers, stepped together
+
+    Args:
+        count (int): number of springs
+    """
+
+    def __init__(self, count):
+        self.previous = np.zeros((count, 3))
+        self.current = np.zeros((count, 3))
+
+    def reset(self, goals, index=slice(None)):
+        """Set the springs at rest in the goals
+
+        Args:
+            goals (numpy.ndarray): goal positions (n x 3)
+            index (slice or numpy.ndarray, optional): springs to reset
+        """
+        self.previous[index] = goals
+        self.current[index] = goals
+
+    def step(self, goals, damping, stiffness, intensity, index=slice(None)):
+        """Step the springs one frame
+
+        Args:
+            goals (numpy.ndarray): goal positions (n x 3)
+            damping (numpy.ndarray): damping values (n)
+            stiffness (numpy.ndarray): stiffness values (n)
+            intensity (numpy.ndarray): intensity values (n)
+            index (slice or numpy.ndarray, optional): springs to step
+
+        Returns:
+            numpy.ndarray: output positions (n x 3)
+        """
+        current = self.current[index]
+        velocity = (current - self.previous[index]) * (1.0 - _column(damping))
+        position = current + velocity
+        position += (goals - position) * _column(stiffness)
+
+        self.previous[index] = current
+        self.current[index] = position
+
+        # the intensity doesn't affect the stored states
+        return goals + (position - goals) * _column(intensity)
+
+
+def simulate(goals, damping, stiffness, intensity):
+    """Simulate independent springs over consecutive frames
+
+    Args:
+        goals (numpy.ndarray): goal positions (frames x springs x 3)
+        damping (numpy.ndarray): damping values (frames x springs) or a
+            value for all the frames and springs
+        stiffness (numpy.ndarray): stiffness values (frames x springs) or a
+            value for all the frames and springs
+        intensity (numpy.ndarray): intensity values (frames x springs) or a
+            value for all the frames and springs
+
+    Returns:
+        numpy.ndarray: output positions (frames x springs x 3)
+    """
+    goals = np.asarray(goals, dtype=float)
+    shape = goals.shape[:2]
+    damping = np.broadcast_to(damping, shape)
+    stiffness = np.broadcast_to(stiffness, shape)
+    intensity = np.broadcast_to(intensity, shape)
+
+    state = SpringState(shape[1])
+    result = np.empty(goals.shape)
+    for f in range(shape[0]):
+        if f == 0:
+            state.reset(goals[f])
+        result[f] = state.step(
+            goals[f], damping[f], stiffness[f], intensity[f]
+        )
+    return result
+
+
+######################################
+# Constraints
+######################################
+
+
+def _normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1)[..., None]
+
+
+def _aim_basis(aim, up):
+    aim = _normalize(aim)
+    side = _normalize(np.cross(aim, up))
+    return np.stack([aim, np.cross(side, aim), side], axis=1)
+
+
+def aim_rotations(aim_dirs, up_dirs, aim_vectors, up_vectors):
+    """Vectorized aim constraint rotation
+
+    Args:
+        aim_dirs (numpy.ndarray): world aim directions (n x 3)
+        up_dirs (numpy.ndarray): world up directions (n x 3)
+        aim_vectors (numpy.ndarray): local aim vectors (n x 3)
+        up_vectors (numpy.ndarray): local up vectors (n x 3)
+
+    Returns:
+        numpy.ndarray: world rotation matrices (n x 3 x 3)
+    """
+    local = _aim_basis(aim_vectors, up_vectors)
+    world = _aim_basis(aim_dirs, up_dirs)
+    return np.matmul(np.transpose(local, (0, 2, 1)), world)
+
+
+def parent_constraint_locals(positions, rotations, scales, parents):
+    """Get the local matrices of parent constrained nodes
+
+    The constraint drives the translation and rotation, the local scale is
+    kept.
+
+    Args:
+        positions (numpy.ndarray): world positions (n x 3)
+        rotations (numpy.ndarray): world rotation matrices (n x 3 x 3)
+        scales (numpy.ndarray): local scale (n x 3)
+        parents (numpy.ndarray): parent world matrices (n x 4 x 4)
+
+    Returns:
+        numpy.ndarray: local matrices (n x 4 x 4)
+    """
+    parent_rotations = parents[:, :3, :3]
+    parent_rotations = parent_rotations / np.linalg.norm(
+        parent_rotations, axis=-1
+    )[:, :, None]
+
+    result = np.zeros((len(positions), 4, 4))
+    result[:, :3, :3] = scales[:, :, None] * np.matmul(
+        rotations, np.linalg.inv(parent_rotations)
+    )
+    result[:, 3, :3] = np.einsum(
+        "ni,nij->nj",
+        positions - parents[:, 3, :3],
+        np.linalg.inv(parents[:, :3, :3]),
+    )
+    result[:, 3, 3] = 1.0
+    return result
+
+
+######################################
+# Spring setups
+######################################
+
+
+def _long_name(node):
+    return cmds.ls(str(node), long=True)[0]
+
+
+def _get_spring_node(driven):
+    """Get the mgear_springNode driving a transform of the setup"""
+    for dm in cmds.listConnections(
+        driven + ".parentMatrix",
+        source=False,
+        destination=True,
+        type="decomposeMatrix",
+    ) or []:
+        nodes = cmds.listConnections(
+            dm + ".outputTranslate",
+            source=False,
+            destination=True,
+            type="mgear_springNode",
+        )
+        if nodes:
+            return nodes[0]
+    raise ValueError("{} is not driven by a spring node".format(driven))
+
+
+def _get_transformation(node):
+    """Get the local matrix of a transform, without the translation"""
+    sel = om2.MSelectionList()
+    sel.add(node)
+    matrix = anim_bake._to_numpy(
+        om2.MFnTransform(sel.getDagPath(0)).transformation().asMatrix()
+    )
+    matrix[3, :3] = 0.0
+    return matrix
+
+
+def has_setup(node):
+    """Check if a node has a spring setup
+
+    Args:
+        node (str): node name
+
+    Returns:
+        bool: True if the node is driven by a spring setup
+    """
+    return bool(
+        cmds.attributeQuery("springSetupMembers", node=node, exists=True)
+        and cmds.listConnections(
+            "{}.springSetupMembers[0]".format(node),
+            source=True,
+            destination=False,
+        )
+    )
+
+
+def get_setup(node):
+    """Get the members and static settings of a spring setup
+
+    Args:
+        node (str or PyNode): node driven by the spring setup
+
+    Returns:
+        dict: setup data
+    """
+    node = _long_name(node)
+    setup = {"node": node}
+    for i, member in enumerate(MEMBERS):
+        connections = cmds.listConnections(
+            "{}.springSetupMembers[{}]".format(node, i),
+            source=True,
+            destination=False,
+        )
+        if not connections:
+            raise ValueError(
+                "{} spring setup is missing the {}".format(node, member)
+            )
+        setup[member] = _long_name(connections[0])
+
+    cns = cmds.listRelatives(
+        setup["driver"], type="aimConstraint", fullPath=True
+    )
+    if not cns:
+        raise ValueError("{} has no aim constraint".format(setup["driver"]))
+    cns = cns[0]
+    setup["aim_vector"] = cmds.getAttr(cns + ".aimVector")[0]
+    setup["up_vector"] = cmds.getAttr(cns + ".upVector")[0]
+    setup["world_up_vector"] = cmds.getAttr(cns + ".worldUpVector")[0]
+    setup["up_object_rotation"] = (
+        cmds.getAttr(cns + ".worldUpType") == WORLD_UP_OBJECT_ROTATION
+    )
+
+    setup["pos_spring"] = _get_spring_node(setup["trans"])
+    setup["rot_spring"] = _get_spring_node(setup["aim_goal"])
+    setup["trans_matrix"] = _get_transformation(setup["trans"])
+    sel = om2.MSelectionList()
+    sel.add(setup["driver"])
+    setup["driver_translation"] = tuple(
+        om2.MFnTransform(sel.getDagPath(0)).translation(om2.MSpace.kTransform)
+    )
+    return setup
+
+
+def get_setups(nodes):
+    """Get the spring setups of the nodes and of their spring ancestors
+
+    The ancestors driven by springs need to be simulated to get the parent
+    matrices of the nodes.
+
+    Args:
+        nodes (list): nodes driven by spring setups
+
+    Returns:
+        list: setups data, the setups of the nodes first
+    """
+    names = [_long_name(n) for n in nodes]
+    found = set(names)
+    for name in list(names):
+        parent = name.rpartition("|")[0]
+        while parent:
+            if parent not in found and has_setup(parent):
+                found.add(parent)
+                names.append(parent)
+            parent = parent.rpartition("|")[0]
+    return [get_setup(n) for n in names]
+
+
+def _get_hierarchy(setups):
+    """Get the closest setup ancestor, the transforms between them and the
+    depth of each setup"""
+    index = dict((s["node"], i) for i, s in enumerate(setups))
+    ancestors = []
+    chains = []
+    for setup in setups:
+        chain = []
+        ancestor = -1
+        parent = setup["node"].rpartition("|")[0]
+        while parent:
+            if parent in index:
+                ancestor = index[parent]
+                break
+            chain.append(parent)
+            parent = parent.rpartition("|")[0]
+        ancestors.append(ancestor)
+        chains.append(chain)
+
+    depths = []
+    for i in range(len(setups)):
+        depth = 0
+        ancestor = ancestors[i]
+        while ancestor >= 0:
+            depth += 1
+            ancestor = ancestors[ancestor]
+        depths.append(depth)
+    return np.array(ancestors, dtype=int), chains, depths
+
+
+def _sample_inputs(setups, ancestors, chains, frames):
+    count = len(setups)
+    identity = np.tile(np.identity(4), (len(frames), count, 1, 1))
+
+    inputs = {}
+    external = [i for i in range(count) if ancestors[i] < 0]
+    inputs["parents"] = identity.copy()
+    inputs["parents"][:, external] = anim_bake.sample_matrices(
+        [setups[i]["root"] for i in external], frames, "parentMatrix"
+    )
+
+    # matrices between the setup and the ancestor setup
+    chain_nodes = sorted(set(n for c in chains for n in c))
+    chain_locals = anim_bake.sample_matrices(chain_nodes, frames, "matrix")
+    inputs["chains"] = identity.copy()
+    for i, chain in enumerate(chains):
+        if ancestors[i] < 0:
+            continue
+        for node in chain:
+            inputs["chains"][:, i] = np.matmul(
+                inputs["chains"][:, i],
+                chain_locals[:, chain_nodes.index(node)],
+            )
+
+    inputs["roots"] = anim_bake.sample_matrices(
+        [s["root"] for s in setups], frames, "matrix"
+    )
+    inputs["aim_roots"] = anim_bake.sample_matrices(
+        [s["aim_root"] for s in setups], frames, "matrix"
+    )
+
+    attrs = []
+    for s in setups:
+        for spring in (s["pos_spring"], s["rot_spring"]):
+            attrs.extend(
+                spring + "." + a for a in ("damping", "stiffness", "intensity")
+            )
+        attrs.extend(s["node"] + "." + a for a in ("sx", "sy", "sz"))
+    values = anim_bake.sample_values(attrs, frames).reshape(
+        len(frames), count, 9
+    )
+    inputs["pos_settings"] = values[:, :, 0:3]
+    inputs["rot_settings"] = values[:, :, 3:6]
+    inputs["scales"] = values[:, :, 6:9]
+    return inputs
+
+
+def simulate_setups(setups, frames):
+    """Simulate the spring setups over consecutive frames
+
+    Args:
+        setups (list): setups data, see get_setup
+        frames (list): consecutive frames
+
+    Returns:
+        numpy.ndarray: local matrices of the driven nodes
+            (frames x setups x 4 x 4)
+    """
+    count = len(setups)
+    ancestors, chains, depths = _get_hierarchy(setups)
+    inputs = _sample_inputs(setups, ancestors, chains, frames)
+
+    trans_matrices = np.array([s["trans_matrix"] for s in setups])
+    driver_translations = np.array([s["driver_translation"] for s in setups])
+    aim_vectors = np.array([s["aim_vector"] for s in setups])
+    up_vectors = np.array([s["up_vector"] for s in setups])
+    world_up_vectors = np.array([s["world_up_vector"] for s in setups])
+    up_object_rotation = np.array([s["up_object_rotation"] for s in setups])
+
+    levels = [
+        np.array([i for i in range(count) if depths[i] == d], dtype=int)
+        for d in range(max(depths) + 1)
+    ]
+
+    pos_state = SpringState(count)
+    rot_state = SpringState(count)
+    world = np.empty((count, 4, 4))
+    result = np.empty((len(frames), count, 4, 4))
+    for f in range(len(frames)):
+        for idx in levels:
+            parents = inputs["parents"][f, idx]
+            has_ancestor = ancestors[idx] >= 0
+            if has_ancestor.any():
+                parents[has_ancestor] = np.matmul(
+                    inputs["chains"][f, idx[has_ancestor]],
+                    world[ancestors[idx[has_ancestor]]],
+                )
+            roots = np.matmul(inputs["roots"][f, idx], parents)
+
+            # position spring
+            goals = roots[:, 3, :3]
+            if f == 0:
+                pos_state.reset(goals, idx)
+            settings = inputs["pos_settings"][f, idx]
+            trans = np.matmul(trans_matrices[idx], roots)
+            trans[:, 3, :3] = pos_state.step(
+                goals, settings[:, 0], settings[:, 1], settings[:, 2], idx
+            )
+
+            # direction spring
+            goals = np.matmul(inputs["aim_roots"][f, idx], trans)[:, 3, :3]
+            if f == 0:
+                rot_state.reset(goals, idx)
+            settings = inputs["rot_settings"][f, idx]
+            aim_goals = rot_state.step(
+                goals, settings[:, 0], settings[:, 1], settings[:, 2], idx
+            )
+
+            # aim constraint
+            positions = trans[:, 3, :3] + np.einsum(
+                "ni,nij->nj", driver_translations[idx], trans[:, :3, :3]
+            )
+            up_dirs = world_up_vectors[idx].copy()
+            rotate_up = up_object_rotation[idx]
+            up_dirs[rotate_up] = np.einsum(
+                "ni,nij->nj", up_dirs[rotate_up], trans[rotate_up, :3, :3]
+            )
+            rotations = aim_rotations(
+                aim_goals - positions,
+                up_dirs,
+                aim_vectors[idx],
+                up_vectors[idx],
+            )
+
+            # parent constraint of the driven node
+            local = parent_constraint_locals(
+                positions, rotations, inputs["scales"][f, idx], parents
+            )
+            world[idx] = np.matmul(local, parents)
+            result[f, idx] = local
+    return result
+
+
+def get_baked_channels(nodes, frames):
+    """Get the channel values of the nodes driven by spring setups
+
+    Args:
+        nodes (list): nodes driven by spring setups
+        frames (list): consecutive frames
+
+    Returns:
+        numpy.ndarray: tx, ty, tz, rx, ry, rz, sx, sy, sz values in UI
+            units (frames x nodes x 9)
+    """
+    setups = get_setups(nodes)
+    local_matrices = simulate_setups(setups, frames)
+
+    angle = om2.MAngle(1.0, om2.MAngle.kRadians).asUnits(om2.MAngle.uiUnit())
+    values = np.empty((len(frames), len(nodes), 9))
+    for i, node in enumerate(nodes):
+        values[:, i] = anim_bake.get_transform_channels(
+            node, local_matrices[:, i]
+        )
+        # continuous rotation curves
+        values[:, i, 3:6] = (
+            np.unwrap(values[:, i, 3:6] / angle, axis=0) * angle
+        )
+    return values
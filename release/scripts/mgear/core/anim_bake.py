@@ -0,0 +1,442 @@
+"""
+Batched animation sampling and baking.
+
+Vectorized engine used by the animation transfer tools in
+mgear.core.anim_utils. The matrices of all the nodes are evaluated over the
+frame range with OpenMaya 2.0 DG context evaluation, without changing the
+current time, and stored in NumPy matrix stacks (frames x nodes x 4 x 4).
+The local matrices are decomposed to TRS channels for all the frames at
+once and each channel is keyed with a single key paste.
+
+Note:
+    NumPy ships with Maya 2022 and later. If it is not available
+    NUMPY_AVAILABLE is False and mgear.core.anim_utils uses its per frame
+    path.
+
+    The decomposition doesn't handle rotate and scale pivots or shear, as
+    the animation controls don't use them.
+"""
+
+#############################################
+# GLOBAL
+#############################################
+
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+from maya import cmds
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+CHANNELS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+
+# rotate order enum index: axis rotated first, second and third
+ROTATE_ORDERS = [
+    (0, 1, 2),  # xyz
+    (1, 2, 0),  # yzx
+    (2, 0, 1),  # zxy
+    (0, 2, 1),  # xzy
+    (1, 0, 2),  # yxz
+    (2, 1, 0),  # zyx
+]
+
+CURVE_TYPES = {
+    "doubleLinear": "animCurveTL",
+    "doubleAngle": "animCurveTA",
+    "time": "animCurveTT",
+}
+
+TEMP_CURVE_NAME = "mgear_bake_tmp_curve"
+
+
+######################################
+# Sampling
+######################################
+
+
+def _get_plug(node, attr):
+    sel = om2.MSelectionList()
+    sel.add(str(node))
+    plug = om2.MFnDependencyNode(sel.getDependNode(0)).findPlug(attr, False)
+    if plug.isArray:
+        plug = plug.elementByLogicalIndex(0)
+    return plug
+
+
+def _to_numpy(matrix):
+    return np.array(tuple(matrix)).reshape(4, 4)
+
+
+def _read(plug, numeric, *context):
+    if numeric:
+        return plug.asDouble(*context)
+    return _to_numpy(om2.MFnMatrixData(plug.asMObject(*context)).matrix())
+
+
+def _evaluate(plugs, frame, numeric=False):
+    """Evaluate the matrix or numeric plugs at a frame without changing the
+    time"""
+    context = om2.MDGContext(om2.MTime(frame, om2.MTime.uiUnit()))
+    if hasattr(om2, "MDGContextGuard"):
+        # the context is used until the guard is deleted
+        guard = om2.MDGContextGuard(context)
+        try:
+            return [_read(p, numeric) for p in plugs]
+        finally:
+            del guard
+    return [_read(p, numeric, context) for p in plugs]
+
+
+def sample_matrices(nodes, frames, attr="worldMatrix"):
+    """Evaluate a matrix attribute of the nodes over the frames
+
+    Args:
+        nodes (list): nodes names or PyNodes
+        frames (list): frames to evaluate
+        attr (str, optional): matrix attribute. I.e: "parentMatrix"
+
+    Returns:
+        numpy.ndarray: matrices (frames x nodes x 4 x 4)
+    """
+    plugs = [_get_plug(n, attr) for n in nodes]
+    result = np.empty((len(frames), len(plugs), 4, 4))
+    for i, frame in enumerate(frames):
+        if plugs:
+            result[i] = _evaluate(plugs, frame)
+    return result
+
+
+def sample_values(attrs, frames):
+    """Evaluate numeric attributes over the frames
+
+    Args:
+        attrs (list): attributes names. I.e: "arm_L0_fk0_ctl.blend"
+        frames (list): frames to evaluate
+
+    Returns:
+        numpy.ndarray: values in internal units (frames x attrs)
+    """
+    plugs = [_get_plug(*str(a).split(".", 1)) for a in attrs]
+    result = np.empty((len(frames), len(plugs)))
+    for i, frame in enumerate(frames):
+        if plugs:
+            result[i] = _evaluate(plugs, frame, numeric=True)
+    return result
+
+
+######################################
+# Matrix stacks
+######################################
+
+
+def translation_matrices(positions):
+    """Get identity matrices with the positions as translation
+
+    Args:
+        positions (numpy.ndarray): positions (n x 3)
+
+    Returns:
+        numpy.ndarray: matrices (n x 4 x 4)
+    """
+    result = np.tile(np.identity(4), (len(positions), 1, 1))
+    result[:, 3, :3] = positions
+    return result
+
+
+def pole_vectors(p1, p2, p3, pole_distance=1.0):
+    """Vectorized mgear.core.vector.calculatePoleVector
+
+    Args:
+        p1 (numpy.ndarray): positions of the first object (n x 3)
+        p2 (numpy.ndarray): positions of the second object (n x 3)
+        p3 (numpy.ndarray): positions of the third object (n x 3)
+        pole_distance (float, optional): distance of the pole vector from
+            the mid point
+
+    Returns:
+        numpy.ndarray: pole vector positions (n x 3)
+    """
+
+    def normal(v):
+        return v / np.linalg.norm(v, axis=-1)[:, None]
+
+    def dot(a, b):
+        return np.sum(a * b, axis=-1)[:, None]
+
+    distance = (
+        (np.linalg.norm(p2 - p1, axis=-1) + np.linalg.norm(p3 - p2, axis=-1))
+        * 0.5
+        * pole_distance
+    )[:, None]
+    p1_norm = normal(p1 - p2) * distance + p2
+    p3_norm = normal(p3 - p2) * distance + p2
+    v = p3_norm - p1_norm
+    mid = p1_norm + v * dot(p2 - p1_norm, v) / dot(v, v)
+    return normal(p2 - mid) * distance + p2
+
+
+def rotation_to_euler(rotations, rotate_order=0):
+    """Get the euler angles of rotation matrices
+
+    Args:
+        rotations (numpy.ndarray): orthonormal matrices, Maya row vector
+            convention (n x 3 x 3)
+        rotate_order (int, optional): rotate order enum index
+
+    Returns:
+        numpy.ndarray: x, y and z angles in radians (n x 3)
+    """
+    i, j, k = ROTATE_ORDERS[rotate_order]
+    odd = (j - i) % 3 != 1
+    # column vector convention
+    m = np.transpose(rotations, (0, 2, 1))
+
+    cy = np.sqrt(m[:, i, i] ** 2 + m[:, j, i] ** 2)
+    singular = cy < 1e-8
+    a = np.where(
+        singular,
+        np.arctan2(-m[:, j, k], m[:, j, j]),
+        np.arctan2(m[:, k, j], m[:, k, k]),
+    )
+    b = np.arctan2(-m[:, k, i], cy)
+    c = np.where(singular, 0.0, np.arctan2(m[:, j, i], m[:, i, i]))
+    if odd:
+        a, b, c = -a, -b, -c
+
+    result = np.empty((len(rotations), 3))
+    result[:, i] = a
+    result[:, j] = b
+    result[:, k] = c
+    return result
+
+
+def decompose(matrices, rotate_order=0, rotate_axis=None, joint_orient=None):
+    """Decompose local matrices to translate, rotate and scale channels
+
+    Args:
+        matrices (numpy.ndarray): local matrices (n x 4 x 4)
+        rotate_order (int, optional): rotate order enum index
+        rotate_axis (numpy.ndarray, optional): rotate axis matrix (3 x 3)
+        joint_orient (numpy.ndarray, optional): joint orient matrix (3 x 3)
+
+    Returns:
+        numpy.ndarray: tx, ty, tz, rx, ry, rz (radians), sx, sy, sz (n x 9)
+    """
+    result = np.empty((len(matrices), 9))
+    result[:, :3] = matrices[:, 3, :3]
+
+    m = matrices[:, :3, :3]
+    scale = np.linalg.norm(m, axis=-1)
+    # negative scale is set in the x axis
+    scale[:, 0] *= np.sign(np.linalg.det(m))
+    rotations = m / scale[:, :, None]
+
+    if rotate_axis is not None:
+        rotations = np.matmul(np.linalg.inv(rotate_axis), rotations)
+    if joint_orient is not None:
+        rotations = np.matmul(rotations, np.linalg.inv(joint_orient))
+
+    result[:, 3:6] = rotation_to_euler(rotations, rotate_order)
+    result[:, 6:] = scale
+    return result
+
+
+######################################
+# Baking
+######################################
+
+
+def get_parent_matrices(nodes, world_matrices, frames):
+    """Get the world parent matrices of the baked nodes over the frames
+
+    If a node is child of another baked node, its parent matrix is computed
+    from the baked world matrix of the ancestor.
+
+    Args:
+        nodes (list): baked nodes
+        world_matrices (numpy.ndarray): baked world matrices
+            (frames x nodes x 4 x 4)
+        frames (list): baked frames
+
+    Returns:
+        numpy.ndarray: parent matrices (frames x nodes x 4 x 4)
+    """
+    long_names = [cmds.ls(str(n), long=True)[0] for n in nodes]
+    index = dict((n, i) for i, n in enumerate(long_names))
+
+    ancestors = []
+    chains = []
+    for name in long_names:
+        chain = []
+        ancestor = None
+        parent = name.rpartition("|")[0]
+        while parent:
+            if parent in index:
+                ancestor = index[parent]
+                break
+            chain.append(parent)
+            parent = parent.rpartition("|")[0]
+        ancestors.append(ancestor)
+        chains.append(chain)
+
+    result = np.empty(world_matrices.shape)
+
+    # the unparented nodes and the intermediate parents are sampled in one
+    # evaluation pass each
+    unparented = [i for i, a in enumerate(ancestors) if a is None]
+    if unparented:
+        result[:, unparented] = sample_matrices(
+            [long_names[i] for i in unparented], frames, "parentMatrix"
+        )
+    chain_nodes = sorted(
+        set(c for i, chain in enumerate(chains) for c in chain
+            if ancestors[i] is not None)
+    )
+    chain_index = dict((n, i) for i, n in enumerate(chain_nodes))
+    if chain_nodes:
+        locals_ = sample_matrices(chain_nodes, frames, "matrix")
+
+    for i, ancestor in enumerate(ancestors):
+        if ancestor is None:
+            continue
+        parent_matrices = world_matrices[:, ancestor]
+        for node in reversed(chains[i]):
+            parent_matrices = np.matmul(
+                locals_[:, chain_index[node]], parent_matrices
+            )
+        result[:, i] = parent_matrices
+    return result
+
+
+def get_transform_channels(node, local_matrices):
+    """Get the channel values of a transform for the local matrices
+
+    Args:
+        node (str or PyNode): transform or joint
+        local_matrices (numpy.ndarray): local matrices (n x 4 x 4)
+
+    Returns:
+        numpy.ndarray: channel values in UI units (n x 9)
+    """
+    sel = om2.MSelectionList()
+    sel.add(str(node))
+    dag_path = sel.getDagPath(0)
+    rotate_axis = _to_numpy(
+        om2.MFnTransform(dag_path)
+        .rotateOrientation(om2.MSpace.kTransform)
+        .asMatrix()
+    )[:3, :3]
+    joint_orient = None
+    if dag_path.hasFn(om2.MFn.kJoint):
+        joint_orient = _to_numpy(
+            oma2.MFnIkJoint(dag_path).orientation().asMatrix()
+        )[:3, :3]
+
+    values = decompose(
+        local_matrices,
+        cmds.getAttr("{}.rotateOrder".format(node)),
+        rotate_axis,
+        joint_orient,
+    )
+    values[:, :3] *= om2.MDistance(1.0, om2.MDistance.internalUnit()).asUnits(
+        om2.MDistance.uiUnit()
+    )
+    values[:, 3:6] *= om2.MAngle(1.0, om2.MAngle.kRadians).asUnits(
+        om2.MAngle.uiUnit()
+    )
+    return values
+
+
+def set_keys(attr, frames, values):
+    """Key an attribute at the frames
+
+    The keys are written in a temporary curve and pasted in the attribute
+    with a single command, using the default tangents. Attributes in
+    animation layers or driven by other nodes are keyed frame by frame.
+
+    Note:
+        The keys clipboard is used.
+
+    Args:
+        attr (str): attribute name. I.e: "arm_L0_fk0_ctl.rx"
+        frames (list): frames to key
+        values (list): values in UI units
+    """
+    if not len(frames):
+        return
+    source = cmds.listConnections(
+        attr, source=True, destination=False, skipConversionNodes=True
+    )
+    if source and not cmds.objectType(source[0], isAType="animCurve"):
+        for frame, value in zip(frames, values):
+            cmds.setKeyframe(attr, time=frame, value=value)
+        return
+
+    curve = cmds.createNode(
+        CURVE_TYPES.get(cmds.getAttr(attr, type=True), "animCurveTU"),
+        name=TEMP_CURVE_NAME,
+        skipSelect=True,
+    )
+    try:
+        ktv = []
+        for frame, value in zip(frames, values):
+            ktv.extend([float(frame), float(value)])
+        cmds.setAttr(
+            "{}.ktv[0:{}]".format(curve, len(frames) - 1),
+            *ktv,
+            size=len(frames)
+        )
+        cmds.keyTangent(
+            curve,
+            inTangentType=cmds.keyTangent(q=True, g=True, itt=True)[0],
+            outTangentType=cmds.keyTangent(q=True, g=True, ott=True)[0],
+        )
+        cmds.copyKey(curve)
+        cmds.pasteKey(
+            attr, option="merge", time=(frames[0], frames[0])
+        )
+    finally:
+        cmds.delete(curve)
+
+
+def key_channels(nodes, frames, values, channels=CHANNELS):
+    """Key the transform channels of the nodes at the frames
+
+    Args:
+        nodes (list): transforms to key
+        frames (list): frames to key
+        values (numpy.ndarray): tx, ty, tz, rx, ry, rz, sx, sy, sz values in
+            UI units (frames x nodes x 9)
+        channels (list, optional): channels to key
+    """
+    for i, node in enumerate(nodes):
+        for ch in channels:
+            attr = "{}.{}".format(node, ch)
+            if cmds.getAttr(attr, lock=True):
+                continue
+            set_keys(attr, frames, values[:, i, CHANNELS.index(ch)])
+
+
+def bake_world_matrices(nodes, world_matrices, frames, channels=CHANNELS):
+    """Key the nodes to match the world matrices over the frames
+
+    Args:
+        nodes (list): transforms to key
+        world_matrices (numpy.ndarray): world matrices
+            (frames x nodes x 4 x 4)
+        frames (list): frames to key
+        channels (list, optional): channels to key
+    """
+    parent_matrices = get_parent_matrices(nodes, world_matrices, frames)
+    local_matrices = np.matmul(
+        world_matrices, np.linalg.inv(parent_matrices)
+    )
+    values = np.empty((len(frames), len(nodes), 9))
+    for i, node in enumerate(nodes):
+        values[:, i] = get_transform_channels(node, local_matrices[:, i])
+    key_channels(nodes, frames, values, channels)
@@ -7,6 +7,7 @@ from .six import PY2
 
 # Maya imports
 from maya import cmds
+import maya.api.OpenMaya as om2
 import pymel.core as pm
 from pymel import versions
 
@@ -15,6 +16,7 @@ import mgear
 from mgear.vendor.Qt import QtCore
 from mgear.vendor.Qt import QtWidgets
 from mgear.core import pyqt
+from mgear.core import anim_bake
 from mgear.core import dag
 from mgear.core import transform
 from mgear.core import utils
@@ -211,6 +213,26 @@ def recordNodesMatrices(nodes, desiredTime):
     return nodeToMat_dict
 
 
+def getBakeFrames(nodes, startFrame, endFrame, onlyKeyframes=True):
+    """get the frames to bake in the frame range
+
+    Args:
+        nodes (list): of nodes with the keyframes
+        startFrame (int): start frame
+        endFrame (int): end frame
+        onlyKeyframes (bool, optional): if True, only the frames with
+            keyframes in the nodes transform channels
+
+    Returns:
+        list: of frames
+    """
+    frames = list(range(startFrame, endFrame + 1))
+    if onlyKeyframes:
+        keyframes = set(pm.keyframe(nodes, at=["t", "r", "s"], q=True))
+        frames = [x for x in frames if x in keyframes]
+    return frames
+
+
 def getRootNode():
     """Returns the root node from a selected node
 
@@ -1295,12 +1317,18 @@ def getMirrorTarget(nameSpace=None, node=None):
         return node
 
 
-def mirrorPose(flip=False, nodes=None):
-    """Summary
+def mirrorPose(flip=False, nodes=None, frameRange=None):
+    """Mirror or flip the pose of the controls
+
+    The mirror data is read from the cached mirror table of the rig. All
+    the values are read before writing them back, so the flip is done in a
+    single pass.
 
     Args:
         flip (bool, options): Set the function behaviour to flip
         nodes (None,  [PyNode]): Controls to mirro/flip the pose
+        frameRange (None, (int, int)): If set, mirror/flip the keys in the
+            frame range instead of the current pose
     """
     if nodes is None:
         nodes = pm.selected()
@@ -1313,24 +1341,20 @@ def mirrorPose(flip=False, nodes=None):
         nameSpace = False
         nameSpace = getNamespace(nodes[0])
 
-        mirrorEntries = []
-        for oSel in nodes:
-            target = getMirrorTarget(nameSpace, oSel)
-            mirrorEntries.extend(calculateMirrorData(oSel, target))
-
-            # To flip a pose, do mirroring both ways.
-            if target not in nodes and flip:
-                mirrorEntries.extend(calculateMirrorData(target, oSel))
-
-        for dat in mirrorEntries:
-            applyMirror(nameSpace, dat)
+        mirrorPairs = getMirrorPairs(nodes, nameSpace, flip)
+        if frameRange:
+            mirrorKeys(nameSpace, mirrorPairs, frameRange)
+        else:
+            applyMirrorPairs(nameSpace, mirrorPairs)
 
     except Exception as e:
         pm.displayWarning("Flip/Mirror pose fail")
         pm.displayWarning(
             "If you are using Custom naming rules in controls. "
             "It is possible that the name configuration makes hard to track "
-            "the correct object to mirror for {}".format(oSel.name())
+            "the correct object to mirror for {}".format(
+                ", ".join([n.name() for n in nodes])
+            )
         )
         import traceback
 
@@ -1341,6 +1365,273 @@ def mirrorPose(flip=False, nodes=None):
         pm.undoInfo(cck=1)
 
 
+# mirror tables by rig root uuid
+_mirrorTables = {}
+_mirrorTablesCallbacks = []
+
+
+def clearMirrorTables(*args):
+    """Clear the cached mirror tables
+
+    The tables are cleared when a scene is opened. Clear them if the
+    controls invert attributes are changed.
+    """
+    _mirrorTables.clear()
+
+
+def getRigRoot(node):
+    """Get the rig root of a node
+
+    Args:
+        node (str or PyNode): Rig node
+
+    Returns:
+        PyNode or None: The rig root with the is_rig attribute
+    """
+    path = cmds.ls(str(node), long=True)
+    if not path:
+        return None
+    parts = path[0].split("|")
+    candidates = ["|".join(parts[:i]) for i in range(2, len(parts) + 1)]
+    roots = cmds.ls(["{}.is_rig".format(c) for c in candidates], long=True)
+    if not roots:
+        return None
+    return pm.PyNode(roots[0].rsplit(".", 1)[0])
+
+
+def getMirrorEntry(node, nameSpace=None):
+    """Get the mirror table entry of a control
+
+    Same rules as calculateMirrorData and applyMirror, without the values.
+
+    Args:
+        node (str or PyNode): The control
+        nameSpace (str, optional): Namespace
+
+    Returns:
+        dict: {"target": target name without namespace or None,
+            "attrs": [[attr, target attr, invert sign], ...]}
+    """
+    if isinstance(node, str):
+        node = pm.PyNode(node)
+
+    target = getMirrorTarget(nameSpace, node)
+    if target is None:
+        return {"target": None, "attrs": []}
+
+    attrs = []
+    for attrName in listAttrForMirror(node):
+        nodeAttr = node.attr(attrName)
+        if nodeAttr.isCompound() or nodeAttr.isMulti():
+            continue
+
+        # whether does attribute "invTx" exists when attrName is "tx"
+        invCheckName = getInvertCheckButtonAttrName(attrName)
+        inv = 1
+        if (
+            pm.attributeQuery(
+                invCheckName, node=node, shortName=True, exists=True
+            )
+            and node.attr(invCheckName).get()
+        ):
+            inv = -1
+
+        # if attr name is side specified, record inverted attr name
+        if isSideElement(attrName):
+            invAttrName = swapSideLabel(attrName)
+        else:
+            invAttrName = attrName
+
+        if [skip for skip in NO_MIRROR_ATTRIBUTES if skip in invAttrName]:
+            continue
+        if not pm.attributeQuery(
+            invAttrName, node=target, shortName=True, exists=True
+        ):
+            continue
+        attrs.append([attrName, invAttrName, inv])
+
+    return {"target": stripNamespace(target.name()), "attrs": attrs}
+
+
+def getMirrorTable(root, refresh=False):
+    """Get the mirror table of a rig
+
+    The table is computed once for all the rig controls and cached.
+
+    Args:
+        root (PyNode): Rig root
+        refresh (bool, optional): If True, compute the table again
+
+    Returns:
+        dict: {control name without namespace: mirror entry}
+    """
+    key = cmds.ls(root.name(), uuid=True)[0]
+    if refresh or key not in _mirrorTables:
+        if not _mirrorTablesCallbacks:
+            for msg in (om2.MSceneMessage.kAfterNew,
+                        om2.MSceneMessage.kAfterOpen):
+                _mirrorTablesCallbacks.append(
+                    om2.MSceneMessage.addCallback(msg, clearMirrorTables)
+                )
+
+        nameSpace = getNamespace(root.name())
+        table = {}
+        for ctl in getControlers(root) or []:
+            table[stripNamespace(ctl.name())] = getMirrorEntry(ctl, nameSpace)
+        _mirrorTables[key] = table
+    return _mirrorTables[key]
+
+
+def getMirrorPairs(nodes, nameSpace=None, flip=False):
+    """Get the mirror source, target and attributes of the controls
+
+    Args:
+        nodes ([PyNode]): Controls to mirror/flip
+        nameSpace (str, optional): Namespace
+        flip (bool, optional): If True, mirror both ways
+
+    Returns:
+        list: [[source name, target name, mirror attrs], ...]. The names
+            without namespace
+    """
+    root = getRigRoot(nodes[0])
+    table = getMirrorTable(root) if root else {}
+
+    def getEntry(name):
+        if name not in table:
+            fullName = ":".join([nameSpace, name]) if nameSpace else name
+            table[name] = getMirrorEntry(fullName, nameSpace)
+        return table[name]
+
+    names = [stripNamespace(n.name()) for n in nodes]
+    pairs = []
+    for name in names:
+        entry = getEntry(name)
+        target = entry["target"]
+        if target is None:
+            mgear.log(
+                "Can't find the mirror target of {}".format(name),
+                mgear.sev_warning,
+            )
+            continue
+        pairs.append([name, target, entry["attrs"]])
+
+        # To flip a pose, do mirroring both ways.
+        if flip and target not in names:
+            pairs.append([target, name, getEntry(target)["attrs"]])
+
+    return pairs
+
+
+def _getPlugValue(plug):
+    # numeric value in UI units
+    attr = plug.attribute()
+    if attr.hasFn(om2.MFn.kUnitAttribute):
+        unitType = om2.MFnUnitAttribute(attr).unitType()
+        if unitType == om2.MFnUnitAttribute.kAngle:
+            return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+        if unitType == om2.MFnUnitAttribute.kDistance:
+            return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+        if unitType == om2.MFnUnitAttribute.kTime:
+            return plug.asMTime().asUnits(om2.MTime.uiUnit())
+    return plug.asDouble()
+
+
+def _getPlugs(plugNames):
+    # MPlugs, finding each node once
+    fns = {}
+    plugs = []
+    for plugName in plugNames:
+        node, attr = plugName.split(".", 1)
+        if node not in fns:
+            sel = om2.MSelectionList()
+            sel.add(node)
+            fns[node] = om2.MFnDependencyNode(sel.getDependNode(0))
+        plugs.append(fns[node].findPlug(attr, False))
+    return plugs
+
+
+def _getMirrorPlugs(nameSpace, mirrorPairs):
+    # [(source plug, target plug, inv)] with namespace
+    plugs = []
+    for src, dst, attrs in mirrorPairs:
+        if nameSpace:
+            src = ":".join([nameSpace, src])
+            dst = ":".join([nameSpace, dst])
+        for attr, invAttr, inv in attrs:
+            plugs.append(
+                ("{}.{}".format(src, attr), "{}.{}".format(dst, invAttr), inv)
+            )
+    return plugs
+
+
+def applyMirrorPairs(nameSpace, mirrorPairs):
+    """Apply the mirror pose of the mirror pairs
+
+    All the values are read in one pass before setting them.
+
+    Args:
+        nameSpace (str): Namespace
+        mirrorPairs (list): Mirror pairs from getMirrorPairs
+    """
+    plugs = _getMirrorPlugs(nameSpace, mirrorPairs)
+    if not plugs:
+        return
+
+    srcPlugs = _getPlugs([p[0] for p in plugs])
+    dstPlugs = _getPlugs([p[1] for p in plugs])
+
+    values = []
+    for i, (src, dst, inv) in enumerate(plugs):
+        if dstPlugs[i].isLocked:
+            continue
+        values.append((dst, _getPlugValue(srcPlugs[i]) * inv))
+
+    for dst, val in values:
+        try:
+            cmds.setAttr(dst, val)
+        except RuntimeError as e:
+            mgear.log(
+                "applyMirror failed: {0}: {1}".format(dst, e),
+                mgear.sev_error,
+            )
+
+
+def mirrorKeys(nameSpace, mirrorPairs, frameRange):
+    """Mirror the keys of the mirror pairs in a frame range
+
+    The source curves are copied before pasting any key, so the keys can be
+    flipped.
+
+    Args:
+        nameSpace (str): Namespace
+        mirrorPairs (list): Mirror pairs from getMirrorPairs
+        frameRange ((int, int)): Start and end frames
+    """
+    frameRange = tuple(frameRange)
+    snapshots = []
+    try:
+        for src, dst, inv in _getMirrorPlugs(nameSpace, mirrorPairs):
+            curves = cmds.listConnections(
+                src, source=True, destination=False, type="animCurve"
+            )
+            if not curves or cmds.getAttr(dst, lock=True):
+                continue
+            snapshots.append((cmds.duplicate(curves[0])[0], dst, inv))
+
+        for curve, dst, inv in snapshots:
+            if not cmds.copyKey(curve, time=frameRange):
+                continue
+            cmds.pasteKey(dst, option="replace", time=frameRange)
+            if inv == -1:
+                cmds.scaleKey(
+                    dst, time=frameRange, valueScale=-1, valuePivot=0
+                )
+    finally:
+        if snapshots:
+            cmds.delete([s[0] for s in snapshots])
+
+
 def applyMirror(nameSpace, mirrorEntry):
     """Apply mirror pose
 
@@ -1794,6 +2085,21 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
 
         channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
 
+        if anim_bake.NUMPY_AVAILABLE:
+            self.bakeAnimationBatch(
+                switch_attr_name,
+                val_src_nodes,
+                key_src_nodes,
+                key_dst_nodes,
+                startFrame,
+                endFrame,
+                onlyKeyframes,
+                definition,
+            )
+            pm.cycleCheck(e=True)
+            pm.displayWarning("CycleCheck turned back ON")
+            return
+
         # right here we need to generate the matrix positions by calculating
         # them if we have 3 fk controls.  Once we've grabbed the solved
         # pole vector positions, we'll insert them into the list by passing
@@ -1840,6 +2146,63 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
         pm.cycleCheck(e=True)
         pm.displayWarning("CycleCheck turned back ON")
 
+    def bakeAnimationBatch(
+        self,
+        switch_attr_name,
+        val_src_nodes,
+        key_src_nodes,
+        key_dst_nodes,
+        startFrame,
+        endFrame,
+        onlyKeyframes=True,
+        definition="",
+    ):
+        # type: (str, List[pm.nodetypes.Transform],
+        # List[pm.nodetypes.Transform],
+        # List[pm.nodetypes.Transform], int, int, bool, str) -> None
+        """Same as bakeAnimation, evaluating all the frames in one pass
+
+        The world matrices are sampled without changing the current time and
+        each channel is keyed with a single key paste.
+        """
+        frames = getBakeFrames(
+            key_src_nodes, startFrame, endFrame, onlyKeyframes
+        )
+        if not frames:
+            return
+
+        sample_nodes = list(val_src_nodes)
+        poleVector = definition.upper() == "IK" and len(key_src_nodes) == 3
+        if poleVector:
+            sample_nodes.extend(key_src_nodes)
+        worldMatrices = anim_bake.sample_matrices(sample_nodes, frames)
+        if poleVector:
+            # the pole vector position replaces the last source matrix
+            positions = worldMatrices[:, len(val_src_nodes):, 3, :3]
+            worldMatrices = worldMatrices[:, : len(val_src_nodes)]
+            worldMatrices[:, -1] = anim_bake.translation_matrices(
+                anim_bake.pole_vectors(
+                    positions[:, 0], positions[:, 1], positions[:, 2]
+                )
+            )
+
+        # delete animation in the space switch channel and destination ctrls
+        pm.cutKey(
+            key_dst_nodes, at=anim_bake.CHANNELS, time=(startFrame, endFrame)
+        )
+        pm.cutKey(switch_attr_name, time=(startFrame, endFrame))
+
+        # set the new space in the channel
+        self.changeAttrToBoundValue()
+        pm.setKeyframe(
+            switch_attr_name, t=frames, v=pm.getAttr(switch_attr_name)
+        )
+
+        # bake the stored transforms to the cotrols
+        anim_bake.bake_world_matrices(
+            key_dst_nodes, worldMatrices[:, : len(key_dst_nodes)], frames
+        )
+
 
 # ================================================
 # Transfer space
@@ -2418,10 +2781,22 @@ class SpineIkFkTransfer(AbstractAnimationTransfer):
 
         # create a dict of every frame, and every node involved on that frame
         matchMatrix_dict = {}
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
-            if onlyKeyframes and x not in keyframeList:
-                continue
-            matchMatrix_dict[x] = recordNodesMatrices(fkControls, x)
+        if anim_bake.NUMPY_AVAILABLE:
+            frames = getBakeFrames(
+                allAnimNodes, startFrame, endFrame, onlyKeyframes
+            )
+            worldMatrices = anim_bake.sample_matrices(fkControls, frames)
+            fkNames = [pm.PyNode(fk).name() for fk in fkControls]
+            for i, x in enumerate(frames):
+                matchMatrix_dict[x] = dict(
+                    (n, pm.datatypes.Matrix(worldMatrices[i, j].tolist()))
+                    for j, n in enumerate(fkNames)
+                )
+        else:
+            for i, x in enumerate(range(startFrame, endFrame + 1)):
+                if onlyKeyframes and x not in keyframeList:
+                    continue
+                matchMatrix_dict[x] = recordNodesMatrices(fkControls, x)
 
         channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
 
@@ -2429,16 +2804,37 @@ class SpineIkFkTransfer(AbstractAnimationTransfer):
         pm.cutKey(fkControls, at=channels, time=(startFrame, endFrame))
         pm.cutKey(ikControls, at=channels, time=(startFrame, endFrame))
 
-        if PY2:
-            dic_items = matchMatrix_dict.iteritems
+        if anim_bake.NUMPY_AVAILABLE:
+            # the keys are set at the end, one key paste by channel
+            values = anim_bake.np.empty((len(frames), len(key_dst_nodes), 9))
+            for i, frame in enumerate(frames):
+                pm.currentTime(frame)
+                transferFunc(
+                    fkControls,
+                    ikControls,
+                    matchMatrix_dict=matchMatrix_dict[frame],
+                )
+                for j, n in enumerate(key_dst_nodes):
+                    values[i, j] = (
+                        cmds.getAttr("{}.translate".format(n))[0]
+                        + cmds.getAttr("{}.rotate".format(n))[0]
+                        + cmds.getAttr("{}.scale".format(n))[0]
+                    )
+            anim_bake.key_channels(key_dst_nodes, frames, values, channels)
+
         else:
-            dic_items = matchMatrix_dict.items
+            if PY2:
+                dic_items = matchMatrix_dict.iteritems
+            else:
+                dic_items = matchMatrix_dict.items
 
-        for frame, matchDict in dic_items():
-            pm.currentTime(frame)
-            transferFunc(fkControls, ikControls, matchMatrix_dict=matchDict)
+            for frame, matchDict in dic_items():
+                pm.currentTime(frame)
+                transferFunc(
+                    fkControls, ikControls, matchMatrix_dict=matchDict
+                )
 
-            pm.setKeyframe(key_dst_nodes, at=channels)
+                pm.setKeyframe(key_dst_nodes, at=channels)
         # If there are keys on the source node outside of the provided range
         # this wont have an effect
         attribute.reset_SRT(key_src_nodes)
@@ -19,6 +19,7 @@ import maya.api.OpenMaya as om
 from .six import string_types
 
 from mgear.core import attribute
+from mgear.core import om_node
 from mgear.core import surface
 
 #############################################
@@ -465,26 +466,27 @@ def gear_mulmatrix_op(mA, mB, target=False, transform="srt"):
         pyNode: Newly created mGear_multMatrix node
 
     """
-    node = pm.createNode("mgear_mulMatrix")
+    # the node facade inside the om_node.om2Nodes block
+    node = om_node.create("mgear_mulMatrix")
     for m, mi in zip([mA, mB], ["matrixA", "matrixB"]):
         if isinstance(m, datatypes.Matrix):
-            pm.setAttr(node.attr(mi), m)
+            node.attr(mi).set(m)
         else:
-            pm.connectAttr(m, node.attr(mi))
+            om_node.connect_attr(m, node.attr(mi))
     if target:
-        dm_node = pm.createNode("decomposeMatrix")
-        pm.connectAttr(node + ".output", dm_node + ".inputMatrix")
+        dm_node = om_node.create("decomposeMatrix")
+        om_node.connect_attr(node + ".output", dm_node + ".inputMatrix")
         if "t" in transform:
-            pm.connectAttr(
-                dm_node + ".outputTranslate", target.attr("translate"), f=True
+            om_node.connect_attr(
+                dm_node + ".outputTranslate", target.attr("translate"), True
             )
         if "r" in transform:
-            pm.connectAttr(
-                dm_node + ".outputRotate", target.attr("rotate"), f=True
+            om_node.connect_attr(
+                dm_node + ".outputRotate", target.attr("rotate"), True
             )
         if "s" in transform:
-            pm.connectAttr(
-                dm_node + ".outputScale", target.attr("scale"), f=True
+            om_node.connect_attr(
+                dm_node + ".outputScale", target.attr("scale"), True
             )
 
     return node
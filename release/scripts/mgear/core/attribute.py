@@ -8,6 +8,7 @@ import mgear
 import pymel.core as pm
 import maya.cmds as cmds
 import pymel.core.datatypes as datatypes
+from mgear.core import om_node
 from .six import string_types
 
 #############################################
@@ -54,7 +55,10 @@ def addAttribute(
     Returns:
         str: The long name of the new attribute
     """
-    if isinstance(node, str):
+    if om_node.is_enabled() and type(node) is not om_node.Node:
+        # the OpenMaya 2.0 facade, inside the om2Nodes block
+        node = om_node.Node(node)
+    elif isinstance(node, str):
         try:
             node = pm.PyNode(node)
         except pm.MayaNodeError:
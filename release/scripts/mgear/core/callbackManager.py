@@ -48,6 +48,7 @@ from functools import wraps, partial
 
 # dcc
 from maya.api import OpenMaya as om
+from maya.api import OpenMayaAnim as oma
 
 # constants -------------------------------------------------------------------
 try:
@@ -259,6 +260,89 @@ def userTimeChangedCB(callback_name, func):
     return callback_id
 
 
+@registerSessionCB
+def worldMatrixModifiedCB(callback_name, func, node):
+    """call the provided function when the world matrix of the node changes,
+    including changes from its parents and animation
+
+    Args:
+        callback_name (str): name of the callback
+        func (function): to be called upon
+        node (str): name of dag node to monitor
+
+    Returns:
+        long: maya id to created callback
+    """
+    mSel = om.MSelectionList()
+    mSel.add(node)
+    callback_id = om.MDagMessage.addWorldMatrixModifiedCallback(
+        mSel.getDagPath(0), func)
+    return callback_id
+
+
+@registerSessionCB
+def timerCB(callback_name, func, period):
+    """call the provided function periodically, while Maya is idle
+
+    Args:
+        callback_name (str): name you want to assign cb
+        func (function): will be called upon
+        period (float): seconds between calls
+
+    Returns:
+        long: maya id to created callback
+    """
+    callback_id = om.MTimerMessage.addTimerCallback(period, func)
+    return callback_id
+
+
+@registerSessionCB
+def animCurveEditedCB(callback_name, func):
+    """When animation curves are edited, call the provided function
+
+    Args:
+        callback_name (str): name you want to assign cb
+        func (function): will be called upon with the edited curves
+
+    Returns:
+        long: maya id to created callback
+    """
+    callback_id = oma.MAnimMessage.addAnimCurveEditedCallback(func)
+    return callback_id
+
+
+@registerSessionCB
+def nodeAddedCB(callback_name, func, node_type="dependNode"):
+    """When a node of the given type is created, call the provided function
+
+    Args:
+        callback_name (str): name you want to assign cb
+        func (function): will be called upon with the node
+        node_type (str, optional): type of the nodes to monitor
+
+    Returns:
+        long: maya id to created callback
+    """
+    callback_id = om.MDGMessage.addNodeAddedCallback(func, node_type)
+    return callback_id
+
+
+@registerSessionCB
+def nodeRemovedCB(callback_name, func, node_type="dependNode"):
+    """When a node of the given type is deleted, call the provided function
+
+    Args:
+        callback_name (str): name you want to assign cb
+        func (function): will be called upon with the node
+        node_type (str, optional): type of the nodes to monitor
+
+    Returns:
+        long: maya id to created callback
+    """
+    callback_id = om.MDGMessage.addNodeRemovedCallback(func, node_type)
+    return callback_id
+
+
 @registerSessionCB
 def sampleCallback(callback_name, func):
     """argument order is important. Callback_name and func must always be first
@@ -470,3 +554,28 @@ class CallbackManager(object):
     def userTimeChangedCB(self, callback_name, func):
         callback_id = userTimeChangedCB(callback_name, func)
         return callback_id
+
+    @registerManagerCB
+    def worldMatrixModifiedCB(self, callback_name, func, node):
+        callback_id = worldMatrixModifiedCB(callback_name, func, node)
+        return callback_id
+
+    @registerManagerCB
+    def timerCB(self, callback_name, func, period):
+        callback_id = timerCB(callback_name, func, period)
+        return callback_id
+
+    @registerManagerCB
+    def animCurveEditedCB(self, callback_name, func):
+        callback_id = animCurveEditedCB(callback_name, func)
+        return callback_id
+
+    @registerManagerCB
+    def nodeAddedCB(self, callback_name, func, node_type="dependNode"):
+        callback_id = nodeAddedCB(callback_name, func, node_type)
+        return callback_id
+
+    @registerManagerCB
+    def nodeRemovedCB(self, callback_name, func, node_type="dependNode"):
+        callback_id = nodeRemovedCB(callback_name, func, node_type)
+        return callback_id
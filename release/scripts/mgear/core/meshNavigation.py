@@ -6,9 +6,26 @@
 import pymel.core as pm
 import pymel.core.datatypes as datatypes
 from maya import OpenMaya as om
+from . import mesh_topology
 from . import utils
 
 
+def _get_indices(components):
+    """Get the mesh shape and the indices of a components list
+
+    Arguments:
+        components (list): PyMEL vertices or edges
+
+    Returns:
+        PyNode, list: the mesh shape and the components indices
+
+    """
+    indices = []
+    for c in components:
+        indices.extend(c.indices())
+    return components[0].node(), indices
+
+
 #############################################
 # Vertex
 #############################################
@@ -29,6 +46,8 @@ def getExtremeVertexFromLoop(edgeList=None, sideRange=False, z_up=False):
     """
     if not edgeList:
         edgeList = [x for x in pm.selected(fl=1)]
+    if mesh_topology.NUMPY_AVAILABLE:
+        return _getExtremeVertexFromLoop(edgeList, sideRange, z_up)
     vertexList = []
     for x in edgeList:
         cv = x.connectedVertices()
@@ -77,6 +96,33 @@ def getExtremeVertexFromLoop(edgeList=None, sideRange=False, z_up=False):
         return upPos, lowPos, inPos, outPos, edgeList, vertexList
 
 
+def _getExtremeVertexFromLoop(edgeList, sideRange=False, z_up=False):
+    """getExtremeVertexFromLoop using the mesh topology index"""
+    mesh, edges = _get_indices(edgeList)
+    topology = mesh_topology.get_topology(mesh)
+    vertices = topology.get_edges_vertices(edges)
+    positions = mesh_topology.get_positions(mesh, vertices)
+
+    if z_up:
+        up_axis = 2
+        axisIndex = 2 if sideRange else 0
+    else:
+        up_axis = 1
+        axisIndex = 1 if sideRange else 0
+
+    # argmax and argmin keep the first vertex on equal positions
+    vertexList = [mesh.vtx[int(i)] for i in vertices]
+    upPos = vertexList[positions[:, up_axis].argmax()]
+    lowPos = vertexList[positions[:, up_axis].argmin()]
+    inPos = vertexList[positions[:, axisIndex].argmin()]
+    outPos = vertexList[positions[:, axisIndex].argmax()]
+
+    if sideRange:
+        return upPos, lowPos, outPos, inPos, edgeList, vertexList
+    else:
+        return upPos, lowPos, inPos, outPos, edgeList, vertexList
+
+
 def getConcentricVertexLoop(loop, nbLoops):
     """Get concentric vertex loops
 
@@ -88,6 +134,12 @@ def getConcentricVertexLoop(loop, nbLoops):
         list: the loop list
 
     """
+    if mesh_topology.NUMPY_AVAILABLE and loop:
+        mesh, indices = _get_indices(loop)
+        topology = mesh_topology.get_topology(mesh)
+        loops = topology.get_concentric_loops(indices, nbLoops)
+        return [loop] + [[mesh.vtx[int(i)] for i in x] for x in loops[1:]]
+
     loopList = []
     allLoops = []
     for x in loop:
@@ -122,6 +174,13 @@ def getVertexRowsFromLoops(loopList):
         list: vertex rows
 
     """
+    if mesh_topology.NUMPY_AVAILABLE and loopList[0]:
+        mesh = loopList[0][0].node()
+        topology = mesh_topology.get_topology(mesh)
+        loops = [_get_indices(x)[1] if x else [] for x in loopList]
+        rows = topology.get_vertex_rows(loops)
+        return [[mesh.vtx[i] for i in r] for r in rows]
+
     rows = []
     for x in loopList[0]:
         rows.append([x])
@@ -166,6 +225,9 @@ def edgeRangeInLoopFromMid(edgeList, midPos, endA, endB):
         list: loop range
 
     """
+    if mesh_topology.NUMPY_AVAILABLE:
+        return _edgeRangeInLoopFromMid(edgeList, midPos, endA, endB)
+
     extremeEdges = []
 
     scanPoint = [midPos]
@@ -220,6 +282,65 @@ def edgeRangeInLoopFromMid(edgeList, midPos, endA, endB):
     return loopRange
 
 
+def _edgeRangeInLoopFromMid(edgeList, midPos, endA, endB):
+    """edgeRangeInLoopFromMid using the mesh topology index"""
+    mesh, edges = _get_indices(edgeList)
+    topology = mesh_topology.get_topology(mesh)
+    edges = set(edges)
+    ends = (endA.index(), endB.index())
+
+    def loopEdges(vertex):
+        return [
+            e
+            for e in topology.get_vertex_edges([vertex]).tolist()
+            if e in edges
+        ]
+
+    extremeEdges = []
+    scanPoint = [midPos.index()]
+    scannedPoints = set()
+    indexcheck = []
+    midEdges = []
+    midEdgesSet = set()
+    count = 0
+    stop = False
+    while True:
+        for sp in scanPoint:
+            scannedPoints.add(sp)
+            for e in loopEdges(sp):
+                if e not in midEdgesSet:
+                    midEdgesSet.add(e)
+                    midEdges.append(e)
+                for v in topology.edge_vertices[e].tolist():
+                    if v in ends and e not in extremeEdges:
+                        # extra check to ensure that the 2 edges
+                        # selected are not attach to the same vertex
+                        if v not in indexcheck:
+                            extremeEdges.append(e)
+                            indexcheck.append(v)
+                            if len(extremeEdges) == 2:
+                                stop = True
+        # regenerate the new list for recursive scan
+        oldScanPoint = scanPoint
+        scanPoint = []
+        for sp in oldScanPoint:
+            for e in loopEdges(sp):
+                for v in topology.edge_vertices[e].tolist():
+                    if (
+                        v not in scanPoint
+                        and v not in scannedPoints
+                        and v not in ends
+                    ):
+                        scanPoint.append(v)
+
+        if stop:
+            break
+        count += 1
+        if count > 50:
+            break
+    return [mesh.e[e] for e in midEdges + extremeEdges]
+
+
 def edgeLoopBetweenVertices(startPos, endPos):
     """Computes edge loop between two vertices.
 
@@ -0,0 +1,409 @@
+"""
+Mesh topology index as NumPy arrays.
+
+Topology engine used by the navigation functions in mgear.core.meshNavigation.
+The vertex, edge and face adjacency of a mesh is read once with OpenMaya 2.0
+and stored as CSR arrays (an offsets array and a flat values array), so the
+loop and row walks are array lookups instead of PyMEL component queries.
+
+The index is cached per mesh shape. The cache entry is dropped when the mesh
+topology changes, when the mesh components count changes, or with
+clear_cache().
+
+Note:
+    NumPy ships with Maya 2022 and later. If it is not available
+    NUMPY_AVAILABLE is False and mgear.core.meshNavigation uses its python
+    path.
+"""
+
+#############################################
+# GLOBAL
+#############################################
+
+import maya.api.OpenMaya as om2
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# {shape handle hash: (MObjectHandle, components count, MeshTopology)}
+_CACHE = {}
+# {shape handle hash: topology changed callback id}
+_CALLBACKS = {}
+
+
+######################################
+# Array helpers
+######################################
+
+
+def get_csr(sources, values, count):
+    """Get the CSR adjacency of pairs of indices
+
+    The values of each source are sorted.
+
+    Args:
+        sources (ndarray): source index of each pair
+        values (ndarray): value of each pair
+        count (int): number of sources
+
+    Returns:
+        ndarray, ndarray: offsets (count + 1) and values
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    order = np.lexsort((values, sources))
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=count), out=offsets[1:])
+    return offsets, values[order]
+
+
+def gather(offsets, values, indices):
+    """Get the values of several sources, source after source
+
+    Args:
+        offsets (ndarray): CSR offsets
+        values (ndarray): CSR values
+        indices (list): sources indices
+
+    Returns:
+        ndarray: concatenated values
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    starts = offsets[indices]
+    lengths = offsets[indices + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+
+    # position of each value in the flat array
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return values[np.arange(total) + shifts]
+
+
+def unique(indices):
+    """Get the unique indices, in first occurrence order
+
+    Args:
+        indices (list): indices
+
+    Returns:
+        ndarray: unique indices
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    _, first = np.unique(indices, return_index=True)
+    return indices[np.sort(first)]
+
+
+######################################
+# Topology index
+######################################
+
+
+class MeshTopology(object):
+    """Vertex, edge and face adjacency of a mesh as CSR arrays
+
+    Adjacent vertices and edges of a vertex are sorted by index, and the
+    vertices of each edge are sorted too, like the PyMEL components.
+
+    Args:
+        vertex_count (int): number of vertices
+        edge_vertices (list): (edges x 2) vertices of each edge
+        face_counts (list): vertices count of each face
+        face_connects (list): vertices of each face, face after face
+    """
+
+    def __init__(self, vertex_count, edge_vertices, face_counts,
+                 face_connects):
+        self.vertex_count = vertex_count
+        self.edge_vertices = np.sort(
+            np.asarray(edge_vertices, dtype=np.int64).reshape(-1, 2), axis=1
+        )
+        self.edge_count = len(self.edge_vertices)
+
+        face_counts = np.asarray(face_counts, dtype=np.int64)
+        self.face_count = len(face_counts)
+        self.face_offsets = np.zeros(self.face_count + 1, dtype=np.int64)
+        np.cumsum(face_counts, out=self.face_offsets[1:])
+        self.face_vertices = np.asarray(face_connects, dtype=np.int64)
+
+        first = self.edge_vertices[:, 0]
+        second = self.edge_vertices[:, 1]
+        edges = np.arange(self.edge_count, dtype=np.int64)
+
+        self.vertex_offsets, self.vertex_neighbors = get_csr(
+            np.concatenate((first, second)),
+            np.concatenate((second, first)),
+            vertex_count,
+        )
+        self.vertex_edge_offsets, self.vertex_edges = get_csr(
+            np.concatenate((first, second)),
+            np.concatenate((edges, edges)),
+            vertex_count,
+        )
+        self.vertex_face_offsets, self.vertex_faces = get_csr(
+            self.face_vertices,
+            np.repeat(np.arange(self.face_count, dtype=np.int64),
+                      face_counts),
+            vertex_count,
+        )
+
+    def get_neighbors(self, vertices):
+        """Get the adjacent vertices of vertices
+
+        Args:
+            vertices (list): vertices indices
+
+        Returns:
+            ndarray: adjacent vertices, vertex after vertex
+        """
+        return gather(self.vertex_offsets, self.vertex_neighbors, vertices)
+
+    def get_vertex_edges(self, vertices):
+        """Get the connected edges of vertices
+
+        Args:
+            vertices (list): vertices indices
+
+        Returns:
+            ndarray: connected edges, vertex after vertex
+        """
+        return gather(self.vertex_edge_offsets, self.vertex_edges, vertices)
+
+    def get_vertex_faces(self, vertices):
+        """Get the connected faces of vertices
+
+        Args:
+            vertices (list): vertices indices
+
+        Returns:
+            ndarray: connected faces, vertex after vertex
+        """
+        return gather(self.vertex_face_offsets, self.vertex_faces, vertices)
+
+    def get_face_vertices(self, faces):
+        """Get the vertices of faces
+
+        Args:
+            faces (list): faces indices
+
+        Returns:
+            ndarray: face vertices, face after face
+        """
+        return gather(self.face_offsets, self.face_vertices, faces)
+
+    def get_edges_vertices(self, edges):
+        """Get the unique vertices of edges
+
+        Args:
+            edges (list): edges indices
+
+        Returns:
+            ndarray: vertices in edge order
+        """
+        edges = np.asarray(edges, dtype=np.int64)
+        return unique(self.edge_vertices[edges].ravel())
+
+    def get_concentric_loops(self, loop, count):
+        """Grow a vertex loop into concentric loops
+
+        Each new loop has the adjacent vertices of the previous loop that
+        are not in any previous loop, in the previous loop order.
+
+        Args:
+            loop (list): vertices indices of the first loop
+            count (int): number of loops to add
+
+        Returns:
+            list: ndarray of each loop, the first loop included
+        """
+        loop = unique(loop)
+        visited = np.zeros(self.vertex_count, dtype=bool)
+        visited[loop] = True
+
+        loops = [loop]
+        for _ in range(count):
+            neighbors = self.get_neighbors(loop)
+            loop = unique(neighbors[~visited[neighbors]])
+            visited[loop] = True
+            loops.append(loop)
+
+        return loops
+
+    def get_vertex_rows(self, loops):
+        """Get the vertex rows across concentric loops
+
+        Each row starts from a vertex of the first loop and is extended with
+        the adjacent vertices in the next loop. After two steps the
+        neighbors of the vertex before the last one are added first, to
+        force the expansion in both directions.
+
+        Args:
+            loops (list): vertices indices of each loop
+
+        Returns:
+            list: vertices indices of each row
+        """
+        rows = [[int(v)] for v in loops[0]]
+        in_loop = np.zeros(self.vertex_count, dtype=bool)
+
+        for loop in loops[1:]:
+            in_loop[:] = False
+            in_loop[np.asarray(loop, dtype=np.int64)] = True
+
+            for row in rows:
+                neighbors = self.get_neighbors([row[-1]])
+                if len(row) > 2:
+                    neighbors = np.concatenate(
+                        (self.get_neighbors([row[-2]]), neighbors)
+                    )
+                row.extend(neighbors[in_loop[neighbors]].tolist())
+
+        return rows
+
+
+######################################
+# Maya API access
+######################################
+
+
+def get_mesh_dag_path(mesh):
+    """Get the dag path of a mesh shape
+
+    Args:
+        mesh (str or PyNode): mesh transform or shape
+
+    Returns:
+        MDagPath: shape dag path
+
+    Raises:
+        ValueError: If the node is not a mesh
+    """
+    sel = om2.MSelectionList()
+    sel.add(str(mesh))
+    dag_path = sel.getDagPath(0)
+    if dag_path.apiType() == om2.MFn.kTransform:
+        dag_path.extendToShape()
+    if not dag_path.hasFn(om2.MFn.kMesh):
+        raise ValueError("Node is not a mesh: {}".format(mesh))
+    return dag_path
+
+
+def get_components_count(fn_mesh):
+    """Get the vertices, edges and faces count of a mesh
+
+    Args:
+        fn_mesh (MFnMesh): mesh function set
+
+    Returns:
+        tuple: vertices, edges and faces count
+    """
+    return fn_mesh.numVertices, fn_mesh.numEdges, fn_mesh.numPolygons
+
+
+def read_topology(dag_path):
+    """Build the topology index of a mesh
+
+    Args:
+        dag_path (MDagPath): mesh shape dag path
+
+    Returns:
+        MeshTopology: the topology index
+    """
+    fn_mesh = om2.MFnMesh(dag_path)
+    counts, connects = fn_mesh.getVertices()
+
+    edge_vertices = np.zeros((fn_mesh.numEdges, 2), dtype=np.int64)
+    it_edge = om2.MItMeshEdge(dag_path)
+    while not it_edge.isDone():
+        edge_vertices[it_edge.index()] = (it_edge.vertexId(0),
+                                          it_edge.vertexId(1))
+        it_edge.next()
+
+    return MeshTopology(fn_mesh.numVertices, edge_vertices, counts, connects)
+
+
+def get_topology(mesh, refresh=False):
+    """Get the cached topology index of a mesh
+
+    The index is built on first use and rebuilt after a topology change.
+
+    Args:
+        mesh (str, PyNode or MDagPath): mesh transform or shape
+        refresh (bool, optional): rebuild the index
+
+    Returns:
+        MeshTopology: the topology index
+    """
+    if not isinstance(mesh, om2.MDagPath):
+        mesh = get_mesh_dag_path(mesh)
+    obj = mesh.node()
+    handle = om2.MObjectHandle(obj)
+    key = handle.hashCode()
+    count = get_components_count(om2.MFnMesh(mesh))
+
+    entry = _CACHE.get(key)
+    if (
+        not refresh
+        and entry
+        and entry[0].isValid()
+        and entry[0].object() == obj
+        and entry[1] == count
+    ):
+        return entry[2]
+
+    _remove_callback(key)
+    topology = read_topology(mesh)
+    _CACHE[key] = (handle, count, topology)
+    if hasattr(om2, "MPolyMessage"):
+        _CALLBACKS[key] = om2.MPolyMessage.addPolyTopologyChangedCallback(
+            obj, _topology_changed, key
+        )
+
+    return topology
+
+
+def get_positions(mesh, vertices, space=om2.MSpace.kWorld):
+    """Get the current positions of vertices
+
+    Args:
+        mesh (str, PyNode or MDagPath): mesh transform or shape
+        vertices (list): vertices indices
+        space (int, optional): MSpace of the positions
+
+    Returns:
+        ndarray: (vertices x 3) positions
+    """
+    if not isinstance(mesh, om2.MDagPath):
+        mesh = get_mesh_dag_path(mesh)
+    fn_mesh = om2.MFnMesh(mesh)
+    positions = np.zeros((len(vertices), 3))
+    for i, vertex in enumerate(vertices):
+        point = fn_mesh.getPoint(int(vertex), space)
+        positions[i] = (point.x, point.y, point.z)
+    return positions
+
+
+def clear_cache(*args):
+    """Clear the cached topology indices"""
+    for key in list(_CALLBACKS):
+        _remove_callback(key)
+    _CACHE.clear()
+
+
+def _topology_changed(*args):
+    """Drop the cached index of a mesh when its topology changes"""
+    _CACHE.pop(args[-1], None)
+
+
+def _remove_callback(key):
+    callback_id = _CALLBACKS.pop(key, None)
+    if callback_id is not None:
+        try:
+            om2.MMessage.removeCallback(callback_id)
+        except RuntimeError:
+            pass
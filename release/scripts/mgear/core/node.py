@@ -5,6 +5,7 @@ import pymel.core as pm
 from pymel import versions
 import pymel.core.datatypes as datatypes
 from mgear.core import attribute
+from mgear.core import om_node
 
 from .six import PY2, string_types
 
@@ -31,26 +32,27 @@ def createMultMatrixNode(mA, mB, target=False, transform="srt"):
         pyNode: Newly created mGear_multMatrix node
 
     """
-    node = pm.createNode("multMatrix")
+    # the node facade inside the om_node.om2Nodes block
+    node = om_node.create("multMatrix")
     for m, mi in zip([mA, mB], ["matrixIn[0]", "matrixIn[1]"]):
         if isinstance(m, datatypes.Matrix):
-            pm.setAttr(node.attr(mi), m)
+            node.attr(mi).set(m)
         else:
-            pm.connectAttr(m, node.attr(mi))
+            om_node.connect_attr(m, node.attr(mi))
     if target:
-        dm_node = pm.createNode("decomposeMatrix")
-        pm.connectAttr(node + ".matrixSum", dm_node + ".inputMatrix")
+        dm_node = om_node.create("decomposeMatrix")
+        om_node.connect_attr(node + ".matrixSum", dm_node + ".inputMatrix")
         if "t" in transform:
-            pm.connectAttr(
-                dm_node + ".outputTranslate", target.attr("translate"), f=True
+            om_node.connect_attr(
+                dm_node + ".outputTranslate", target.attr("translate"), True
             )
         if "r" in transform:
-            pm.connectAttr(
-                dm_node + ".outputRotate", target.attr("rotate"), f=True
+            om_node.connect_attr(
+                dm_node + ".outputRotate", target.attr("rotate"), True
             )
         if "s" in transform:
-            pm.connectAttr(
-                dm_node + ".outputScale", target.attr("scale"), f=True
+            om_node.connect_attr(
+                dm_node + ".outputScale", target.attr("scale"), True
             )
 
     return node
@@ -69,9 +71,9 @@ def createDecomposeMatrixNode(m):
     >>> dm_node = nod.createDecomposeMatrixNode(mulmat_node+".output")
 
     """
-    node = pm.createNode("decomposeMatrix")
+    node = om_node.create("decomposeMatrix")
 
-    pm.connectAttr(m, node + ".inputMatrix")
+    om_node.connect_attr(m, node + ".inputMatrix")
 
     return node
 
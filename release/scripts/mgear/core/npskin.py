@@ -0,0 +1,505 @@
+"""
+Binary sparse skin file format (.npSkin).
+
+The weights of each object are stored as CSR arrays, one row per vertex:
+
+    indptr (int64, vertexCount + 1): row start in indices and weights
+    indices (int32): influence index of each non zero weight
+    weights (float32): non zero weights
+    blendWeights (float32, vertexCount): dual quaternion blend weights
+
+File layout:
+
+    MAGIC (8 bytes) | header length (uint64) | JSON header | padding | data
+
+The JSON header keeps the object metadata (name, namespace, skinCluster
+attributes, influence names) and the offset of each array in the data
+block. The arrays are read with numpy.memmap, so only the objects that
+are requested are loaded from disk.
+"""
+
+#############################################
+# GLOBAL
+#############################################
+
+import json
+import os
+import pickle
+import struct
+import tempfile
+import time
+
+from mgear.core import skin_array
+
+np = skin_array.np
+
+MAGIC = b"NPSKIN01"
+VERSION = 1
+ALIGNMENT = 8
+
+# little endian dtypes, so the files are portable
+DTYPES = {
+    "indptr": "<i8",
+    "indices": "<i4",
+    "weights": "<f4",
+    "blendWeights": "<f4",
+}
+
+META_KEYS = [
+    "objName",
+    "nameSpace",
+    "skinClsName",
+    "skinningMethod",
+    "normalizeWeights",
+    "vertexCount",
+]
+
+# format of the data dictionaries returned by read
+ARRAY_DATA_FORMAT = "array"
+
+
+def _align(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+######################################
+# CSR conversion
+######################################
+
+
+def weights_to_csr(weights):
+    """Convert a dense weights matrix to CSR arrays
+
+    Args:
+        weights (ndarray): (vertices x influences) weights matrix
+
+    Returns:
+        ndarray, ndarray, ndarray: indptr, influence indices and weights
+    """
+    rows, cols = np.nonzero(weights)
+    counts = np.bincount(rows, minlength=weights.shape[0])
+    indptr = np.zeros(weights.shape[0] + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, cols, weights[rows, cols]
+
+
+def csr_to_weights(indptr, indices, weights, influence_count, dtype=None):
+    """Convert CSR arrays to a dense weights matrix
+
+    Args:
+        indptr (ndarray): row start of each vertex
+        indices (ndarray): influence index of each weight
+        weights (ndarray): non zero weights
+        influence_count (int): number of influences
+        dtype (dtype, optional): matrix dtype. Default is float32, the
+            precision stored in the file
+
+    Returns:
+        ndarray: (vertices x influences) weights matrix
+    """
+    vertex_count = len(indptr) - 1
+    matrix = np.zeros(
+        (vertex_count, influence_count), dtype=dtype or np.float32
+    )
+    rows = np.repeat(np.arange(vertex_count), np.diff(indptr))
+    matrix[rows, indices] = weights
+    return matrix
+
+
+def csr_to_dict(indptr, indices, weights, influences):
+    """Convert CSR arrays to the compressed skin data dictionary
+
+    Args:
+        indptr (ndarray): row start of each vertex
+        indices (ndarray): influence index of each weight
+        weights (ndarray): non zero weights
+        influences (list): influence names
+
+    Returns:
+        dict: {influence: {vertex: weight}}
+    """
+    indices = np.asarray(indices)
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    starts = np.searchsorted(indices[order], np.arange(len(influences) + 1))
+    data = {}
+    for col, name in enumerate(influences):
+        sel = order[starts[col]:starts[col + 1]]
+        data[str(name)] = dict(
+            zip(rows[sel].tolist(), np.asarray(weights)[sel].tolist())
+        )
+    return data
+
+
+def get_csr(data):
+    """Get the CSR weights arrays of an array data dictionary
+
+    Args:
+        data (dict): array data dictionary, with weightsCSR or
+            weightsMatrix
+
+    Returns:
+        tuple: indptr, influence indices and weights
+    """
+    if "weightsCSR" in data:
+        return data["weightsCSR"]
+    return weights_to_csr(data["weightsMatrix"])
+
+
+def get_weights_matrix(data, dtype=None):
+    """Get the dense weights matrix of an array data dictionary
+
+    Args:
+        data (dict): array data dictionary
+        dtype (dtype, optional): matrix dtype. Default is float32
+
+    Returns:
+        ndarray: (vertices x influences) weights matrix
+    """
+    if "weightsMatrix" in data:
+        return np.asarray(data["weightsMatrix"], dtype=dtype or np.float32)
+    indptr, indices, weights = data["weightsCSR"]
+    return csr_to_weights(
+        indptr, indices, weights, len(data["influences"]), dtype
+    )
+
+
+######################################
+# Write
+######################################
+
+
+def write(file_path, objs_data):
+    """Write the skin data of a list of objects to a .npSkin file
+
+    Args:
+        file_path (str): .npSkin file path
+        objs_data (list): array data dictionaries. See read for the keys.
+            weightsMatrix can be used instead of weightsCSR.
+    """
+    header = {"version": VERSION, "objs": []}
+    blocks = []
+    offset = 0
+    for data in objs_data:
+        indptr, indices, weights = get_csr(data)
+        arrays = {
+            "indptr": indptr,
+            "indices": indices,
+            "weights": weights,
+            "blendWeights": data["blendWeightsArray"],
+        }
+        entry = {k: data.get(k) for k in META_KEYS}
+        entry["influences"] = [str(i) for i in data["influences"]]
+        entry["arrays"] = {}
+        for name in DTYPES:
+            array = np.ascontiguousarray(arrays[name], dtype=DTYPES[name])
+            entry["arrays"][name] = {"offset": offset, "count": array.size}
+            blocks.append((offset, array))
+            offset = _align(offset + array.nbytes)
+        header["objs"].append(entry)
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_offset = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    with open(file_path, "wb") as fp:
+        fp.write(MAGIC)
+        fp.write(struct.pack("<Q", len(header_bytes)))
+        fp.write(header_bytes)
+        for block_offset, array in blocks:
+            fp.seek(data_offset + block_offset)
+            fp.write(array.tobytes())
+        # pad the last block, so every mapped array is inside the file
+        fp.seek(data_offset + offset)
+        fp.truncate()
+
+
+######################################
+# Read
+######################################
+
+
+def read_header(file_path):
+    """Read the .npSkin header without loading any array
+
+    Args:
+        file_path (str): .npSkin file path
+
+    Returns:
+        dict: header. dataOffset is the file offset of the data block
+
+    Raises:
+        ValueError: if the file is not a .npSkin file
+    """
+    with open(file_path, "rb") as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a valid npSkin file: {}".format(file_path))
+        (length,) = struct.unpack("<Q", fp.read(8))
+        header = json.loads(fp.read(length).decode("utf-8"))
+    header["dataOffset"] = _align(len(MAGIC) + 8 + length)
+    return header
+
+
+def get_objs(file_path):
+    """Get the object names stored in a .npSkin file
+
+    Args:
+        file_path (str): .npSkin file path
+
+    Returns:
+        list: object names
+    """
+    return [e["objName"] for e in read_header(file_path)["objs"]]
+
+
+def map_array(file_path, header, entry, name):
+    """Memory map one array of an object
+
+    Args:
+        file_path (str): .npSkin file path
+        header (dict): file header from read_header
+        entry (dict): object entry of the header
+        name (str): array name. See DTYPES
+
+    Returns:
+        ndarray: read only memory mapped array
+    """
+    info = entry["arrays"][name]
+    if not info["count"]:
+        return np.zeros(0, dtype=DTYPES[name])
+    return np.memmap(
+        file_path,
+        dtype=DTYPES[name],
+        mode="r",
+        offset=header["dataOffset"] + info["offset"],
+        shape=(info["count"],),
+    )
+
+
+def read(file_path, obj_names=None):
+    """Read the skin data of a .npSkin file
+
+    Args:
+        file_path (str): .npSkin file path
+        obj_names (list, optional): Only read these objects. Other objects
+            arrays are not loaded from disk.
+
+    Returns:
+        list: array data dictionaries with the META_KEYS, plus
+            influences (list), weightsCSR (indptr, indices and float32
+            weights ndarrays) and blendWeightsArray (ndarray)
+    """
+    header = read_header(file_path)
+    objs_data = []
+    for entry in header["objs"]:
+        if obj_names is not None and entry["objName"] not in obj_names:
+            continue
+        data = {k: entry.get(k) for k in META_KEYS}
+        data["skinDataFormat"] = ARRAY_DATA_FORMAT
+        data["influences"] = entry["influences"]
+        # the weights stay sparse, see skin_array.set_weights_csr
+        data["weightsCSR"] = tuple(
+            np.array(map_array(file_path, header, entry, name))
+            for name in ("indptr", "indices", "weights")
+        )
+        data["blendWeightsArray"] = np.array(
+            map_array(file_path, header, entry, "blendWeights"),
+            dtype=np.float64,
+        )
+        objs_data.append(data)
+    return objs_data
+
+
+######################################
+# gSkin / jSkin conversion
+######################################
+
+
+def from_skin_data(data):
+    """Convert a .gSkin/.jSkin object data dictionary to array data
+
+    Args:
+        data (dict): object data dictionary, compressed or not
+
+    Returns:
+        dict: array data dictionary
+    """
+    compressed = data.get("skinDataFormat") == "compressed"
+    if compressed:
+        vertex_count = data["vertexCount"]
+    else:
+        vertex_count = len(data["blendWeights"])
+
+    array_data = {k: data.get(k) for k in META_KEYS}
+    array_data["vertexCount"] = vertex_count
+    array_data["skinDataFormat"] = ARRAY_DATA_FORMAT
+    weights, influences = skin_array.dict_to_weights(
+        data["weights"], vertex_count, compressed
+    )
+    array_data["weightsMatrix"] = weights
+    array_data["influences"] = influences
+    array_data["blendWeightsArray"] = skin_array.dict_to_blend_weights(
+        data["blendWeights"], vertex_count, compressed
+    )
+    return array_data
+
+
+def to_skin_data(array_data):
+    """Convert array data to a compressed .gSkin/.jSkin data dictionary
+
+    Args:
+        array_data (dict): array data dictionary
+
+    Returns:
+        dict: compressed object data dictionary
+    """
+    data = {k: array_data.get(k) for k in META_KEYS}
+    data["skinDataFormat"] = "compressed"
+    indptr, indices, weights = get_csr(array_data)
+    data["weights"] = csr_to_dict(
+        indptr, indices, weights, array_data["influences"]
+    )
+    data["blendWeights"] = skin_array.blend_weights_to_dict(
+        array_data["blendWeightsArray"]
+    )
+    return data
+
+
+def from_pack_data(pack_data):
+    """Convert a .gSkin/.jSkin file content to a list of array data
+
+    Args:
+        pack_data (dict): {"objs": [], "objDDic": [], "bypassObj": []}
+
+    Returns:
+        list: array data dictionaries
+    """
+    return [from_skin_data(d) for d in pack_data["objDDic"]]
+
+
+def to_pack_data(objs_data):
+    """Convert a list of array data to the .gSkin/.jSkin file content
+
+    Args:
+        objs_data (list): array data dictionaries
+
+    Returns:
+        dict: {"objs": [], "objDDic": [], "bypassObj": []}
+    """
+    return {
+        "objs": [d["objName"] for d in objs_data],
+        "objDDic": [to_skin_data(d) for d in objs_data],
+        "bypassObj": [],
+    }
+
+
+######################################
+# Benchmark
+######################################
+
+
+def synthetic_data(
+    vertex_count=150000, influence_count=300, influences_per_vertex=4, seed=0
+):
+    """Create random array data, to benchmark the skin file formats
+
+    Args:
+        vertex_count (int, optional): number of vertices
+        influence_count (int, optional): number of influences
+        influences_per_vertex (int, optional): non zero weights per vertex
+        seed (int, optional): random seed
+
+    Returns:
+        dict: array data dictionary
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((vertex_count, influence_count), dtype=np.float64)
+    rows = np.repeat(np.arange(vertex_count), influences_per_vertex)
+    cols = rng.integers(0, influence_count, size=rows.size)
+    weights[rows, cols] = rng.random(rows.size)
+    weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+    # same precision as the one stored in the file
+    weights = weights.astype(np.float32).astype(np.float64)
+    return {
+        "objName": "synthetic_mesh",
+        "nameSpace": "",
+        "skinClsName": "synthetic_mesh_skinCluster",
+        "skinningMethod": 0,
+        "normalizeWeights": 1,
+        "vertexCount": vertex_count,
+        "skinDataFormat": ARRAY_DATA_FORMAT,
+        "influences": ["joint_{}".format(i) for i in range(influence_count)],
+        "weightsMatrix": weights,
+        "blendWeightsArray": np.zeros(vertex_count, dtype=np.float64),
+    }
+
+
+def benchmark(objs_data=None, folder=None):
+    """Compare file size, write and read time of the skin file formats
+
+    Args:
+        objs_data (list, optional): array data dictionaries. Defaults to a
+            synthetic 150k vertices, 300 influences mesh.
+        folder (str, optional): folder for the temporary files
+
+    Returns:
+        dict: {extension: {"size": bytes, "write": seconds, "read": seconds}}
+    """
+    if objs_data is None:
+        objs_data = [synthetic_data()]
+    if folder is None:
+        folder = tempfile.mkdtemp(prefix="mgear_npskin_")
+
+    pack_data = to_pack_data(objs_data)
+    results = {}
+
+    def _timed(func):
+        start = time.time()
+        func()
+        return time.time() - start
+
+    # .gSkin
+    path = os.path.join(folder, "benchmark.gSkin")
+
+    def _write_gskin():
+        with open(path, "wb") as fp:
+            pickle.dump(pack_data, fp, pickle.HIGHEST_PROTOCOL)
+
+    def _read_gskin():
+        with open(path, "rb") as fp:
+            from_pack_data(pickle.load(fp))
+
+    results[".gSkin"] = {"write": _timed(_write_gskin)}
+    results[".gSkin"]["read"] = _timed(_read_gskin)
+    results[".gSkin"]["size"] = os.path.getsize(path)
+    os.remove(path)
+
+    # .jSkin
+    path = os.path.join(folder, "benchmark.jSkin")
+
+    def _write_jskin():
+        with open(path, "w") as fp:
+            json.dump(pack_data, fp, indent=4, sort_keys=True)
+
+    def _read_jskin():
+        with open(path, "r") as fp:
+            from_pack_data(json.load(fp))
+
+    results[".jSkin"] = {"write": _timed(_write_jskin)}
+    results[".jSkin"]["read"] = _timed(_read_jskin)
+    results[".jSkin"]["size"] = os.path.getsize(path)
+    os.remove(path)
+
+    # .npSkin
+    path = os.path.join(folder, "benchmark.npSkin")
+    results[".npSkin"] = {"write": _timed(lambda: write(path, objs_data))}
+    results[".npSkin"]["read"] = _timed(lambda: read(path))
+    results[".npSkin"]["size"] = os.path.getsize(path)
+    os.remove(path)
+
+    for ext, r in sorted(results.items()):
+        print(
+            "{:<8} size: {:>12} bytes  write: {:>8.3f}s  read: {:>8.3f}s".format(
+                ext, r["size"], r["write"], r["read"]
+            )
+        )
+    return results
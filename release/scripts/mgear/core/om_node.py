@@ -0,0 +1,482 @@
+"""
+Thin OpenMaya 2.0 node facade.
+
+Lightweight alternative to the PyMEL PyNode for the build hot path. A Node
+keeps an MObjectHandle and caches its function sets, and implements the
+subset of the PyNode API used by mgear.core.primitive,
+mgear.core.attribute.addAttribute and mgear.core.applyop. The string
+conversion returns the unique node name, so a Node or an Attribute can be
+passed to maya.cmds and PyMEL commands.
+
+Node and Attribute are lazy proxies of the PyMEL objects: the rest of the
+PyMEL API, and the isinstance checks, use a PyNode created on first use.
+So the nodes can be returned to the component code, and only the nodes
+using the PyMEL API pay for the PyNode.
+
+The primitive, attribute.addAttribute and the matrix nodes of applyop use
+this module inside the om2Nodes block. The Shifter build uses the block
+when the "om2_primitives" guide option is on.
+"""
+
+#############################################
+# GLOBAL
+#############################################
+import contextlib
+
+import maya.api.OpenMaya as om2
+from maya import cmds
+
+from .six import string_types
+
+# use the node facade inside the om2Nodes block
+_enabled = [False]
+
+
+@contextlib.contextmanager
+def om2Nodes(enabled=True):
+    """Create the nodes with the OpenMaya 2.0 facade in the block
+
+    Note:
+        The node modifiers are not registered in the undo queue.
+
+    Args:
+        enabled (bool, optional): Use the facade in the block
+    """
+    previous = _enabled[0]
+    _enabled[0] = enabled
+    try:
+        yield
+    finally:
+        _enabled[0] = previous
+
+
+def is_enabled():
+    """Check if the node facade is used
+
+    Returns:
+        bool: True inside an enabled om2Nodes block
+    """
+    return _enabled[0]
+
+
+def get_mobject(node):
+    """Get the MObject of a node
+
+    Args:
+        node (str, Node, PyNode or MObject): the node
+
+    Returns:
+        MObject: the node MObject
+    """
+    # the type is checked first, the Node isinstance checks create the
+    # PyNode
+    if type(node) is Node:
+        return node.object()
+    if isinstance(node, om2.MObject):
+        return node
+    sel = om2.MSelectionList()
+    sel.add(str(node))
+    return sel.getDependNode(0)
+
+
+def _as_matrix(m):
+    # accepts MMatrix, PyMEL Matrix or nested/flat lists of 16 values
+    if isinstance(m, om2.MMatrix):
+        return m
+    values = []
+    for row in m:
+        if isinstance(row, (int, float)):
+            values.append(row)
+        else:
+            values.extend(row)
+    return om2.MMatrix(values)
+
+
+#############################################
+# ATTRIBUTE
+#############################################
+
+
+class Attribute(object):
+    """Node attribute facade
+
+    The methods not implemented here are the ones of the PyMEL Attribute.
+    """
+
+    __slots__ = ("node", "attr_name", "_pyattr")
+
+    def __init__(self, node, attr_name):
+        self.node = node
+        self.attr_name = attr_name
+        self._pyattr = None
+
+    def to_pyattr(self):
+        """Get the PyMEL attribute
+
+        Returns:
+            Attribute: the PyMEL attribute
+        """
+        if self._pyattr is None:
+            import pymel.core as pm
+
+            self._pyattr = pm.Attribute(str(self))
+        return self._pyattr
+
+    @property
+    def __class__(self):
+        # isinstance checks as a PyMEL Attribute
+        return type(self.to_pyattr())
+
+    def __getattr__(self, name):
+        return getattr(self.to_pyattr(), name)
+
+    def __getitem__(self, index):
+        return Attribute(self.node, "{}[{}]".format(self.attr_name, index))
+
+    def __str__(self):
+        return "{}.{}".format(self.node, self.attr_name)
+
+    def __repr__(self):
+        return "Attribute('{}')".format(self)
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __rshift__(self, other):
+        self.connect(other)
+
+    def name(self):
+        return str(self)
+
+    def attrName(self):
+        return self.attr_name
+
+    def plug(self):
+        """Get the attribute MPlug
+
+        Returns:
+            MPlug: the plug
+        """
+        return self.node.fn.findPlug(self.attr_name, False)
+
+    def exists(self):
+        return self.node.hasAttr(self.attr_name)
+
+    def get(self, **kwargs):
+        # the PyMEL types, i.e: Vector or Matrix
+        return self.to_pyattr().get(**kwargs)
+
+    def set(self, *args, **kwargs):
+        """Set the attribute value
+
+        Same arguments as PyMEL Attribute.set. The numeric and string values
+        are set with maya.cmds, the other values with PyMEL.
+        """
+        if len(args) == 1 and isinstance(args[0], (list, tuple)):
+            args = tuple(args[0])
+        if not all(
+            isinstance(a, (bool, int, float) + string_types) for a in args
+        ):
+            self.to_pyattr().set(*args, **kwargs)
+            return
+        if (
+            args
+            and isinstance(args[0], string_types)
+            and "type" not in kwargs
+        ):
+            kwargs["type"] = "string"
+        cmds.setAttr(str(self), *args, **kwargs)
+
+    def connect(self, destination, force=True):
+        cmds.connectAttr(str(self), str(destination), force=force)
+
+    def disconnect(self, destination):
+        cmds.disconnectAttr(str(self), str(destination))
+
+    def lock(self):
+        cmds.setAttr(str(self), lock=True)
+
+    def unlock(self):
+        cmds.setAttr(str(self), lock=False)
+
+    def isLocked(self):
+        return self.plug().isLocked
+
+    def listConnections(self, **kwargs):
+        return cmds.listConnections(str(self), **kwargs) or []
+
+
+#############################################
+# NODE
+#############################################
+
+
+class Node(object):
+    """OpenMaya 2.0 node facade
+
+    The methods not implemented here are the ones of the PyNode.
+
+    Args:
+        node (str, Node, PyNode or MObject): the node
+    """
+
+    __slots__ = ("_handle", "_fn", "_pynode")
+
+    def __init__(self, node):
+        self._handle = om2.MObjectHandle(get_mobject(node))
+        self._fn = None
+        self._pynode = None
+
+    @property
+    def __class__(self):
+        # isinstance checks as a PyNode, i.e: pm.nodetypes.Joint
+        return type(self.to_pynode())
+
+    def __getattr__(self, name):
+        return getattr(self.to_pynode(), name)
+
+    # -----------------------------------------------
+    # identity
+
+    def object(self):
+        return self._handle.object()
+
+    def exists(self):
+        return self._handle.isValid()
+
+    def isDag(self):
+        return self.object().hasFn(om2.MFn.kDagNode)
+
+    @property
+    def fn(self):
+        """Cached MFnDependencyNode or MFnDagNode function set"""
+        if self._fn is None:
+            if self.isDag():
+                self._fn = om2.MFnDagNode(self.object())
+            else:
+                self._fn = om2.MFnDependencyNode(self.object())
+        return self._fn
+
+    def dagPath(self):
+        # not cached, the path changes with the parent
+        return om2.MDagPath.getAPathTo(self.object())
+
+    def __str__(self):
+        if self.isDag():
+            return self.dagPath().partialPathName()
+        return self.fn.name()
+
+    def __repr__(self):
+        return "Node('{}')".format(self)
+
+    def __add__(self, other):
+        return str(self) + other
+
+    def __radd__(self, other):
+        return other + str(self)
+
+    def __eq__(self, other):
+        if type(other) is Node:
+            return self._handle == other._handle
+        try:
+            return self.object() == get_mobject(other)
+        except (RuntimeError, TypeError):
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self._handle.hashCode()
+
+    def name(self, *args, **kwargs):
+        if args or kwargs:
+            return self.to_pynode().name(*args, **kwargs)
+        return str(self)
+
+    def shortName(self):
+        return self.fn.name()
+
+    def longName(self):
+        if self.isDag():
+            return self.dagPath().fullPathName()
+        return self.fn.name()
+
+    def fullPath(self):
+        return self.longName()
+
+    def rename(self, name, **kwargs):
+        cmds.rename(str(self), name, **kwargs)
+        return self
+
+    def type(self):
+        return self.fn.typeName
+
+    def to_pynode(self):
+        """Get the PyMEL node
+
+        Returns:
+            PyNode: the node
+        """
+        if self._pynode is None:
+            import pymel.core as pm
+
+            self._pynode = pm.PyNode(self.longName())
+        return self._pynode
+
+    # -----------------------------------------------
+    # attributes
+
+    def hasAttr(self, attr, checkShape=True):
+        if self.fn.hasAttribute(attr.split("[")[0].split(".")[0]):
+            return True
+        # as PyMEL, the transform has the shape attributes
+        return checkShape and any(
+            s.hasAttr(attr, False) for s in self.getShapes()
+        )
+
+    def attr(self, attr):
+        if self.hasAttr(attr, False):
+            return Attribute(self, attr)
+        # as PyMEL, the transform gives access to the shape attributes
+        if self.isDag():
+            for shape in self.getShapes():
+                if shape.hasAttr(attr, False):
+                    return Attribute(shape, attr)
+        raise AttributeError(
+            "Node {} has no attribute {}".format(self, attr)
+        )
+
+    def addAttr(self, longName, **kwargs):
+        cmds.addAttr(str(self), longName=longName, **kwargs)
+
+    def setAttr(self, attr, *args, **kwargs):
+        self.attr(attr).set(*args, **kwargs)
+
+    def getAttr(self, attr, **kwargs):
+        return self.attr(attr).get(**kwargs)
+
+    # -----------------------------------------------
+    # hierarchy
+
+    def getParent(self, *args, **kwargs):
+        if args or kwargs:
+            return self.to_pynode().getParent(*args, **kwargs)
+        if not self.isDag():
+            return None
+        parent = self.fn.parent(0)
+        if parent.hasFn(om2.MFn.kWorld):
+            return None
+        return Node(parent)
+
+    def getChildren(self, **kwargs):
+        if kwargs:
+            return self.to_pynode().getChildren(**kwargs)
+        return [Node(self.fn.child(i)) for i in range(self.fn.childCount())]
+
+    def getShapes(self, **kwargs):
+        if kwargs:
+            return self.to_pynode().getShapes(**kwargs)
+        return [
+            c for c in self.getChildren()
+            if c.object().hasFn(om2.MFn.kShape)
+        ]
+
+    def addChild(self, child):
+        # keeps the child world transformation, as PyMEL addChild
+        cmds.parent(str(child), str(self))
+        return child
+
+    # -----------------------------------------------
+    # transformation
+
+    def _transform_fn(self):
+        return om2.MFnTransform(self.dagPath())
+
+    def setTransformation(self, m):
+        self._transform_fn().setTransformation(
+            om2.MTransformationMatrix(_as_matrix(m))
+        )
+
+    def setMatrix(self, m, worldSpace=False):
+        m = _as_matrix(m)
+        if worldSpace:
+            m = m * self.dagPath().exclusiveMatrixInverse()
+        self.setTransformation(m)
+
+    # getMatrix and getTranslation are the PyNode ones, returning the PyMEL
+    # Matrix and Vector
+
+    def setTranslation(self, pos, space="object"):
+        space = om2.MSpace.kWorld if space == "world" else om2.MSpace.kObject
+        self._transform_fn().setTranslation(
+            om2.MVector(pos[0], pos[1], pos[2]), space
+        )
+
+
+#############################################
+# NODE CREATION
+#############################################
+
+
+def create_node(node_type, name=None, parent=None):
+    """Create a node with a single modifier
+
+    Args:
+        node_type (str): node type
+        name (str, optional): node name
+        parent (str, Node, PyNode or MObject, optional): parent of a dag
+            node
+
+    Returns:
+        Node: the new node. For shapes, the transform
+    """
+    dag_modifier = om2.MDagModifier()
+    try:
+        parent_obj = (
+            get_mobject(parent) if parent is not None else om2.MObject()
+        )
+        mobject = dag_modifier.createNode(node_type, parent_obj)
+        modifier = dag_modifier
+    except (TypeError, RuntimeError):
+        # not a dag node
+        modifier = om2.MDGModifier()
+        mobject = modifier.createNode(node_type)
+    if name:
+        modifier.renameNode(mobject, name)
+    modifier.doIt()
+    return Node(mobject)
+
+
+def create(node_type):
+    """Create a node with the facade inside the om2Nodes block
+
+    Args:
+        node_type (str): node type
+
+    Returns:
+        Node or PyNode: the new node. A PyNode outside the om2Nodes block
+    """
+    if is_enabled():
+        return create_node(node_type)
+    import pymel.core as pm
+
+    return pm.createNode(node_type)
+
+
+def connect_attr(source, destination, force=False):
+    """Connect two attributes with maya.cmds
+
+    Args:
+        source (str, Attribute or PyMEL Attribute): source attribute
+        destination (str, Attribute or PyMEL Attribute): destination
+            attribute
+        force (bool, optional): replace the existing connection
+    """
+    cmds.connectAttr(str(source), str(destination), force=force)
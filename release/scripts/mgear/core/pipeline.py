@@ -0,0 +1,171 @@
+"""
+Pipelined file IO.
+
+Helpers to overlap file encoding/decoding and disk IO, running in a thread
+pool, with the Maya work that must stay in the main thread.
+
+Maya commands are not thread safe, so the functions submitted to the pool
+must not use Maya. The progress callbacks and the apply functions are
+always called from the calling (main) thread.
+"""
+
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures import FIRST_COMPLETED
+
+
+def _error_message():
+    return traceback.format_exc().strip().splitlines()[-1]
+
+
+class CollectError(object):
+    """Data of an item that failed to be collected
+
+    run_writes reports the message as the item error, without writing it.
+
+    Args:
+        message (str, optional): error message. Default is the exception
+            being handled
+    """
+
+    def __init__(self, message=None):
+        self.message = message or _error_message()
+
+
+def run_writes(items, write_func, workers=4, progress_callback=None,
+               max_pending=None):
+    """Write files in a thread pool while the next items are collected
+
+    Args:
+        items (iterable): (name, path, data) tuples. If it is a generator,
+            the collection of the next item, in the main thread, overlaps
+            with the writing of the previous ones. data can be a
+            CollectError to report an item that failed to be collected.
+        write_func (callable): write_func(path, data). Must not use Maya.
+        workers (int, optional): number of writer threads. 0 writes each
+            file in the main thread.
+        progress_callback (callable, optional): called with
+            (name, done, total, error) after each file is written. total is
+            None while items are still being collected.
+        max_pending (int, optional): maximum number of collected items
+            waiting to be written. The collection waits for a write to
+            finish when it is reached. Default is twice the workers.
+
+    Returns:
+        OrderedDict: {name: error message or None}, in items order
+    """
+    report = OrderedDict()
+    done = [0]
+
+    def _finish(name, error, total=None):
+        report[name] = error
+        done[0] += 1
+        if progress_callback:
+            progress_callback(name, done[0], total, error)
+
+    if not workers:
+        for name, path, data in items:
+            report[name] = None
+            if isinstance(data, CollectError):
+                _finish(name, data.message)
+                continue
+            try:
+                write_func(path, data)
+                error = None
+            except Exception:
+                error = _error_message()
+            _finish(name, error)
+        return report
+
+    if not max_pending:
+        max_pending = workers * 2
+    pending = {}
+
+    def _collect_finished(futures):
+        for future in futures:
+            name = pending.pop(future)
+            error = None
+            if future.exception() is not None:
+                error = "{}: {}".format(
+                    type(future.exception()).__name__, future.exception()
+                )
+            _finish(name, error, total)
+
+    total = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, path, data in items:
+            # keep the items order in the report
+            report[name] = None
+            if isinstance(data, CollectError):
+                _finish(name, data.message)
+                continue
+            pending[pool.submit(write_func, path, data)] = name
+            _collect_finished([f for f in list(pending) if f.done()])
+
+            # bound the collected data kept in memory
+            while len(pending) >= max_pending:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                _collect_finished(finished)
+
+        total = len(report)
+        while pending:
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            _collect_finished(finished)
+
+    return report
+
+
+def run_reads(files, read_func, apply_func, workers=4,
+              progress_callback=None):
+    """Read files in a thread pool and apply them in order in the main thread
+
+    Args:
+        files (list): (name, path) tuples
+        read_func (callable): read_func(path) returns the decoded data.
+            Must not use Maya.
+        apply_func (callable): apply_func(name, data), called in the main
+            thread, in files order.
+        workers (int, optional): number of reader threads. 0 reads each file
+            in the main thread.
+        progress_callback (callable, optional): called with
+            (name, done, total, error) after each file is applied.
+
+    Returns:
+        OrderedDict: {name: error message or None}, in files order
+    """
+    report = OrderedDict()
+    total = len(files)
+
+    def _apply(index, name, read_data):
+        try:
+            apply_func(name, read_data())
+            error = None
+        except Exception:
+            error = _error_message()
+        report[name] = error
+        if progress_callback:
+            progress_callback(name, index + 1, total, error)
+
+    if not workers:
+        for index, (name, path) in enumerate(files):
+            _apply(index, name, lambda: read_func(path))
+        return report
+
+    # bound the number of decoded files waiting in memory
+    window = max(1, workers) * 2
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(read_func, path) for name, path in files[:window]
+        ]
+        for index, (name, path) in enumerate(files):
+            future = futures[index]
+            _apply(index, name, future.result)
+            next_index = index + window
+            if next_index < total:
+                futures.append(pool.submit(read_func, files[next_index][1]))
+            # release the decoded data
+            futures[index] = None
+
+    return report
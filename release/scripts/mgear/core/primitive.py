@@ -4,12 +4,41 @@ import pymel.core as pm
 import pymel.core.datatypes as datatypes
 
 from mgear.core import transform
+from mgear.core import om_node
 
 #############################################
 # PRIMITIVE
 #############################################
 
 
+# create the nodes with OpenMaya 2.0 inside the om2Nodes block
+om2Nodes = om_node.om2Nodes
+
+
+def _addNode_om2(node_type, parent, name, m=None, pos=None, vis=None,
+                 size=None):
+    """Create a dagNode with the OpenMaya 2.0 node facade.
+
+    Same behaviour as the PyMEL functions: the transformation is set in
+    world space and the node is parented after, keeping it.
+
+    Returns:
+        Node: The newly created node. A lazy proxy of the PyNode
+    """
+    node = om_node.create_node(node_type, name)
+    if m is not None:
+        node.setTransformation(m)
+    if pos is not None:
+        node.setTranslation(pos, space="world")
+    if vis is not None:
+        node.setAttr("visibility", vis)
+    if size is not None:
+        node.setAttr("localScale", size, size, size)
+    if parent is not None:
+        om_node.Node(parent).addChild(node)
+    return node
+
+
 def addTransform(parent, name, m=datatypes.Matrix()):
     """Create a transform dagNode.
 
@@ -22,6 +51,9 @@ def addTransform(parent, name, m=datatypes.Matrix()):
         dagNode: The newly created node.
 
     """
+    if om_node.is_enabled():
+        return _addNode_om2("transform", parent, name, m=m)
+
     node = pm.PyNode(pm.createNode("transform", n=name))
     node.setTransformation(m)
 
@@ -43,6 +75,9 @@ def addTransformFromPos(parent, name, pos=datatypes.Vector(0, 0, 0)):
         dagNode: The newly created node.
 
     """
+    if om_node.is_enabled():
+        return _addNode_om2("transform", parent, name, pos=pos)
+
     node = pm.PyNode(pm.createNode("transform", n=name))
     node.setTranslation(pos, space="world")
 
@@ -69,6 +104,9 @@ def addLocator(parent, name, m=datatypes.Matrix(), size=1):
         dagNode: The newly created node.
 
     """
+    if om_node.is_enabled():
+        return _addNode_om2("locator", parent, name, m=m, size=size)
+
     node = pm.PyNode(pm.createNode("locator")).getParent()
     node.rename(name)
     node.setTransformation(m)
@@ -93,6 +131,9 @@ def addLocatorFromPos(parent, name, pos=datatypes.Vector(0, 0, 0), size=1):
         dagNode: The newly created node.
 
     """
+    if om_node.is_enabled():
+        return _addNode_om2("locator", parent, name, pos=pos, size=size)
+
     node = pm.PyNode(pm.createNode("locator")).getParent()
     node.rename(name)
     node.setTranslation(pos, space="world")
@@ -125,6 +166,9 @@ def addJoint(parent, name, m=datatypes.Matrix(), vis=True):
         dagNode: The newly created node.
 
     """
+    if om_node.is_enabled():
+        return _addNode_om2("joint", parent, name, m=m, vis=vis)
+
     node = pm.PyNode(pm.createNode("joint", n=name))
     node.setTransformation(m)
     node.setAttr("visibility", vis)
@@ -151,6 +195,9 @@ def addJointFromPos(parent, name, pos=datatypes.Vector(0, 0, 0)):
         dagNode: The newly created node.
 
     """
+    if om_node.is_enabled():
+        return _addNode_om2("joint", parent, name, pos=pos)
+
     node = pm.PyNode(pm.createNode("joint", n=name))
     node.setTranslation(pos, space="world")
 
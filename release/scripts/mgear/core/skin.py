@@ -22,10 +22,14 @@ from mgear.vendor.Qt import QtWidgets
 from mgear.vendor.Qt import QtCore
 from mgear.vendor.Qt import QtGui
 from mgear.core import pyqt
+from mgear.core import skin_array
+from mgear.core import npskin
+from mgear.core import pipeline
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
 FILE_EXT = ".gSkin"
 FILE_JSON_EXT = ".jSkin"
+FILE_NPSKIN_EXT = ".npSkin"
 PACK_EXT = ".gSkinPack"
 
 ######################################
@@ -164,6 +168,13 @@ def getCurrentWeights(skinCls, dagPath, components):
 
 
 def collectInfluenceWeights(skinCls, dagPath, components, dataDic):
+    if skin_array.NUMPY_AVAILABLE:
+        # vectorized path. Reads the whole weights matrix at once
+        weights, influences = skin_array.get_weights(skinCls)
+        dataDic["vertexCount"] = weights.shape[0]
+        dataDic["weights"] = skin_array.weights_to_dict(weights, influences)
+        return
+
     weights = getCurrentWeights(skinCls, dagPath, components)
 
     influencePaths = OpenMaya.MDagPathArray()
@@ -186,6 +197,12 @@ def collectInfluenceWeights(skinCls, dagPath, components, dataDic):
 
 
 def collectBlendWeights(skinCls, dagPath, components, dataDic):
+    if skin_array.NUMPY_AVAILABLE:
+        dataDic["blendWeights"] = skin_array.blend_weights_to_dict(
+            skin_array.get_blend_weights(skinCls)
+        )
+        return
+
     weights = OpenMaya.MDoubleArray()
     skinCls.__apimfn__().getBlendWeights(dagPath, components, weights)
     # round the weights down. This should be safe on Dual Quat blends
@@ -208,43 +225,37 @@ def collectData(skinCls, dataDic):
     dataDic["skinClsName"] = skinCls.name()
 
 
-######################################
-# Skin export
-######################################
+def collectArrayData(skinCls, dataDic):
+    """Collect the skin data as NumPy arrays for the .npSkin format"""
+    weights, influences = skin_array.get_weights(skinCls)
+    dataDic["vertexCount"] = weights.shape[0]
+    dataDic["influences"] = influences
+    dataDic["weightsMatrix"] = weights
+    dataDic["blendWeightsArray"] = skin_array.get_blend_weights(skinCls)
 
+    for attr in ["skinningMethod", "normalizeWeights"]:
+        dataDic[attr] = skinCls.attr(attr).get()
 
-def exportSkin(filePath=None, objs=None, *args):
-    if not objs:
-        if pm.selected():
-            objs = pm.selected()
-        else:
-            pm.displayWarning("Please Select One or more objects")
-            return False
+    dataDic["skinClsName"] = skinCls.name()
 
-    packDic = {"objs": [], "objDDic": [], "bypassObj": []}
 
-    if not filePath:
+######################################
+# Skin export
+######################################
 
-        f2 = "jSkin ASCII  (*{});;gSkin Binary (*{})".format(
-            FILE_JSON_EXT, FILE_EXT
-        )
-        f3 = ";;All Files (*.*)"
-        fileFilters = f2 + f3
-        filePath = pm.fileDialog2(fileMode=0, fileFilter=fileFilters)
-        if filePath:
-            filePath = filePath[0]
 
-        else:
-            return False
+def collectSkinPack(objs, use_npskin=False):
+    """Collect the skin data of the objects from the scene
 
-    if not filePath.endswith(FILE_EXT) and not filePath.endswith(
-        FILE_JSON_EXT
-    ):
-        # filePath += file_ext
-        pm.displayWarning("Not valid file extension for: {}".format(filePath))
-        return
+    Args:
+        objs (list): objects to collect
+        use_npskin (bool, optional): collect NumPy arrays for .npSkin
+
+    Returns:
+        dict: skin file data {"objs": [], "objDDic": [], "bypassObj": []}
+    """
+    packDic = {"objs": [], "objDDic": [], "bypassObj": []}
 
-    _, file_ext = os.path.splitext(filePath)
     # object parsing
     for obj in objs:
         skinCls = getSkinCluster(obj)
@@ -274,7 +285,14 @@ def exportSkin(filePath=None, objs=None, *args):
             dataDic["objName"] = obj.name()
             dataDic["nameSpace"] = obj.namespace()
 
-            collectData(skinCls, dataDic)
+            if use_npskin:
+                collectArrayData(skinCls, dataDic)
+                influenceCount = len(dataDic["influences"])
+                pointCount = dataDic["vertexCount"]
+            else:
+                collectData(skinCls, dataDic)
+                influenceCount = len(dataDic["weights"].keys())
+                pointCount = len(dataDic["blendWeights"])
 
             packDic["objs"].append(obj.name())
             packDic["objDDic"].append(dataDic)
@@ -282,25 +300,108 @@ def exportSkin(filePath=None, objs=None, *args):
             pm.displayInfo(
                 exportMsg.format(
                     skinCls.name(),
-                    len(dataDic["weights"].keys()),
-                    len(dataDic["blendWeights"]),
+                    influenceCount,
+                    pointCount,
                     obj.name(),
                 )
             )
 
-    if packDic["objs"]:
-        if filePath.endswith(FILE_EXT):
-            with open(filePath, "wb") as fp:
-                pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
+    return packDic
+
+
+def writeSkinFile(filePath, packDic):
+    """Encode and write the skin data to disk
+
+    This function doesn't use Maya, so it can run in a worker thread.
+
+    Args:
+        filePath (str): .gSkin, .jSkin or .npSkin file path
+        packDic (dict): skin file data from collectSkinPack
+    """
+    if filePath.endswith(FILE_NPSKIN_EXT):
+        npskin.write(filePath, packDic["objDDic"])
+    elif filePath.endswith(FILE_EXT):
+        with open(filePath, "wb") as fp:
+            pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
+    else:
+        with open(filePath, "w") as fp:
+            json.dump(packDic, fp, indent=4, sort_keys=True)
+
+
+def exportSkin(filePath=None, objs=None, *args):
+    if not objs:
+        if pm.selected():
+            objs = pm.selected()
         else:
-            with open(filePath, "w") as fp:
-                json.dump(packDic, fp, indent=4, sort_keys=True)
+            pm.displayWarning("Please Select One or more objects")
+            return False
 
+    if not filePath:
+
+        f2 = "jSkin ASCII  (*{});;gSkin Binary (*{});;npSkin Binary (*{})".format(
+            FILE_JSON_EXT, FILE_EXT, FILE_NPSKIN_EXT
+        )
+        f3 = ";;All Files (*.*)"
+        fileFilters = f2 + f3
+        filePath = pm.fileDialog2(fileMode=0, fileFilter=fileFilters)
+        if filePath:
+            filePath = filePath[0]
+
+        else:
+            return False
+
+    if not filePath.endswith((FILE_EXT, FILE_JSON_EXT, FILE_NPSKIN_EXT)):
+        # filePath += file_ext
+        pm.displayWarning("Not valid file extension for: {}".format(filePath))
+        return
+
+    use_npskin = filePath.endswith(FILE_NPSKIN_EXT)
+    if use_npskin and not skin_array.NUMPY_AVAILABLE:
+        pm.displayWarning("NumPy is required to export {}".format(filePath))
+        return
+
+    packDic = collectSkinPack(objs, use_npskin)
+
+    if packDic["objs"]:
+        writeSkinFile(filePath, packDic)
         return True
 
 
-def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
-    if use_json:
+def exportSkinPack(
+    packPath=None,
+    objs=None,
+    use_json=False,
+    use_npskin=False,
+    workers=4,
+    progress_callback=None,
+    *args
+):
+    """Export the skin of each object to its own file, plus a pack file
+
+    The skin data is collected from Maya in the main thread, while the
+    encoding and writing of the previous objects runs in a thread pool.
+
+    Args:
+        packPath (str, optional): .gSkinPack file path
+        objs (list, optional): objects to export. Default is the selection
+        use_json (bool, optional): export .jSkin files
+        use_npskin (bool, optional): export .npSkin files
+        workers (int, optional): number of writer threads. 0 to write each
+            file before collecting the next object.
+        progress_callback (callable, optional): called in the main thread
+            with (fileName, done, total, error) after each file is written.
+
+    Returns:
+        dict: {fileName: error message or None} for each exported file,
+            including the objects whose skin data failed to be collected
+    """
+    if use_npskin and not skin_array.NUMPY_AVAILABLE:
+        pm.displayWarning("NumPy is required to export .npSkin files")
+        return
+
+    if use_npskin:
+        file_ext = FILE_NPSKIN_EXT
+    elif use_json:
         file_ext = FILE_JSON_EXT
     else:
         file_ext = FILE_EXT
@@ -330,15 +431,34 @@ def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
 
     packDic["rootPath"], packName = os.path.split(packPath)
 
-    for obj in objs:
-        fileName = obj.stripNamespace() + file_ext
-        filePath = os.path.join(packDic["rootPath"], fileName)
-        if exportSkin(filePath, [obj], use_json):
+    def collect():
+        # generator of (fileName, filePath, skin data). Runs in main thread
+        for obj in objs:
+            fileName = obj.stripNamespace() + file_ext
+            filePath = os.path.join(packDic["rootPath"], fileName)
+            try:
+                objPack = collectSkinPack([obj], use_npskin)
+            except Exception:
+                # reported for this file, the other objects are exported
+                yield fileName, filePath, pipeline.CollectError()
+                continue
+            if objPack["objs"]:
+                yield fileName, filePath, objPack
+
+    report = pipeline.run_writes(
+        collect(),
+        writeSkinFile,
+        workers=workers,
+        progress_callback=progress_callback,
+    )
+
+    for fileName, error in report.items():
+        if error is None:
             packDic["packFiles"].append(fileName)
-            pm.displayInfo(filePath)
+            pm.displayInfo(os.path.join(packDic["rootPath"], fileName))
         else:
-            pm.displayWarning(
-                obj.name() + ": Skipped because don't have Skin Cluster"
+            pm.displayError(
+                "{}: Skin file export failed. {}".format(fileName, error)
             )
 
     if packDic["packFiles"]:
@@ -351,29 +471,42 @@ def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
             "Any of the selected objects have Skin Cluster. "
             "Skin Pack export aborted."
         )
+    return report
 
 
 def exportJsonSkinPack(packPath=None, objs=None, *args):
     exportSkinPack(packPath, objs, use_json=True)
 
 
+def exportNpSkinPack(packPath=None, objs=None, *args):
+    exportSkinPack(packPath, objs, use_npskin=True)
+
+
 ######################################
 # Skin setters
 ######################################
 
 
 def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
+    if skin_array.NUMPY_AVAILABLE:
+        # vectorized path. Writes the whole weights matrix with one call
+        return skin_array.set_weights_from_dict(
+            skinCls, dataDic["weights"], compressed
+        )
+
     unusedImports = []
     weights = getCurrentWeights(skinCls, dagPath, components)
     influencePaths = OpenMaya.MDagPathArray()
     numInfluences = skinCls.__apimfn__().influenceObjects(influencePaths)
     numComponentsPerInfluence = int(weights.length() / numInfluences)
+    influenceNames = [
+        pm.PyNode(influencePaths[ii].partialPathName()).stripNamespace()
+        for ii in range(influencePaths.length())
+    ]
 
     for importedInfluence, wtValues in dataDic["weights"].items():
         for ii in range(influencePaths.length()):
-            influenceName = influencePaths[ii].partialPathName()
-            nnspace = pm.PyNode(influenceName).stripNamespace()
-            influenceWithoutNamespace = nnspace
+            influenceWithoutNamespace = influenceNames[ii]
             if influenceWithoutNamespace == importedInfluence:
                 if compressed:
                     for jj in range(numComponentsPerInfluence):
@@ -397,9 +530,19 @@ def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
     skinCls.__apimfn__().setWeights(
         dagPath, components, influenceIndices, weights, False
     )
+    return unusedImports
 
 
 def setBlendWeights(skinCls, dagPath, components, dataDic, compressed):
+    if skin_array.NUMPY_AVAILABLE:
+        skin_array.set_blend_weights(
+            skinCls,
+            skin_array.dict_to_blend_weights(
+                dataDic["blendWeights"], dataDic["vertexCount"], compressed
+            ),
+        )
+        return
+
     if compressed:
         # The compressed format skips 0.0 weights. If the key is empty,
         # set it to 0.0. JSON keys can't be integers. The vtx number key
@@ -418,7 +561,28 @@ def setBlendWeights(skinCls, dagPath, components, dataDic, compressed):
     skinCls.__apimfn__().setBlendWeights(dagPath, components, blendWeights)
 
 
+def setArrayData(skinCls, dataDic):
+    """Set the skin data from the .npSkin array format"""
+    if "weightsCSR" in dataDic:
+        # sparse weights read from a .npSkin file, written in chunks
+        indptr, indices, weights = dataDic["weightsCSR"]
+        skin_array.set_weights_csr(
+            skinCls, indptr, indices, weights, dataDic["influences"]
+        )
+    else:
+        skin_array.set_weights(
+            skinCls, dataDic["weightsMatrix"], dataDic["influences"]
+        )
+    for attr in ["skinningMethod", "normalizeWeights"]:
+        skinCls.attr(attr).set(dataDic[attr])
+    skin_array.set_blend_weights(skinCls, dataDic["blendWeightsArray"])
+
+
 def setData(skinCls, dataDic, compressed):
+    if dataDic.get("skinDataFormat") == npskin.ARRAY_DATA_FORMAT:
+        setArrayData(skinCls, dataDic)
+        return
+
     dagPath, components = getGeometryComponents(skinCls)
     setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed)
     for attr in ["skinningMethod", "normalizeWeights"]:
@@ -434,10 +598,13 @@ def setData(skinCls, dataDic, compressed):
 def _getObjsFromSkinFile(filePath=None, *args):
     # retrive the object names inside gSkin file
     if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
+        f1 = "mGear Skin (*{0} *{1} *{2})".format(
+            FILE_EXT, FILE_JSON_EXT, FILE_NPSKIN_EXT
+        )
         f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
             FILE_EXT, FILE_JSON_EXT
         )
+        f2 += ";;npSkin Binary (*{0})".format(FILE_NPSKIN_EXT)
         f3 = ";;All Files (*.*)"
         fileFilters = f1 + f2 + f3
         filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
@@ -446,6 +613,10 @@ def _getObjsFromSkinFile(filePath=None, *args):
     if not isinstance(filePath, string_types):
         filePath = filePath[0]
 
+    if filePath.endswith(FILE_NPSKIN_EXT):
+        # only the header is read
+        return npskin.get_objs(filePath)
+
     # Read in the file
     with open(filePath, "r") as fp:
         if filePath.endswith(FILE_EXT):
@@ -463,37 +634,54 @@ def getObjsFromSkinFile(filePath=None, *args):
             print(x)
 
 
-def importSkin(filePath=None, *args):
+def readSkinFile(filePath, objs=None):
+    """Read and decode a skin file
 
-    if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
-        f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
-            FILE_EXT, FILE_JSON_EXT
-        )
-        f3 = ";;All Files (*.*)"
-        fileFilters = f1 + f2 + f3
-        filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
-    if not filePath:
-        return
-    if not isinstance(filePath, string_types):
-        filePath = filePath[0]
+    This function doesn't use Maya, so it can run in a worker thread.
 
-    # Read in the file
-    if filePath.endswith(FILE_EXT):
+    Args:
+        filePath (str): .gSkin, .jSkin or .npSkin file path
+        objs (list, optional): With .npSkin files only the data of these
+            objects is loaded from disk.
+
+    Returns:
+        dict: skin file data {"objs": [], "objDDic": [], ...}
+    """
+    if filePath.endswith(FILE_NPSKIN_EXT):
+        return {"objDDic": npskin.read(filePath, objs)}
+    elif filePath.endswith(FILE_EXT):
         with open(filePath, "rb") as fp:
-            dataPack = pickle.load(fp)
+            return pickle.load(fp)
     else:
         with open(filePath, "r") as fp:
-            dataPack = json.load(fp)
+            return json.load(fp)
 
+
+def applySkinPack(dataPack, objs=None):
+    """Apply the skin file data to the scene objects
+
+    Args:
+        dataPack (dict): skin file data from readSkinFile
+        objs (list, optional): only apply the skin to these object names
+    """
     for data in dataPack["objDDic"]:
+        if objs is not None and data["objName"] not in objs:
+            continue
+
         # This checks if the jSkin file has the new style compressed format.
         # use a skinDataFormat key to check for backwards compatibility.
         # If it doesn't exist, just continue with the old method.
         compressed = False
+        arrayFormat = False
         if "skinDataFormat" in data:
             if data["skinDataFormat"] == "compressed":
                 compressed = True
+            elif data["skinDataFormat"] == npskin.ARRAY_DATA_FORMAT:
+                arrayFormat = True
+        if arrayFormat:
+            influences = data["influences"]
+        else:
+            influences = list(data["weights"].keys())
 
         try:
             skinCluster = False
@@ -518,7 +706,7 @@ def importSkin(filePath=None, *args):
                     # TODO: Implement other skinnable objs like lattices.
                     meshVertices = 0
 
-                if compressed:
+                if compressed or arrayFormat:
                     importedVertices = data["vertexCount"]
                 else:
                     importedVertices = len(data["blendWeights"])
@@ -537,7 +725,7 @@ def importSkin(filePath=None, *args):
                 skinCluster = getSkinCluster(objNode)
             else:
                 try:
-                    joints = list(data["weights"].keys())
+                    joints = influences
                     # strip | from longName, or skinCluster command may fail.
                     skinName = data["skinClsName"].replace("|", "")
                     skinCluster = pm.skinCluster(
@@ -548,7 +736,7 @@ def importSkin(filePath=None, *args):
                         [pm.PyNode(x).name() for x in pm.ls(type="joint")]
                     )
                     notFound = []
-                    for j in data["weights"].keys():
+                    for j in influences:
                         if j not in sceneJoints:
                             notFound.append(str(j))
                     pm.displayWarning(
@@ -566,7 +754,66 @@ def importSkin(filePath=None, *args):
             pm.displayWarning(warningMsg.format(objName))
 
 
-def importSkinPack(filePath=None, *args):
+def importSkin(filePath=None, *args, **kwargs):
+    """Import skin data from a .gSkin, .jSkin or .npSkin file
+
+    Args:
+        filePath (str, optional): skin file path
+        *args: Maya Dummy
+        **kwargs: objs (list) limits the import to these object names.
+            With .npSkin files only their data is loaded from disk.
+    """
+    objs = kwargs.get("objs")
+
+    if not filePath:
+        f1 = "mGear Skin (*{0} *{1} *{2})".format(
+            FILE_EXT, FILE_JSON_EXT, FILE_NPSKIN_EXT
+        )
+        f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
+            FILE_EXT, FILE_JSON_EXT
+        )
+        f2 += ";;npSkin Binary (*{0})".format(FILE_NPSKIN_EXT)
+        f3 = ";;All Files (*.*)"
+        fileFilters = f1 + f2 + f3
+        filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
+    if not filePath:
+        return
+    if not isinstance(filePath, string_types):
+        filePath = filePath[0]
+
+    # Read in the file
+    if filePath.endswith(FILE_NPSKIN_EXT) and objs is None:
+        fileObjs = npskin.get_objs(filePath)
+        objs = [o for o in fileObjs if cmds.objExists(o)]
+        for o in fileObjs:
+            if o not in objs:
+                warningMsg = "Object: {} Skipped. Can NOT be found in the scene"
+                pm.displayWarning(warningMsg.format(o))
+
+    applySkinPack(readSkinFile(filePath, objs), objs)
+
+
+def importSkinPack(filePath=None, *args, **kwargs):
+    """Import a skin pack
+
+    The skin files are read and decoded in a thread pool, while the
+    skin of the files already loaded is applied in the main thread.
+
+    Args:
+        filePath (str, optional): .gSkinPack file path
+        *args: Maya Dummy
+        **kwargs: objs (list) limits the import to these object names.
+            workers (int) number of reader threads, default 4. 0 reads
+            each file after applying the previous one.
+            progress_callback (callable) called in the main thread with
+            (fileName, done, total, error) after each file is applied.
+
+    Returns:
+        dict: {fileName: error message or None} for each pack file
+    """
+    objs = kwargs.get("objs")
+    workers = kwargs.get("workers", 4)
+    progress_callback = kwargs.get("progress_callback")
     if not filePath:
         filePath = pm.fileDialog2(
             fileMode=1, fileFilter="mGear skinPack (*%s)" % PACK_EXT
@@ -578,9 +825,70 @@ def importSkinPack(filePath=None, *args):
 
     with open(filePath) as fp:
         packDic = json.load(fp)
-        for pFile in packDic["packFiles"]:
-            filePath = os.path.join(os.path.split(filePath)[0], pFile)
-            importSkin(filePath, True)
+
+    rootPath = os.path.split(filePath)[0]
+    files = [
+        (pFile, os.path.join(rootPath, pFile)) for pFile in packDic["packFiles"]
+    ]
+
+    def apply(fileName, dataPack):
+        applySkinPack(dataPack, objs)
+
+    report = pipeline.run_reads(
+        files,
+        lambda path: readSkinFile(path, objs),
+        apply,
+        workers=workers,
+        progress_callback=progress_callback,
+    )
+    for fileName, error in report.items():
+        if error is not None:
+            pm.displayError(
+                "{}: Skin file import failed. {}".format(fileName, error)
+            )
+    return report
+
+
+######################################
+# Skin file conversion
+######################################
+
+
+def convertSkinFile(srcPath, dstPath):
+    """Convert a skin file between the .gSkin, .jSkin and .npSkin formats
+
+    Args:
+        srcPath (str): source skin file path
+        dstPath (str): destination skin file path. The extension defines
+            the format.
+    """
+    if srcPath.endswith(FILE_NPSKIN_EXT):
+        objsData = npskin.read(srcPath)
+        dataPack = None
+    else:
+        if srcPath.endswith(FILE_EXT):
+            with open(srcPath, "rb") as fp:
+                dataPack = pickle.load(fp)
+        else:
+            with open(srcPath, "r") as fp:
+                dataPack = json.load(fp)
+        objsData = None
+
+    if dstPath.endswith(FILE_NPSKIN_EXT):
+        if objsData is None:
+            objsData = npskin.from_pack_data(dataPack)
+        npskin.write(dstPath, objsData)
+    else:
+        if dataPack is None:
+            dataPack = npskin.to_pack_data(objsData)
+        if dstPath.endswith(FILE_EXT):
+            with open(dstPath, "wb") as fp:
+                pickle.dump(dataPack, fp, pickle.HIGHEST_PROTOCOL)
+        else:
+            with open(dstPath, "w") as fp:
+                json.dump(dataPack, fp, indent=4, sort_keys=True)
+
+    pm.displayInfo("Converted skin file: {} -> {}".format(srcPath, dstPath))
 
 
 ######################################
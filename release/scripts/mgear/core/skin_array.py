@@ -0,0 +1,480 @@
+"""
+Skin weights as NumPy arrays.
+
+Vectorized weight engine used by the skin IO functions in mgear.core.skin.
+The skinCluster weights are moved as a dense (vertices x influences) matrix
+with OpenMaya 2.0, instead of being read and written one value at a time.
+
+The helpers to convert the matrix from and to the compressed
+{influence: {vertex: weight}} dictionary keep the .gSkin and .jSkin
+files compatible.
+
+Note:
+    NumPy ships with Maya 2022 and later. If it is not available
+    NUMPY_AVAILABLE is False and mgear.core.skin uses its python path.
+"""
+
+#############################################
+# GLOBAL
+#############################################
+
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+from maya import cmds
+
+from .six import string_types
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# vertices written per setWeights call with set_weights_csr
+CHUNK_SIZE = 10000
+
+
+######################################
+# Maya API access
+######################################
+
+
+def get_skin_cluster_fn(skin_cluster):
+    """Get the OpenMaya 2.0 function set of a skinCluster
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+
+    Returns:
+        MFnSkinCluster: skinCluster function set
+    """
+    if not isinstance(skin_cluster, string_types):
+        skin_cluster = skin_cluster.name()
+    sel = om2.MSelectionList()
+    sel.add(skin_cluster)
+    return oma2.MFnSkinCluster(sel.getDependNode(0))
+
+
+def _get_tag_expression_components(fn_skin, tag="*"):
+    """Get the geometry components from the component tag expression
+
+    Maya 2022 and later may not have a deformer set.
+
+    Args:
+        fn_skin (MFnSkinCluster): skinCluster function set
+        tag (str, optional): Component tag expression
+
+    Returns:
+        MDagPath, MObject: The shape dagPath and the components
+    """
+    shape = fn_skin.getOutputGeometry()[0]
+    dag_path = om2.MDagPath.getAPathTo(shape)
+    out_attr = cmds.deformableShape(
+        dag_path.fullPathName(), localShapeOutAttr=True
+    )[0]
+    plug = om2.MFnDependencyNode(shape).findPlug(out_attr, True)
+    fn_geodata = om2.MFnGeometryData(plug.asMObject())
+    components = fn_geodata.resolveComponentTagExpression(tag)
+    return dag_path, components
+
+
+def get_geometry_components(fn_skin):
+    """Get the geometry components deformed by the skinCluster
+
+    Args:
+        fn_skin (MFnSkinCluster): skinCluster function set
+
+    Returns:
+        MDagPath, MObject: The shape dagPath and the components
+    """
+    try:
+        fn_set = om2.MFnSet(fn_skin.deformerSet)
+        members = fn_set.getMembers(False)
+        return members.getComponent(0)
+    except Exception:
+        return _get_tag_expression_components(fn_skin)
+
+
+def strip_namespace(name):
+    """Remove the namespace from each element of a DAG path name
+
+    Args:
+        name (str): node name or partial path name
+
+    Returns:
+        str: name without namespace
+    """
+    return "|".join(n.split(":")[-1] for n in name.split("|"))
+
+
+def get_influence_names(fn_skin):
+    """Get the skinCluster influence names without namespace
+
+    Args:
+        fn_skin (MFnSkinCluster): skinCluster function set
+
+    Returns:
+        list: influence names, in skinCluster influence index order
+    """
+    return [
+        strip_namespace(p.partialPathName())
+        for p in fn_skin.influenceObjects()
+    ]
+
+
+######################################
+# Weight matrix getters and setters
+######################################
+
+
+def get_weights(skin_cluster):
+    """Get the skinCluster weights matrix
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+
+    Returns:
+        ndarray, list: (vertices x influences) weights and influence names
+    """
+    fn_skin = get_skin_cluster_fn(skin_cluster)
+    dag_path, components = get_geometry_components(fn_skin)
+    matrix = _get_weights_matrix(fn_skin, dag_path, components)
+    return matrix, get_influence_names(fn_skin)
+
+
+def _get_weights_matrix(fn_skin, dag_path, components):
+    weights, num_influences = fn_skin.getWeights(dag_path, components)
+    return np.array(weights, dtype=np.float64).reshape(-1, num_influences)
+
+
+def _map_influences(fn_skin, influences):
+    """Map the influence names to the skinCluster influence indices
+
+    Returns:
+        list, list, list: source columns, skinCluster influence indices and
+            influence names not found in the skinCluster
+    """
+    # name -> index table. First match wins, as the python path does
+    index_table = {}
+    for i, name in enumerate(get_influence_names(fn_skin)):
+        index_table.setdefault(name, i)
+
+    src_columns = []
+    dst_columns = []
+    unused = []
+    for col, name in enumerate(influences):
+        index = index_table.get(name)
+        if index is None:
+            unused.append(name)
+        else:
+            src_columns.append(col)
+            dst_columns.append(index)
+    return src_columns, dst_columns, unused
+
+
+def _get_component_chunks(components, count, chunk_size):
+    """Split single indexed components in chunks of elements
+
+    Other components, i.e: NURBS surface CVs, are not split.
+
+    Yields:
+        int, int, MObject: first and last + 1 element position, and the
+            components of the chunk
+    """
+    if count <= chunk_size or not components.hasFn(
+        om2.MFn.kSingleIndexedComponent
+    ):
+        yield 0, count, components
+        return
+
+    fn_comp = om2.MFnSingleIndexedComponent(components)
+    if fn_comp.isComplete:
+        elements = list(range(count))
+    else:
+        elements = list(fn_comp.getElements())
+    for start in range(0, count, chunk_size):
+        end = min(start + chunk_size, count)
+        chunk = om2.MFnSingleIndexedComponent()
+        chunk_components = chunk.create(components.apiType())
+        chunk.addElements(elements[start:end])
+        yield start, end, chunk_components
+
+
+def _write_weights(fn_skin, dag_path, components, weights, influences,
+                   chunk_size=CHUNK_SIZE):
+    """Write the weights columns in vertex chunks
+
+    Only the matched influences are written, the other skinCluster
+    influences keep their current weights.
+
+    Returns:
+        list: influence names not found in the skinCluster
+    """
+    src_columns, dst_columns, unused = _map_influences(fn_skin, influences)
+    if not dst_columns:
+        return unused
+
+    weights = np.asarray(weights, dtype=np.float64)
+    influence_indices = om2.MIntArray(dst_columns)
+    for start, end, chunk_components in _get_component_chunks(
+        components, weights.shape[0], chunk_size
+    ):
+        fn_skin.setWeights(
+            dag_path,
+            chunk_components,
+            influence_indices,
+            om2.MDoubleArray(weights[start:end, src_columns].ravel().tolist()),
+            False,
+        )
+    return unused
+
+
+def _get_component_count(dag_path, components):
+    return om2.MItGeometry(dag_path, components).count()
+
+
+def set_weights(skin_cluster, weights, influences):
+    """Set the skinCluster weights from a weights matrix
+
+    The columns are mapped to the skinCluster influences by name. Influences
+    of the skinCluster not in the matrix keep their current weights.
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+        weights (ndarray): (vertices x len(influences)) weights matrix
+        influences (list): column influence names, without namespace
+
+    Returns:
+        list: influence names not found in the skinCluster
+    """
+    fn_skin = get_skin_cluster_fn(skin_cluster)
+    dag_path, components = get_geometry_components(fn_skin)
+    return _write_weights(fn_skin, dag_path, components, weights, influences)
+
+
+def set_weights_csr(skin_cluster, indptr, indices, weights, influences,
+                    chunk_size=CHUNK_SIZE):
+    """Set the skinCluster weights from CSR arrays, in vertex chunks
+
+    Only a (chunk vertices x matched influences) block is dense at a time.
+    The weights of the skinCluster influences not in influences are not
+    changed.
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+        indptr (ndarray): row start of each vertex
+        indices (ndarray): influence column of each non zero weight
+        weights (ndarray): non zero weights
+        influences (list): column influence names, without namespace
+        chunk_size (int, optional): number of vertices written per call
+
+    Returns:
+        list: influence names not found in the skinCluster
+    """
+    fn_skin = get_skin_cluster_fn(skin_cluster)
+    dag_path, components = get_geometry_components(fn_skin)
+    src_columns, dst_columns, unused = _map_influences(fn_skin, influences)
+    if not dst_columns:
+        return unused
+
+    # file column -> chunk column, -1 for the unused influences
+    column_map = np.full(len(influences), -1, dtype=np.int64)
+    column_map[src_columns] = np.arange(len(src_columns))
+    influence_indices = om2.MIntArray(dst_columns)
+
+    indptr = np.asarray(indptr, dtype=np.int64)
+    for start, end, chunk_components in _get_component_chunks(
+        components, len(indptr) - 1, chunk_size
+    ):
+        matrix = get_csr_block(
+            indptr, indices, weights, start, end, column_map,
+            len(dst_columns)
+        )
+        fn_skin.setWeights(
+            dag_path,
+            chunk_components,
+            influence_indices,
+            om2.MDoubleArray(matrix.ravel().tolist()),
+            False,
+        )
+    return unused
+
+
+def get_csr_block(indptr, indices, weights, start, end, column_map, width):
+    """Get a dense block of rows from CSR weights arrays
+
+    Args:
+        indptr (ndarray): row start of each vertex
+        indices (ndarray): influence column of each non zero weight
+        weights (ndarray): non zero weights
+        start (int): first row
+        end (int): last row + 1
+        column_map (ndarray): block column of each influence column, -1 to
+            skip the influence
+        width (int): number of block columns
+
+    Returns:
+        ndarray: (end - start x width) weights
+    """
+    first, last = indptr[start], indptr[end]
+    rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+    columns = column_map[np.asarray(indices[first:last], dtype=np.int64)]
+    used = columns >= 0
+
+    block = np.zeros((end - start, width), dtype=np.float64)
+    block[rows[used], columns[used]] = np.asarray(weights[first:last])[used]
+    return block
+
+
+def set_weights_from_dict(skin_cluster, weights_dict, compressed=True):
+    """Set the skinCluster weights from a skin data weights dictionary
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+        weights_dict (dict): .gSkin/.jSkin weights. See dict_to_weights
+        compressed (bool, optional): True for the compressed data format
+
+    Returns:
+        list: influence names not found in the skinCluster
+    """
+    fn_skin = get_skin_cluster_fn(skin_cluster)
+    dag_path, components = get_geometry_components(fn_skin)
+    weights, influences = dict_to_weights(
+        weights_dict, _get_component_count(dag_path, components), compressed
+    )
+    return _write_weights(fn_skin, dag_path, components, weights, influences)
+
+
+def get_blend_weights(skin_cluster):
+    """Get the skinCluster dual quaternion blend weights
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+
+    Returns:
+        ndarray: blend weight per vertex
+    """
+    fn_skin = get_skin_cluster_fn(skin_cluster)
+    dag_path, components = get_geometry_components(fn_skin)
+    weights = fn_skin.getBlendWeights(dag_path, components)
+    return np.array(weights, dtype=np.float64)
+
+
+def set_blend_weights(skin_cluster, blend_weights):
+    """Set the skinCluster dual quaternion blend weights
+
+    Args:
+        skin_cluster (str or PyNode): skinCluster node
+        blend_weights (ndarray): blend weight per vertex
+    """
+    fn_skin = get_skin_cluster_fn(skin_cluster)
+    dag_path, components = get_geometry_components(fn_skin)
+    fn_skin.setBlendWeights(
+        dag_path,
+        components,
+        om2.MDoubleArray(np.asarray(blend_weights, dtype=np.float64).tolist()),
+    )
+
+
+######################################
+# gSkin / jSkin data conversion
+######################################
+
+
+def weights_to_dict(weights, influences):
+    """Convert a weights matrix to the compressed skin data dictionary
+
+    0.0 weights are skipped.
+
+    Args:
+        weights (ndarray): (vertices x influences) weights matrix
+        influences (list): column influence names
+
+    Returns:
+        dict: {influence: {vertex: weight}}
+    """
+    data = {}
+    for col, name in enumerate(influences):
+        column = weights[:, col]
+        indices = np.flatnonzero(column)
+        data[str(name)] = dict(
+            zip(indices.tolist(), column[indices].tolist())
+        )
+    return data
+
+
+def dict_to_weights(weights_dict, vertex_count, compressed=True):
+    """Convert a skin data weights dictionary to a weights matrix
+
+    Args:
+        weights_dict (dict): {influence: {vertex: weight}} if compressed or
+            {influence: [weight per vertex]} for the old uncompressed files.
+        vertex_count (int): number of vertices
+        compressed (bool, optional): True for the compressed data format
+
+    Returns:
+        ndarray, list: (vertices x influences) weights and influence names
+    """
+    influences = list(weights_dict.keys())
+    matrix = np.zeros((vertex_count, len(influences)), dtype=np.float64)
+    for col, name in enumerate(influences):
+        values = weights_dict[name]
+        if not values:
+            continue
+        if compressed:
+            # json keys can't be integers, the keys can be int or str
+            indices = np.fromiter(
+                (int(k) for k in values.keys()), dtype=np.int64,
+                count=len(values)
+            )
+            matrix[indices, col] = np.fromiter(
+                values.values(), dtype=np.float64, count=len(values)
+            )
+        else:
+            column = np.asarray(values, dtype=np.float64)
+            matrix[: len(column), col] = column[:vertex_count]
+    return matrix, influences
+
+
+def blend_weights_to_dict(blend_weights, precision=6):
+    """Convert blend weights to the compressed skin data dictionary
+
+    Args:
+        blend_weights (ndarray): blend weight per vertex
+        precision (int, optional): rounding decimals
+
+    Returns:
+        dict: {vertex: blend weight}, skipping 0.0 values
+    """
+    rounded = np.round(blend_weights, precision)
+    indices = np.flatnonzero(rounded)
+    return dict(zip(indices.tolist(), rounded[indices].tolist()))
+
+
+def dict_to_blend_weights(blend_dict, vertex_count, compressed=True):
+    """Convert skin data blend weights to a blend weights array
+
+    Args:
+        blend_dict (dict or list): {vertex: weight} if compressed, or a list
+            of blend weight per vertex for the old uncompressed files.
+        vertex_count (int): number of vertices
+        compressed (bool, optional): True for the compressed data format
+
+    Returns:
+        ndarray: blend weight per vertex
+    """
+    if not compressed:
+        return np.asarray(blend_dict, dtype=np.float64)
+    blend_weights = np.zeros(vertex_count, dtype=np.float64)
+    if blend_dict:
+        indices = np.fromiter(
+            (int(k) for k in blend_dict.keys()), dtype=np.int64,
+            count=len(blend_dict)
+        )
+        blend_weights[indices] = np.fromiter(
+            blend_dict.values(), dtype=np.float64, count=len(blend_dict)
+        )
+    return blend_weights
@@ -10,11 +10,12 @@ you want to update with Flex
 from __future__ import absolute_import
 from mgear.flex import logger
 from mgear.flex.decorators import timer
+from mgear.flex.fingerprint import get_cached_fingerprints
+from mgear.flex.fingerprint import get_changed_shapes
+from mgear.flex.fingerprint import get_fingerprints
+from mgear.flex.fingerprint import is_matching_bounding_box
 from mgear.flex.query import get_matching_shapes_from_group
 from mgear.flex.query import get_missing_shapes_from_group
-from mgear.flex.query import is_matching_bouding_box
-from mgear.flex.query import is_matching_count
-from mgear.flex.query import is_matching_type
 
 
 @timer
@@ -26,6 +27,10 @@ def analyze_groups(source, target):
 
     :param target: maya transform node
     :type target: str
+
+    :return: matching shapes, mismatching types, vertices count and bounding
+             box shapes, and the shapes changed since the last update
+    :rtype: dict, list, list, list, list
     """
 
     logger.debug("Analysing the following groups - source: {}  - target: {}"
@@ -34,22 +39,39 @@ def analyze_groups(source, target):
     # gets the matching shapes
     matching_shapes = get_matching_shapes_from_group(source, target)
 
+    # gets the source and target (orig) shapes fingerprints in bulk
+    source_fingerprints = get_fingerprints(matching_shapes.keys())
+    target_fingerprints = get_fingerprints(matching_shapes.values(),
+                                           use_orig=True)
+
+    def fingerprints(shape):
+        return (source_fingerprints[shape],
+                target_fingerprints[matching_shapes[shape]])
+
     # gets mismatching shape types
-    mismatched_types = [x for x in matching_shapes if not is_matching_type(
-        x, matching_shapes[x])]
+    mismatched_types = [x for x in matching_shapes
+                        if fingerprints(x)[0]["type"] !=
+                        fingerprints(x)[1]["type"]]
 
     # gets mismatching shape vertices count
-    mismatched_count = [x for x in matching_shapes if not is_matching_count(
-        x, matching_shapes[x])]
+    mismatched_count = [x for x in matching_shapes
+                        if fingerprints(x)[0]["count"] !=
+                        fingerprints(x)[1]["count"]]
 
     # gets mismatching shape bounding box
     mismatched_bbox = [x for x in matching_shapes if not
-                       is_matching_bouding_box(x, matching_shapes[x])]
+                       is_matching_bounding_box(*fingerprints(x))]
+
+    # gets the shapes changed since the last update
+    changed_shapes = get_changed_shapes(source_fingerprints, matching_shapes,
+                                        get_cached_fingerprints(target),
+                                        target_fingerprints)
 
     logger.info("-" * 90)
     logger.info("Mismatch shapes types: {}".format(mismatched_types))
     logger.info("Mismatch vertices shapes: {}".format(mismatched_count))
     logger.info("Mismatch volume shapes: {}".format(mismatched_bbox))
+    logger.info("Changed shapes: {}".format(changed_shapes))
     logger.warning("-" * 90)
     logger.warning("Source missing shapes: {}" .format(
         get_missing_shapes_from_group(source, target)))
@@ -57,4 +79,5 @@ def analyze_groups(source, target):
         get_missing_shapes_from_group(target, source)))
     logger.warning("-" * 90)
 
-    return matching_shapes, mismatched_types, mismatched_count, mismatched_bbox
+    return (matching_shapes, mismatched_types, mismatched_count,
+            mismatched_bbox, changed_shapes)
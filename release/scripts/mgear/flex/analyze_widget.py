@@ -75,7 +75,7 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
 
         # creates the table
         self.table_widget = QtWidgets.QTableWidget()
-        self.table_widget.setColumnCount(6)
+        self.table_widget.setColumnCount(7)
         self.table_widget.setIconSize(QtCore.QSize(20, 20))
 
         # adds headers
@@ -84,6 +84,7 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
                                                      "Type",
                                                      "Count",
                                                      "B-Box",
+                                                     "Changed",
                                                      "Result"])
 
         # setup headers look and feel
@@ -96,12 +97,13 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         h_header.setSectionResizeMode(3, h_header.Fixed)
         h_header.setSectionResizeMode(4, h_header.Fixed)
         h_header.setSectionResizeMode(5, h_header.Fixed)
+        h_header.setSectionResizeMode(6, h_header.Fixed)
         h_header.setSectionsClickable(False)
 
         # hides vertical header
         self.table_widget.verticalHeader().setVisible(False)
 
-    def add_item(self, source, target, match, count, bbox):
+    def add_item(self, source, target, match, count, bbox, changed=None):
         """ Handles adding items to the table widget
 
         :param source: the source shape element
@@ -112,6 +114,9 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
 
         :param match: whether the type matches
         :type match: bool
+
+        :param changed: the shapes changed since the last update
+        :type changed: list
         """
 
         # source item
@@ -149,6 +154,13 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
             bbox_item.setIcon(self.red_icon)
         bbox_item.setFlags(QtCore.Qt.ItemIsEnabled)
 
+        # changed item
+        changed_item = QtWidgets.QTableWidgetItem()
+        changed_item.setIcon(self.green_icon)
+        if changed is None or source in changed:
+            changed_item.setIcon(self.yellow_icon)
+        changed_item.setFlags(QtCore.Qt.ItemIsEnabled)
+
         # result item
         result_item = QtWidgets.QTableWidgetItem()
         result_item.setFlags(QtCore.Qt.ItemIsEnabled)
@@ -171,4 +183,5 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         self.table_widget.setItem(0, 2, match_item)
         self.table_widget.setItem(0, 3, count_item)
         self.table_widget.setItem(0, 4, bbox_item)
-        self.table_widget.setItem(0, 5, result_item)
+        self.table_widget.setItem(0, 5, changed_item)
+        self.table_widget.setItem(0, 6, result_item)
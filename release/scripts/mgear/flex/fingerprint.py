@@ -0,0 +1,360 @@
+""" flex.fingerprint
+
+flex.fingerprint module contains the functions to compute the shapes
+fingerprints, which allows Flex to find the shapes that changed since the last
+update.
+
+A fingerprint holds the shape type, vertices count and bounding box, and the
+hashes of the topology, points positions and uvs. The arrays are read in bulk
+with the Maya API 2.0 instead of querying each shape attribute.
+
+:module: flex.fingerprint
+"""
+
+# imports
+from __future__ import absolute_import
+import array
+import hashlib
+import json
+import math
+from maya import cmds
+from maya.api import OpenMaya as om2
+from mgear.flex import logger
+from mgear.flex.query import get_prefix_less_name
+from mgear.flex.query import get_shape_orig
+
+# fingerprints cache attribute on the target group
+FINGERPRINTS_ATTRIBUTE = "flexFingerprints"
+
+# fingerprint keys compared to know if a shape changed
+HASH_KEYS = ("topology", "points", "uvs")
+
+# points positions are rounded to this number of decimals before hashing
+POINTS_PRECISION = 5
+
+
+def _hash_doubles(values, precision=None):
+    """ Returns the md5 hash of the given float values
+
+    :param values: iterable of float values
+    :type values: iterable
+
+    :param precision: number of decimals kept, all if None
+    :type precision: int
+
+    :return: hex digest
+    :rtype: str
+    """
+
+    if precision is not None:
+        values = (round(v, precision) + 0.0 for v in values)
+    return hashlib.md5(array.array("d", values).tobytes()).hexdigest()
+
+
+def _hash_ints(values):
+    """ Returns the md5 hash of the given integer values
+
+    :param values: iterable of int values
+    :type values: iterable
+
+    :return: hex digest
+    :rtype: str
+    """
+
+    return hashlib.md5(array.array("i", values).tobytes()).hexdigest()
+
+
+def _get_points_hash(points):
+    """ Returns the hash of the given points positions
+
+    :param points: the points positions
+    :type points: om2.MPointArray
+
+    :return: hex digest
+    :rtype: str
+    """
+
+    return _hash_doubles((c for p in points for c in (p.x, p.y, p.z)),
+                         POINTS_PRECISION)
+
+
+def _get_mesh_hashes(dag_path):
+    """ Returns the topology, points and uvs hashes of a mesh
+
+    :param dag_path: the mesh shape dag path
+    :type dag_path: om2.MDagPath
+
+    :return: vertices count and hashes
+    :rtype: int, str, str, str
+    """
+
+    fn_mesh = om2.MFnMesh(dag_path)
+    counts, connects = fn_mesh.getVertices()
+    topology = _hash_ints(list(counts) + list(connects))
+    points = _get_points_hash(fn_mesh.getPoints(om2.MSpace.kObject))
+
+    uvs = hashlib.md5()
+    for uv_set in fn_mesh.getUVSetNames():
+        u_values, v_values = fn_mesh.getUVs(uv_set)
+        uv_counts, uv_ids = fn_mesh.getAssignedUVs(uv_set)
+        uvs.update(uv_set.encode("utf-8"))
+        uvs.update(_hash_doubles(u_values, POINTS_PRECISION).encode("utf-8"))
+        uvs.update(_hash_doubles(v_values, POINTS_PRECISION).encode("utf-8"))
+        uvs.update(_hash_ints(list(uv_counts) + list(uv_ids)).encode("utf-8"))
+
+    return fn_mesh.numVertices, topology, points, uvs.hexdigest()
+
+
+def _get_nurbs_curve_hashes(dag_path):
+    """ Returns the topology, points and uvs hashes of a nurbs curve
+
+    :param dag_path: the nurbs curve shape dag path
+    :type dag_path: om2.MDagPath
+
+    :return: cvs count and hashes
+    :rtype: int, str, str, str
+    """
+
+    fn_curve = om2.MFnNurbsCurve(dag_path)
+    topology = _hash_doubles([fn_curve.degree, fn_curve.form]
+                             + list(fn_curve.knots()))
+    points = _get_points_hash(fn_curve.cvPositions(om2.MSpace.kObject))
+
+    return fn_curve.numCVs, topology, points, None
+
+
+def _get_nurbs_surface_hashes(dag_path):
+    """ Returns the topology, points and uvs hashes of a nurbs surface
+
+    :param dag_path: the nurbs surface shape dag path
+    :type dag_path: om2.MDagPath
+
+    :return: cvs count and hashes
+    :rtype: int, str, str, str
+    """
+
+    fn_surface = om2.MFnNurbsSurface(dag_path)
+    topology = _hash_doubles([fn_surface.degreeInU, fn_surface.degreeInV,
+                              fn_surface.formInU, fn_surface.formInV]
+                             + list(fn_surface.knotsInU())
+                             + list(fn_surface.knotsInV()))
+    points = _get_points_hash(fn_surface.cvPositions(om2.MSpace.kObject))
+
+    return (fn_surface.numCVsInU * fn_surface.numCVsInV, topology, points,
+            None)
+
+
+SHAPE_HASHES_FUNCTIONS = {"mesh": _get_mesh_hashes,
+                          "nurbsCurve": _get_nurbs_curve_hashes,
+                          "nurbsSurface": _get_nurbs_surface_hashes}
+
+
+def get_shape_fingerprint(shape, use_orig=False):
+    """ Returns the fingerprint of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :param use_orig: whether the orig shape of a deformed shape is used
+    :type use_orig: bool
+
+    :return: type, count, bounding box (min, max), topology, points and uvs
+    :rtype: dict
+    """
+
+    if use_orig:
+        orig_shape = get_shape_orig(shape)
+        if orig_shape:
+            shape = orig_shape[0]
+
+    selection = om2.MSelectionList()
+    selection.add(shape)
+    dag_path = selection.getDagPath(0)
+
+    shape_type = cmds.objectType(shape)
+    count, topology, points, uvs = SHAPE_HASHES_FUNCTIONS[shape_type](
+        dag_path)
+    bbox = om2.MFnDagNode(dag_path).boundingBox
+
+    return {"type": shape_type,
+            "count": count,
+            "bbox": ([bbox.min.x, bbox.min.y, bbox.min.z],
+                     [bbox.max.x, bbox.max.y, bbox.max.z]),
+            "topology": topology,
+            "points": points,
+            "uvs": uvs}
+
+
+def get_fingerprints(shapes, use_orig=False):
+    """ Returns the fingerprint of each given shape
+
+    :param shapes: maya shape nodes
+    :type shapes: list
+
+    :param use_orig: whether the orig shape of deformed shapes are used
+    :type use_orig: bool
+
+    :return: fingerprint by shape
+    :rtype: dict
+    """
+
+    return dict([(s, get_shape_fingerprint(s, use_orig)) for s in shapes])
+
+
+def is_matching_bounding_box(source, target, tolerance=0.05):
+    """ Checks if the source and target fingerprints have the same bounding box
+
+    Same check as query.is_matching_bouding_box, on the bounding boxes
+    gathered with the fingerprints.
+
+    :param source: source shape fingerprint
+    :type source: dict
+
+    :param target: target shape fingerprint
+    :type target: dict
+
+    :param tolerance: difference tolerance allowed. Default 0.05
+    :type tolerance: float
+
+    :return: If source and target matches their bounding box
+    :rtype: bool
+    """
+
+    for src_vector, tgt_vector in zip(source["bbox"], target["bbox"]):
+        src_mag = math.sqrt(sum(v ** 2 for v in src_vector))
+        tgt_mag = math.sqrt(sum(v ** 2 for v in tgt_vector))
+        if abs(tgt_mag - src_mag) > tolerance:
+            return False
+
+    return True
+
+
+def get_hashes(fingerprint):
+    """ Returns the fingerprint hashes compared to detect changes
+
+    :param fingerprint: shape fingerprint
+    :type fingerprint: dict
+
+    :return: topology, points and uvs hashes
+    :rtype: dict
+    """
+
+    return dict([(k, fingerprint[k]) for k in HASH_KEYS])
+
+
+def get_cached_fingerprints(group):
+    """ Returns the fingerprints stored on the given group
+
+    :param group: maya transform node
+    :type group: str
+
+    :return: the update options and the hashes by prefix-less shape name
+    :rtype: dict
+    """
+
+    attribute = "{}.{}".format(group, FINGERPRINTS_ATTRIBUTE)
+    if not cmds.objExists(attribute):
+        return {}
+
+    try:
+        return json.loads(cmds.getAttr(attribute) or "{}")
+    except ValueError:
+        logger.warning("Invalid Flex fingerprints found on {}".format(group))
+        return {}
+
+
+def set_cached_fingerprints(group, cache):
+    """ Stores the fingerprints on the given group
+
+    :param group: maya transform node
+    :type group: str
+
+    :param cache: the update options and the hashes by prefix-less shape name
+    :type cache: dict
+    """
+
+    attribute = "{}.{}".format(group, FINGERPRINTS_ATTRIBUTE)
+    try:
+        if not cmds.objExists(attribute):
+            cmds.addAttr(group, longName=FINGERPRINTS_ATTRIBUTE,
+                         dataType="string")
+        cmds.setAttr(attribute, json.dumps(cache, sort_keys=True),
+                     type="string")
+    except RuntimeError:
+        logger.warning("Flex fingerprints could not be stored on {}"
+                       .format(group))
+
+
+def get_changed_shapes(source_fingerprints, matching_shapes, cache,
+                       target_fingerprints=None, options=None):
+    """ Returns the source shapes which changed since the last update
+
+    A source shape is changed if its hashes differ from the ones cached on the
+    target group. Without a cached entry the source hashes are compared to the
+    target fingerprints if given, otherwise the shape is considered changed.
+    All the shapes are changed if the update options differ from the cached
+    ones.
+
+    :param source_fingerprints: fingerprint by source shape
+    :type source_fingerprints: dict
+
+    :param matching_shapes: target shape by source shape
+    :type matching_shapes: dict
+
+    :param cache: fingerprints cache from the target group
+    :type cache: dict
+
+    :param target_fingerprints: fingerprint by target shape
+    :type target_fingerprints: dict
+
+    :param options: update options, not compared if None
+    :type options: dict
+
+    :return: the changed source shapes
+    :rtype: list
+    """
+
+    if options is not None and cache.get("options") != options:
+        return list(matching_shapes)
+
+    cached_hashes = cache.get("shapes", {})
+    changed = []
+    for shape in matching_shapes:
+        hashes = get_hashes(source_fingerprints[shape])
+        name = get_prefix_less_name(shape)
+        if name in cached_hashes:
+            previous = cached_hashes[name]
+        elif target_fingerprints:
+            previous = get_hashes(target_fingerprints[matching_shapes[shape]])
+        else:
+            previous = None
+        if hashes != previous:
+            changed.append(shape)
+
+    return changed
+
+
+def update_cached_fingerprints(group, source_fingerprints, options):
+    """ Stores the given source fingerprints on the target group
+
+    The fingerprints of shapes not given are kept, unless the options changed.
+
+    :param group: maya transform node
+    :type group: str
+
+    :param source_fingerprints: fingerprint by source shape
+    :type source_fingerprints: dict
+
+    :param options: update options used
+    :type options: dict
+    """
+
+    cache = get_cached_fingerprints(group)
+    if cache.get("options") != options:
+        cache = {"options": options, "shapes": {}}
+    cache.setdefault("shapes", {})
+
+    for shape, fingerprint in source_fingerprints.items():
+        cache["shapes"][get_prefix_less_name(shape)] = get_hashes(fingerprint)
+
+    set_cached_fingerprints(group, cache)
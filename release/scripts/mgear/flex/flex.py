@@ -58,6 +58,7 @@ class Flex(object):
                                  "plugin_attributes": False,
                                  "hold_transform_values": True,
                                  "mismatched_topologies": True,
+                                 "changed_only": False,
                                  }
 
     def __check_source_and_target_properties(self):
@@ -88,6 +89,7 @@ class Flex(object):
            * plugin_attributes
            * hold_transform_values
            * mismatched_topologies
+           * changed_only
         """
 
         # gather ui options
@@ -109,6 +111,7 @@ class Flex(object):
             self.ui.transformed_hold_check.isChecked())
         ui_options["mismatched_topologies"] = (
             self.ui.mismatched_topologies.isChecked())
+        ui_options["changed_only"] = self.ui.changed_only_check.isChecked()
 
         return ui_options
 
@@ -307,13 +310,13 @@ class Flex(object):
 
         # runs analyze
         matching_shapes, mismatched_types, mismatched_count, \
-            mismatched_bbox = analyze_groups(source=self.source_group,
-                                             target=self.target_group)
+            mismatched_bbox, changed_shapes = analyze_groups(
+                source=self.source_group, target=self.target_group)
 
         if update_ui:
             [self.analyze_ui.add_item(shape, matching_shapes[shape],
                                       mismatched_types, mismatched_count,
-                                      mismatched_bbox)
+                                      mismatched_bbox, changed_shapes)
              for shape in matching_shapes]
 
     @set_focus
@@ -426,6 +429,8 @@ class Flex(object):
                    "component_display": False,
                    "plugin_attributes": False,
                    "hold_transform_values": True,
+                   "mismatched_topologies": True,
+                   "changed_only": False,
                   }
         """
 
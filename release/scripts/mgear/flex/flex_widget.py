@@ -217,6 +217,13 @@ class FlexDialog(QtWidgets.QDialog):
             "Component Display Attrs.")
         self.component_attributes_check.setChecked(False)
 
+        # changed shapes only
+        self.changed_only_check = QtWidgets.QCheckBox("Changed Shapes Only")
+        self.changed_only_check.setChecked(False)
+        self.changed_only_check.setStatusTip(
+            "Skips the deformed geometry update of the shapes which did not "
+            "change since the last update")
+
         # adds widgets to layout
         grid_layout.addWidget(self.user_attributes_check, 0, 0, 1, 1)
         grid_layout.addWidget(self.plugin_attributes_check, 0, 1, 1, 1)
@@ -224,6 +231,7 @@ class FlexDialog(QtWidgets.QDialog):
 #         grid_layout.addWidget(self.vertex_colours_check, 1, 2, 1, 1)
         grid_layout.addWidget(self.display_attributes_check, 1, 0, 1, 1)
         grid_layout.addWidget(self.component_attributes_check, 1, 1, 1, 1)
+        grid_layout.addWidget(self.changed_only_check, 1, 2, 1, 1)
         grid_layout.addWidget(t_n_d_widget, 2, 0, 1, 3)
 
         # adds the group box widget to the widgets_layout
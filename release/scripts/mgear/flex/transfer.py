@@ -0,0 +1,669 @@
+""" flex.transfer
+
+flex.transfer module contains the point correspondence engine used to update
+the deformers of shapes with a mismatching topology.
+
+Each point of the new topology is projected on the closest triangle of the
+previous topology. The skin weights, blendshape deltas and cluster weights are
+interpolated with the barycentric coordinates of the projected points and set
+directly on the deformers, without wrap deformers or backup shapes.
+
+.. note:: NumPy ships with Maya 2022 and later. If it is not available
+          NUMPY_AVAILABLE is False and flex uses the wrap deformers update.
+
+:module: flex.transfer
+"""
+
+# imports
+from __future__ import absolute_import
+import heapq
+import math
+import re
+from maya import cmds
+from maya.api import OpenMaya as om2
+from mgear.core import skin_array
+from mgear.flex import logger
+from mgear.flex.attributes import BLENDSHAPE_TARGET
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# number of nearest triangles centers tested for each point
+CANDIDATES = 8
+
+# maximum number of points on the KD-tree leaves
+LEAF_SIZE = 16
+
+# maximum number of points of the KD-tree nodes searched as a block when
+# querying several points at once
+BATCH_LEAF_SIZE = 256
+
+# blendshape deltas smaller than this are not stored on the targets
+DELTA_TOLERANCE = 1e-6
+
+# index or index range of a component string like vtx[4] or vtx[4:12]
+COMPONENT_PATTERN = re.compile(r"\[(\d+)(?::(\d+))?\]")
+
+
+class KDTree(object):
+    """ Static KD-tree used to find the nearest points of a points array
+
+    The nodes are split at the median of their widest axis, so the tree stays
+    balanced whatever the points distribution is.
+
+    :param points: points positions
+    :type points: numpy.ndarray
+
+    :param leaf_size: maximum number of points on the tree leaves
+    :type leaf_size: int
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.indices = np.arange(len(self.points))
+
+        # nodes split axis, split value, children and points range
+        self.axis = []
+        self.value = []
+        self.children = []
+        self.ranges = []
+
+        if len(self.points):
+            self._build(max(1, leaf_size))
+
+        # points sorted by leaf, so each leaf points are a contiguous slice
+        self.leaf_points = self.points[self.indices]
+
+    def __len__(self):
+        return len(self.points)
+
+    def _add_node(self, start, end):
+        self.axis.append(-1)
+        self.value.append(0.0)
+        self.children.append((-1, -1))
+        self.ranges.append((start, end))
+        return len(self.ranges) - 1
+
+    def _build(self, leaf_size):
+        stack = [self._add_node(0, len(self.points))]
+        while stack:
+            node = stack.pop()
+            start, end = self.ranges[node]
+            if end - start <= leaf_size:
+                continue
+
+            indices = self.indices[start:end]
+            points = self.points[indices]
+            axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+            middle = (end - start) // 2
+            order = np.argpartition(points[:, axis], middle)
+            self.indices[start:end] = indices[order]
+
+            self.axis[node] = axis
+            self.value[node] = float(points[order[middle], axis])
+            left = self._add_node(start, start + middle)
+            right = self._add_node(start + middle, end)
+            self.children[node] = (left, right)
+            stack.extend((left, right))
+
+    def query(self, point, count=1):
+        """ Returns the nearest points to the given point
+
+        :param point: position to search from
+        :type point: sequence
+
+        :param count: number of nearest points returned
+        :type count: int
+
+        :return: distances and indices of the nearest points, nearest first
+        :rtype: list, list
+        """
+
+        count = min(count, len(self.points))
+        if count < 1:
+            return [], []
+
+        position = np.asarray(point, dtype=np.float64)[:3]
+        coordinates = position.tolist()
+
+        # max heap of the nearest points as (-squared distance, index)
+        nearest = []
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(nearest) == count and bound >= -nearest[0][0]:
+                continue
+
+            left, right = self.children[node]
+            if left < 0:
+                start, end = self.ranges[node]
+                distances = ((self.leaf_points[start:end] - position) ** 2
+                             ).sum(axis=1)
+                for distance, index in zip(distances.tolist(),
+                                           self.indices[start:end].tolist()):
+                    if len(nearest) < count:
+                        heapq.heappush(nearest, (-distance, index))
+                    elif distance < -nearest[0][0]:
+                        heapq.heapreplace(nearest, (-distance, index))
+                continue
+
+            offset = coordinates[self.axis[node]] - self.value[node]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+
+        nearest.sort(reverse=True)
+        return ([math.sqrt(-d) for d, _ in nearest],
+                [i for _, i in nearest])
+
+    def query_points(self, points, count=1):
+        """ Returns the indices of the nearest points to each given point
+
+        The positions are searched in batches. Each position goes down to
+        its own block, a node with up to BATCH_LEAF_SIZE points, and the
+        nearest points of the block are found with a block of distances.
+        Only the positions closer to a split plane than to their nearest
+        points go through the tree again, together, skipping the nodes
+        that can't have nearer points.
+
+        :param points: positions to search from
+        :type points: numpy.ndarray
+
+        :param count: number of nearest points returned for each position
+        :type count: int
+
+        :return: (positions x count) indices, nearest first
+        :rtype: numpy.ndarray
+        """
+
+        count = min(count, len(self.points))
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if count < 1:
+            return np.zeros((len(points), 0), dtype=np.int64)
+
+        # squared distances and indices of the nearest points found, and
+        # the farthest of these distances
+        distances = np.full((len(points), count), np.inf)
+        indices = np.full((len(points), count), -1, dtype=np.int64)
+        farthest = np.full(len(points), np.inf)
+
+        axis = np.asarray(self.axis)
+        value = np.asarray(self.value)
+        children = np.asarray(self.children)
+        ranges = np.asarray(self.ranges)
+        is_block = ((children[:, 0] < 0)
+                    | (ranges[:, 1] - ranges[:, 0] <= BATCH_LEAF_SIZE))
+
+        # own block of each position, and its distance to the split planes
+        blocks = np.zeros(len(points), dtype=np.int64)
+        planes = np.full(len(points), np.inf)
+        active = np.flatnonzero(~is_block[blocks])
+        while len(active):
+            nodes = blocks[active]
+            offset = points[active, axis[nodes]] - value[nodes]
+            planes[active] = np.minimum(planes[active], offset * offset)
+            blocks[active] = children[nodes, (offset >= 0).astype(np.int64)]
+            active = active[~is_block[blocks[active]]]
+
+        order = np.argsort(blocks, kind="stable")
+        block_ids, firsts = np.unique(blocks[order], return_index=True)
+        for block, queries in zip(block_ids.tolist(),
+                                  np.split(order, firsts[1:])):
+            self._merge_block(points, distances, indices, farthest, block,
+                              queries)
+
+        # positions with nearer points maybe out of their block
+        stack = []
+        queries = np.flatnonzero(farthest > planes)
+        if len(queries):
+            stack.append((0, queries, np.zeros(len(queries))))
+        while stack:
+            node, queries, bounds = stack.pop()
+            keep = bounds < farthest[queries]
+            queries = queries[keep]
+            bounds = bounds[keep]
+
+            if is_block[node]:
+                # the own block points are already merged
+                queries = queries[blocks[queries] != node]
+                if len(queries):
+                    self._merge_block(points, distances, indices, farthest,
+                                      node, queries)
+                continue
+            if not len(queries):
+                continue
+
+            left, right = self.children[node]
+            offset = points[queries, self.axis[node]] - self.value[node]
+            far_bounds = np.maximum(bounds, offset * offset)
+            is_left = offset < 0
+
+            # far sides are pushed first, to be pruned after the near sides
+            stack.append((right, queries[is_left], far_bounds[is_left]))
+            stack.append((left, queries[~is_left], far_bounds[~is_left]))
+            stack.append((right, queries[~is_left], bounds[~is_left]))
+            stack.append((left, queries[is_left], bounds[is_left]))
+
+        order = np.argsort(distances, axis=1, kind="stable")
+        return np.take_along_axis(indices, order, 1)
+
+    def _merge_block(self, points, distances, indices, farthest, node,
+                     queries):
+        # keeps the nearest points between the found ones and the node ones
+        start, end = self.ranges[node]
+        positions = points[queries]
+        block = self.leaf_points[start:end]
+        found = np.concatenate(
+            (distances[queries],
+             (positions[:, :1] - block[:, 0]) ** 2
+             + (positions[:, 1:2] - block[:, 1]) ** 2
+             + (positions[:, 2:] - block[:, 2]) ** 2),
+            axis=1)
+        found_indices = np.concatenate(
+            (indices[queries],
+             np.repeat(self.indices[np.newaxis, start:end], len(queries),
+                       axis=0)),
+            axis=1)
+
+        count = distances.shape[1]
+        rows = np.arange(len(queries))[:, np.newaxis]
+        nearest = np.argpartition(found, count - 1, axis=1)[:, :count]
+        distances[queries] = found[rows, nearest]
+        indices[queries] = found_indices[rows, nearest]
+        farthest[queries] = distances[queries].max(axis=1)
+
+
+def get_barycentric_coordinates(points, a, b, c):
+    """ Returns the barycentric coordinates of the closest points on triangles
+
+    Vectorized version of the closest point on triangle from Real-Time
+    Collision Detection (C. Ericson). Each point is projected on the triangle
+    at the same row.
+
+    :param points: (n x 3) positions
+    :type points: numpy.ndarray
+
+    :param a: (n x 3) triangles first vertex positions
+    :type a: numpy.ndarray
+
+    :param b: (n x 3) triangles second vertex positions
+    :type b: numpy.ndarray
+
+    :param c: (n x 3) triangles third vertex positions
+    :type c: numpy.ndarray
+
+    :return: (n x 3) weights of the a, b and c vertices
+    :rtype: numpy.ndarray
+    """
+
+    def dot(x, y):
+        return (x * y).sum(axis=1)
+
+    def divide(x, y):
+        return x / np.where(y == 0, 1.0, y)
+
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+    d1 = dot(ab, ap)
+    d2 = dot(ac, ap)
+    d3 = dot(ab, bp)
+    d4 = dot(ac, bp)
+    d5 = dot(ab, cp)
+    d6 = dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # inside the triangle
+    total = va + vb + vc
+    v = divide(vb, total)
+    w = divide(vc, total)
+    weights = np.stack([1.0 - v - w, v, w], axis=1)
+
+    # the regions are applied from the lowest to the highest priority
+    edge_bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+    w = divide(d4 - d3, (d4 - d3) + (d5 - d6))
+    weights[edge_bc] = np.stack([np.zeros_like(w), 1.0 - w, w],
+                                axis=1)[edge_bc]
+
+    edge_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+    w = divide(d2, d2 - d6)
+    weights[edge_ac] = np.stack([1.0 - w, np.zeros_like(w), w],
+                                axis=1)[edge_ac]
+
+    weights[(d6 >= 0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+
+    edge_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+    v = divide(d1, d1 - d3)
+    weights[edge_ab] = np.stack([1.0 - v, v, np.zeros_like(v)],
+                                axis=1)[edge_ab]
+
+    weights[(d3 >= 0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+    weights[(d1 <= 0) & (d2 <= 0)] = (1.0, 0.0, 0.0)
+
+    return weights
+
+
+def get_point_correspondence(points, triangles, targets,
+                             candidates=CANDIDATES):
+    """ Returns the triangle vertices and weights matching each target point
+
+    The closest point is searched on the triangles with the nearest centers,
+    found with a KD-tree. Without triangles the nearest point is used.
+
+    :param points: (n x 3) previous topology points positions
+    :type points: numpy.ndarray
+
+    :param triangles: (m x 3) previous topology triangles vertices indices
+    :type triangles: numpy.ndarray
+
+    :param targets: (k x 3) new topology points positions
+    :type targets: numpy.ndarray
+
+    :param candidates: number of triangles tested for each target point
+    :type candidates: int
+
+    :return: (k x 3) previous topology vertices indices and weights
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+
+    weights = np.zeros((len(targets), 3))
+    weights[:, 0] = 1.0
+
+    if not len(triangles):
+        nearest = KDTree(points).query_points(targets)
+        return np.repeat(nearest[:, :1], 3, axis=1), weights
+
+    tree = KDTree(points[triangles].mean(axis=1))
+    nearest = tree.query_points(targets, candidates)
+    count = nearest.shape[1]
+
+    # tests each target point against its candidates triangles at once
+    vertices = triangles[nearest].reshape(-1, 3)
+    repeated = np.repeat(targets, count, axis=0)
+    a, b, c = (points[vertices[:, i]] for i in range(3))
+    coordinates = get_barycentric_coordinates(repeated, a, b, c)
+    closest = (coordinates[:, :1] * a + coordinates[:, 1:2] * b
+               + coordinates[:, 2:] * c)
+    distances = ((closest - repeated) ** 2).sum(axis=1).reshape(-1, count)
+
+    best = np.arange(len(targets)) * count + distances.argmin(axis=1)
+
+    return vertices[best], coordinates[best]
+
+
+def interpolate(values, indices, weights):
+    """ Returns the values interpolated with the given correspondence
+
+    :param values: (n x ...) values of the previous topology points
+    :type values: numpy.ndarray
+
+    :param indices: (k x 3) previous topology vertices indices
+    :type indices: numpy.ndarray
+
+    :param weights: (k x 3) weight of each vertex
+    :type weights: numpy.ndarray
+
+    :return: (k x ...) values for the new topology points
+    :rtype: numpy.ndarray
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    shape = weights.shape + (1,) * (values.ndim - 1)
+    return (values[indices] * weights.reshape(shape)).sum(axis=1)
+
+
+def get_dag_path(shape):
+    """ Returns the dag path of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the shape dag path
+    :rtype: om2.MDagPath
+    """
+
+    selection = om2.MSelectionList()
+    selection.add(shape)
+    return selection.getDagPath(0)
+
+
+def get_mesh_data(shape):
+    """ Returns the object space points and the triangles of the given mesh
+
+    :param shape: maya mesh shape node
+    :type shape: str
+
+    :return: (n x 3) points positions and (m x 3) triangles vertices indices
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+
+    fn_mesh = om2.MFnMesh(get_dag_path(shape))
+    points = np.array([(p.x, p.y, p.z) for p in
+                       fn_mesh.getPoints(om2.MSpace.kObject)],
+                      dtype=np.float64).reshape(-1, 3)
+    triangles = np.array(fn_mesh.getTriangles()[1],
+                         dtype=np.int64).reshape(-1, 3)
+
+    return points, triangles
+
+
+def get_components_indices(components):
+    """ Returns the indices of the given single indexed component strings
+
+    :param components: component strings like vtx[4] or vtx[4:12]
+    :type components: list(str)
+
+    :return: the components indices, in the components order
+    :rtype: list(int)
+    """
+
+    indices = []
+    for component in components or []:
+        match = COMPONENT_PATTERN.search(component)
+        if not match:
+            continue
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        indices.extend(range(start, end + 1))
+
+    return indices
+
+
+def get_components_strings(indices, prefix="vtx"):
+    """ Returns the component strings of the given sorted indices
+
+    :param indices: sorted components indices
+    :type indices: list(int)
+
+    :param prefix: component type
+    :type prefix: str
+
+    :return: component strings, with contiguous indices as ranges
+    :rtype: list(str)
+    """
+
+    components = []
+    start = previous = None
+    for index in list(indices) + [None]:
+        if previous is not None and index == previous + 1:
+            previous = index
+            continue
+        if start is not None:
+            if start == previous:
+                components.append("{}[{}]".format(prefix, start))
+            else:
+                components.append("{}[{}:{}]".format(prefix, start, previous))
+        start = previous = index
+
+    return components
+
+
+def get_blendshape_deltas(node, count):
+    """ Returns the deltas of the given blendshape node targets
+
+    Live targets are skipped as their geometry is connected.
+
+    :param node: blendshape node
+    :type node: str
+
+    :param count: the deformed shape points count
+    :type count: int
+
+    :return: (count x 3) deltas by target index and in-between index
+    :rtype: dict
+    """
+
+    deltas = {}
+    for idx in cmds.getAttr("{}.weight".format(node), multiIndices=True) or []:
+        attr_name = BLENDSHAPE_TARGET.format(node, idx)
+
+        for item in cmds.getAttr(attr_name, multiIndices=True) or []:
+            item_attr = "{}[{}]".format(attr_name, item)
+
+            if cmds.listConnections("{}.inputGeomTarget".format(item_attr),
+                                    destination=False):
+                logger.warning("{} can't be updated because it is a live "
+                               "target".format(item_attr))
+                continue
+
+            points = cmds.getAttr("{}.inputPointsTarget"
+                                  .format(item_attr)) or []
+            indices = get_components_indices(
+                cmds.getAttr("{}.inputComponentsTarget".format(item_attr)))
+
+            item_deltas = np.zeros((count, 3))
+            for index, point in zip(indices, points):
+                if index < count:
+                    item_deltas[index] = point[:3]
+            deltas[(idx, item)] = item_deltas
+
+    return deltas
+
+
+def set_blendshape_deltas(node, deltas):
+    """ Sets the deltas of the given blendshape node targets
+
+    :param node: blendshape node
+    :type node: str
+
+    :param deltas: (count x 3) deltas by target index and in-between index
+    :type deltas: dict
+    """
+
+    for (idx, item), item_deltas in deltas.items():
+        item_attr = "{}[{}]".format(BLENDSHAPE_TARGET.format(node, idx), item)
+        indices = np.nonzero(np.abs(item_deltas).max(axis=1)
+                             > DELTA_TOLERANCE)[0].tolist()
+        points = [tuple(item_deltas[i].tolist()) + (1.0,) for i in indices]
+        components = get_components_strings(indices)
+
+        cmds.setAttr("{}.inputPointsTarget".format(item_attr), len(points),
+                     *points, type="pointArray")
+        cmds.setAttr("{}.inputComponentsTarget".format(item_attr),
+                     len(components), *components, type="componentList")
+
+
+def get_cluster_weights(node, count):
+    """ Returns the weights of the given cluster node
+
+    Points without weight value use the default weight of 1.0.
+
+    :param node: cluster node
+    :type node: str
+
+    :param count: the deformed shape points count
+    :type count: int
+
+    :return: weight of each point
+    :rtype: numpy.ndarray
+    """
+
+    weights = np.ones(count)
+    attr_name = "{}.weightList[0].weights".format(node)
+    indices = cmds.getAttr(attr_name, multiIndices=True)
+    if not indices:
+        return weights
+
+    # the values of all the existing indices, in the same order
+    indices = np.array(indices)
+    values = np.ravel(cmds.getAttr(attr_name))
+    valid = indices < count
+    weights[indices[valid]] = values[valid]
+
+    return weights
+
+
+def set_cluster_weights(node, weights):
+    """ Sets the weights of the given cluster node
+
+    :param node: cluster node
+    :type node: str
+
+    :param weights: weight of each point
+    :type weights: numpy.ndarray
+    """
+
+    if not len(weights):
+        return
+
+    cmds.setAttr("{}.weightList[0].weights[0:{}]".format(node,
+                                                         len(weights) - 1),
+                 *weights.tolist(), size=len(weights))
+
+
+def set_skin_weights(skin, shape, weights):
+    """ Sets the weights of all the given mesh vertices on the skin cluster
+
+    .. note:: The weights are set with MFnSkinCluster.setWeights, which is
+              not undoable.
+
+    :param skin: skin cluster node
+    :type skin: str
+
+    :param shape: the deformed mesh shape node
+    :type shape: str
+
+    :param weights: (vertices x influences) weights matrix
+    :type weights: numpy.ndarray
+    """
+
+    fn_skin = skin_array.get_skin_cluster_fn(skin)
+    dag_path = get_dag_path(shape)
+    influences = om2.MIntArray(list(range(weights.shape[1])))
+
+    # written in vertex chunks, only one chunk is converted to a list
+    for start in range(0, len(weights), skin_array.CHUNK_SIZE):
+        end = min(start + skin_array.CHUNK_SIZE, len(weights))
+        fn_component = om2.MFnSingleIndexedComponent()
+        components = fn_component.create(om2.MFn.kMeshVertComponent)
+        fn_component.addElements(list(range(start, end)))
+        fn_skin.setWeights(dag_path, components, influences,
+                           om2.MDoubleArray(weights[start:end].ravel()
+                                            .tolist()), False)
+
+
+def normalize_weights(weights):
+    """ Returns the given weights with each row summing to one
+
+    :param weights: (points x influences) weights matrix
+    :type weights: numpy.ndarray
+
+    :return: the normalized weights, rows without weights are kept
+    :rtype: numpy.ndarray
+    """
+
+    totals = weights.sum(axis=1, keepdims=True)
+    return weights / np.where(totals == 0, 1.0, totals)
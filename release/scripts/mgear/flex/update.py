@@ -12,11 +12,16 @@ from __future__ import absolute_import
 from maya import cmds
 
 from mgear.flex import logger
+from mgear.flex import transfer
 from mgear.flex.attributes import BLENDSHAPE_TARGET
 from mgear.flex.attributes import COMPONENT_DISPLAY_ATTRIBUTES
 from mgear.flex.attributes import OBJECT_DISPLAY_ATTRIBUTES
 from mgear.flex.attributes import RENDER_STATS_ATTRIBUTES
 from mgear.flex.decorators import timer
+from mgear.flex.fingerprint import get_cached_fingerprints
+from mgear.flex.fingerprint import get_changed_shapes
+from mgear.flex.fingerprint import get_fingerprints
+from mgear.flex.fingerprint import update_cached_fingerprints
 from mgear.flex.query import get_deformers
 from mgear.flex.query import get_matching_shapes_from_group
 from mgear.flex.query import get_missing_shapes_from_group
@@ -34,6 +39,7 @@ from mgear.flex.update_utils import copy_skin_weights
 from mgear.flex.update_utils import create_deformers_backups
 from mgear.flex.update_utils import delete_transform_from_nodes
 from mgear.flex.update_utils import set_deformer_state
+from mgear.flex.update_utils import transfer_deformers
 from mgear.flex.update_utils import update_shape
 import pymel.core as pm
 
@@ -177,6 +183,10 @@ def update_clusters_nodes(shape, weight_files):
 def update_deformed_mismatching_shape(source, target, shape_orig):
     """ Updates the target shape with the given source shape content
 
+    Mesh deformers are transferred with the flex.transfer point correspondence.
+    Other shape types, or meshes when NumPy isn't available, are updated with
+    backup shapes and wrap deformers.
+
     :param source: maya shape node
     :type source: str
 
@@ -199,6 +209,17 @@ def update_deformed_mismatching_shape(source, target, shape_orig):
     # Turns all deformers envelope off
     set_deformer_state(deformers, False)
 
+    # transfers the deformers data on meshes without wrap deformers
+    if transfer.NUMPY_AVAILABLE and cmds.objectType(target) == "mesh":
+        transfer_deformers(source, target, shape_orig, deformers)
+
+        # updates uv sets on target shape
+        update_uvs_sets(target)
+
+        # Turns all deformers envelope ON
+        set_deformer_state(deformers, True)
+        return
+
     # creates deformers backups
     bs_nodes, skin_nodes, cluster_nodes = create_deformers_backups(source,
                                                                    target,
@@ -325,6 +346,11 @@ def update_rig(source, target, options):
 
     :param options: update options
     :type options: dict
+
+    .. note:: With the changed_only option, the deformed geometry is only
+              updated on the shapes whose fingerprint changed since the last
+              update, with the same options. The other update steps run on
+              every shape. The fingerprints are stored on the target group.
     """
 
     # gets the matching shapes
@@ -334,11 +360,25 @@ def update_rig(source, target, options):
     logger.info("Matching shapes: {}" .format(matching_shapes))
     logger.info("-" * 90)
 
+    # gets the shapes changed since the last update
+    fingerprint_options = dict([(k, v) for k, v in options.items()
+                                if k != "changed_only"])
+    source_fingerprints = get_fingerprints(matching_shapes.keys())
+    changed_shapes = list(matching_shapes)
+    if options.get("changed_only", False):
+        changed_shapes = get_changed_shapes(source_fingerprints,
+                                            matching_shapes,
+                                            get_cached_fingerprints(target),
+                                            options=fingerprint_options)
+        logger.info("Unchanged geometry skipped: {}".format(
+            [s for s in matching_shapes if s not in changed_shapes]))
+        logger.info("-" * 90)
+
     for shape in matching_shapes:
         logger.debug("-" * 90)
         logger.debug("Updating: {}".format(matching_shapes[shape]))
 
-        if options["deformed"]:
+        if options["deformed"] and shape in changed_shapes:
             update_deformed_shape(shape, matching_shapes[shape],
                                   options["mismatched_topologies"])
 
@@ -370,6 +410,11 @@ def update_rig(source, target, options):
         if options["plugin_attributes"]:
             update_plugin_attributes(shape, matching_shapes[shape])
 
+    # stores the fingerprints of the updated shapes
+    update_cached_fingerprints(target, dict([(s, source_fingerprints[s])
+                                             for s in changed_shapes]),
+                               fingerprint_options)
+
     logger.info("-" * 90)
     logger.info("Source missing shapes: {}" .format(
         get_missing_shapes_from_group(source, target)))
@@ -12,7 +12,9 @@ from maya import OpenMaya
 from maya import cmds
 from maya import mel
 
+from mgear.core import skin_array
 from mgear.flex import logger
+from mgear.flex import transfer
 from mgear.flex.attributes import BLENDSHAPE_TARGET
 from mgear.flex.decorators import timer
 from mgear.flex.query import get_dependency_node
@@ -670,6 +672,74 @@ def set_deformer_state(deformers, enable):
             set_deformer_off(i)
 
 
+@timer
+def transfer_deformers(source, target, shape_orig, deformers):
+    """ Updates the target mesh shape and its deformers with the source shape
+
+    The deformers data is read on the current topology, then interpolated on
+    the new topology points with the flex.transfer point correspondence and
+    set back on the same deformers nodes.
+
+    :param source: the shape containing the new shape
+    :type source: str
+
+    :param target: the shape containing the deformers
+    :type target: str
+
+    :param shape_orig: the intermediate shape from the target shape
+    :type shape_orig: str
+
+    :param deformers: deformers used on target
+    :type deformers: dict
+    """
+
+    logger.debug("Transferring deformers from {} topology".format(source))
+
+    # gets the current topology and deformers data
+    points, triangles = transfer.get_mesh_data(shape_orig)
+    count = len(points)
+
+    skin_weights = None
+    if deformers["skinCluster"]:
+        skin_weights = skin_array.get_weights(
+            deformers["skinCluster"][0])[0]
+        if len(skin_weights) != count:
+            logger.warning("{} doesn't deform all {} points. Skin weights "
+                           "won't be updated".format(
+                               deformers["skinCluster"][0], target))
+            skin_weights = None
+
+    bs_deltas = dict([(node, transfer.get_blendshape_deltas(node, count))
+                      for node in deformers["blendShape"]])
+    cluster_weights = dict([(node, transfer.get_cluster_weights(node, count))
+                            for node in deformers["cluster"]])
+
+    # updates target shape
+    update_shape(source, shape_orig)
+
+    # maps the new topology points on the previous topology
+    indices, weights = transfer.get_point_correspondence(
+        points, triangles, transfer.get_mesh_data(shape_orig)[0])
+
+    if skin_weights is not None:
+        logger.info("Transferring skinning on {}".format(target))
+        transfer.set_skin_weights(deformers["skinCluster"][0], target,
+                                  transfer.normalize_weights(
+                                      transfer.interpolate(skin_weights,
+                                                           indices, weights)))
+
+    for node, deltas in bs_deltas.items():
+        logger.info("Transferring blendshape targets of {}".format(node))
+        transfer.set_blendshape_deltas(node, dict(
+            [(key, transfer.interpolate(value, indices, weights))
+             for key, value in deltas.items()]))
+
+    for node, values in cluster_weights.items():
+        logger.info("Transferring cluster weights of {}".format(node))
+        transfer.set_cluster_weights(node, transfer.interpolate(
+            values, indices, weights))
+
+
 def update_shape(source, target):
     """ Connect the shape output from source to the input shape on target
 
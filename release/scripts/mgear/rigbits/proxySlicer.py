@@ -1,17 +1,338 @@
-"""Rigbits proxy mesh slicer"""
+"""Rigbits proxy mesh slicer
+
+Each face is assigned to the influence with the highest weight sum over the
+face vertices. The skin weights are read once as a matrix, and each proxy
+piece is created directly from its faces, without duplicating the mesh.
+The pieces keep the per-face shading assignments and the default uv set of
+the sliced mesh.
+
+Note:
+    The proxy shapes are created with OpenMaya, outside of the undo queue,
+    so the slicing can't be undone. The undo is turned off while slicing,
+    which flushes the undo queue, so no previous step can be undone over
+    the proxies.
+
+    NumPy ships with Maya 2022 and later. If it is not available
+    NUMPY_AVAILABLE is False and the dominant influences are computed with
+    the python path.
+"""
 
 import datetime
+import time
 
+import maya.api.OpenMaya as om2
 import pymel.core as pm
+from maya import cmds
 
 import mgear
 
-from mgear.core import applyop, node, transform
+from mgear.core import applyop, node, skin_array, transform
+
+np = skin_array.np
+NUMPY_AVAILABLE = skin_array.NUMPY_AVAILABLE
+
+# influences summed at once over the face vertices
+INFLUENCES_BLOCK = 16
+
+
+def get_dominant_influences(weights, counts, connects,
+                            block_size=INFLUENCES_BLOCK):
+    """Get the influence with the highest weight sum of each face
+
+    On equal sums the first influence is used. The sums are computed for
+    blocks of influences, so the memory used is (face vertices x block_size)
+    instead of (face vertices x influences).
+
+    Args:
+        weights (ndarray or list): (vertices x influences) weights. A list
+            of rows for the python path
+        counts (list): vertices count of each face
+        connects (list): vertices of each face, face after face
+        block_size (int, optional): influences summed at once
+
+    Returns:
+        list: influence index of each face
+    """
+    if not len(counts):
+        return []
+
+    if NUMPY_AVAILABLE:
+        weights = np.asarray(weights)
+        counts = np.asarray(counts, dtype=np.int64)
+        connects = np.asarray(connects, dtype=np.int64)
+        starts = np.cumsum(counts) - counts
+
+        dominant = np.zeros(len(counts), dtype=np.int64)
+        best = np.full(len(counts), -np.inf)
+        for first in range(0, weights.shape[1], block_size):
+            block = weights[:, first:first + block_size]
+            face_weights = block[connects].astype(np.float64, copy=False)
+            sums = np.add.reduceat(face_weights, starts, axis=0)
+            block_dominant = sums.argmax(axis=1)
+            block_best = sums[np.arange(len(counts)), block_dominant]
+            # strictly greater, the first influence wins on equal sums
+            better = block_best > best
+            dominant[better] = block_dominant[better] + first
+            best[better] = block_best[better]
+        return dominant.tolist()
+
+    dominant = []
+    start = 0
+    for count in counts:
+        rows = [weights[v] for v in connects[start:start + count]]
+        sums = [sum(column) for column in zip(*rows)]
+        dominant.append(sums.index(max(sums)))
+        start += count
+    return dominant
+
+
+def get_face_groups(dominant, influences_count):
+    """Get the faces of each influence
+
+    Args:
+        dominant (list): influence index of each face
+        influences_count (int): number of influences
+
+    Returns:
+        list: faces indices of each influence
+    """
+    face_groups = [[] for _ in range(influences_count)]
+    for face, influence in enumerate(dominant):
+        face_groups[influence].append(face)
+    return face_groups
+
+
+def get_face_subset(counts, connects, faces, starts=None):
+    """Extract faces from a face vertex list, with the vertices re-indexed
+
+    This is used for the vertices and the uvs of the faces.
+
+    Args:
+        counts (list): vertices count of each face
+        connects (list): vertices of each face, face after face
+        faces (list): faces to extract
+        starts (list, optional): first connect index of each face
+
+    Returns:
+        list, list, list: original vertices in new index order, and the
+            counts and connects of the extracted faces
+    """
+    if starts is None:
+        starts = get_face_starts(counts)
+
+    indices = {}
+    order = []
+    sub_counts = []
+    sub_connects = []
+    for face in faces:
+        start = starts[face]
+        sub_counts.append(counts[face])
+        for vertex in connects[start:start + counts[face]]:
+            index = indices.get(vertex)
+            if index is None:
+                index = indices[vertex] = len(order)
+                order.append(vertex)
+            sub_connects.append(index)
+
+    return order, sub_counts, sub_connects
+
+
+def get_shader_faces(face_shaders, faces):
+    """Get the faces of each shader in a faces subset
+
+    Args:
+        face_shaders (list): shader index of each face of the mesh, -1 for
+            the faces without shader
+        faces (list): faces of the subset
+
+    Returns:
+        dict: {shader index: faces indices in the subset}
+    """
+    shader_faces = {}
+    for i, face in enumerate(faces):
+        shader_faces.setdefault(face_shaders[face], []).append(i)
+    return shader_faces
+
+
+def get_ranges(indices):
+    """Compact sorted indices into ranges
+
+    Args:
+        indices (list): sorted indices
+
+    Returns:
+        list: (first, last) of each range
+    """
+    ranges = []
+    for index in indices:
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return [tuple(r) for r in ranges]
+
+
+def get_face_starts(counts):
+    """Get the first connect index of each face
+
+    Args:
+        counts (list): vertices count of each face
+
+    Returns:
+        list: connect index of each face
+    """
+    starts = []
+    start = 0
+    for count in counts:
+        starts.append(start)
+        start += count
+    return starts
+
+
+def get_dag_path(name):
+    """Get the MDagPath of a node
+
+    Args:
+        name (str): node name
+
+    Returns:
+        MDagPath: the node dag path
+    """
+    sel = om2.MSelectionList()
+    sel.add(name)
+    return sel.getDagPath(0)
+
+
+def get_slice_data(skin_cluster):
+    """Get the skinned mesh data and the faces of each influence
+
+    Args:
+        skin_cluster (str): skinCluster node
+
+    Returns:
+        dict: influences names, face groups, and the counts, connects,
+            points, default set uvs and shading engines of the mesh
+    """
+    fn_skin = skin_array.get_skin_cluster_fn(skin_cluster)
+    dag_path, components = skin_array.get_geometry_components(fn_skin)
+    influences = [p.partialPathName() for p in fn_skin.influenceObjects()]
+
+    fn_mesh = om2.MFnMesh(dag_path)
+    counts, connects = fn_mesh.getVertices()
+    counts = list(counts)
+    connects = list(connects)
+
+    # whole weight matrix in one read
+    flat_weights, influences_count = fn_skin.getWeights(dag_path, components)
+    if NUMPY_AVAILABLE:
+        weights = np.array(flat_weights, dtype=np.float64).reshape(
+            -1, influences_count
+        )
+    else:
+        flat_weights = list(flat_weights)
+        weights = [
+            flat_weights[i:i + influences_count]
+            for i in range(0, len(flat_weights), influences_count)
+        ]
+
+    dominant = get_dominant_influences(weights, counts, connects)
+
+    uv_counts, uv_ids = fn_mesh.getAssignedUVs()
+    u_values, v_values = fn_mesh.getUVs()
+
+    shaders, face_shaders = fn_mesh.getConnectedShaders(
+        dag_path.instanceNumber()
+    )
+
+    return {
+        "influences": influences,
+        "face_groups": get_face_groups(dominant, len(influences)),
+        "counts": counts,
+        "connects": connects,
+        "starts": get_face_starts(counts),
+        "points": fn_mesh.getPoints(om2.MSpace.kObject),
+        "uv_counts": list(uv_counts),
+        "uv_ids": list(uv_ids),
+        "uv_starts": get_face_starts(uv_counts),
+        "u_values": u_values,
+        "v_values": v_values,
+        "shaders": [om2.MFnDependencyNode(s).name() for s in shaders],
+        "face_shaders": list(face_shaders),
+    }
+
+
+def create_proxy_mesh(data, faces, parent, name, matrix=None):
+    """Create a mesh shape with the given faces of the sliced mesh
+
+    The shape keeps the default uv set and the per-face shading engines of
+    the sliced mesh. It is created with OpenMaya and can't be undone.
+
+    Args:
+        data (dict): sliced mesh data. See get_slice_data
+        faces (list): faces indices
+        parent (str): transform of the new shape
+        name (str): shape name
+        matrix (MMatrix, optional): transformation applied to the points
+
+    Returns:
+        str: the mesh shape name
+    """
+    vertices, counts, connects = get_face_subset(
+        data["counts"], data["connects"], faces, data["starts"]
+    )
+    points = om2.MPointArray([data["points"][i] for i in vertices])
+    if matrix is not None:
+        for i in range(len(points)):
+            points[i] *= matrix
+
+    fn_mesh = om2.MFnMesh()
+    fn_mesh.create(
+        points, counts, connects, parent=get_dag_path(parent).node()
+    )
+
+    # default uv set of the faces
+    uvs, uv_counts, uv_ids = get_face_subset(
+        data["uv_counts"], data["uv_ids"], faces, data["uv_starts"]
+    )
+    if uvs:
+        fn_mesh.setUVs(
+            [data["u_values"][i] for i in uvs],
+            [data["v_values"][i] for i in uvs],
+        )
+        fn_mesh.assignUVs(uv_counts, uv_ids)
+
+    shape = cmds.rename(fn_mesh.fullPathName(), name)
+
+    shader_faces = get_shader_faces(data["face_shaders"], faces)
+    for shader, shader_face_ids in shader_faces.items():
+        # faces without shader are added to the default shading group
+        engine = (data["shaders"][shader] if shader >= 0
+                  else "initialShadingGroup")
+        if len(shader_faces) == 1:
+            members = [shape]
+        else:
+            members = ["{}.f[{}:{}]".format(shape, first, last)
+                       for first, last in get_ranges(shader_face_ids)]
+        cmds.sets(members, edit=True, forceElement=engine)
+
+    return shape
 
 
 def slice(parent=False, oSel=False, *args):
-    """Create a proxy geometry from a skinned object"""
+    """Create a proxy geometry from a skinned object
 
+    The slicing can't be undone and flushes the undo queue. See the module
+    note.
+    """
+    undo_state = cmds.undoInfo(query=True, state=True)
+    cmds.undoInfo(state=False)
+    try:
+        _slice(parent, oSel)
+    finally:
+        cmds.undoInfo(state=undo_state)
+
+
+def _slice(parent=False, oSel=False):
     startTime = datetime.datetime.now()
     print(oSel)
     if not oSel:
@@ -19,32 +340,11 @@ def slice(parent=False, oSel=False, *args):
         print("----")
         print(oSel)
 
-    oColl = pm.skinCluster(oSel, query=True, influence=True)
-    oFaces = oSel.faces
-    nFaces = oSel.numFaces()
-
-    faceGroups = []
-    for x in oColl:
-        faceGroups.append([])
     sCluster = pm.listConnections(oSel.getShape(), type="skinCluster")
     print(sCluster)
-    sCName = sCluster[0].name()
-    for iFace in range(nFaces):
-        faceVtx = oFaces[iFace].getVertices()
-        oSum = False
-        for iVtx in faceVtx:
-            values = pm.skinPercent(sCName, oSel.vtx[iVtx], q=True, v=True)
-            if oSum:
-                oSum = [L + l for L, l in zip(oSum, values)]
-            else:
-                oSum = values
-
-        print("adding face: " \
-              + str(iFace) \
-              + " to group in: " \
-              + str(oColl[oSum.index(max(oSum))]))
-
-        faceGroups[oSum.index(max(oSum))].append(iFace)
+    data = get_slice_data(sCluster[0].name())
+    oColl = data["influences"]
+    faceGroups = data["face_groups"]
 
     original = oSel
     if not parent:
@@ -57,75 +357,99 @@ def slice(parent=False, oSel=False, *args):
     except TypeError:
         proxySet = pm.sets(name="rig_proxyGeo_grp", em=True)
 
-    for boneList in faceGroups:
+    for i, boneList in enumerate(faceGroups):
+
+        if not len(boneList):
+            continue
 
-        if len(boneList):
-            newObj = pm.duplicate(
-                original,
-                rr=True,
-                name=oColl[faceGroups.index(boneList)] + "_Proxy")
+        oInfluence = pm.PyNode(oColl[i])
+        name = "{}_Proxy".format(oColl[i].split("|")[-1])
 
-            for trans in ["tx",
-                          "ty",
-                          "tz",
-                          "rx",
-                          "ry",
-                          "rz",
-                          "sx",
-                          "sy",
-                          "sz"]:
+        if parent:
+            newObj = pm.PyNode(cmds.createNode("transform", name=name))
+            create_proxy_mesh(data, boneList, newObj.name(),
+                              newObj.name() + "Shape")
+            transform.matchWorldTransform(original, newObj)
+            pm.parent(newObj, oInfluence, a=True)
+        else:
+            newObj = pm.PyNode(
+                cmds.createNode("transform", name=name,
+                                parent=parentGroup.name()))
+            transform.matchWorldTransform(oInfluence, newObj)
 
-                pm.setAttr(newObj[0].name() + "." + trans, lock=0)
+            # points from the original object space to the proxy space
+            matrix = (get_dag_path(original.name()).inclusiveMatrix()
+                      * get_dag_path(newObj.name()).inclusiveMatrixInverse())
+            create_proxy_mesh(data,
+                              boneList,
+                              newObj.name(),
+                              newObj.name() + "_offset",
+                              matrix)
 
-            c = list(newObj[0].faces)
+            mulmat_node = applyop.gear_mulmatrix_op(
+                oInfluence.name() + ".worldMatrix",
+                newObj.name() + ".parentInverseMatrix")
 
-            for index in reversed(boneList):
+            outPlug = mulmat_node + ".output"
+            dm_node = node.createDecomposeMatrixNode(outPlug)
 
-                c.pop(index)
+            pm.connectAttr(dm_node + ".outputTranslate",
+                           newObj.name() + ".t")
+            pm.connectAttr(dm_node + ".outputRotate",
+                           newObj.name() + ".r")
+            pm.connectAttr(dm_node + ".outputScale",
+                           newObj.name() + ".s")
 
-            pm.delete(c)
-            if parent:
-                pm.parent(newObj,
-                          pm.PyNode(oColl[faceGroups.index(boneList)]),
-                          a=True)
-            else:
-                pm.parent(newObj, parentGroup, a=True)
-                dummyCopy = pm.duplicate(newObj[0])[0]
-                pm.delete(newObj[0].listRelatives(c=True))
+        print("Creating proxy for: {}".format(oColl[i]))
 
-                transform.matchWorldTransform(
-                    pm.PyNode(oColl[faceGroups.index(boneList)]), newObj[0])
+        pm.sets(proxySet, add=newObj)
 
-                pm.parent(dummyCopy.listRelatives(c=True)[0],
-                          newObj[0],
-                          shape=True)
+    endTime = datetime.datetime.now()
+    finalTime = endTime - startTime
+    mgear.log("=============== Slicing for: %s finish ======= [ %s  ] ==="
+              "===" % (oSel.name(), str(finalTime)))
 
-                pm.delete(dummyCopy)
 
-                pm.rename(newObj[0].listRelatives(c=True)[0],
-                          newObj[0].name() + "_offset")
+def benchmark(subdivisions=(400, 250), joints=20):
+    """Time the slicing of a synthetic skinned high resolution mesh
 
-                o_multiplayer = pm.PyNode(oColl[faceGroups.index(boneList)])
-                mulmat_node = applyop.gear_mulmatrix_op(
-                    o_multiplayer.name() + ".worldMatrix",
-                    newObj[0].name() + ".parentInverseMatrix")
+    A sphere is skinned to a joint chain in a new scene.
 
-                outPlug = mulmat_node + ".output"
-                dm_node = node.createDecomposeMatrixNode(outPlug)
+    Args:
+        subdivisions (tuple, optional): sphere axis and height subdivisions.
+            The default creates a 100k faces mesh
+        joints (int, optional): number of joints of the chain
 
-                pm.connectAttr(dm_node + ".outputTranslate",
-                               newObj[0].name() + ".t")
-                pm.connectAttr(dm_node + ".outputRotate",
-                               newObj[0].name() + ".r")
-                pm.connectAttr(dm_node + ".outputScale",
-                               newObj[0].name() + ".s")
+    Returns:
+        dict: seconds of the face partitioning and of the whole slicing
+    """
+    cmds.file(new=True, force=True)
+    mesh = cmds.polySphere(subdivisionsAxis=subdivisions[0],
+                           subdivisionsHeight=subdivisions[1],
+                           radius=10,
+                           constructionHistory=False)[0]
 
-            print("Creating proxy for: {}".format(
-                str(oColl[faceGroups.index(boneList)])))
+    cmds.select(clear=True)
+    chain = []
+    for i in range(joints):
+        y = -10.0 + 20.0 * i / max(joints - 1, 1)
+        chain.append(cmds.joint(name="bench_{}_jnt".format(i),
+                                position=(0, y, 0)))
+    skin_cluster = cmds.skinCluster(chain, mesh, maximumInfluences=4,
+                                    toSelectedBones=True)[0]
 
-            pm.sets(proxySet, add=newObj)
+    timings = {}
+    start = time.time()
+    get_slice_data(skin_cluster)
+    timings["partition"] = time.time() - start
 
-    endTime = datetime.datetime.now()
-    finalTime = endTime - startTime
-    mgear.log("=============== Slicing for: %s finish ======= [ %s  ] ==="
-              "===" % (oSel.name(), str(finalTime)))
+    start = time.time()
+    slice(oSel=pm.PyNode(mesh))
+    timings["slice"] = time.time() - start
+
+    print("[Benchmark] {} faces, {} joints: partition {:.2f}s, "
+          "slice {:.2f}s".format(cmds.polyEvaluate(mesh, face=True),
+                                 joints,
+                                 timings["partition"],
+                                 timings["slice"]))
+    return timings
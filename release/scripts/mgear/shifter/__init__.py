@@ -13,7 +13,8 @@ from pymel import versions
 # mgear
 import mgear
 import mgear.core.utils
-from . import guide, component
+from . import guide, component, incremental, profiler, scheduler
+from . import component_registry, guide_scanner
 
 from mgear.core import primitive, attribute, skin, dag, icon, node
 from mgear import shifter_classic_components
@@ -97,15 +98,19 @@ def log_window():
         mgear.logInfos()
 
 
+def getDefaultComponentDirectories():
+    """Get the mGear components directories"""
+    return [
+        os.path.join(os.path.dirname(shifter_classic_components.__file__)),
+        os.path.join(os.path.dirname(shifter_epic_components.__file__)),
+    ]
+
+
 def getComponentDirectories():
     """Get the components directory"""
     # TODO: ready to support multiple default directories
     return mgear.core.utils.gatherCustomModuleDirectories(
-        SHIFTER_COMPONENT_ENV_KEY,
-        [
-            os.path.join(os.path.dirname(shifter_classic_components.__file__)),
-            os.path.join(os.path.dirname(shifter_epic_components.__file__)),
-        ],
+        SHIFTER_COMPONENT_ENV_KEY, getDefaultComponentDirectories()
     )
     # return mgear.core.utils.gatherCustomModuleDirectories(
     #     SHIFTER_COMPONENT_ENV_KEY,
@@ -114,6 +119,11 @@ def getComponentDirectories():
 
 def importComponentGuide(comp_type):
     """Import the Component guide"""
+    # the registry avoids scanning the component directories on each import
+    module = component_registry.import_component(comp_type, "guide")
+    if module:
+        return module
+
     dirs = getComponentDirectories()
     defFmt = "mgear.core.shifter.component.{}.guide"
     customFmt = "{}.guide"
@@ -126,6 +136,10 @@ def importComponentGuide(comp_type):
 
 def importComponent(comp_type):
     """Import the Component"""
+    module = component_registry.import_component(comp_type)
+    if module:
+        return module
+
     dirs = getComponentDirectories()
     defFmt = "mgear.core.shifter.component.{}"
     customFmt = "{}"
@@ -142,6 +156,8 @@ def reloadComponents(*args):
     Args:
         *args: Dummy
     """
+    component_registry.clear()
+    guide_scanner.clear()
     compDir = getComponentDirectories()
 
     for x in compDir:
@@ -189,6 +205,15 @@ class Rig(object):
 
         self.component_finalize = False
 
+        # incremental build
+        self.incremental = False
+        self.recorder = None
+        self.dirty_components = []
+        self.incremental_data = {}
+
+        # opt-in build profiling
+        self.profiler = profiler.BuildProfiler(enabled=profiler.is_enabled())
+
     def buildFromDict(self, conf_dict):
         log_window()
         startTime = datetime.datetime.now()
@@ -259,7 +284,9 @@ class Rig(object):
         if not self.stopBuild:
             mgear.log("\n" + "= GUIDE VALIDATION " + "=" * 46)
             # Check guide is valid
-            self.guide.setFromSelection()
+            self.guide.setFromSelection(
+                use_cache=guide_scanner.is_cache_enabled()
+            )
             if not self.guide.valid:
                 return
 
@@ -290,6 +317,128 @@ class Rig(object):
 
         return build_data
 
+    def buildIncremental(self):
+        """Rebuild only the components with changes in the selected guide.
+
+        The guide hashes and the nodes created by each component are stored
+        in the rig model. The first build, or a build after changing the
+        guide root settings, is a full build.
+
+        Returns:
+            dict: The collected data
+        """
+        startTime = datetime.datetime.now()
+        mgear.log("\n" + "= SHIFTER INCREMENTAL BUILD " + "=" * 39)
+
+        self.stopBuild = False
+        selection = pm.ls(selection=True)
+        if not selection:
+            selection = pm.ls("guide")
+            if not selection:
+                mgear.log(
+                    "Not guide found or selected.\n"
+                    + "Select one or more guide root or a guide model",
+                    mgear.sev_error,
+                )
+                return
+        ismodel = selection[0].hasAttr("ismodel")
+
+        mgear.log("\n" + "= GUIDE VALIDATION " + "=" * 46)
+        self.guide.setFromSelection(
+            use_cache=guide_scanner.is_cache_enabled()
+        )
+        if not self.guide.valid:
+            return
+
+        template = self.guide.get_guide_template_dict()
+        hashes = incremental.get_component_hashes(template)
+        model = incremental.find_rig_model(self.guide.values["rig_name"])
+        old_hashes = None
+        if model:
+            old_hashes, self.incremental_data = incremental.load(model)
+
+        if (
+            old_hashes is None
+            or old_hashes[incremental.GLOBAL_KEY]
+            != hashes[incremental.GLOBAL_KEY]
+        ):
+            mgear.log("Full build")
+            if model:
+                pm.delete(model)
+            self.incremental_data = {}
+            self.dirty_components = list(template["components_list"])
+        else:
+            self.dirty_components, removed = (
+                incremental.get_dirty_components(template, old_hashes, hashes)
+            )
+            if not self.dirty_components and not removed:
+                mgear.log("The rig is up to date")
+                return
+            mgear.log(
+                "Rebuilding components: "
+                + ", ".join(self.dirty_components)
+            )
+            if ismodel and (
+                self.guide.values["doPreCustomStep"]
+                or self.guide.values["doPostCustomStep"]
+            ):
+                pm.displayWarning(
+                    "Custom steps are only executed on full builds"
+                )
+            incremental.delete_component_nodes(
+                self.incremental_data, self.dirty_components + removed
+            )
+            self.incremental = True
+            self.incremental_model = model
+
+        if not self.incremental and ismodel:
+            self.preCustomStep(selection)
+            if self.stopBuild:
+                return
+
+        # Build
+        mgear.log("\n" + "= BUILDING RIG " + "=" * 46)
+        self.recorder = incremental.NodeRecorder()
+        hosts = None
+        if self.incremental:
+            # transforms of the rig that can get attributes from the
+            # rebuilt components. I.e: UI hosts
+            hosts = [
+                n.longName()
+                for n in self.incremental_model.listRelatives(
+                    allDescendents=True, type="transform"
+                )
+            ]
+        self.recorder.start(hosts)
+        try:
+            self.build()
+        finally:
+            self.recorder.stop()
+        incremental.store(
+            self,
+            hashes,
+            self.recorder.get_nodes(),
+            self.incremental_data,
+            self.recorder.get_attributes(),
+        )
+        if not self.incremental and ismodel:
+            self.postCustomStep()
+
+        # Collect post-build data
+        build_data = self.collect_build_data()
+
+        endTime = datetime.datetime.now()
+        finalTime = endTime - startTime
+        pm.flushUndo()
+        mgear.log(
+            "\n"
+            + "= SHIFTER INCREMENTAL BUILD DONE {} [ {} ] {}".format(
+                "=" * 16, finalTime, "=" * 7
+            )
+        )
+
+        return build_data
+
     def build(self):
         """Build the rig."""
 
@@ -298,9 +447,26 @@ class Rig(object):
 
         self.customStepDic["mgearRun"] = self
 
-        self.initialHierarchy()
-        self.processComponents()
-        self.finalize()
+        self.profiler.start()
+        try:
+            # opt-in OpenMaya 2.0 node creation, guide option
+            with primitive.om2Nodes(
+                self.options.get("om2_primitives", False)
+            ):
+                with self.profiler.record(
+                    "Initial Hierarchy", profiler.RIG_CATEGORY
+                ):
+                    if self.incremental:
+                        self.incrementalHierarchy()
+                    else:
+                        self.initialHierarchy()
+                self.processComponents()
+                with self.profiler.record(
+                    "Finalize", profiler.RIG_CATEGORY
+                ):
+                    self.finalize()
+        finally:
+            self.profiler.stop()
 
         return self.model
 
@@ -324,16 +490,23 @@ class Rig(object):
 
     def customStep(self, customSteps=None):
         if customSteps:
-            for step in customSteps:
-                if not self.stopBuild:
-                    if step.startswith("*"):
-                        continue
-                    self.stopBuild = guide.helperSlots.runStep(
-                        step.split("|")[-1][1:], self.customStepDic
-                    )
-                else:
-                    pm.displayWarning("Build Stopped")
-                    break
+            try:
+                for step in customSteps:
+                    if not self.stopBuild:
+                        if step.startswith("*"):
+                            continue
+                        with self.profiler.record(
+                            step.split("|")[0].strip(),
+                            profiler.CUSTOM_STEP_CATEGORY,
+                        ):
+                            self.stopBuild = guide.helperSlots.runStep(
+                                step.split("|")[-1][1:], self.customStepDic
+                            )
+                    else:
+                        pm.displayWarning("Build Stopped")
+                        break
+            finally:
+                self.profiler.stop()
 
     def preCustomStep(self, selection):
         if (
@@ -515,6 +688,46 @@ class Rig(object):
                 self.global_ctl.s >> self.jnt_org.s
             pm.connectAttr(self.jntVis_att, self.jnt_org.attr("visibility"))
 
+    def incrementalHierarchy(self):
+        """Get the initial hierarchy of the rig from the built rig model.
+
+        Used by the incremental build, instead of initialHierarchy.
+
+        """
+        mgear.log("Incremental Hierarchy")
+
+        self.model = self.incremental_model
+        self.date_att = self.model.attr("date")
+        self.date_att.set(str(datetime.datetime.now()))
+        self.ctlVis_att = self.model.attr("ctl_vis")
+        if versions.current() >= 201650:
+            self.ctlVisPlayback_att = self.model.attr("ctl_vis_on_playback")
+        self.jntVis_att = self.model.attr("jnt_vis")
+        if versions.current() >= 20220000:
+            self.ctlXRay_att = self.model.attr("ctl_x_ray")
+
+        self.rigGroups = self.model.attr("rigGroups")
+        self.rigPoses = self.model.attr("rigPoses")
+        self.rigCtlTags = self.model.attr("rigCtlTags")
+        self.rigScriptNodes = self.model.attr("rigScriptNodes")
+
+        self.guide_data_att = self.model.attr("guide_data")
+        self.guide_data_att.set(self.get_guide_data())
+
+        if self.options["worldCtl"]:
+            if self.options["world_ctl_name"]:
+                name = self.options["world_ctl_name"]
+            else:
+                name = "world_ctl"
+        else:
+            name = "global_C0_ctl"
+        self.global_ctl = dag.findChild(self.model, name)
+
+        self.setupWS = dag.findChild(self.model, "setup")
+        if self.options["joint_rig"]:
+            self.root_joint = None
+            self.jnt_org = dag.findChild(self.model, "jnt_org")
+
     def processComponents(self):
         """
         Process the components of the rig, following the creation steps.
@@ -525,6 +738,20 @@ class Rig(object):
 
         for comp in self.guide.componentsIndex:
             guide_ = self.guides[comp]
+            if self.incremental and comp not in self.dirty_components:
+                # already built component
+                comp = incremental.BuiltComponent(
+                    self, guide_, self.incremental_data[comp]
+                )
+                self.components[comp.fullName] = comp
+                self.componentsIndex.append(comp.fullName)
+                self.components_infos[comp.fullName] = [
+                    guide_.compType,
+                    guide_.getVersion(),
+                    guide_.author,
+                ]
+                continue
+
             mgear.log("Init : " + guide_.fullName + " (" + guide_.type + ")")
 
             module = importComponent(guide_.type)
@@ -542,15 +769,29 @@ class Rig(object):
                 ]
 
         # Creation steps
+        # the dependencies of each component are processed first
+        self.buildOrder = scheduler.schedule(self.guide)
         self.steps = component.Main.steps
         for i, name in enumerate(self.steps):
             # for count, compName in enumerate(self.componentsIndex):
-            for compName in self.componentsIndex:
+            for compName in self.buildOrder:
                 comp = self.components[compName]
+                if isinstance(comp, incremental.BuiltComponent):
+                    continue
                 mgear.log(
                     name + " : " + comp.fullName + " (" + comp.type + ")"
                 )
-                comp.stepMethods[i]()
+                if self.recorder:
+                    self.recorder.current = compName
+                with self.profiler.record(
+                    name,
+                    profiler.COMPONENT_CATEGORY,
+                    component=comp.fullName,
+                    type=comp.type,
+                ):
+                    comp.stepMethods[i]()
+                if self.recorder:
+                    self.recorder.current = None
                 if name == "Finalize":
                     self.component_finalize = True
 
@@ -583,38 +824,18 @@ class Rig(object):
             for name, objects in component_.subGroups.items():
                 self.addToSubGroup(objects, name)
 
-        # Create master set to group all the groups
-        masterSet = pm.sets(n=self.model.name() + "_sets_grp", em=True)
-        pm.connectAttr(masterSet.message, self.model.rigGroups[groupIdx])
-        groupIdx += 1
-
-        # Creating all groups
-        pm.select(cl=True)
-        for name, objects in self.groups.items():
-            s = pm.sets(n=self.model.name() + "_" + name + "_grp")
-            s.union(objects)
-            pm.connectAttr(s.message, self.model.rigGroups[groupIdx])
-            groupIdx += 1
-            masterSet.add(s)
-        for parentGroup, subgroups in self.subGroups.items():
-            pg = pm.PyNode(self.model.name() + "_" + parentGroup + "_grp")
-            for sg in subgroups:
-                sub = pm.PyNode(self.model.name() + "_" + sg + "_grp")
-                if sub in masterSet.members():
-                    masterSet.remove(sub)
-                pg.add(sub)
-
-        # create geo group
-
-        geoSet = pm.sets(n=self.model.name() + "_geo_grp", em=True)
-        pm.connectAttr(geoSet.message, self.model.rigGroups[groupIdx])
-        masterSet.add(geoSet)
-        groupIdx += 1
+        if self.incremental:
+            # the sets of the rig already exist
+            self.updateIncrementalGroups()
+        else:
+            self.createGroups(groupIdx)
 
         # Bind pose ---------------------------------------
         # controls_grp = self.groups["controllers"]
         # pprint(controls_grp, stream=None, indent=1, width=100)
         ctl_master_grp = pm.PyNode(self.model.name() + "_controllers_grp")
+        if self.incremental:
+            pm.delete(self.model.rigPoses[0].listConnections())
         pm.select(ctl_master_grp, replace=True)
         dag_node = pm.dagPose(save=True, selection=True)
         pm.connectAttr(dag_node.message, self.model.rigPoses[0])
@@ -649,6 +870,64 @@ class Rig(object):
                     + " Skipped!"
                 )
 
+    def createGroups(self, groupIdx=0):
+        """Create the rig groups (Maya sets) from the collected groups.
+
+        Args:
+            groupIdx (int, optional): first rigGroups index to connect
+        """
+        # Create master set to group all the groups
+        masterSet = pm.sets(n=self.model.name() + "_sets_grp", em=True)
+        pm.connectAttr(masterSet.message, self.model.rigGroups[groupIdx])
+        groupIdx += 1
+
+        # Creating all groups
+        pm.select(cl=True)
+        for name, objects in self.groups.items():
+            s = pm.sets(n=self.model.name() + "_" + name + "_grp")
+            s.union(objects)
+            pm.connectAttr(s.message, self.model.rigGroups[groupIdx])
+            groupIdx += 1
+            masterSet.add(s)
+        for parentGroup, subgroups in self.subGroups.items():
+            pg = pm.PyNode(self.model.name() + "_" + parentGroup + "_grp")
+            for sg in subgroups:
+                sub = pm.PyNode(self.model.name() + "_" + sg + "_grp")
+                if sub in masterSet.members():
+                    masterSet.remove(sub)
+                pg.add(sub)
+
+        # create geo group
+
+        geoSet = pm.sets(n=self.model.name() + "_geo_grp", em=True)
+        pm.connectAttr(geoSet.message, self.model.rigGroups[groupIdx])
+        masterSet.add(geoSet)
+
+    def updateIncrementalGroups(self):
+        """Add the rebuilt components objects to the existing rig groups.
+
+        The groups that don't exist yet are created.
+        """
+        masterSet = pm.PyNode(self.model.name() + "_sets_grp")
+        pm.select(cl=True)
+        for name, objects in self.groups.items():
+            set_name = self.model.name() + "_" + name + "_grp"
+            if pm.objExists(set_name):
+                s = pm.PyNode(set_name)
+            else:
+                s = pm.sets(n=set_name)
+                ni = attribute.get_next_available_index(self.model.rigGroups)
+                pm.connectAttr(s.message, self.model.rigGroups[ni])
+                masterSet.add(s)
+            s.union(objects)
+        for parentGroup, subgroups in self.subGroups.items():
+            pg = pm.PyNode(self.model.name() + "_" + parentGroup + "_grp")
+            for sg in subgroups:
+                sub = pm.PyNode(self.model.name() + "_" + sg + "_grp")
+                if sub in masterSet.members():
+                    masterSet.remove(sub)
+                pg.add(sub)
+
     def collect_build_data(self):
         """Collect post build data
 
@@ -667,9 +946,37 @@ class Rig(object):
             self.add_collected_data_to_root_jnt(root_jnt=root_jnt)
         if self.options["data_collector"]:
             self.data_collector_output(self.options["data_collector_path"])
+        if self.profiler.enabled:
+            self.profiler_output()
 
         return self.build_data
 
+    def profiler_output(self):
+        """Save the build profile as JSON and Chrome trace files
+
+        The files are saved next to the data collector output or in the
+        temp folder.
+
+        Returns:
+            str, str: profile and trace file paths
+        """
+        self.profiler.stop()
+        self.profiler.metadata.update(
+            {
+                "rig_name": self.options["rig_name"],
+                "date": str(datetime.datetime.now()),
+                "maya_version": str(
+                    pm.mel.eval("getApplicationVersionAsFloat")
+                ),
+                "gear_version": mgear.getVersion(),
+                "incremental": self.incremental,
+            }
+        )
+        base_path = profiler.get_output_base_path(self.options)
+        paths = self.profiler.save(base_path)
+        mgear.log("Build profile saved: {}".format(", ".join(paths)))
+        return paths
+
     def data_collector_output(self, file_path=None):
         """Output collected data to a Json file
 
@@ -0,0 +1,331 @@
+"""Shifter component registry.
+
+Index of the available components (type, path, version, guide info and
+guide parameters schema), read from the component guide.py files without
+importing them, so the component UI modules are only imported when used.
+
+The registry is cached in memory and persisted to disk. Each component
+entry is invalidated when the modification time of its guide.py or
+__init__.py files changes, and the listing of each component directory
+when the directory modification time changes.
+"""
+import ast
+import importlib
+import json
+import os
+import sys
+
+import mgear
+from mgear.core.six import string_types
+
+REGISTRY_VERSION = 1
+REGISTRY_FILE_NAME = "shifter_component_registry.json"
+REGISTRY_PATH_ENV_KEY = "MGEAR_SHIFTER_COMPONENT_REGISTRY_PATH"
+
+INFO_NAMES = ["TYPE", "NAME", "AUTHOR", "URL", "EMAIL", "VERSION",
+              "DESCRIPTION"]
+PARAM_METHODS = {
+    "addParam": "valueType",
+    "addEnumParam": "enum",
+    "addFCurveParam": "fcurve",
+    "addColorParam": "color",
+}
+
+_registry = {}
+
+
+def get_registry_path():
+    """Get the registry file path
+
+    Returns:
+        str: registry file path
+    """
+    path = os.environ.get(REGISTRY_PATH_ENV_KEY)
+    if path:
+        return path
+    app_dir = os.environ.get("MAYA_APP_DIR") or os.path.expanduser("~")
+    return os.path.join(app_dir, "mGear", REGISTRY_FILE_NAME)
+
+
+def _get_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, SyntaxError, TypeError):
+        return None
+
+
+def parse_guide(guide_path):
+    """Get the component info and parameters schema from the guide.py
+
+    The guide file is parsed, not imported.
+
+    Args:
+        guide_path (str): guide.py file path
+
+    Returns:
+        dict: {"info": {TYPE, NAME, ...}, "params": [{name, type, default}]}
+    """
+    with open(guide_path, "r") as f:
+        tree = ast.parse(f.read(), guide_path)
+
+    info = {}
+    params = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and node in tree.body:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in INFO_NAMES:
+                    info[target.id] = _literal(node.value)
+
+        elif isinstance(node, ast.Call) and isinstance(
+            node.func, ast.Attribute
+        ):
+            method = node.func.attr
+            if method not in PARAM_METHODS or not node.args:
+                continue
+            name = _literal(node.args[0])
+            if not isinstance(name, string_types):
+                # dynamic names, i.e: "k_" + s
+                continue
+            param = {"name": name, "type": PARAM_METHODS[method]}
+            if method == "addParam" and len(node.args) > 1:
+                param["type"] = _literal(node.args[1])
+                if len(node.args) > 2:
+                    param["default"] = _literal(node.args[2])
+            params.append(param)
+
+    return {"info": info, "params": params}
+
+
+def _make_entry(comp_type, base_path, default):
+    comp_path = os.path.join(base_path, comp_type)
+    guide_path = os.path.join(comp_path, "guide.py")
+    entry = {
+        "type": comp_type,
+        "path": comp_path,
+        "base_path": base_path,
+        "default": default,
+        "mtime": [
+            _get_mtime(os.path.join(comp_path, "__init__.py")),
+            _get_mtime(guide_path),
+        ],
+        "info": {},
+        "params": [],
+        "error": None,
+    }
+    try:
+        entry.update(parse_guide(guide_path))
+    except Exception as e:
+        entry["error"] = "{}: {}".format(type(e).__name__, e)
+    return entry
+
+
+def _is_valid(entry):
+    comp_path = entry["path"]
+    return entry["mtime"] == [
+        _get_mtime(os.path.join(comp_path, "__init__.py")),
+        _get_mtime(os.path.join(comp_path, "guide.py")),
+    ]
+
+
+def update_registry(directories, registry=None, default_directories=()):
+    """Update the registry with the components in the directories
+
+    Only the components with changes are parsed again.
+
+    Args:
+        directories (list): component directories, in priority order
+        registry (dict, optional): previous registry
+        default_directories (list, optional): mGear components directories
+
+    Returns:
+        dict: registry
+    """
+    registry = registry or {}
+    old_dirs = registry.get("directories", {})
+    old_comps = registry.get("components", {})
+
+    new_dirs = {}
+    components = {}
+    duplicated = []
+    for directory in directories:
+        mtime = _get_mtime(directory)
+        if mtime is None:
+            continue
+        cached = old_dirs.get(directory)
+        if cached and cached["mtime"] == mtime:
+            names = cached["components"]
+        else:
+            names = sorted(
+                n for n in os.listdir(directory)
+                if os.path.exists(os.path.join(directory, n, "__init__.py"))
+            )
+        new_dirs[directory] = {"mtime": mtime, "components": names}
+
+        for comp_type in names:
+            if comp_type in components:
+                duplicated.append(comp_type)
+                continue
+            entry = old_comps.get(comp_type)
+            if (
+                not entry
+                or entry["base_path"] != directory
+                or not _is_valid(entry)
+            ):
+                entry = _make_entry(
+                    comp_type, directory, directory in default_directories
+                )
+            components[comp_type] = entry
+
+    return {
+        "version": REGISTRY_VERSION,
+        "directories": new_dirs,
+        "components": components,
+        "duplicated": sorted(set(duplicated)),
+    }
+
+
+def load(path=None):
+    """Load the registry persisted to disk
+
+    Args:
+        path (str, optional): registry file path
+
+    Returns:
+        dict: registry. Empty if the file doesn't exist or is not valid
+    """
+    path = path or get_registry_path()
+    try:
+        with open(path, "r") as f:
+            registry = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    if registry.get("version") != REGISTRY_VERSION:
+        return {}
+    return registry
+
+
+def save(registry, path=None):
+    """Persist the registry to disk
+
+    Args:
+        registry (dict): registry
+        path (str, optional): registry file path
+    """
+    path = path or get_registry_path()
+    try:
+        folder = os.path.dirname(path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(path, "w") as f:
+            json.dump(registry, f)
+    except (IOError, OSError) as e:
+        mgear.log(
+            "Can't save the component registry: {}".format(e),
+            mgear.sev_warning,
+        )
+
+
+def get_registry(refresh=False):
+    """Get the component registry of the current component directories
+
+    Args:
+        refresh (bool, optional): If True, the registry is validated against
+            the components files. Otherwise the registry in memory is used.
+
+    Returns:
+        dict: registry
+    """
+    from mgear import shifter
+
+    if _registry and not refresh:
+        return _registry
+
+    directories = list(shifter.getComponentDirectories().keys())
+    previous = _registry or load()
+    registry = update_registry(
+        directories, previous, shifter.getDefaultComponentDirectories()
+    )
+    if registry != previous:
+        save(registry)
+    _registry.clear()
+    _registry.update(registry)
+    return _registry
+
+
+def get_component(comp_type):
+    """Get the registry entry of a component
+
+    Args:
+        comp_type (str): component type
+
+    Returns:
+        dict: component entry or None if not found
+    """
+    return get_registry()["components"].get(comp_type)
+
+
+def get_component_types():
+    """Get the valid component types
+
+    Returns:
+        list: component types, sorted by component directory
+    """
+    registry = get_registry(refresh=True)
+    for comp_type in registry["duplicated"]:
+        mgear.log(
+            "Custom component name: {}, already in default components. "
+            "Names should be unique. This component is not "
+            "loaded".format(comp_type),
+            mgear.sev_warning,
+        )
+    types = []
+    for directory in registry["directories"].values():
+        for comp_type in directory["components"]:
+            entry = registry["components"].get(comp_type)
+            if entry and not entry["error"] and comp_type not in types:
+                types.append(comp_type)
+    return types
+
+
+def import_component(comp_type, submodule=None):
+    """Import a component module from the registry path
+
+    Args:
+        comp_type (str): component type
+        submodule (str, optional): component submodule. I.e: "guide"
+
+    Returns:
+        module: the imported module or None if the component is not in the
+            registry
+    """
+    entry = get_component(comp_type)
+    if entry is None:
+        # new component after the registry was cached
+        entry = get_registry(refresh=True)["components"].get(comp_type)
+        if entry is None:
+            return None
+
+    base_path = entry["base_path"]
+    if base_path not in sys.path:
+        from maya import cmds
+
+        base_path = cmds.dirmap(cd=base_path)
+        if base_path not in sys.path:
+            sys.path.append(base_path)
+
+    module_name = comp_type
+    if submodule:
+        module_name += "." + submodule
+    return importlib.import_module(module_name)
+
+
+def clear():
+    """Clear the registry in memory. The next access will validate it."""
+    _registry.clear()
@@ -0,0 +1,117 @@
+"""
+Animation Clip Batch
+
+Exports animation clips from a saved scene in a Maya Batch process, so the
+clips of a character can be split between several background workers.
+
+Process
+-------
+1. Shift FBX Exporter saves the scene as a temporary .ma file.
+2. The enabled clips are split between the workers, balancing the number of
+   frames of each worker.
+3. Each worker opens the .ma file, prepares the scene the same way the serial
+   export does and exports its clips.
+
+Note
+----
+- Each worker reports its progress with batch_pool report entries, one
+  entry per clip status change, instead of using the process output.
+"""
+import json
+import traceback
+
+import maya.cmds as cmds
+
+from mgear.shifter.game_tools_fbx import batch_pool, utils
+
+
+def get_clip_frames(clip_data):
+    """
+    Returns the number of frames of a clip.
+
+    :param dict clip_data: animation clip data.
+    :return: number of frames.
+    :rtype: float
+    """
+    start_frame = float(clip_data.get("start_frame", 0))
+    end_frame = float(clip_data.get("end_frame", start_frame))
+    return max(end_frame - start_frame, 0) + 1
+
+
+def split_clips(clips, workers):
+    """
+    Splits the clips between the workers, balancing the number of frames.
+
+    The longest clips are assigned first, each one to the worker with less
+    frames. The clips of each worker keep their original order.
+
+    :param list(dict) clips: animation clips data.
+    :param int workers: number of workers.
+    :return: clip indices of each worker, without empty groups.
+    :rtype: list(list(int))
+    """
+    return batch_pool.split_weights(
+        [get_clip_frames(clip_data) for clip_data in clips], workers
+    )
+
+
+def export_clips(job_path):
+    """
+    Exports the animation clips of a job.
+
+    This is called by a MayaBatch process.
+
+    :param str job_path: JSON job file with the master_path, export_config,
+        report_path and the clips, as (clip index, clip data) pairs.
+    """
+    with open(job_path, "r") as f:
+        job = json.load(f)
+    report_path = job["report_path"]
+    export_config = job["export_config"]
+    clips = job["clips"]
+
+    def report(index, clip_data, status, path=None, error=None):
+        batch_pool.write_report_entry(
+            report_path,
+            {
+                "index": index,
+                "clip": clip_data.get("title", ""),
+                "status": status,
+                "path": path,
+                "error": error,
+            },
+        )
+
+    try:
+        cmds.file(job["master_path"], open=True, force=True)
+
+        if export_config.get("remove_namespace", True):
+            utils.clean_namespaces(export_config)
+
+        # Parent skeleton root directly to world
+        root_joint = export_config.get("joint_root", "")
+        if cmds.listRelatives(root_joint, parent=True):
+            cmds.parent(root_joint, world=True)
+    except Exception:
+        error = traceback.format_exc().strip().splitlines()[-1]
+        for index, clip_data in clips:
+            report(index, clip_data, batch_pool.FAILED, error=error)
+        return
+
+    for index, clip_data in clips:
+        report(index, clip_data, batch_pool.STARTED)
+        try:
+            path = utils.export_animation_clip(export_config, clip_data)
+        except Exception:
+            error = traceback.format_exc().strip().splitlines()[-1]
+            report(index, clip_data, batch_pool.FAILED, error=error)
+            continue
+        if path:
+            report(index, clip_data, batch_pool.DONE, path=path)
+        else:
+            report(
+                index,
+                clip_data,
+                batch_pool.FAILED,
+                error="Export returned no file",
+            )
@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+
+from mgear.vendor.Qt.QtCore import QThread, Signal
+from mgear.core import string
+
+from mgear.shifter.game_tools_fbx import anim_clip_batch, batch_pool
+
+import maya.cmds as cmds
+
+WORKER_FUNCTION = "mgear.shifter.game_tools_fbx.anim_clip_batch.export_clips"
+
+
+class AnimClipExportThread(QThread):
+    """ Thread that exports animation clips with a pool of Maya batch workers"""
+
+    completed = Signal(object, bool)
+    progress_signal = Signal(float)
+    clip_signal = Signal(object)
+
+    def __init__(self, export_config, clips, workers=4, timeout=None):
+        """
+        Initializes the thread.
+
+        :param dict export_config: exporter configuration.
+        :param list(dict) clips: enabled animation clips data.
+        :param int workers: maximum number of Maya batch processes.
+        :param float timeout: seconds each Maya batch process can run. None
+            to disable.
+        """
+        super().__init__()
+
+        self.export_config = export_config
+        self.clips = clips
+        self.workers = workers
+        self.timeout = timeout
+        self.master_path = None
+
+        # clip results, in clips order
+        self.results = [
+            {
+                "clip": c.get("title", ""),
+                "status": None,
+                "path": None,
+                "error": None,
+            }
+            for c in clips
+        ]
+
+        # Makes sure the Thread removes itself
+        self.finished.connect(self.deleteLater)
+
+    def init_data(self):
+        """
+        Saves the scene as the temporary .ma file opened by the workers.
+
+        Note: This process cannot be run in the thread as Maya commands are not
+        thread safe.
+        """
+        file_path = self.export_config.get("file_path", "")
+        self.master_path = string.normalize_path(
+            os.path.join(file_path, "temporary_anim_export.ma")
+        )
+
+        current_scene_path = cmds.file(query=True, sceneName=True)
+        scene_modified = cmds.file(query=True, modified=True)
+
+        cmds.file(rename=self.master_path)
+        cmds.file(save=True, type="mayaAscii", force=True)
+
+        # Revert the scene name to the original path
+        if current_scene_path:
+            cmds.file(rename=current_scene_path)
+        cmds.file(modified=scene_modified)
+
+        print("Temporary Animation file: {}".format(self.master_path))
+
+    def cancel(self):
+        """
+        Stops the running Maya batch processes. Their clips not exported yet
+        are reported as failed.
+        """
+        self.requestInterruption()
+
+    def run(self):
+        """
+        Main function that gets called when the thread starts.
+        """
+        success = False
+        try:
+            success = self.export_clips()
+        finally:
+            if self.master_path and os.path.exists(self.master_path):
+                os.remove(self.master_path)
+            self.completed.emit(self.results, success)
+
+    def _update(self, entry):
+        result = self.results[entry["index"]]
+        result.update(
+            (k, entry.get(k)) for k in ("status", "path", "error")
+        )
+        self.clip_signal.emit(dict(result))
+        finished = [
+            r for r in self.results
+            if r["status"] in (batch_pool.DONE, batch_pool.FAILED)
+        ]
+        self.progress_signal.emit(
+            100.0 * len(finished) / max(len(self.results), 1)
+        )
+
+    def _worker_exited(self, worker, returncode):
+        # clips not reported by a worker that stopped
+        for i, _ in worker["job"]["clips"]:
+            if self.results[i]["status"] in (batch_pool.DONE, batch_pool.FAILED):
+                continue
+            self._update(
+                {
+                    "index": i,
+                    "status": batch_pool.FAILED,
+                    "error": worker["error"],
+                }
+            )
+
+    def export_clips(self):
+        """
+        Exports the clips with the Maya batch workers and collects their
+        reports.
+
+        :return: True if all the clips were exported.
+        :rtype: bool
+        """
+        if not self.clips:
+            return True
+        if not (self.master_path and os.path.exists(self.master_path)):
+            return False
+
+        job_dir = tempfile.mkdtemp(prefix="mgear_anim_export_")
+        groups = anim_clip_batch.split_clips(self.clips, self.workers)
+        jobs = [
+            {
+                "master_path": self.master_path,
+                "export_config": self.export_config,
+                "clips": [[i, self.clips[i]] for i in indices],
+            }
+            for indices in groups
+        ]
+        self.progress_signal.emit(0)
+        try:
+            batch_pool.run_workers(
+                job_dir,
+                jobs,
+                WORKER_FUNCTION,
+                self._update,
+                self._worker_exited,
+                timeout=self.timeout,
+                is_cancelled=self.isInterruptionRequested,
+            )
+        except OSError as error:
+            print("Error:", error)
+            return False
+
+        success = all(r["status"] == batch_pool.DONE for r in self.results)
+        # logs are kept to debug the failed clips
+        if success:
+            shutil.rmtree(job_dir, ignore_errors=True)
+        return success
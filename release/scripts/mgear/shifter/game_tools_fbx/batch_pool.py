@@ -0,0 +1,280 @@
+"""
+Batch Pool
+
+Runs export jobs in a pool of Maya batch processes.
+
+Each worker runs a python function with the path of its JSON job file, and
+reports its progress as JSON lines in its own report file, one entry per item
+status change. The report files are read while the workers are running, so
+the progress does not depend on parsing the process output.
+
+Note
+----
+- The worker output is written to a log file next to its job file.
+"""
+import json
+import os
+import shlex
+import subprocess
+import time
+
+from mgear.core import string, utils as coreUtils
+
+# item status
+STARTED = "started"
+DONE = "done"
+FAILED = "failed"
+
+# seconds between the reads of the workers reports
+POLL_INTERVAL = 0.25
+
+
+def get_mayabatch_args(script_file_path):
+    """
+    Returns the command to run a MEL script file with a Maya batch process.
+
+    :param str script_file_path: MEL script file path.
+    :return: subprocess arguments and whether they need to run in a shell.
+    :rtype: tuple(list(str) or str, bool)
+    """
+    mayabatch_dir = coreUtils.get_maya_path()
+    mayabatch_path = None
+    mayabatch_args = None
+    mayabatch_shell = False
+
+    # Depending on the os we would need to change from maya, to maya batch
+    # windows uses mayabatch
+    if str(coreUtils.get_os()) == "win64" or str(coreUtils.get_os()) == "nt":
+        option = "mayabatch"
+    else:
+        option = "maya"
+
+    if option == "maya":
+        mayabatch_command = 'maya'
+        mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
+        mayabatch_args = [shlex.quote(mayabatch_path)]
+        mayabatch_args.append("-batch")
+        mayabatch_shell = False
+        mayabatch_args.append("-script")
+        mayabatch_args.append(shlex.quote(script_file_path))
+        # mayabatch_args.append("-log")
+        # mayabatch_args.append(shlex.quote(log_path))
+
+        print("-------------------------------------------")
+        print("[Launching] MayaBatch")
+        print("   {}".format(mayabatch_args))
+        print("   {}".format(" ".join(mayabatch_args)))
+        print("-------------------------------------------")
+
+    else:
+        mayabatch_command = "maya"
+        mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
+        mayabatch_args = ['"'+mayabatch_path+'"']
+        mayabatch_args.append("-batch")
+        mayabatch_shell = True
+        mayabatch_args.append("-script")
+        mayabatch_args.append('"'+script_file_path+'"')
+        # mayabatch_args.append("-log")
+        # mayabatch_args.append('"'+log_path+'"')
+
+        mayabatch_args = "{}".format(" ".join(mayabatch_args))
+
+        print("-------------------------------------------")
+        print("[Launching] MayaBatch")
+        print("   {}".format(mayabatch_args))
+        print("-------------------------------------------")
+
+    return mayabatch_args, mayabatch_shell
+
+
+def split_weights(weights, workers):
+    """
+    Splits the items between the workers, balancing the weight of each worker.
+
+    The heaviest items are assigned first, each one to the worker with less
+    weight. The items of each worker keep their original order.
+
+    :param list(float) weights: weight of each item.
+    :param int workers: number of workers.
+    :return: item indices of each worker, without empty groups.
+    :rtype: list(list(int))
+    """
+    workers = max(1, min(workers, len(weights)))
+    groups = [[] for _ in range(workers)]
+    totals = [0] * workers
+    order = sorted(range(len(weights)), key=lambda i: -weights[i])
+    for i in order:
+        worker = totals.index(min(totals))
+        groups[worker].append(i)
+        totals[worker] += weights[i]
+    return [sorted(group) for group in groups if group]
+
+
+def write_report_entry(report_path, entry):
+    """
+    Appends an entry to a worker report file.
+
+    :param str report_path: report file path.
+    :param dict entry: JSON serializable entry.
+    """
+    with open(report_path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def read_report(report_path, offset=0):
+    """
+    Reads the complete entries of a worker report file, from an offset.
+
+    :param str report_path: report file path.
+    :param int offset: position of the first entry to read.
+    :return: entries and offset of the next entry.
+    :rtype: tuple(list(dict), int)
+    """
+    if not os.path.exists(report_path):
+        return [], offset
+    with open(report_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    entries = []
+    # the last line is incomplete while the worker is writing it
+    for line in data.splitlines(True):
+        if not line.endswith(b"\n"):
+            break
+        offset += len(line)
+        line = line.strip()
+        if line:
+            entries.append(json.loads(line.decode("utf-8")))
+    return entries, offset
+
+
+def start_worker(job_dir, worker, job, function):
+    """
+    Starts a Maya batch process that runs a function with a job file.
+
+    :param str job_dir: folder of the job, report and log files.
+    :param int worker: worker number.
+    :param dict job: JSON serializable job data. The report_path is added.
+    :param str function: full name of the python function to run, like
+        "mgear.shifter.game_tools_fbx.fbx_batch.export_partitions_job".
+    :return: worker data, with the process and the file paths.
+    :rtype: dict
+    """
+    job_path = os.path.join(job_dir, "job_{}.json".format(worker))
+    report_path = os.path.join(job_dir, "report_{}.jsonl".format(worker))
+    log_path = os.path.join(job_dir, "log_{}.txt".format(worker))
+    script_path = os.path.join(job_dir, "job_{}.mel".format(worker))
+
+    job = dict(job, report_path=report_path)
+    with open(job_path, "w") as f:
+        json.dump(job, f)
+
+    module_name, function_name = function.rsplit(".", 1)
+    with open(script_path, "w") as f:
+        f.write(
+            'python "import {module}";\n'
+            'python "{module}.{function}(\'{job_path}\')";\n'.format(
+                module=module_name,
+                function=function_name,
+                job_path=string.normalize_path(job_path),
+            )
+        )
+
+    args, shell = get_mayabatch_args(script_path)
+    log_file = open(log_path, "w")
+    try:
+        process = subprocess.Popen(
+            args,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            shell=shell,
+        )
+    except OSError:
+        log_file.close()
+        raise
+    return {
+        "process": process,
+        "log_file": log_file,
+        "log_path": log_path,
+        "report_path": report_path,
+        "offset": 0,
+        "job": job,
+        "start_time": time.time(),
+    }
+
+
+def stop_worker(worker, error):
+    """
+    Kills a running worker process.
+
+    :param dict worker: worker data from start_worker.
+    :param str error: reason of the stop, stored as the worker error.
+    """
+    worker["error"] = error
+    worker["process"].kill()
+
+
+def run_workers(job_dir, jobs, function, on_entry, on_exit=None,
+                timeout=None, is_cancelled=None):
+    """
+    Runs each job in a Maya batch process and waits for all of them.
+
+    A worker running longer than the timeout, or all the running workers when
+    the batch is cancelled, are killed. Their worker data gets an error
+    message, and on_exit is called as for any other exit.
+
+    :param str job_dir: folder of the job, report and log files.
+    :param list(dict) jobs: JSON serializable data of each job.
+    :param str function: full name of the python function to run.
+    :param callable on_entry: called with each report entry.
+    :param callable on_exit: called with the worker data and the return code
+        when a worker exits, after its last report entries.
+    :param float timeout: seconds each worker can run. None to disable.
+    :param callable is_cancelled: returns True to stop all the workers.
+    :return: return code of each worker.
+    :rtype: list(int)
+    """
+    workers = []
+    try:
+        for worker, job in enumerate(jobs):
+            workers.append(start_worker(job_dir, worker, job, function))
+    except OSError:
+        for worker in workers:
+            worker["process"].kill()
+            worker["log_file"].close()
+        raise
+
+    running = list(workers)
+    while running:
+        time.sleep(POLL_INTERVAL)
+        cancelled = is_cancelled is not None and is_cancelled()
+        for worker in list(running):
+            returncode = worker["process"].poll()
+            if returncode is None and cancelled:
+                stop_worker(worker, "Cancelled")
+                returncode = worker["process"].wait()
+            elif returncode is None and timeout is not None and (
+                time.time() - worker["start_time"] > timeout
+            ):
+                stop_worker(worker, "Timed out after {}s".format(timeout))
+                returncode = worker["process"].wait()
+            entries, worker["offset"] = read_report(
+                worker["report_path"], worker["offset"]
+            )
+            for entry in entries:
+                on_entry(entry)
+            if returncode is None:
+                continue
+
+            running.remove(worker)
+            worker["log_file"].close()
+            worker["returncode"] = returncode
+            worker.setdefault(
+                "error",
+                "Maya batch exited with code {}, see {}".format(
+                    returncode, worker["log_path"]
+                ),
+            )
+            if on_exit is not None:
+                on_exit(worker, returncode)
+
+    return [worker["returncode"] for worker in workers]
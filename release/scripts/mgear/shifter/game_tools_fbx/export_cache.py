@@ -0,0 +1,494 @@
+"""
+Export Cache
+
+Skips the skeletal mesh partitions and animation clips that did not change
+since their last export.
+
+Each output FBX has a content hash computed from the scene data it is
+exported from, before any scene conditioning happens:
+
+- Skeletal meshes: mesh topology, points, UVs, normals with the locked
+  normals, edge smoothing, color sets, per-face shader assignments, skin
+  weights, blendshape targets, the joint list with its local transforms and
+  the export settings.
+- Animation clips: the joint list, the keys of the clip range, the clip data
+  and the export settings. Curves with cycle or oscillate infinity are hashed
+  whole.
+
+The hashes are stored in a JSON manifest inside the export folder. An output
+is skipped when its hash matches the manifest and the FBX file still exists.
+
+Note
+----
+- Changes that are not keyed, like a rig or constraint edit, are not part of
+  the clip hashes. Use force to export everything again.
+"""
+import array
+import bisect
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from mgear.core import skin_array, string
+
+MANIFEST_NAME = ".mgear_export_cache.json"
+MANIFEST_VERSION = 2
+
+# export configuration keys that change the exported FBX content
+SETTINGS_KEYS = (
+    "geo_roots",
+    "joint_root",
+    "up_axis",
+    "file_type",
+    "fbx_version",
+    "remove_namespace",
+    "scene_clean",
+    "skinning",
+    "blendshapes",
+    "use_partitions",
+    "cull_joints",
+)
+
+ANIM_CURVE_TYPES = ["animCurveTL", "animCurveTA", "animCurveTU", "animCurveTT"]
+
+# cycle, cycle with offset and oscillate: every key changes the clip range
+CYCLE_INFINITY = (3, 4, 5)
+
+
+def get_fbx_file_name(file_name):
+    """
+    Returns the file name with the .fbx extension.
+
+    :param str file_name: file name, with or without extension.
+    :return: FBX file name.
+    :rtype: str
+    """
+    if not file_name.endswith(".fbx"):
+        file_name = "{}.fbx".format(file_name)
+    return file_name
+
+
+def get_partition_file_name(file_name, partition_name):
+    """
+    Returns the FBX file name of a skeletal mesh partition.
+
+    :param str file_name: export file name.
+    :param str partition_name: partition name.
+    :return: FBX file name.
+    :rtype: str
+    """
+    return "{}_{}.fbx".format(file_name, partition_name)
+
+
+def get_clip_file_name(file_name, clip_data):
+    """
+    Returns the FBX file name of an animation clip.
+
+    :param str file_name: export file name.
+    :param dict clip_data: animation clip data.
+    :return: FBX file name.
+    :rtype: str
+    """
+    title = clip_data.get("title", "")
+    if title:
+        file_name = "{}_{}".format(file_name, title)
+    return get_fbx_file_name(file_name)
+
+
+class ExportCache(object):
+    """
+    Manifest of the content hashes of the FBX files of an export folder.
+
+    :param str file_path: export folder.
+    :param bool force: if True no output is considered current.
+    """
+
+    def __init__(self, file_path, force=False):
+        self.file_path = file_path
+        self.force = force
+        self.manifest_path = string.normalize_path(
+            os.path.join(file_path, MANIFEST_NAME)
+        )
+        self.entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def is_current(self, file_name, digest):
+        """
+        Returns whether the FBX file was exported from the same content.
+
+        :param str file_name: FBX file name, relative to the export folder.
+        :param str digest: content hash.
+        :rtype: bool
+        """
+        if self.force or self.entries.get(file_name) != digest:
+            return False
+        return os.path.exists(os.path.join(self.file_path, file_name))
+
+    def update(self, file_name, digest):
+        """
+        Records the content hash of an exported FBX file.
+
+        :param str file_name: FBX file name, relative to the export folder.
+        :param str digest: content hash.
+        """
+        self.entries[file_name] = digest
+
+    def save(self):
+        """
+        Writes the manifest to the export folder.
+        """
+        if not os.path.isdir(self.file_path):
+            return
+        with open(self.manifest_path, "w") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "entries": self.entries},
+                f,
+                indent=4,
+                sort_keys=True,
+            )
+
+
+def _update_hash(hasher, value):
+    if isinstance(value, (bytes, bytearray)):
+        hasher.update(value)
+    else:
+        hasher.update(
+            json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+        )
+
+
+def _get_dag_path(node):
+    sel = om.MSelectionList()
+    sel.add(node)
+    return sel.getDagPath(0)
+
+
+def _doubles(values):
+    return array.array("d", values).tobytes()
+
+
+def _ints(values):
+    return array.array("i", values).tobytes()
+
+
+def get_settings_data(export_config):
+    """
+    Returns the export settings that change the exported FBX content.
+
+    The FBX preset file is included by content.
+
+    :param dict export_config: exporter configuration.
+    :rtype: dict
+    """
+    data = {k: export_config.get(k) for k in SETTINGS_KEYS}
+    preset_path = export_config.get("preset_path", None)
+    if preset_path and os.path.exists(preset_path):
+        with open(preset_path, "rb") as f:
+            data["preset"] = hashlib.sha1(f.read()).hexdigest()
+    return data
+
+
+def hash_mesh(hasher, mesh):
+    """
+    Adds the mesh topology, points, UVs, normals, edge smoothing, color
+    sets, per-face shader assignments, skin weights and blendshape targets
+    of a mesh transform to the hash.
+
+    The points and normals are read from the original shape of deformed
+    meshes, so the current pose does not change the hash. The shaders are
+    read from the visible shape.
+
+    :param hasher: hashlib object.
+    :param str mesh: mesh transform.
+    """
+    shapes = cmds.listRelatives(
+        mesh, shapes=True, fullPath=True, type="mesh"
+    ) or []
+    if not shapes:
+        return
+    intermediates = [
+        s for s in shapes if cmds.getAttr(s + ".intermediateObject")
+    ]
+    visible = [s for s in shapes if s not in intermediates] or shapes
+    source = intermediates[0] if intermediates else shapes[0]
+
+    fn_mesh = om.MFnMesh(_get_dag_path(source))
+    counts, connects = fn_mesh.getVertices()
+    points = fn_mesh.getPoints(om.MSpace.kObject)
+    _update_hash(hasher, mesh.split("|")[-1])
+    _update_hash(hasher, _ints(counts))
+    _update_hash(hasher, _ints(connects))
+    _update_hash(
+        hasher, _doubles(c for p in points for c in (p.x, p.y, p.z))
+    )
+    for uv_set in fn_mesh.getUVSetNames():
+        u, v = fn_mesh.getUVs(uv_set)
+        _update_hash(hasher, uv_set)
+        _update_hash(hasher, _doubles(u))
+        _update_hash(hasher, _doubles(v))
+
+    normal_counts, normal_ids = fn_mesh.getNormalIds()
+    normals = fn_mesh.getNormals(om.MSpace.kObject)
+    _update_hash(hasher, _ints(normal_counts))
+    _update_hash(hasher, _ints(normal_ids))
+    _update_hash(
+        hasher, _doubles(c for n in normals for c in (n.x, n.y, n.z))
+    )
+    _update_hash(
+        hasher,
+        _ints(
+            i for i in range(fn_mesh.numNormals)
+            if fn_mesh.isNormalLocked(i)
+        ),
+    )
+    _update_hash(
+        hasher,
+        _ints(
+            i for i in range(fn_mesh.numEdges) if fn_mesh.isEdgeSmooth(i)
+        ),
+    )
+    for color_set in fn_mesh.getColorSetNames():
+        colors = fn_mesh.getFaceVertexColors(color_set)
+        _update_hash(hasher, color_set)
+        _update_hash(
+            hasher,
+            _doubles(x for c in colors for x in (c.r, c.g, c.b, c.a)),
+        )
+
+    dag_path = _get_dag_path(visible[0])
+    shaders, face_shaders = om.MFnMesh(dag_path).getConnectedShaders(
+        dag_path.instanceNumber()
+    )
+    _update_hash(
+        hasher,
+        [om.MFnDependencyNode(shader).name() for shader in shaders],
+    )
+    _update_hash(hasher, _ints(face_shaders))
+
+    history = cmds.listHistory(mesh) or []
+    for skin_cluster in cmds.ls(history, type="skinCluster"):
+        fn_skin = skin_array.get_skin_cluster_fn(skin_cluster)
+        dag_path, components = skin_array.get_geometry_components(fn_skin)
+        weights, _ = fn_skin.getWeights(dag_path, components)
+        _update_hash(hasher, skin_array.get_influence_names(fn_skin))
+        _update_hash(hasher, cmds.getAttr(skin_cluster + ".skinningMethod"))
+        _update_hash(hasher, _doubles(weights))
+
+    for blendshape in cmds.ls(history, type="blendShape"):
+        _update_hash(hasher, cmds.listAttr(blendshape + ".weight", multi=True))
+        group_attr = "{}.inputTarget[0].inputTargetGroup".format(blendshape)
+        for group in cmds.getAttr(group_attr, multiIndices=True) or []:
+            item_attr = "{}[{}].inputTargetItem".format(group_attr, group)
+            for item in cmds.getAttr(item_attr, multiIndices=True) or []:
+                for attr in ("inputPointsTarget", "inputComponentsTarget"):
+                    _update_hash(
+                        hasher,
+                        [
+                            group,
+                            item,
+                            cmds.getAttr(
+                                "{}[{}].{}".format(item_attr, item, attr)
+                            ),
+                        ],
+                    )
+
+
+def get_joints(joint_root):
+    """
+    Returns the joint root and all its descendant joints.
+
+    :param str joint_root: root joint.
+    :return: joints full path names, in hierarchy order.
+    :rtype: list(str)
+    """
+    if not cmds.objExists(joint_root):
+        return []
+    joints = cmds.ls(joint_root, long=True)
+    descendants = cmds.listRelatives(
+        joint_root, allDescendents=True, fullPath=True, type="joint"
+    ) or []
+    return joints + sorted(descendants)
+
+
+def hash_joints(hasher, joints, transforms=True):
+    """
+    Adds the joint list to the hash.
+
+    :param hasher: hashlib object.
+    :param list(str) joints: joints full path names.
+    :param bool transforms: adds the local transforms of the joints.
+    """
+    _update_hash(hasher, joints)
+    if not transforms:
+        return
+    for jnt in joints:
+        _update_hash(
+            hasher, _doubles(cmds.xform(jnt, query=True, matrix=True))
+        )
+        _update_hash(
+            hasher, _doubles(cmds.getAttr(jnt + ".jointOrient")[0])
+        )
+
+
+def get_skeletal_mesh_hashes(export_config):
+    """
+    Returns the content hash of each skeletal mesh FBX file to export.
+
+    :param dict export_config: exporter configuration, with the enabled
+        partitions.
+    :return: content hash by FBX file name.
+    :rtype: OrderedDict
+    """
+    file_name = export_config.get("file_name", "")
+    settings = get_settings_data(export_config)
+    joints = get_joints(export_config.get("joint_root", ""))
+
+    if export_config.get("use_partitions", True):
+        outputs = [
+            (
+                get_partition_file_name(file_name, name),
+                {"partition": name, "data": data},
+                data.get("skeletal_meshes", []),
+            )
+            for name, data in export_config.get("partitions", {}).items()
+        ]
+    else:
+        geo_roots = export_config.get("geo_roots", [])
+        meshes = cmds.listRelatives(
+            geo_roots, allDescendents=True, fullPath=True, type="mesh"
+        ) or []
+        meshes = sorted(
+            set(cmds.listRelatives(meshes, parent=True, fullPath=True) or [])
+        )
+        outputs = [(get_fbx_file_name(file_name), {}, meshes)]
+
+    mesh_hashes = {}
+    hashes = OrderedDict()
+    for output_name, output_data, meshes in outputs:
+        hasher = hashlib.sha1()
+        _update_hash(hasher, settings)
+        _update_hash(hasher, output_data)
+        hash_joints(hasher, joints)
+        for mesh in meshes:
+            # meshes can be shared between partitions
+            if mesh not in mesh_hashes:
+                mesh_hasher = hashlib.sha1()
+                if cmds.objExists(mesh):
+                    hash_mesh(mesh_hasher, mesh)
+                mesh_hashes[mesh] = mesh_hasher.hexdigest()
+            _update_hash(hasher, mesh_hashes[mesh])
+        hashes[output_name] = hasher.hexdigest()
+    return hashes
+
+
+def get_anim_curves_data():
+    """
+    Returns the keys of all the time based animation curves of the scene.
+
+    :return: curve data by curve name, with the connected plugs, key times,
+        values, tangents and infinity.
+    :rtype: dict
+    """
+    curves_data = {}
+    for curve in cmds.ls(type=ANIM_CURVE_TYPES) or []:
+        times = cmds.keyframe(curve, query=True, timeChange=True) or []
+        keys = list(
+            zip(
+                times,
+                cmds.keyframe(curve, query=True, valueChange=True) or [],
+                cmds.keyTangent(curve, query=True, inAngle=True) or [],
+                cmds.keyTangent(curve, query=True, outAngle=True) or [],
+                cmds.keyTangent(curve, query=True, inWeight=True) or [],
+                cmds.keyTangent(curve, query=True, outWeight=True) or [],
+                cmds.keyTangent(curve, query=True, inTangentType=True) or [],
+                cmds.keyTangent(curve, query=True, outTangentType=True) or [],
+            )
+        )
+        curves_data[curve] = {
+            "plugs": sorted(
+                cmds.listConnections(
+                    curve + ".output", source=False, plugs=True
+                ) or []
+            ),
+            "times": times,
+            "keys": keys,
+            "infinity": [
+                cmds.getAttr(curve + ".preInfinity"),
+                cmds.getAttr(curve + ".postInfinity"),
+            ],
+        }
+    return curves_data
+
+
+def hash_clip_keys(hasher, curves_data, start_frame, end_frame):
+    """
+    Adds the keys that change the animation of a frame range to the hash.
+
+    These are the keys inside the range and the closest key at each side.
+    All the keys of a curve with cycle or oscillate infinity.
+
+    :param hasher: hashlib object.
+    :param dict curves_data: curves data from get_anim_curves_data.
+    :param float start_frame: clip start frame.
+    :param float end_frame: clip end frame.
+    """
+    for curve in sorted(curves_data):
+        data = curves_data[curve]
+        times = data["times"]
+        if any(i in CYCLE_INFINITY for i in data["infinity"]):
+            keys = data["keys"]
+        else:
+            first = max(bisect.bisect_left(times, start_frame) - 1, 0)
+            last = bisect.bisect_right(times, end_frame) + 1
+            keys = data["keys"][first:last]
+        _update_hash(
+            hasher, [curve, data["plugs"], data["infinity"], keys]
+        )
+
+
+def get_clip_hashes(export_config, clips, curves_data=None):
+    """
+    Returns the content hash of each animation clip.
+
+    :param dict export_config: exporter configuration.
+    :param list(dict) clips: animation clips data.
+    :param dict curves_data: curves data from get_anim_curves_data.
+    :return: content hash of each clip, in clips order.
+    :rtype: list(str)
+    """
+    if curves_data is None:
+        curves_data = get_anim_curves_data()
+    settings = get_settings_data(export_config)
+    joints = get_joints(export_config.get("joint_root", ""))
+    playback_range = (
+        cmds.playbackOptions(query=True, minTime=True),
+        cmds.playbackOptions(query=True, maxTime=True),
+    )
+
+    hashes = []
+    for clip_data in clips:
+        start_frame = float(clip_data.get("start_frame", playback_range[0]))
+        end_frame = float(clip_data.get("end_frame", playback_range[1]))
+        hasher = hashlib.sha1()
+        _update_hash(hasher, settings)
+        _update_hash(hasher, clip_data)
+        _update_hash(hasher, cmds.currentUnit(query=True, time=True))
+        hash_joints(hasher, joints, transforms=False)
+        hash_clip_keys(hasher, curves_data, start_frame, end_frame)
+        hashes.append(hasher.hexdigest())
+    return hashes
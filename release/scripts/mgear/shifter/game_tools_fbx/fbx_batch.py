@@ -21,10 +21,19 @@ Tasks / Conditions
 - Partition Skeleton + Geometry.
 - Exports each partition as an FBX.
 
+Concurrent Partitions
+---------------------
+When a partition plan path is given, the conditioning process only writes the
+meshes and joints of each partition to the plan and keeps the conditioned file.
+The partitions are then exported by several Maya Batch workers, each one
+running export_partitions_job on its share of the plan.
+
 Note
 ----
 - Print logs are being used by the partition subprocess thread to detect progress.
+- The partition workers report their progress with batch_pool report entries.
 """
+import json
 import os
 import traceback
 from collections import OrderedDict
@@ -35,6 +44,7 @@ import pymel.core as pm
 
 from mgear.core import pyFBX as pfbx
 import mgear.shifter.game_tools_disconnect as gtDisc
+from mgear.shifter.game_tools_fbx import batch_pool
 
 def perform_fbx_condition(
         remove_namespace,
@@ -45,11 +55,16 @@ def perform_fbx_condition(
         skinning=True,
         blendshapes=True,
         partitions=True,
-        export_data=None):
+        export_data=None,
+        plan_path=None):
     """
     Performs the FBX file conditioning and partition exports.
 
     This is called by a MayaBatch process.
+
+    If plan_path is given, the partitions are not exported. Their meshes and
+    joints are written to the plan and the conditioned file is kept for the
+    partition workers.
     """
     print("--------------------------")
     print(" PERFORM FBX CONDITIONING")
@@ -149,6 +164,15 @@ def perform_fbx_condition(
         pfbx.FBXExport(f=master_fbx_path, s=True)
         status = True
 
+    if partitions and export_data is not None and plan_path:
+        print("[Partitions]")
+        print("   Writing Partition plan: {}".format(plan_path))
+        plan = get_partitions_plan([root_joint], export_data)
+        with open(plan_path, "w") as f:
+            json.dump(plan, f)
+        # The conditioned file is removed once the partition workers finish
+        return plan is not None
+
     if partitions and export_data is not None:
         print("[Partitions]")
         print("   Preparing scene for Partition creation..")
@@ -167,25 +191,18 @@ def perform_fbx_condition(
     return status
 
 
-def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
+def _get_partitions_data(jnt_roots, export_data):
     """
-    Exports the individual partition hierarchies that have been specified.
-
-    For each Partition, the conditioned .ma file will be loaded and have 
-    alterations performed to it.
+    Returns the root joint and the joint hierarchy of each enabled partition.
 
+    Returns None if there are no partitions defined.
     """
     print("   Correlating Mesh to joints...")
 
-    file_path = export_data.get("file_path", "")
-    file_name = export_data.get("file_name", "")
-
     partitions = export_data.get("partitions", dict())
     if not partitions:
         cmds.warning("  Partitions not defined!")
-        return False
-
-    cull_joints = export_data.get("cull_joints", False)
+        return None
 
     # Collects all partition data, so it can be more easily accessed in the next stage
     # where mesh and skeleton data is deleted and exported.
@@ -243,6 +260,56 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
 
         partitions_data[partition_name]["hierarchy"] = short_hierarchy
 
+    return partitions_data
+
+
+def get_partitions_plan(jnt_roots, export_data):
+    """
+    Returns the meshes and joints of each partition to export, with the
+    number of vertices of the meshes as the partition weight.
+
+    Returns None if there are no partitions defined.
+    """
+    partitions_data = _get_partitions_data(jnt_roots, export_data)
+    if partitions_data is None:
+        return None
+    partitions = export_data.get("partitions", dict())
+
+    plan = []
+    for partition_name, partition_data in partitions_data.items():
+        if not partition_data:
+            print("   Partition {} contains no data.".format(partition_name))
+            continue
+        meshes = partitions.get(partition_name).get("skeletal_meshes")
+        weight = 0
+        for mesh in meshes:
+            vertices = cmds.polyEvaluate(mesh, vertex=True)
+            if isinstance(vertices, int):
+                weight += vertices
+        plan.append(
+            {
+                "name": partition_name,
+                "meshes": meshes,
+                "joints": partition_data.get("hierarchy", []),
+                "weight": weight,
+            }
+        )
+    return plan
+
+
+def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
+    """
+    Exports the individual partition hierarchies that have been specified.
+
+    For each Partition, the conditioned .ma file will be loaded and have 
+    alterations performed to it.
+
+    """
+    partitions = export_data.get("partitions", dict())
+    partitions_data = _get_partitions_data(jnt_roots, export_data)
+    if partitions_data is None:
+        return False
+
     print("   Modifying Hierarchy...")
 
     # - Loop over each Partition
@@ -258,54 +325,14 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
         partition_meshes = partitions.get(partition_name).get("skeletal_meshes")
         partition_joints = partition_data.get("hierarchy", [])
 
-        print("Open Conditioned Scene: {}".format(scene_path))
-        # Loads the conditioned scene file, to perform partition actions on.
-        cmds.file(scene_path, open=True, force=True, save=False)
-
-        # Deletes meshes that are not included in the partition.
-        all_meshes = _get_all_mesh_dag_objects()
-        for mesh in all_meshes:
-            if not mesh in partition_meshes:
-                cmds.delete(mesh)
-
-        # Delete joints that are not included in the partition
-        if cull_joints:
-            print("    Culling Joints...")
-            all_joints = _get_all_joint_dag_objects()
-            for jnt in reversed(all_joints):
-                if not jnt in partition_joints:
-                    cmds.delete(jnt)
-
-        # Exporting fbx
-        partition_file_name = file_name + "_" + partition_name + ".fbx"
-        export_path = os.path.join(file_path, partition_file_name)
-
-        print("Exporting FBX: {}".format(export_path))
         try:
-            preset_path = export_data.get("preset_path", None)
-            up_axis = export_data.get("up_axis", None)
-            fbx_version = export_data.get("fbx_version", None)
-            file_type = export_data.get("file_type", "binary").lower()
-            # export settings config
-            pfbx.FBXResetExport()
-            # set configuration
-            if preset_path is not None:
-                # load FBX export preset file
-                pfbx.FBXLoadExportPresetFile(f=preset_path)
-            fbx_version_str = None
-            if up_axis is not None:
-                pfbx.FBXExportUpAxis(up_axis.lower())
-            if fbx_version is not None:
-                fbx_version_str = "{}00".format(
-                    fbx_version.split("/")[0].replace(" ", "")
-                )
-                pfbx.FBXExportFileVersion(v=fbx_version_str)
-            if file_type == "ascii":
-                pfbx.FBXExportInAscii(v=True)
-
-            cmds.select(clear=True)
-            cmds.select(partition_joints + partition_meshes)
-            pfbx.FBXExport(f=export_path, s=True)
+            export_partition(
+                partition_name,
+                partition_meshes,
+                partition_joints,
+                export_data,
+                scene_path,
+            )
         except Exception:
             cmds.error(
                 "Something wrong happened while export Partition {}: {}".format(
@@ -317,6 +344,114 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
     return True
 
 
+def export_partition(
+        partition_name,
+        partition_meshes,
+        partition_joints,
+        export_data,
+        scene_path):
+    """
+    Exports a partition from the conditioned scene.
+
+    The conditioned .ma file is loaded, and the meshes and joints that are not
+    part of the partition are deleted before the export.
+
+    :return: the path of the exported fbx.
+    :rtype: str
+    """
+    file_path = export_data.get("file_path", "")
+    file_name = export_data.get("file_name", "")
+    cull_joints = export_data.get("cull_joints", False)
+
+    print("Open Conditioned Scene: {}".format(scene_path))
+    # Loads the conditioned scene file, to perform partition actions on.
+    cmds.file(scene_path, open=True, force=True, save=False)
+
+    # Deletes meshes that are not included in the partition.
+    all_meshes = _get_all_mesh_dag_objects()
+    for mesh in all_meshes:
+        if not mesh in partition_meshes:
+            cmds.delete(mesh)
+
+    # Delete joints that are not included in the partition
+    if cull_joints:
+        print("    Culling Joints...")
+        all_joints = _get_all_joint_dag_objects()
+        for jnt in reversed(all_joints):
+            if not jnt in partition_joints:
+                cmds.delete(jnt)
+
+    # Exporting fbx
+    partition_file_name = file_name + "_" + partition_name + ".fbx"
+    export_path = os.path.join(file_path, partition_file_name)
+
+    print("Exporting FBX: {}".format(export_path))
+    preset_path = export_data.get("preset_path", None)
+    up_axis = export_data.get("up_axis", None)
+    fbx_version = export_data.get("fbx_version", None)
+    file_type = export_data.get("file_type", "binary").lower()
+    # export settings config
+    pfbx.FBXResetExport()
+    # set configuration
+    if preset_path is not None:
+        # load FBX export preset file
+        pfbx.FBXLoadExportPresetFile(f=preset_path)
+    fbx_version_str = None
+    if up_axis is not None:
+        pfbx.FBXExportUpAxis(up_axis.lower())
+    if fbx_version is not None:
+        fbx_version_str = "{}00".format(
+            fbx_version.split("/")[0].replace(" ", "")
+        )
+        pfbx.FBXExportFileVersion(v=fbx_version_str)
+    if file_type == "ascii":
+        pfbx.FBXExportInAscii(v=True)
+
+    cmds.select(clear=True)
+    cmds.select(partition_joints + partition_meshes)
+    pfbx.FBXExport(f=export_path, s=True)
+    return export_path
+
+
+def export_partitions_job(job_path):
+    """
+    Exports the partitions of a job, from the conditioned scene.
+
+    This is called by a MayaBatch process.
+
+    :param str job_path: JSON job file with the scene_path, export_data,
+        report_path and the partitions, as plan entries with their index.
+    """
+    with open(job_path, "r") as f:
+        job = json.load(f)
+    report_path = job["report_path"]
+    export_data = job["export_data"]
+
+    for partition in job["partitions"]:
+        entry = {
+            "index": partition["index"],
+            "partition": partition["name"],
+            "path": None,
+            "error": None,
+        }
+        batch_pool.write_report_entry(
+            report_path, dict(entry, status=batch_pool.STARTED)
+        )
+        try:
+            entry["path"] = export_partition(
+                partition["name"],
+                partition["meshes"],
+                partition["joints"],
+                export_data,
+                job["scene_path"],
+            )
+            entry["status"] = batch_pool.DONE
+        except Exception:
+            entry["error"] = traceback.format_exc().strip().splitlines()[-1]
+            entry["status"] = batch_pool.FAILED
+        batch_pool.write_report_entry(report_path, entry)
+
+
 def _delete_blendshapes():
     """
     Deletes all blendshape objects in the scene.
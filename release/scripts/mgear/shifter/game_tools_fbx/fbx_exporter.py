@@ -18,7 +18,10 @@ from mgear.core import (
 )
 import mgear.shifter.game_tools_disconnect as gtDisc
 from mgear.shifter.game_tools_fbx import (
+    anim_clip_thread,
     anim_clip_widgets,
+    batch_pool,
+    export_cache,
     fbx_export_node,
     partitions_outliner,
     utils,
@@ -334,6 +337,15 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         )
         self.main_layout.addWidget(export_collap_wgt)
 
+        self.force_export_checkbox = QtWidgets.QCheckBox(
+            "Force Export (ignore unchanged cache)"
+        )
+        self.force_export_checkbox.setToolTip(
+            "Exports all the files, even if their content did not change "
+            "since the last export."
+        )
+        export_collap_wgt.addWidget(self.force_export_checkbox)
+
         self.export_tab = QtWidgets.QTabWidget()
         export_collap_wgt.addWidget(self.export_tab)
 
@@ -372,6 +384,23 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         deformers_layout.addWidget(self.partitions_checkbox)
         deformers_layout.addWidget(self.culljoints_checkbox)
 
+        # partition workers
+        partition_workers_layout = QtWidgets.QHBoxLayout()
+        skeletal_mesh_layout.addLayout(partition_workers_layout)
+        partition_workers_label = QtWidgets.QLabel("Partition Workers")
+        self.partition_workers_spinbox = QtWidgets.QSpinBox()
+        self.partition_workers_spinbox.setToolTip(
+            "Number of Maya batch processes that export the partitions. "
+            "With 1 worker the partitions are exported one after the other."
+        )
+        self.partition_workers_spinbox.setRange(
+            1, max(os.cpu_count() or 1, 1)
+        )
+        self.partition_workers_spinbox.setValue(1)
+        partition_workers_layout.addWidget(partition_workers_label)
+        partition_workers_layout.addWidget(self.partition_workers_spinbox)
+        partition_workers_layout.addStretch()
+
         # partitions layout
         self.partitions_label = QtWidgets.QLabel("Partitions")
         skeletal_mesh_layout.addWidget(self.partitions_label)
@@ -406,6 +435,11 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         skeletal_mesh_layout.addWidget(self.skmesh_export_btn)
         skeletal_mesh_layout.addWidget(self.progress_bar)
 
+        # cancel button, visible while the Maya batch export runs
+        self.skmesh_cancel_btn = QtWidgets.QPushButton("Cancel Export")
+        self.skmesh_cancel_btn.setHidden(True)
+        skeletal_mesh_layout.addWidget(self.skmesh_cancel_btn)
+
     def update_progress_bar(self, value):
         self.progress_bar.setValue(int(value))
 
@@ -420,12 +454,44 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         )
         animation_layout.addWidget(self.anim_clips_listwidget)
 
+        # background export options
+        background_layout = QtWidgets.QHBoxLayout()
+        animation_layout.addLayout(background_layout)
+        self.anim_background_checkbox = QtWidgets.QCheckBox(
+            "Export in Background"
+        )
+        self.anim_background_checkbox.setToolTip(
+            "Export the clips with Maya batch processes, "
+            "without blocking Maya."
+        )
+        background_layout.addWidget(self.anim_background_checkbox)
+        background_layout.addWidget(QtWidgets.QLabel("Workers"))
+        self.anim_workers_spinbox = QtWidgets.QSpinBox()
+        self.anim_workers_spinbox.setRange(1, max(os.cpu_count() or 1, 1))
+        self.anim_workers_spinbox.setValue(
+            min(4, self.anim_workers_spinbox.maximum())
+        )
+        background_layout.addWidget(self.anim_workers_spinbox)
+        background_layout.addStretch()
+
         self.anim_export_btn = QtWidgets.QPushButton("Export Animations")
         self.anim_export_btn.setStyleSheet(
             "QPushButton {background:rgb(150, 35, 50);}"
         )
         animation_layout.addWidget(self.anim_export_btn)
 
+        # progress bar
+        self.anim_progress_bar = QtWidgets.QProgressBar(self)
+        self.anim_progress_bar.setAlignment(QtCore.Qt.AlignCenter)
+        self.default_progress_bar(self.anim_progress_bar)
+        self.anim_progress_bar.setHidden(True)
+        animation_layout.addWidget(self.anim_progress_bar)
+
+        # cancel button, visible while the background export runs
+        self.anim_cancel_btn = QtWidgets.QPushButton("Cancel Export")
+        self.anim_cancel_btn.setHidden(True)
+        animation_layout.addWidget(self.anim_cancel_btn)
+
     def create_connections(self):
         # menu connections
         self.file_export_preset_action.triggered.connect(self.export_fbx_presets)
@@ -519,9 +585,13 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             self.remove_skeletal_mesh_partition
         )
         self.skmesh_export_btn.clicked.connect(self.export_skeletal_mesh)
+        self.skmesh_cancel_btn.clicked.connect(
+            self.cancel_skeletal_mesh_export
+        )
 
         # animation connection
         self.anim_export_btn.clicked.connect(self.export_animation_clips)
+        self.anim_cancel_btn.clicked.connect(self.cancel_animation_export)
 
         # partition skinning connection
         self.skinning_checkbox.toggled.connect(self.partition_skinning_toggled)
@@ -746,11 +816,38 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         preset_file_path = self._get_preset_file_path()
         print("\t>>> Preset File Path: {}".format(preset_file_path))
 
+        # Skips the files whose content did not change since last export
+        cache = export_cache.ExportCache(
+            file_path, force=self.force_export_checkbox.isChecked()
+        )
+        hashes = export_cache.get_skeletal_mesh_hashes(export_config)
+        changed_hashes = {
+            name: digest
+            for name, digest in hashes.items()
+            if not cache.is_current(name, digest)
+        }
+        for name in hashes:
+            if name not in changed_hashes:
+                print("\t>>> Unchanged, skipping: {}".format(name))
+        if not changed_hashes:
+            print("----- Skeletal Meshes are up to date -----")
+            return True
+        if use_partitions:
+            export_config["partitions"] = {
+                name: data
+                for name, data in export_config["partitions"].items()
+                if export_cache.get_partition_file_name(file_name, name)
+                in changed_hashes
+            }
+        self._skeletal_mesh_cache = (cache, changed_hashes)
+
         self.default_progress_bar()
         self.progress_bar.setHidden(False)
 
         # Creates a Thread to perform the maya batch in.
-        self.partition_thread = partition_thread.PartitionThread(export_config)
+        self.partition_thread = partition_thread.PartitionThread(
+            export_config, self.partition_workers_spinbox.value()
+        )
         # Settup Thread Signals
         self.partition_thread.completed.connect(self._import_into_unreal)
         self.partition_thread.progress_signal.connect(self.update_progress_bar)
@@ -758,9 +855,17 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.update_progress_bar(5)
         self.partition_thread.init_data()
         self.partition_thread.start()
+        self.skmesh_cancel_btn.setHidden(False)
 
         return True
 
+    def cancel_skeletal_mesh_export(self):
+        """
+        Stops the Maya batch skeletal mesh export.
+        """
+        self.skmesh_cancel_btn.setHidden(True)
+        self.partition_thread.cancel()
+
     def update_progress_bar(self, value: int):
         """
         Updates the progress bar in the GUI.
@@ -771,11 +876,12 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         # if value == 100:
         #     self.progress_bar.setHidden(True)
 
-    def error_progress_bar(self):
+    def error_progress_bar(self, progress_bar=None):
         """
         Sets the progress bar to be red, errored
         """
-        self.progress_bar.setStyleSheet("""
+        progress_bar = progress_bar or self.progress_bar
+        progress_bar.setStyleSheet("""
             QProgressBar {
                 text-align: center;
             }
@@ -783,13 +889,14 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 background-color: #9c1e1e;
             }
         """)
-        self.progress_bar.update()
+        progress_bar.update()
 
-    def default_progress_bar(self):
+    def default_progress_bar(self, progress_bar=None):
         """
         Sets the progress bar to its default green colour.
         """
-        self.progress_bar.setStyleSheet("""
+        progress_bar = progress_bar or self.progress_bar
+        progress_bar.setStyleSheet("""
             QProgressBar {
                 text-align: center;
             }
@@ -797,7 +904,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 background-color: #4CAF50;
             }
         """)
-        self.progress_bar.update()
+        progress_bar.update()
 
 
     def _import_into_unreal(self, export_config, success):
@@ -809,11 +916,18 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
         Recieves the export configuration from the Thread that was completed
         """
+        self.skmesh_cancel_btn.setHidden(True)
         if not success:
             print("ERROR: Export Failed")
             self.error_progress_bar()
             return
 
+        # Records the content of the exported files
+        cache, hashes = self._skeletal_mesh_cache
+        for name, digest in hashes.items():
+            cache.update(name, digest)
+        cache.save()
+
         use_partitions = export_config.get("use_partitions", True)
         partitions = export_config.get("partitions", dict())
         file_name = export_config.get("file_name", "")
@@ -944,6 +1058,34 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         export_config = self._get_current_tool_data()
         anim_clip_data = export_node.get_animation_clips(joint_root)
 
+        # Skips the clips whose content did not change since last export
+        anim_clip_data = [c for c in anim_clip_data if c["enabled"]]
+        cache = export_cache.ExportCache(
+            file_path, force=self.force_export_checkbox.isChecked()
+        )
+        clip_hashes = export_cache.get_clip_hashes(
+            export_config, anim_clip_data
+        )
+        changed_clips = []
+        changed_hashes = []
+        for clip_data, digest in zip(anim_clip_data, clip_hashes):
+            name = export_cache.get_clip_file_name(file_name, clip_data)
+            if cache.is_current(name, digest):
+                print("\t>>> Unchanged, skipping: {}".format(name))
+                continue
+            changed_clips.append(clip_data)
+            changed_hashes.append(digest)
+        if not changed_clips:
+            print("----- Animation Clips are up to date -----")
+            return True
+        anim_clip_data = changed_clips
+        self._anim_clips_cache = (cache, changed_hashes)
+
+        if self.anim_background_checkbox.isChecked():
+            return self.export_animation_clips_in_background(
+                export_config, anim_clip_data
+            )
+
         # Stores the selected objects, before performing the export.
         # These objects will be selected again, upon completion of
         # exporting.
@@ -992,12 +1134,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         export_fbx_paths = []
 
         # Exports each clip
-        for clip_data in anim_clip_data:
-
-            # skip disabled clips.
-            if not clip_data["enabled"]:
-                continue
-
+        for clip_data, digest in zip(anim_clip_data, changed_hashes):
             result = utils.export_animation_clip(export_config, clip_data)
             if not result:
                 print(
@@ -1007,6 +1144,8 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 )
             else:
                 export_fbx_paths.append(result)
+                cache.update(os.path.basename(result), digest)
+        cache.save()
 
         # Load temporary scene after all exportation
         # Set temporary scene file path to stashed scene file path
@@ -1032,6 +1171,103 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 )
         return True
 
+    def export_animation_clips_in_background(
+        self, export_config, anim_clip_data
+    ):
+        """
+        Exports the enabled clips with a pool of Maya batch processes.
+
+        The scene is saved to a temporary .ma file that the workers open, so
+        the current scene is not modified.
+        """
+        clips = [c for c in anim_clip_data if c["enabled"]]
+        if not clips:
+            cmds.warning("No enabled animation clips to export!")
+            return False
+        if export_config.get("file_path", "") == "":
+            print("Error no file path specified")
+            return False
+        os.makedirs(export_config["file_path"], exist_ok=True)
+
+        self.default_progress_bar(self.anim_progress_bar)
+        self.anim_progress_bar.setValue(0)
+        self.anim_progress_bar.setHidden(False)
+        self.anim_export_btn.setEnabled(False)
+
+        self.anim_clip_thread = anim_clip_thread.AnimClipExportThread(
+            export_config, clips, self.anim_workers_spinbox.value()
+        )
+        self.anim_clip_thread.progress_signal.connect(
+            lambda value: self.anim_progress_bar.setValue(int(value))
+        )
+        self.anim_clip_thread.clip_signal.connect(self._anim_clip_reported)
+        self.anim_clip_thread.completed.connect(self._anim_clips_exported)
+        self.anim_clip_thread.init_data()
+        self.anim_clip_thread.start()
+        self.anim_cancel_btn.setHidden(False)
+
+        return True
+
+    def cancel_animation_export(self):
+        """
+        Stops the background animation export. The clips not exported yet
+        are reported as failed.
+        """
+        self.anim_cancel_btn.setHidden(True)
+        self.anim_clip_thread.cancel()
+
+    def _anim_clip_reported(self, result):
+        """
+        Event triggered when a background worker reports a clip status.
+        """
+        if result["status"] == batch_pool.FAILED:
+            print(
+                "\t!!! >>> Failed to export clip: {} - {}".format(
+                    result["clip"], result["error"]
+                )
+            )
+        elif result["status"] == batch_pool.DONE:
+            print("\t>>> Exported clip: {}".format(result["path"]))
+
+    def _anim_clips_exported(self, results, success):
+        """
+        Event triggered when the background export has completed.
+
+        Imports the exported clips into Unreal, if enabled.
+        """
+        self.anim_export_btn.setEnabled(True)
+        self.anim_cancel_btn.setHidden(True)
+        export_fbx_paths = [
+            r["path"] for r in results if r["status"] == batch_pool.DONE
+        ]
+
+        # Records the content of the exported clips
+        cache, hashes = self._anim_clips_cache
+        for result, digest in zip(results, hashes):
+            if result["status"] == batch_pool.DONE:
+                cache.update(os.path.basename(result["path"]), digest)
+        cache.save()
+        print(
+            "----- Exported {} of {} Animation Clips -----".format(
+                len(export_fbx_paths), len(results)
+            )
+        )
+        if not success:
+            self.error_progress_bar(self.anim_progress_bar)
+
+        # Unreal Import, if enabled.
+        if self.ue_import_cbx.isChecked() and export_fbx_paths:
+            skeleton_path = self.ue_skeleton_listwgt.selectedItems()[0].text()
+            unreal_folder = self.ue_file_path_lineedit.text()
+
+            for path in export_fbx_paths:
+                name = os.path.basename(path)
+                animation_name = ".".join(name.split(".")[:-1])
+                uegear.export_animation_to_unreal(
+                    path, unreal_folder, animation_name, skeleton_path
+                )
+        self.anim_progress_bar.setValue(100)
+
     # helper methods
     def _get_or_create_export_node(self):
         """
@@ -1,9 +1,12 @@
+import copy
+import json
 import os
+import shutil
 import subprocess
 from typing import Callable
 import tempfile
-import shlex
 import datetime
+import time
 
 from mgear.vendor.Qt.QtCore import QThread, Signal
 from mgear.core import (
@@ -12,24 +15,41 @@ from mgear.core import (
     utils as coreUtils,
 )
 
+from mgear.shifter.game_tools_fbx import batch_pool
+
 import maya.cmds as cmds
 
+WORKER_FUNCTION = "mgear.shifter.game_tools_fbx.fbx_batch.export_partitions_job"
+
 
 class PartitionThread(QThread):
     """ Thread that handles the creation of fbx partitions"""
 
     completed = Signal(object, bool)
     progress_signal = Signal(float)
+    partition_signal = Signal(object)
 
-    def __init__(self, export_config):
+    def __init__(self, export_config, workers=1, timeout=None):
         """
         Initializes the thread.
+
+        :param dict export_config: exporter configuration.
+        :param int workers: number of Maya batch processes that export the
+            partitions. With 1 worker the partitions are exported by the
+            conditioning process.
+        :param float timeout: seconds each partition Maya batch process can
+            run. None to disable.
         """
         super().__init__()
 
         # self.log_message = log_message_function
 
         self.export_config = export_config
+        self.workers = workers
+        self.timeout = timeout
+
+        # partition results of the concurrent export, in plan order
+        self.results = []
 
         # Makes sure the Thread removes itself
         self.finished.connect(self.deleteLater)
@@ -44,6 +64,13 @@ class PartitionThread(QThread):
         success = self.export_skeletal_mesh()
         self.onComplete(success)
 
+    def cancel(self):
+        """
+        Stops the conditioning or the partition Maya batch processes. The
+        partitions not exported yet are reported as failed.
+        """
+        self.requestInterruption()
+
     def onComplete(self, success):
         """
         Cleans up the thread when the thread is finished.
@@ -82,6 +109,16 @@ class PartitionThread(QThread):
         if not path_is_valid:
             return False
 
+        # Exports the partitions with several workers
+        job_dir = None
+        plan_path = None
+        partitions = export_data.get("partitions", dict())
+        if use_partitions and self.workers > 1 and len(partitions) > 1:
+            job_dir = tempfile.mkdtemp(prefix="mgear_partition_export_")
+            plan_path = string.normalize_path(
+                os.path.join(job_dir, "partition_plan.json")
+            )
+
         # Creates a MEL temporary job file..
         script_content = """
 python "from mgear.shifter.game_tools_fbx import fbx_batch";
@@ -89,7 +126,8 @@ python "master_path='{master_path}'";
 python "root_joint='{joint_root}'";
 python "root_geos={geo_roots}";
 python "export_data={e_data}";
-python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, root_geos, {sk}, {bs}, {ps}, export_data)";
+python "plan_path={plan_path}";
+python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, root_geos, {sk}, {bs}, {ps}, export_data, plan_path)";
 """.format(
             ns=remove_namespaces,
             sc=scene_clean,
@@ -99,59 +137,15 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
             sk=skinning,
             bs=blendshapes,
             ps=use_partitions,
-            e_data=export_data)
+            e_data=export_data,
+            plan_path="'{}'".format(plan_path) if plan_path else None)
 
         script_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.mel')
         script_file.write(script_content)
         script_file_path = script_file.name
         script_file.close()
 
-        mayabatch_dir = coreUtils.get_maya_path()
-        mayabatch_path = None
-        mayabatch_args = None
-        mayabatch_shell = False
-
-        # Depending on the os we would need to change from maya, to maya batch
-        # windows uses mayabatch
-        if str(coreUtils.get_os()) == "win64" or str(coreUtils.get_os()) == "nt":
-            option = "mayabatch"
-        else:
-            option = "maya"
-
-        if option == "maya":
-            mayabatch_command = 'maya'
-            mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
-            mayabatch_args = [shlex.quote(mayabatch_path)]
-            mayabatch_args.append("-batch")
-            mayabatch_shell = False
-            mayabatch_args.append("-script")
-            mayabatch_args.append(shlex.quote(script_file_path))
-            # mayabatch_args.append("-log")
-            # mayabatch_args.append(shlex.quote(log_path))
-
-            print("-------------------------------------------")
-            print("[Launching] MayaBatch")
-            print("   {}".format(mayabatch_args))
-            print("   {}".format(" ".join(mayabatch_args)))
-            print("-------------------------------------------")
-
-        else:
-            mayabatch_command = "maya"
-            mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
-            mayabatch_args = ['"'+mayabatch_path+'"']
-            mayabatch_args.append("-batch")
-            mayabatch_shell = True
-            mayabatch_args.append("-script")
-            mayabatch_args.append('"'+script_file_path+'"')
-            # mayabatch_args.append("-log")
-            # mayabatch_args.append('"'+log_path+'"')
-
-            mayabatch_args = "{}".format(" ".join(mayabatch_args))
-
-            print("-------------------------------------------")
-            print("[Launching] MayaBatch")
-            print("   {}".format(mayabatch_args))
-            print("-------------------------------------------")
+        mayabatch_args, mayabatch_shell = batch_pool.get_mayabatch_args(script_file_path)
 
         self.progress_signal.emit(50)
 
@@ -168,6 +162,10 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
                 # Process each line (sentence) from the subprocess output
                 # Looks for specific sentences in the logs and uses those as progress milestones.
                 for line in process.stdout:
+                    if self.isInterruptionRequested():
+                        process.kill()
+                        print("Mayabatch process cancelled.")
+                        return False
                     line = line.strip()
                     print(line)
                     if line.find("Conditioned file:") >= 0:
@@ -207,9 +205,108 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
             print("[Removing File] {}".format(script_file_path))
             os.remove(script_file_path)
 
+        if plan_path:
+            return self.export_partitions(job_dir, plan_path, export_path)
+
         # If all goes well return the export path location, else None
         return True
 
+    def _update(self, entry):
+        result = self.results[entry["index"]]
+        result.update(
+            (k, entry.get(k)) for k in ("status", "path", "error")
+        )
+        self.partition_signal.emit(dict(result))
+        finished = [
+            r for r in self.results
+            if r["status"] in (batch_pool.DONE, batch_pool.FAILED)
+        ]
+        self.progress_signal.emit(
+            80 + 20.0 * len(finished) / max(len(self.results), 1)
+        )
+
+    def _worker_exited(self, worker, returncode):
+        # partitions not reported by a worker that stopped
+        for partition in worker["job"]["partitions"]:
+            i = partition["index"]
+            if self.results[i]["status"] in (batch_pool.DONE, batch_pool.FAILED):
+                continue
+            self._update(
+                {
+                    "index": i,
+                    "status": batch_pool.FAILED,
+                    "error": worker["error"],
+                }
+            )
+
+    def export_partitions(self, job_dir, plan_path, scene_path):
+        """
+        Exports the partitions of the plan with the Maya batch workers, from
+        the conditioned scene, and removes the conditioned scene.
+
+        :param str job_dir: folder of the job, report and log files.
+        :param str plan_path: partition plan written by the conditioning.
+        :param str scene_path: conditioned .ma file.
+        :return: True if all the partitions were exported.
+        :rtype: bool
+        """
+        try:
+            with open(plan_path, "r") as f:
+                plan = json.load(f)
+            if plan is None:
+                return False
+
+            self.results = [
+                {
+                    "partition": p["name"],
+                    "status": None,
+                    "path": None,
+                    "error": None,
+                }
+                for p in plan
+            ]
+            groups = batch_pool.split_weights(
+                [p["weight"] for p in plan], self.workers
+            )
+            jobs = [
+                {
+                    "scene_path": scene_path,
+                    "export_data": self.export_config,
+                    "partitions": [dict(plan[i], index=i) for i in indices],
+                }
+                for indices in groups
+            ]
+            print("[Partitions] {} workers".format(len(jobs)))
+            batch_pool.run_workers(
+                job_dir,
+                jobs,
+                WORKER_FUNCTION,
+                self._update,
+                self._worker_exited,
+                timeout=self.timeout,
+                is_cancelled=self.isInterruptionRequested,
+            )
+        except (IOError, OSError, ValueError) as error:
+            print("Error:", error)
+            return False
+        finally:
+            if os.path.exists(scene_path):
+                print("[Removing File] {}".format(scene_path))
+                os.remove(scene_path)
+
+        for result in self.results:
+            if result["status"] == batch_pool.FAILED:
+                print(
+                    "Partition {} failed: {}".format(
+                        result["partition"], result["error"]
+                    )
+                )
+        success = all(r["status"] == batch_pool.DONE for r in self.results)
+        # logs are kept to debug the failed partitions
+        if success:
+            shutil.rmtree(job_dir, ignore_errors=True)
+        return success
+
     def init_data(self):
         """
         Initialises the Master .ma files that will be needed by the Thread and Maya batcher.
@@ -248,3 +345,39 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
         print("Temporary Master file: {}".format(master_path))
 
         return
+
+
+def benchmark(export_config, worker_counts=(1, 2, 4)):
+    """
+    Times the skeletal mesh export of the current scene with several worker
+    counts, to compare the concurrent partitions export with the serial one.
+
+    This runs the export in the calling thread, so Maya is blocked until all
+    the exports are done.
+
+    :param dict export_config: exporter configuration, with the partitions.
+    :param tuple(int) worker_counts: worker counts to time.
+    :return: seconds by worker count.
+    :rtype: dict
+    """
+    timings = {}
+    for workers in worker_counts:
+        thread = PartitionThread(copy.deepcopy(export_config), workers)
+        thread.init_data()
+        start = time.time()
+        success = thread.export_skeletal_mesh()
+        timings[workers] = time.time() - start
+        print(
+            "[Benchmark] {} workers: {:.2f}s success: {}".format(
+                workers, timings[workers], success
+            )
+        )
+    serial_time = timings.get(1)
+    if serial_time:
+        for workers, seconds in sorted(timings.items()):
+            print(
+                "[Benchmark] {} workers speed-up: {:.2f}x".format(
+                    workers, serial_time / max(seconds, 1e-6)
+                )
+            )
+    return timings
@@ -20,6 +20,7 @@ from mgear.core import (
     utils as coreUtils,
     animLayers,
 )
+from mgear.shifter.game_tools_fbx import export_cache
 # from mgear.shifter.game_tools_fbx import sdk_utils
 
 NO_EXPORT_TAG = "no_export"
@@ -137,10 +138,7 @@ def export_animation_clip(config_data, clip_data):
         cmds.warning(msg)
         return False
 
-    if title:
-        file_name = "{}_{}".format(file_name, title)
-    if not file_name.endswith(".fbx"):
-        file_name = "{}.fbx".format(file_name)
+    file_name = export_cache.get_clip_file_name(file_name, clip_data)
     path = string.normalize_path(os.path.join(file_path, file_name))
     print("\t>>> Export Path: {}".format(path))
 
@@ -167,8 +165,9 @@ def export_animation_clip(config_data, clip_data):
             animlayer_mute = cmds.animLayer(anim_layer, query=True, mute=True)
             cmds.animLayer(anim_layer, edit=True, mute=False)
 
-        # disable viewport
-        mel.eval("paneLayout -e -manage false $gMainPane")
+        # disable viewport, there is no viewport in batch mode
+        if not cmds.about(batch=True):
+            mel.eval("paneLayout -e -manage false $gMainPane")
 
         pfbx.FBXResetExport()
 
@@ -255,7 +254,8 @@ def export_animation_clip(config_data, clip_data):
             cmds.file(modified=False)
 
         # enable viewport
-        mel.eval("paneLayout -e -manage true $gMainPane")
+        if not cmds.about(batch=True):
+            mel.eval("paneLayout -e -manage true $gMainPane")
 
     return path
 
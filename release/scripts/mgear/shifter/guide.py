@@ -27,6 +27,7 @@ from . import guide_ui as guui
 from . import custom_step_ui as csui
 from . import naming_rules_ui as naui
 from . import naming
+from . import guide_scanner
 
 # pyside
 from maya.app.general.mayaMixin import MayaQDockWidget
@@ -350,6 +351,7 @@ class Rig(Main):
             "attrPrefixName", "bool", False
         )
         self.pWorldCtl = self.addParam("worldCtl", "bool", False)
+        self.pOm2Primitives = self.addParam("om2_primitives", "bool", False)
         self.pWorldCtl_name = self.addParam(
             "world_ctl_name", "string", "world_ctl"
         )
@@ -494,8 +496,14 @@ class Rig(Main):
             "joint_index_padding", "long", 0, 0, 99
         )
 
-    def setFromSelection(self):
-        """Set the guide hierarchy from selection."""
+    def setFromSelection(self, use_cache=False):
+        """Set the guide hierarchy from selection.
+
+        Arguments:
+            use_cache (bool): True to reuse the guide parsed by a previous
+                call if the guide hierarchy has not changed.
+
+        """
         selection = pm.ls(selection=True)
         if not selection:
             selection = pm.ls("guide")
@@ -510,16 +518,20 @@ class Rig(Main):
                 return False
 
         for node in selection:
-            self.setFromHierarchy(node, node.hasAttr("ismodel"))
+            self.setFromHierarchy(
+                node, node.hasAttr("ismodel"), use_cache=use_cache
+            )
 
         return True
 
-    def setFromHierarchy(self, root, branch=True):
+    def setFromHierarchy(self, root, branch=True, use_cache=False):
         """Set the guide from given hierarchy.
 
         Arguments:
             root (dagNode): The root of the hierarchy to parse.
             branch (bool): True to parse children components.
+            use_cache (bool): True to reuse the guide parsed by a previous
+                call if the guide hierarchy has not changed.
 
         """
         startTime = datetime.datetime.now()
@@ -534,6 +546,18 @@ class Rig(Main):
             root = root.getParent()
             mgear.log(root)
 
+        cache_key = (root.longName(), branch)
+        if use_cache:
+            cache_data = guide_scanner.get_cached(cache_key)
+            if cache_data:
+                self.setFromCacheData(cache_data)
+                endTime = datetime.datetime.now()
+                finalTime = endTime - startTime
+                mgear.log(
+                    "Guide loaded from cache in  [ " + str(finalTime) + " ]"
+                )
+                return
+
         # ---------------------------------------------------
         # First check and set the options
         mgear.log("Get options")
@@ -550,49 +574,34 @@ class Rig(Main):
         # ---------------------------------------------------
         # Components
         mgear.log("Get components")
-        self.findComponentRecursive(root, branch)
+        scan = guide_scanner.scan(
+            self.model.longName(), root.longName(), branch
+        )
+        root_names = {}
+        for path in scan["components"]:
+            comp_guide = self.addComponentFromHierarchy(pm.PyNode(path))
+            if comp_guide:
+                root_names[path] = comp_guide.fullName
         endTime = datetime.datetime.now()
         finalTime = endTime - startTime
-        mgear.log("Find recursive in  [ " + str(finalTime) + " ]")
+        mgear.log("Find components in  [ " + str(finalTime) + " ]")
         # Parenting
         if self.valid:
-            for name in self.componentsIndex:
+            for path, name in root_names.items():
+                parent = scan["parents"][path]
+                if not parent or parent[0] not in root_names:
+                    continue
                 mgear.log("Get parenting for: " + name)
-                # TODO: In the future should use connections to retrive this
-                # data
-                # We try the fastes aproach, will fail if is not the top node
-                try:
-                    # search for his parent
-                    compParent = self.components[name].root.getParent()
-                    if compParent and compParent.hasAttr("isGearGuide"):
-
-                        names = naming.get_component_and_relative_name(
-                            compParent.name(long=None)
-                        )
-                        pName = names[0]
-                        pLocal = names[1]
-                        pComp = self.components[pName]
-                        self.components[name].parentComponent = pComp
-                        self.components[name].parentLocalName = pLocal
-                # This will scan the hierachy in reverse. It is much slower
-                except KeyError:
-                    # search children and set him as parent
-                    compParent = self.components[name]
-                    # for localName, element in compParent.getObjects(
-                    #         self.model, False).items():
-                    # NOTE: getObjects3 is an experimental function
-                    for localName, element in compParent.getObjects3(
-                        self.model
-                    ).items():
-                        for name in self.componentsIndex:
-                            compChild = self.components[name]
-                            compChild_parent = compChild.root.getParent()
-                            if (
-                                element is not None
-                                and element == compChild_parent
-                            ):
-                                compChild.parentComponent = compParent
-                                compChild.parentLocalName = localName
+                pComp = self.components[root_names[parent[0]]]
+                pLocal = guide_scanner.get_local_name(
+                    parent[1], pComp.fullName
+                )
+                if pLocal is None:
+                    pLocal = naming.get_component_and_relative_name(
+                        parent[1].split("|")[-1]
+                    )[1]
+                self.components[name].parentComponent = pComp
+                self.components[name].parentLocalName = pLocal
 
             # More option values
             self.addOptionsValues()
@@ -604,11 +613,53 @@ class Rig(Main):
                 "Check logged messages and update the guide.",
                 mgear.sev_warning,
             )
+        elif use_cache:
+            guide_scanner.set_cached(
+                cache_key, self.getCacheData(), scan["transforms"]
+            )
 
         endTime = datetime.datetime.now()
         finalTime = endTime - startTime
         mgear.log("Guide loaded from hierarchy in  [ " + str(finalTime) + " ]")
 
+    def getCacheData(self):
+        """Get the parsed guide data to cache.
+
+        Returns:
+            dict: The parsed guide data.
+        """
+        return {
+            "model": self.model,
+            "paramDefValues": dict(
+                (k, p.value) for k, p in self.paramDefs.items()
+            ),
+            "values": dict(self.values),
+            "controllers_org": self.controllers_org,
+            "controllers": dict(self.controllers),
+            "componentsIndex": list(self.componentsIndex),
+            "components": guide_scanner.copy_components(self.components),
+        }
+
+    def setFromCacheData(self, data):
+        """Set the guide from cached parsed guide data.
+
+        The component guides are copied, so the cached data is not modified
+        by the build.
+
+        Arguments:
+            data (dict): The parsed guide data.
+        """
+        self.model = data["model"]
+        for scriptName, value in data["paramDefValues"].items():
+            self.paramDefs[scriptName].value = value
+        self.values.update(data["values"])
+        self.controllers_org = data["controllers_org"]
+        self.controllers.update(data["controllers"])
+        self.components.update(
+            guide_scanner.copy_components(data["components"])
+        )
+        self.componentsIndex.extend(data["componentsIndex"])
+
     def set_from_dict(self, guide_template_dict):
 
         self.guide_template_dict = guide_template_dict
@@ -726,23 +777,38 @@ class Rig(Main):
             branch (bool): If True search recursive all the children.
         """
 
-        if node.hasAttr("comp_type"):
-            comp_type = node.getAttr("comp_type")
-            comp_guide = self.getComponentGuide(comp_type)
-
-            if comp_guide:
-                comp_guide.setFromHierarchy(node)
-                mgear.log(comp_guide.fullName + " (" + comp_type + ")")
-                if not comp_guide.valid:
-                    self.valid = False
-
-                self.componentsIndex.append(comp_guide.fullName)
-                self.components[comp_guide.fullName] = comp_guide
+        self.addComponentFromHierarchy(node)
 
         if branch:
             for child in node.getChildren(type="transform"):
                 self.findComponentRecursive(child)
 
+    def addComponentFromHierarchy(self, node):
+        """Add the component guide of a component root.
+
+        Arguments:
+            node (dagNode): The component root.
+
+        Returns:
+            The component guide or None if the node is not a component root.
+        """
+        if not node.hasAttr("comp_type"):
+            return None
+
+        comp_type = node.getAttr("comp_type")
+        comp_guide = self.getComponentGuide(comp_type)
+
+        if comp_guide:
+            comp_guide.setFromHierarchy(node)
+            mgear.log(comp_guide.fullName + " (" + comp_type + ")")
+            if not comp_guide.valid:
+                self.valid = False
+
+            self.componentsIndex.append(comp_guide.fullName)
+            self.components[comp_guide.fullName] = comp_guide
+
+        return comp_guide
+
     def getComponentGuide(self, comp_type):
         """Get the componet guide python object
 
@@ -1647,6 +1713,9 @@ class GuideSettings(MayaQWidgetDockableMixin, QtWidgets.QDialog, HelperSlots):
         self.populateCheck(
             self.guideSettingsTab.attrPrefix_checkBox, "attrPrefixName"
         )
+        self.populateCheck(
+            self.guideSettingsTab.om2Primitives_checkBox, "om2_primitives"
+        )
         self.populateCheck(
             self.guideSettingsTab.importSkin_checkBox, "importSkin"
         )
@@ -1855,6 +1924,11 @@ class GuideSettings(MayaQWidgetDockableMixin, QtWidgets.QDialog, HelperSlots):
                 self.updateCheck, tap.attrPrefix_checkBox, "attrPrefixName"
             )
         )
+        tap.om2Primitives_checkBox.stateChanged.connect(
+            partial(
+                self.updateCheck, tap.om2Primitives_checkBox, "om2_primitives"
+            )
+        )
         tap.dataCollector_checkBox.stateChanged.connect(
             partial(
                 self.updateCheck, tap.dataCollector_checkBox, "data_collector"
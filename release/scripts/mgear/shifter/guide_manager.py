@@ -91,6 +91,17 @@ def build_from_selection(*args):
     rg.buildFromSelection()
 
 
+def build_incremental_from_selection(*args):
+    """Rebuild only the components with changes in the selected guide
+
+    Args:
+        *args: None
+    """
+    shifter.log_window()
+    rg = shifter.Rig()
+    rg.buildIncremental()
+
+
 def inspect_settings(tabIdx=0, *args):
     """Open the component or root setting UI.
 
@@ -1,6 +1,3 @@
-import os
-import sys
-import traceback
 from functools import partial
 
 import pymel.core as pm
@@ -10,12 +7,10 @@ from mgear.core import pyqt
 
 from mgear.vendor.Qt import QtCore, QtWidgets, QtGui
 
-from mgear import shifter
 from mgear.shifter import guide_manager
+from mgear.shifter import component_registry
 from mgear.shifter import guide_manager_component_ui as gmcUI
-import importlib
 
-PY2 = sys.version_info[0] == 2
 
 class GuideManagerComponentUI(QtWidgets.QDialog, gmcUI.Ui_Form):
 
@@ -80,46 +75,9 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.setLayout(self.gmc_layout)
 
     def get_component_list(self):
-        comp_list = []
-        compDir = shifter.getComponentDirectories()
-        trackLoadComponent = []
-        for path, comps in compDir.items():
-            pm.progressWindow(title='Loading Components',
-                              progress=0,
-                              max=len(comps))
-            for comp_name in comps:
-                pm.progressWindow(e=True,
-                                  step=1,
-                                  status='\nLoading: %s' % comp_name)
-                if comp_name == "__init__.py":
-                    continue
-                elif comp_name in trackLoadComponent:
-                    pm.displayWarning(
-                        "Custom component name: %s, already in default "
-                        "components. Names should be unique. This component is"
-                        " not loaded" % comp_name)
-                    continue
-                else:
-                    trackLoadComponent.append(comp_name)
-
-                if not os.path.exists(os.path.join(path,
-                                                   comp_name, "__init__.py")):
-                    continue
-                try:
-                    module = shifter.importComponentGuide(comp_name)
-                    if PY2:
-                        reload(module)
-                    else:
-                        importlib.reload(module)
-                    comp_list.append(module.TYPE)
-                except Exception as e:
-                    pm.displayWarning(
-                        "{} can't be load. Error at import".format(comp_name))
-                    pm.displayError(e)
-                    pm.displayError(traceback.format_exc())
-
-        pm.progressWindow(e=True, endProgress=True)
-        return comp_list
+        # the component registry reads the guides info without importing
+        # the components modules
+        return component_registry.get_component_types()
 
     def setSourceModel(self, model):
         """Set the source model for the listview
@@ -224,21 +182,17 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         try:
             item = self.gmcUIInst.component_listView.selectedIndexes()[0]
             comp_name = item.data()
-            module = shifter.importComponentGuide(comp_name)
-            if PY2:
-                reload(module)
-            else:
-                importlib.reload(module)
+            info = component_registry.get_component(comp_name)["info"]
             info_text = (
-                "{}\n".format(module.DESCRIPTION)
+                "{}\n".format(info.get("DESCRIPTION"))
                 + "\n-------------------------------\n\n"
-                + "Author: {}\n".format(module.AUTHOR)
-                + "Url: {}\n".format(module.URL)
-                + "Version: {}\n".format(str(module.VERSION))
-                + "Type: {}\n".format(module.TYPE)
-                + "Name: {}\n".format(module.NAME)
+                + "Author: {}\n".format(info.get("AUTHOR"))
+                + "Url: {}\n".format(info.get("URL"))
+                + "Version: {}\n".format(str(info.get("VERSION")))
+                + "Type: {}\n".format(info.get("TYPE"))
+                + "Name: {}\n".format(info.get("NAME"))
             )
-        except IndexError:
+        except (IndexError, TypeError):
             info_text = ""
 
         self.gmcUIInst.info_plainTextEdit.setPlainText(info_text)
@@ -0,0 +1,326 @@
+"""Shifter guide scanner.
+
+Single pass scan of a guide hierarchy. The guide transforms, the component
+roots and the guide objects are queried with bulk cmds.ls calls and the
+component parenting is resolved with a path index, instead of walking the
+hierarchy node by node.
+
+The parsed guides can be cached. Each cache entry has a dirty counter
+increased by callbacks on the guide transforms (attribute, name, dag
+changes and deletion), so the entry is only reused while the guide is
+untouched in the scene.
+
+The cache registers 4 callbacks on each guide transform, so it is opt-in.
+It is enabled setting the MGEAR_SHIFTER_GUIDE_CACHE environment variable
+to 1.
+"""
+import copy
+import os
+
+import maya.api.OpenMaya as om
+from maya import cmds
+
+CACHE_ENV_KEY = "MGEAR_SHIFTER_GUIDE_CACHE"
+
+COMP_TYPE_ATTR = "comp_type"
+GUIDE_ATTR = "isGearGuide"
+
+# attribute changes that don't modify the parsed guide
+IGNORED_ATTRS = ["visibility", "v"]
+
+_cache = {}
+_scene_callbacks = []
+
+
+#############################################
+# SCAN
+#############################################
+
+
+def _get_parent_path(path):
+    return path.rpartition("|")[0]
+
+
+def get_nodes_with_attr(attr):
+    """Get all the transforms with an attribute in the scene
+
+    Args:
+        attr (str): attribute name
+
+    Returns:
+        set: long names of the transforms
+    """
+    nodes = cmds.ls(
+        "*.{}".format(attr),
+        objectsOnly=True,
+        long=True,
+        recursive=True,
+        type="transform",
+    )
+    return set(nodes or [])
+
+
+def get_component_roots(transforms, comp_nodes, root, branch=True):
+    """Get the component roots under the root, in hierarchy order
+
+    Args:
+        transforms (list): long names of the guide transforms, in depth
+            first order
+        comp_nodes (set): long names of the nodes with the comp_type attr
+        root (str): long name of the root of the scan
+        branch (bool): True to get the children components
+
+    Returns:
+        list: long names of the component roots
+    """
+    if not branch:
+        return [root] if root in comp_nodes else []
+    prefix = root + "|"
+    return [
+        t for t in transforms
+        if t in comp_nodes and (t == root or t.startswith(prefix))
+    ]
+
+
+def get_owner(path, comp_roots):
+    """Get the component root owning a guide object
+
+    The owner is the closest component root in the object path.
+
+    Args:
+        path (str): long name of the guide object
+        comp_roots (set): long names of the component roots
+
+    Returns:
+        str: long name of the component root or None
+    """
+    while path:
+        if path in comp_roots:
+            return path
+        path = _get_parent_path(path)
+    return None
+
+
+def get_parent_index(comp_roots, guide_nodes):
+    """Get the parent guide object and its component of each component
+
+    Args:
+        comp_roots (list): long names of the component roots
+        guide_nodes (set): long names of the nodes with the isGearGuide attr
+
+    Returns:
+        dict: {component root: (parent component root, parent object)}.
+            None if the component is not parented to a scanned component
+    """
+    roots = set(comp_roots)
+    index = {}
+    for root in comp_roots:
+        parent = _get_parent_path(root)
+        owner = None
+        if parent in guide_nodes:
+            owner = get_owner(parent, roots)
+        index[root] = (owner, parent) if owner else None
+    return index
+
+
+def get_local_name(path, comp_full_name):
+    """Get the relative local name of a component guide object
+
+    Args:
+        path (str): long name of the guide object
+        comp_full_name (str): component full name. I.e: "arm_L0"
+
+    Returns:
+        str: local name. I.e: "elbow". None if the object doesn't belong to
+            the component
+    """
+    name = path.split("|")[-1].split(":")[-1]
+    prefix = comp_full_name + "_"
+    if name.startswith(prefix):
+        return name[len(prefix):]
+    return None
+
+
+def scan(model, root, branch=True):
+    """Scan the guide hierarchy
+
+    Args:
+        model (str): long name of the guide model
+        root (str): long name of the root of the scan
+        branch (bool): True to get the children components
+
+    Returns:
+        dict: transforms (all the guide transforms), components (component
+            roots in hierarchy order) and parents (parent index)
+    """
+    transforms = cmds.ls(model, dag=True, long=True, type="transform") or []
+    comp_roots = get_component_roots(
+        transforms, get_nodes_with_attr(COMP_TYPE_ATTR), root, branch
+    )
+    return {
+        "transforms": transforms,
+        "components": comp_roots,
+        "parents": get_parent_index(
+            comp_roots, get_nodes_with_attr(GUIDE_ATTR)
+        ),
+    }
+
+
+#############################################
+# CACHE
+#############################################
+
+
+def is_cache_enabled():
+    """Check if the guide cache is enabled in the environment
+
+    Returns:
+        bool: True if enabled
+    """
+    return os.environ.get(CACHE_ENV_KEY, "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+class GuideWatcher(object):
+    """Dirty counter of a guide hierarchy
+
+    Args:
+        paths (list): long names of the guide transforms
+    """
+
+    def __init__(self, paths):
+        self.counter = 0
+        self._handles = []
+        self._callback_ids = []
+
+        sel = om.MSelectionList()
+        for path in paths:
+            sel.add(path)
+        for i in range(sel.length()):
+            mobj = sel.getDependNode(i)
+            self._handles.append(om.MObjectHandle(mobj))
+            self._callback_ids.extend(
+                [
+                    om.MNodeMessage.addAttributeChangedCallback(
+                        mobj, self._attr_changed
+                    ),
+                    om.MNodeMessage.addNameChangedCallback(
+                        mobj, self._changed
+                    ),
+                    om.MNodeMessage.addNodePreRemovalCallback(
+                        mobj, self._changed
+                    ),
+                    om.MDagMessage.addAllDagChangesDagPathCallback(
+                        sel.getDagPath(i), self._changed
+                    ),
+                ]
+            )
+
+    def _changed(self, *args):
+        self.counter += 1
+
+    def _attr_changed(self, msg, plug, *args):
+        if msg & om.MNodeMessage.kAttributeEval:
+            return
+        if plug.partialName(useLongNames=True) in IGNORED_ATTRS:
+            return
+        self.counter += 1
+
+    def is_alive(self):
+        return all(h.isValid() for h in self._handles)
+
+    def remove(self):
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+        self._handles = []
+
+
+def _register_scene_callbacks():
+    if _scene_callbacks:
+        return
+    for msg in (
+        om.MSceneMessage.kBeforeNew,
+        om.MSceneMessage.kBeforeOpen,
+        om.MSceneMessage.kBeforeRemoveReference,
+        om.MSceneMessage.kBeforeUnloadReference,
+    ):
+        _scene_callbacks.append(
+            om.MSceneMessage.addCallback(msg, lambda *args: clear())
+        )
+
+
+def get_cached(key):
+    """Get a cached parsed guide
+
+    Args:
+        key (hashable): cache key. I.e: (root long name, branch)
+
+    Returns:
+        object: the cached data or None if the guide changed since it was
+            cached
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    watcher = entry["watcher"]
+    if watcher.counter != entry["counter"] or not watcher.is_alive():
+        watcher.remove()
+        del _cache[key]
+        return None
+    return entry["data"]
+
+
+def set_cached(key, data, paths):
+    """Cache a parsed guide
+
+    Args:
+        key (hashable): cache key. I.e: (root long name, branch)
+        data (object): parsed guide data
+        paths (list): long names of the transforms that invalidate the entry
+            when changed
+    """
+    _register_scene_callbacks()
+    if key in _cache:
+        _cache[key]["watcher"].remove()
+    watcher = GuideWatcher(paths)
+    _cache[key] = {
+        "watcher": watcher,
+        "counter": watcher.counter,
+        "data": data,
+    }
+
+
+def clear():
+    """Clear the guide cache"""
+    for entry in _cache.values():
+        entry["watcher"].remove()
+    _cache.clear()
+
+
+def copy_components(components):
+    """Copy the component guides, with their own values and transforms
+
+    The parent component references point to the copies.
+
+    Args:
+        components (dict): component guides by full name
+
+    Returns:
+        dict: the copied component guides by full name
+    """
+    copies = {}
+    for name, comp in components.items():
+        new = copy.copy(comp)
+        for attr, value in vars(comp).items():
+            if isinstance(value, (dict, list)):
+                setattr(new, attr, copy.copy(value))
+        copies[name] = new
+    for new in copies.values():
+        parent = getattr(new, "parentComponent", None)
+        if parent is not None:
+            new.parentComponent = copies.get(parent.fullName, parent)
+    return copies
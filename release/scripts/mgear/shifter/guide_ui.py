@@ -86,6 +86,9 @@ class Ui_Form(object):
         self.step_comboBox.addItem("")
         self.formLayout.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.step_comboBox)
         self.gridLayout_3.addLayout(self.formLayout, 0, 0, 1, 1)
+        self.om2Primitives_checkBox = QtWidgets.QCheckBox(self.groupBox)
+        self.om2Primitives_checkBox.setObjectName("om2Primitives_checkBox")
+        self.gridLayout_3.addWidget(self.om2Primitives_checkBox, 1, 0, 1, 1)
         self.gridLayout_2.addWidget(self.groupBox, 0, 0, 1, 1)
         self.groupBox_2 = QtWidgets.QGroupBox(Form)
         self.groupBox_2.setObjectName("groupBox_2")
@@ -516,6 +519,8 @@ class Ui_Form(object):
         self.mode_label.setText(QtWidgets.QApplication.translate("Form", "Debug Mode", None, -1))
         self.mode_comboBox.setItemText(0, QtWidgets.QApplication.translate("Form", "Final", None, -1))
         self.mode_comboBox.setItemText(1, QtWidgets.QApplication.translate("Form", "WIP", None, -1))
+        self.om2Primitives_checkBox.setToolTip(QtWidgets.QApplication.translate("Form", "<html><head/><body><p>If this option is checked. The primitives, attributes and matrix nodes are created with OpenMaya 2.0 during the build.</p><p>The nodes are converted to PyNodes only when the PyMEL API is used on them.</p><p><span style=\" font-weight:600;\">NOTE</span>: The node creation is not registered in the undo queue.</p></body></html>", None, -1))
+        self.om2Primitives_checkBox.setText(QtWidgets.QApplication.translate("Form", "Fast Node Creation (OpenMaya 2.0)", None, -1))
         self.step_label.setText(QtWidgets.QApplication.translate("Form", "Guide Build Steps:", None, -1))
         self.step_comboBox.setItemText(0, QtWidgets.QApplication.translate("Form", "All Steps", None, -1))
         self.step_comboBox.setItemText(1, QtWidgets.QApplication.translate("Form", "Objects", None, -1))
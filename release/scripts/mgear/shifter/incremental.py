@@ -0,0 +1,509 @@
+"""Incremental Shifter rebuild.
+
+Rebuild only the components whose guide data changed since the last build.
+
+Each component guide template dictionary (plus the hash of its parent
+component and its control shape buffers) is hashed and the hashes are stored
+on the rig model, together with the nodes created by each component, the
+attributes it added to other nodes (i.e: its UI host) and its relatives
+names.
+
+On rebuild, the changed components and their dependents (child components
+and components referencing them in their settings) are deleted and built
+again, while the untouched components are represented by BuiltComponent
+stand-ins that resolve their relatives from the stored names.
+"""
+import hashlib
+import json
+
+import pymel.core as pm
+from maya import cmds
+from maya.api import OpenMaya as om
+
+import mgear
+from mgear.core import attribute
+from mgear.core.six import string_types
+
+HASHES_ATTR = "guide_hashes"
+INCREMENTAL_DATA_ATTR = "incremental_data"
+GLOBAL_KEY = "__global__"
+
+
+# =====================================================
+# HASHES
+# =====================================================
+
+
+def hash_data(data):
+    """Stable hash of JSON compatible data
+
+    Args:
+        data (variant): data to hash
+
+    Returns:
+        str: hexadecimal hash
+    """
+    data_string = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(data_string.encode("utf-8")).hexdigest()
+
+
+def get_component_hashes(template):
+    """Get the guide hashes of each component
+
+    The hash of a component includes its guide data, the control shapes
+    buffers of the component and the hash of its parent component. So a
+    change in a parent changes the hash of all its children.
+
+    Args:
+        template (dict): guide template dictionary from
+            guide.Rig.get_guide_template_dict
+
+    Returns:
+        dict: {component fullName: hash, GLOBAL_KEY: guide root settings hash}
+    """
+    comps = template["components_dict"]
+    buffers = template.get("ctl_buffers_dict") or {}
+    buffer_names = buffers.get("curves_names", [])
+
+    hashes = {}
+
+    def _hash(name):
+        if name in hashes:
+            return hashes[name]
+        c_dict = dict(comps[name])
+        # adding a child component should not change the parent
+        c_dict.pop("child_components", None)
+        prefix = name + "_"
+        c_dict["ctl_buffers"] = [
+            buffers[b] for b in buffer_names if b.startswith(prefix)
+        ]
+        parent = c_dict.get("parent_fullName")
+        if parent in comps:
+            c_dict["parent_hash"] = _hash(parent)
+        hashes[name] = hash_data(c_dict)
+        return hashes[name]
+
+    for name in template["components_list"]:
+        _hash(name)
+
+    hashes[GLOBAL_KEY] = hash_data(template["guide_root"]["param_values"])
+    return hashes
+
+
+def get_references(param_values, names):
+    """Get the components referenced in the component settings
+
+    Args:
+        param_values (dict): component settings
+        names (list): components fullName
+
+    Returns:
+        set, set: components referenced by name (the component object is
+            used, i.e: masterChainA) and components referenced by a guide
+            name (its relatives are used, i.e: ikrefarray)
+    """
+    components = set()
+    relatives = set()
+    for value in param_values.values():
+        if not isinstance(value, string_types):
+            continue
+        for token in value.replace("|", ",").split(","):
+            token = token.strip()
+            if not token:
+                continue
+            if token in names:
+                components.add(token)
+                continue
+            for name in names:
+                if token.startswith(name + "_"):
+                    relatives.add(name)
+    return components, relatives
+
+
+def get_dirty_components(template, old_hashes, new_hashes):
+    """Get the components to rebuild
+
+    A component is rebuilt if its hash changed or if it depends on a rebuilt
+    or removed component: child components and components referencing it in
+    the settings. The components referenced by name from a rebuilt component
+    are rebuilt too, since the stand-ins only provide the relatives.
+
+    Args:
+        template (dict): guide template dictionary
+        old_hashes (dict): hashes stored in the built rig
+        new_hashes (dict): hashes of the current guide
+
+    Returns:
+        list, list: components to rebuild, in build order and components
+            removed from the guide
+    """
+    comps_list = template["components_list"]
+    comps = template["components_dict"]
+    removed = [
+        name for name in old_hashes
+        if name != GLOBAL_KEY and name not in comps
+    ]
+    names = set(comps_list) | set(removed)
+
+    depends = {}
+    used_components = {}
+    for name in comps_list:
+        c_dict = comps[name]
+        components, relatives = get_references(c_dict["param_values"], names)
+        used_components[name] = components
+        depends[name] = components | relatives
+        if c_dict.get("parent_fullName"):
+            depends[name].add(c_dict["parent_fullName"])
+
+    dirty = set(
+        name for name in comps_list
+        if old_hashes.get(name) != new_hashes[name]
+    )
+    changed = dirty | set(removed)
+    while changed:
+        new_dirty = set()
+        for name in comps_list:
+            if name not in dirty and depends[name] & changed:
+                new_dirty.add(name)
+        for name in changed:
+            new_dirty |= used_components.get(name, set()) - dirty
+        new_dirty -= set(removed)
+        dirty |= new_dirty
+        changed = new_dirty
+
+    return [name for name in comps_list if name in dirty], removed
+
+
+# =====================================================
+# NODE RECORDER
+# =====================================================
+
+
+class NodeRecorder(object):
+    """Record the nodes created by each component during the build, and the
+    attributes added by each component to the transforms created by others.
+
+    Uses Maya node added and attribute added callbacks, so the cost is small
+    compared with listing the scene before and after each step.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.attributes = {}
+        self.current = None
+        self._handles = []
+        self._attribute_handles = []
+        self._callback_id = None
+        self._attribute_callback_ids = []
+
+    def start(self, nodes=None):
+        """Start recording
+
+        Args:
+            nodes (list, optional): names of the transforms created before
+                the build that can get attributes from the components
+        """
+        self._callback_id = om.MDGMessage.addNodeAddedCallback(
+            self._node_added, "dependNode"
+        )
+        if nodes:
+            sel = om.MSelectionList()
+            for name in nodes:
+                sel.add(name)
+            for i in range(sel.length()):
+                self._watch_attributes(sel.getDependNode(i))
+
+    def stop(self):
+        if self._callback_id is not None:
+            om.MMessage.removeCallback(self._callback_id)
+            self._callback_id = None
+        for callback_id in self._attribute_callback_ids:
+            om.MMessage.removeCallback(callback_id)
+        self._attribute_callback_ids = []
+
+    def _watch_attributes(self, mobject):
+        self._attribute_callback_ids.append(
+            om.MNodeMessage.addAttributeAddedOrRemovedCallback(
+                mobject, self._attribute_added
+            )
+        )
+
+    def _node_added(self, mobject, *args):
+        if self.current is not None:
+            self._handles.append((self.current, om.MObjectHandle(mobject)))
+        # only transforms are used as UI host
+        if mobject.hasFn(om.MFn.kTransform):
+            self._watch_attributes(mobject)
+
+    def _attribute_added(self, message, plug, *args):
+        if (
+            self.current is None
+            or not message & om.MNodeMessage.kAttributeAdded
+            or plug.isChild
+        ):
+            return
+        self._attribute_handles.append(
+            (
+                self.current,
+                om.MObjectHandle(plug.node()),
+                plug.partialName(useLongNames=True),
+            )
+        )
+
+    @staticmethod
+    def _node_name(handle):
+        mobject = handle.object()
+        if mobject.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(mobject).partialPathName()
+        return om.MFnDependencyNode(mobject).name()
+
+    def get_nodes(self):
+        """Get the recorded nodes names still alive
+
+        Returns:
+            dict: {component fullName: [node names]}
+        """
+        for comp_name, handle in self._handles:
+            if not handle.isValid():
+                continue
+            self.nodes.setdefault(comp_name, []).append(
+                self._node_name(handle)
+            )
+        self._handles = []
+        return self.nodes
+
+    def get_attributes(self):
+        """Get the recorded attributes added to nodes of other components
+
+        Returns:
+            dict: {component fullName: [node.attribute names]}
+        """
+        nodes = self.get_nodes()
+        own_nodes = dict((k, set(v)) for k, v in nodes.items())
+        for comp_name, handle, attr_name in self._attribute_handles:
+            if not handle.isValid():
+                continue
+            node_name = self._node_name(handle)
+            if node_name in own_nodes.get(comp_name, ()):
+                continue
+            self.attributes.setdefault(comp_name, []).append(
+                "{}.{}".format(node_name, attr_name)
+            )
+        self._attribute_handles = []
+        return self.attributes
+
+
+# =====================================================
+# COMPONENT STAND-IN
+# =====================================================
+
+
+def _to_node(name):
+    if name and cmds.objExists(name):
+        return pm.PyNode(name)
+    return None
+
+
+class BuiltComponent(object):
+    """Stand-in of an already built component.
+
+    Provides the subset of the component.Main API used by the other
+    components (relatives, joints, UI host) from the data stored on the rig.
+    """
+
+    def __init__(self, rig, guide, data):
+        self.rig = rig
+        self.guide = guide
+        self.settings = guide.values
+        self.fullName = data["FullName"]
+        self.name = data["Name"]
+        self.side = data["Side"]
+        self.index = data["Index"]
+        self.type = data["Type"]
+        self.build_data = data.get("build_data", {})
+
+        self.root = _to_node(data.get("root"))
+        self.ui = None
+        self.uihost = self.root
+        self.relatives = dict(
+            (k, _to_node(v)) for k, v in data["relatives"].items()
+        )
+        self.controlRelatives = dict(
+            (k, _to_node(v)) for k, v in data["controlRelatives"].items()
+        )
+        self.jointRelatives = data["jointRelatives"]
+        self.aliasRelatives = data["aliasRelatives"]
+        self.jointList = [_to_node(j) for j in data["joints"]]
+        self.controlers = [
+            c for c in (_to_node(n) for n in data["controls"]) if c
+        ]
+        self.hostRelatives = dict(
+            (k, _to_node(v)) for k, v in data["hostRelatives"].items()
+        )
+        self.groups = {}
+        self.subGroups = {}
+
+    def getRelation(self, name):
+        if name not in self.relatives.keys():
+            mgear.log(
+                "Can't find reference for object : "
+                + self.fullName
+                + "."
+                + name,
+                mgear.sev_error,
+            )
+            return False
+        return self.relatives[name]
+
+    def getControlRelation(self, name):
+        if name not in self.controlRelatives.keys():
+            mgear.log(
+                "Control tag relative: Can't find reference for "
+                " object : " + self.fullName + "." + name,
+                mgear.sev_error,
+            )
+            return False
+        return self.controlRelatives[name]
+
+
+def get_component_data(comp, nodes, attributes=None):
+    """Data stored on the rig to rebuild the stand-in of a component
+
+    Args:
+        comp (component.Main or BuiltComponent): built component
+        nodes (list): names of the nodes created by the component
+        attributes (list, optional): attributes added by the component to
+            nodes of other components
+
+    Returns:
+        dict: component data
+    """
+
+    def _names(relatives):
+        result = {}
+        for key, relative in relatives.items():
+            if isinstance(relative, pm.PyNode):
+                result[key] = relative.longName()
+            else:
+                result[key] = None
+        return result
+
+    return {
+        "FullName": comp.fullName,
+        "Name": comp.name,
+        "Side": comp.side,
+        "Index": comp.index,
+        "Type": comp.guide.type,
+        "root": comp.root.longName() if comp.root else None,
+        "relatives": _names(comp.relatives),
+        "controlRelatives": _names(comp.controlRelatives),
+        "jointRelatives": comp.jointRelatives,
+        "aliasRelatives": comp.aliasRelatives,
+        "hostRelatives": _names(comp.hostRelatives),
+        "joints": [j.longName() if j else None for j in comp.jointList],
+        "controls": [c.longName() for c in comp.controlers],
+        "build_data": comp.build_data,
+        "nodes": nodes,
+        "attributes": attributes or [],
+    }
+
+
+# =====================================================
+# RIG STORAGE
+# =====================================================
+
+
+def store(rig, hashes, nodes, previous_data=None, attributes=None):
+    """Store the hashes and the components data on the rig model
+
+    Args:
+        rig (shifter.Rig): the built rig
+        hashes (dict): component hashes
+        nodes (dict): {component fullName: [node names]} of the built
+            components
+        previous_data (dict, optional): stored data of the components that
+            were not rebuilt
+        attributes (dict, optional): {component fullName: [attributes]}
+            added by the built components to nodes of other components
+    """
+    attributes = attributes or {}
+    data = {}
+    for name in rig.componentsIndex:
+        comp = rig.components[name]
+        if isinstance(comp, BuiltComponent) and previous_data:
+            data[name] = previous_data[name]
+        else:
+            data[name] = get_component_data(
+                comp, nodes.get(name, []), attributes.get(name)
+            )
+
+    for attr_name, value in (
+        (HASHES_ATTR, hashes),
+        (INCREMENTAL_DATA_ATTR, data),
+    ):
+        value = json.dumps(value, default=str)
+        if rig.model.hasAttr(attr_name):
+            rig.model.attr(attr_name).set(value)
+        else:
+            attribute.addAttribute(rig.model, attr_name, "string", value)
+
+
+def load(model):
+    """Load the hashes and components data stored on a rig model
+
+    Args:
+        model (PyNode): rig model
+
+    Returns:
+        dict, dict: hashes and components data. None if not stored
+    """
+    if not model.hasAttr(HASHES_ATTR) or not model.hasAttr(
+        INCREMENTAL_DATA_ATTR
+    ):
+        return None, None
+    hashes = json.loads(model.attr(HASHES_ATTR).get())
+    data = json.loads(model.attr(INCREMENTAL_DATA_ATTR).get())
+    return hashes, data
+
+
+def find_rig_model(rig_name):
+    """Find a built rig with incremental data
+
+    Args:
+        rig_name (str): rig name
+
+    Returns:
+        PyNode: rig model or None
+    """
+    for model in pm.ls(rig_name, type="transform"):
+        if model.hasAttr("is_rig") and model.hasAttr(HASHES_ATTR):
+            return model
+    return None
+
+
+def delete_component_nodes(comps_data, names):
+    """Delete the nodes created by the components, and the attributes they
+    added to the nodes of other components
+
+    Args:
+        comps_data (dict): stored components data
+        names (list): components fullName to delete
+    """
+    # in reverse creation order, so the attributes can be rebuilt with the
+    # same names and indices
+    for name in names:
+        for attr in reversed(comps_data.get(name, {}).get("attributes", [])):
+            if cmds.objExists(attr):
+                cmds.setAttr(attr, lock=False)
+                node, attr_name = attr.split(".", 1)
+                cmds.deleteAttr(node, attribute=attr_name)
+
+    nodes = []
+    for name in names:
+        for node in comps_data.get(name, {}).get("nodes", []):
+            if cmds.objExists(node):
+                nodes.append(node)
+    if nodes:
+        # lockNode and locked attributes do not block the deletion of nodes
+        cmds.lockNode(nodes, lock=False)
+        cmds.delete(nodes)
@@ -4,6 +4,7 @@ import json
 import sys
 import pymel.core as pm
 from mgear import shifter
+from mgear.shifter import guide_scanner
 from mgear.core import curve
 
 if sys.version_info[0] == 2:
@@ -25,7 +26,9 @@ def get_guide_template_dict(guide_node, meta=None):
     """
     try:
         rig = shifter.Rig()
-        rig.guide.setFromHierarchy(guide_node)
+        rig.guide.setFromHierarchy(
+            guide_node, use_cache=guide_scanner.is_cache_enabled()
+        )
         return rig.guide.get_guide_template_dict(meta)
     except TypeError:
         pm.displayWarning("The selected object is not a valid guide element")
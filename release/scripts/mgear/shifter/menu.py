@@ -16,6 +16,11 @@ def install():
         ("Extract Controls", str_extract_controls, "mgear_move.svg"),
         ("-----", None),
         ("Build from Selection", str_build_from_selection, "mgear_play.svg"),
+        (
+            "Incremental Build from Selection",
+            str_build_incremental_from_selection,
+            "mgear_play.svg",
+        ),
         (
             "Build From Guide Template File",
             str_build_from_file,
@@ -231,6 +236,11 @@ from mgear.shifter import guide_manager
 guide_manager.build_from_selection()
 """
 
+str_build_incremental_from_selection = """
+from mgear.shifter import guide_manager
+guide_manager.build_incremental_from_selection()
+"""
+
 str_build_from_file = """
 from mgear.shifter import io
 io.build_from_file(None)
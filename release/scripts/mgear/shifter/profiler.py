@@ -0,0 +1,422 @@
+"""Shifter build profiler.
+
+Opt-in instrumentation of the rig build. Records the wall time, the number
+of nodes created and the number of Python calls of each component step,
+each custom step and each rig build stage.
+
+The profiling is enabled setting the MGEAR_SHIFTER_BUILD_PROFILE
+environment variable to 1. The profile is saved next to the data collector
+output, or in the temp folder, as JSON and as Chrome trace
+(chrome://tracing or https://ui.perfetto.dev).
+
+Compare two builds to catch performance regressions:
+
+    >>> from mgear.shifter import profiler
+    >>> print(profiler.compare_report("before.profile.json",
+    ...                               "after.profile.json"))
+
+Time a full build with the OpenMaya 2.0 node creation off and on, and the
+import of the Shifter modules in a new mayapy process:
+
+    >>> profiler.benchmark_om2_primitives("guide")
+    >>> profiler.time_import("mgear.shifter")
+"""
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import subprocess
+import tempfile
+import timeit
+
+from maya.api import OpenMaya as om
+
+PROFILE_ENV_KEY = "MGEAR_SHIFTER_BUILD_PROFILE"
+PROFILE_EXT = ".profile.json"
+TRACE_EXT = ".trace.json"
+
+COMPONENT_CATEGORY = "component"
+CUSTOM_STEP_CATEGORY = "custom_step"
+RIG_CATEGORY = "rig"
+
+
+def is_enabled():
+    """Check if the build profiling is enabled in the environment
+
+    Returns:
+        bool: True if enabled
+    """
+    return os.environ.get(PROFILE_ENV_KEY, "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+class BuildProfiler(object):
+    """Record the build events
+
+    Args:
+        enabled (bool, optional): If False, record does nothing
+        count_nodes (bool, optional): Count the created nodes
+        count_calls (bool, optional): Count the Python function calls. Adds
+            some overhead to the recorded wall time.
+    """
+
+    def __init__(self, enabled=True, count_nodes=True, count_calls=True):
+        self.enabled = enabled
+        self.count_nodes = count_nodes
+        self.count_calls = count_calls
+        self.events = []
+        self.metadata = {}
+        self._origin = None
+        self._nodes = 0
+        self._callback_ids = []
+
+    def _node_added(self, *args):
+        self._nodes += 1
+
+    def _node_removed(self, *args):
+        self._nodes -= 1
+
+    def start(self):
+        if not self.enabled:
+            return
+        if self._origin is None:
+            self._origin = timeit.default_timer()
+        # the callbacks are registered again after a stop
+        if self.count_nodes and not self._callback_ids:
+            self._callback_ids = [
+                om.MDGMessage.addNodeAddedCallback(self._node_added),
+                om.MDGMessage.addNodeRemovedCallback(self._node_removed),
+            ]
+
+    def stop(self):
+        for callback_id in self._callback_ids:
+            om.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+
+    @contextlib.contextmanager
+    def record(self, name, category, **kwargs):
+        """Record the code executed in the context
+
+        Args:
+            name (str): event name. I.e: the step name
+            category (str): event category
+            **kwargs: event arguments. I.e: component and component type
+        """
+        if not self.enabled:
+            yield
+            return
+        self.start()
+
+        profile = None
+        if self.count_calls:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # other profiler active
+                profile = None
+
+        nodes = self._nodes
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            end = timeit.default_timer()
+            calls = None
+            if profile:
+                profile.disable()
+                calls = pstats.Stats(profile).total_calls
+            event = {
+                "name": name,
+                "category": category,
+                "start": start - self._origin,
+                "duration": end - start,
+                "nodes": self._nodes - nodes if self.count_nodes else None,
+                "calls": calls,
+            }
+            event.update(kwargs)
+            self.events.append(event)
+
+    def to_dict(self):
+        """Get the profile data
+
+        Returns:
+            dict: metadata, events and summary
+        """
+        return {
+            "metadata": self.metadata,
+            "events": self.events,
+            "summary": summarize(self.events),
+        }
+
+    def to_chrome_trace(self):
+        """Get the events in Chrome trace event format
+
+        Returns:
+            dict: trace data
+        """
+        trace_events = []
+        for event in self.events:
+            args = dict(
+                (k, v)
+                for k, v in event.items()
+                if k not in ("name", "category", "start", "duration")
+            )
+            trace_events.append(
+                {
+                    "name": _event_label(event),
+                    "cat": event["category"],
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": event["duration"] * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": trace_events, "otherData": self.metadata}
+
+    def save(self, base_path):
+        """Save the profile as JSON and as Chrome trace
+
+        Args:
+            base_path (str): path without extension
+
+        Returns:
+            str, str: profile and trace file paths
+        """
+        profile_path = base_path + PROFILE_EXT
+        trace_path = base_path + TRACE_EXT
+        with open(profile_path, "w") as f:
+            f.write(json.dumps(self.to_dict(), indent=4))
+        with open(trace_path, "w") as f:
+            f.write(json.dumps(self.to_chrome_trace()))
+        return profile_path, trace_path
+
+
+def _event_label(event):
+    if event.get("component"):
+        return "{} : {}".format(event["name"], event["component"])
+    return event["name"]
+
+
+def _event_key(event):
+    # component steps are compared by component type
+    if event["category"] == COMPONENT_CATEGORY:
+        return "{} | {}".format(event.get("type"), event["name"])
+    return "{} | {}".format(event["category"], event["name"])
+
+
+def summarize(events):
+    """Aggregate the events by component type and step
+
+    Args:
+        events (list): profile events
+
+    Returns:
+        dict: {key: {"count", "duration", "nodes", "calls"}}
+    """
+    summary = {}
+    for event in events:
+        data = summary.setdefault(
+            _event_key(event),
+            {"count": 0, "duration": 0.0, "nodes": 0, "calls": 0},
+        )
+        data["count"] += 1
+        data["duration"] += event["duration"]
+        data["nodes"] += event.get("nodes") or 0
+        data["calls"] += event.get("calls") or 0
+    return summary
+
+
+def load(path):
+    """Load a saved profile
+
+    Args:
+        path (str): profile file path
+
+    Returns:
+        dict: profile data
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare(profile_a, profile_b, threshold=0.1, min_duration=0.01):
+    """Compare the summary of two profiles
+
+    Args:
+        profile_a (dict): reference profile data
+        profile_b (dict): new profile data
+        threshold (float, optional): relative duration increase to flag
+            a regression
+        min_duration (float, optional): durations under this value, in
+            seconds, are never flagged
+
+    Returns:
+        list: rows dictionaries sorted by duration difference, bigger first
+    """
+    summary_a = profile_a["summary"]
+    summary_b = profile_b["summary"]
+    rows = []
+    for key in set(summary_a) | set(summary_b):
+        a = summary_a.get(key)
+        b = summary_b.get(key)
+        duration_a = a["duration"] if a else 0.0
+        duration_b = b["duration"] if b else 0.0
+        delta = duration_b - duration_a
+        ratio = delta / duration_a if duration_a else None
+        regression = (
+            duration_b >= min_duration
+            and (ratio is None or ratio > threshold)
+            and delta > 0
+        )
+        rows.append(
+            {
+                "key": key,
+                "duration_a": duration_a,
+                "duration_b": duration_b,
+                "delta": delta,
+                "ratio": ratio,
+                "nodes_a": a["nodes"] if a else None,
+                "nodes_b": b["nodes"] if b else None,
+                "calls_a": a["calls"] if a else None,
+                "calls_b": b["calls"] if b else None,
+                "regression": regression,
+            }
+        )
+    rows.sort(key=lambda r: r["delta"], reverse=True)
+    return rows
+
+
+def compare_report(path_a, path_b, threshold=0.1, min_duration=0.01):
+    """Text report of the comparison of two saved profiles
+
+    Args:
+        path_a (str): reference profile path
+        path_b (str): new profile path
+        threshold (float, optional): relative duration increase to flag
+            a regression
+        min_duration (float, optional): durations under this value, in
+            seconds, are never flagged
+
+    Returns:
+        str: report
+    """
+    rows = compare(load(path_a), load(path_b), threshold, min_duration)
+    lines = [
+        "{:<50} {:>10} {:>10} {:>9} {:>13} {:>15}".format(
+            "Component type | step", "A (s)", "B (s)", "Diff %",
+            "Nodes A/B", "Calls A/B"
+        )
+    ]
+    for row in rows:
+        if row["ratio"] is None:
+            ratio = "new" if row["duration_b"] else "-"
+        else:
+            ratio = "{:+.1f}".format(row["ratio"] * 100)
+        lines.append(
+            "{:<50} {:>10.4f} {:>10.4f} {:>9} {:>13} {:>15} {}".format(
+                row["key"],
+                row["duration_a"],
+                row["duration_b"],
+                ratio,
+                "{}/{}".format(row["nodes_a"], row["nodes_b"]),
+                "{}/{}".format(row["calls_a"], row["calls_b"]),
+                "<< REGRESSION" if row["regression"] else "",
+            ).rstrip()
+        )
+    regressions = len([r for r in rows if r["regression"]])
+    lines.append("{} regression(s) found".format(regressions))
+    return "\n".join(lines)
+
+
+def get_output_base_path(options):
+    """Get the profile output path, without extension
+
+    Next to the data collector output if it is enabled. Otherwise in the
+    temp folder.
+
+    Args:
+        options (dict): rig guide options
+
+    Returns:
+        str: base path
+    """
+    if options.get("data_collector") and options.get("data_collector_path"):
+        return os.path.splitext(options["data_collector_path"])[0]
+    return os.path.join(
+        tempfile.gettempdir(), "{}_build".format(options["rig_name"])
+    )
+
+
+def benchmark_om2_primitives(guide_root="guide", repeat=1):
+    """Time a full build with the om2_primitives guide option off and on
+
+    The guide option is restored, and the built rigs are deleted.
+
+    Args:
+        guide_root (str, optional): guide root node
+        repeat (int, optional): number of builds for each value, the best
+            time is kept
+
+    Returns:
+        dict: {om2_primitives value: build seconds}
+    """
+    from maya import cmds
+
+    from mgear import shifter
+
+    attr = guide_root + ".om2_primitives"
+    original = cmds.getAttr(attr)
+    times = {}
+    try:
+        for value in (False, True):
+            cmds.setAttr(attr, value)
+            durations = []
+            for _ in range(repeat):
+                cmds.select(guide_root)
+                rig = shifter.Rig()
+                start = timeit.default_timer()
+                rig.buildFromSelection()
+                durations.append(timeit.default_timer() - start)
+                cmds.delete(str(rig.model))
+            times[value] = min(durations)
+    finally:
+        cmds.setAttr(attr, original)
+    return times
+
+
+def time_import(module="mgear.shifter", mayapy_path=None, repeat=3):
+    """Time the import of a module in a new mayapy process
+
+    Args:
+        module (str, optional): module to import
+        mayapy_path (str, optional): mayapy executable. From the
+            MAYA_LOCATION environment if None
+        repeat (int, optional): number of processes, the best time is kept
+
+    Returns:
+        float: import seconds
+    """
+    from mgear.shifter.rig_builder import batch
+
+    executor = batch.MayapyExecutor(mayapy_path)
+    code = (
+        "import timeit\n"
+        "start = timeit.default_timer()\n"
+        "import {}\n"
+        "print(timeit.default_timer() - start)"
+    ).format(module)
+    durations = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [executor.mayapy_path, "-c", code],
+            env=executor.get_environment(),
+        )
+        durations.append(float(output.decode().strip().splitlines()[-1]))
+    return min(durations)
@@ -0,0 +1,292 @@
+"""
+Rig Builder Batch
+
+Parallel execution of the Rig Builder configuration rows.
+
+Each row of a .srb configuration is an independent build: import the guide
+template, build, validate and save. Instead of walking the rows one after
+another in the current Maya session, the BatchScheduler fans them out to a
+pool of executors and collects the serialized validator results back.
+
+Executors
+---------
+- MayapyExecutor: builds each row in a fresh headless ``mayapy`` process
+  running ``worker.py``.
+- LocalExecutor: runs a python callable in the current process. It is used
+  as a stand-in to test the scheduling, result aggregation and failure
+  isolation without Maya.
+
+Note
+----
+This module does not import Maya, so it can be imported from any python
+interpreter.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# mgear scripts folder. Added to the worker PYTHONPATH, since mayapy does
+# not know about the mGear module before Maya standalone is initialized.
+SCRIPTS_DIR = os.path.dirname(
+    os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+)
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "worker.py")
+
+# Name of the check used to report a worker failure in the results
+BUILD_PROCESS_CHECK = "BuildProcess"
+
+
+class BuildTimeoutError(RuntimeError):
+    """Raised when a row build exceeds the configured timeout."""
+
+
+def make_result(row, success=True, error=None, results=None,
+                valid=True, saved=False, attempts=1, duration=0.0):
+    """Creates the result dictionary of a single row build.
+
+    Args:
+        row (dict): Configuration row.
+        success (bool, optional): True if the worker finished the build.
+        error (str, optional): Worker error message.
+        results (dict, optional): Validator results { check_name: data }
+        valid (bool, optional): True if all the validators passed.
+        saved (bool, optional): True if the build was saved.
+        attempts (int, optional): Number of attempts used.
+        duration (float, optional): Build time in seconds.
+
+    Returns:
+        dict: row result
+    """
+    return {
+        "output_name": row.get("output_name"),
+        "file_path": row.get("file_path"),
+        "success": success,
+        "error": error,
+        "results": results or {},
+        "valid": valid,
+        "saved": saved,
+        "attempts": attempts,
+        "duration": duration,
+    }
+
+
+def serialize_checks(checks_dict):
+    """Converts validator results to JSON friendly data.
+
+    Pyblish instances and exceptions are converted to strings.
+
+    Args:
+        checks_dict (dict): { check_name: { instance, success, error } }
+
+    Returns:
+        dict: serializable copy of the results
+    """
+    serialized = {}
+    for check_name, check_data in checks_dict.items():
+        error = check_data.get("error")
+        instance = check_data.get("instance")
+        serialized[check_name] = {
+            "instance": str(instance) if instance is not None else None,
+            "success": bool(check_data.get("success")),
+            "error": str(error) if error is not None else None,
+        }
+    return serialized
+
+
+class LocalExecutor(object):
+    """Runs the row builds with a python callable in the current process.
+
+    The callable receives (config, row, validate, passed_only) and must return
+    a result dictionary as created by make_result.
+    """
+
+    def __init__(self, build_function):
+        self.build_function = build_function
+
+    def run(self, config, row, validate=True, passed_only=False,
+            timeout=None):
+        start = time.time()
+        result = self.build_function(config, row, validate, passed_only)
+        if timeout and time.time() - start > timeout:
+            raise BuildTimeoutError(
+                "Build of '{}' exceeded {}s".format(
+                    row.get("output_name"), timeout
+                )
+            )
+        return result
+
+
+class MayapyExecutor(object):
+    """Runs each row build in a headless mayapy process."""
+
+    def __init__(self, mayapy_path=None):
+        if not mayapy_path:
+            mayapy_path = self.get_mayapy_path()
+        self.mayapy_path = mayapy_path
+
+    @staticmethod
+    def get_mayapy_path():
+        """Gets the mayapy executable from the MAYA_LOCATION environment.
+
+        Returns:
+            str: mayapy path
+        """
+        maya_location = os.environ.get("MAYA_LOCATION", "")
+        name = "mayapy.exe" if sys.platform.startswith("win") else "mayapy"
+        return os.path.normpath(os.path.join(maya_location, "bin", name))
+
+    def get_environment(self):
+        """Worker environment with the mGear scripts in the python path."""
+        env = os.environ.copy()
+        python_path = env.get("PYTHONPATH")
+        if python_path:
+            env["PYTHONPATH"] = os.pathsep.join([SCRIPTS_DIR, python_path])
+        else:
+            env["PYTHONPATH"] = SCRIPTS_DIR
+        return env
+
+    def run(self, config, row, validate=True, passed_only=False,
+            timeout=None):
+        job_dir = tempfile.mkdtemp(prefix="mgear_rig_builder_")
+        job_path = os.path.join(job_dir, "job.json")
+        result_path = os.path.join(job_dir, "result.json")
+        job = {
+            "config": config,
+            "row": row,
+            "validate": validate,
+            "passed_only": passed_only,
+            "result_path": result_path,
+        }
+        with open(job_path, "w") as fp:
+            json.dump(job, fp)
+
+        args = [self.mayapy_path, WORKER_SCRIPT, job_path]
+        try:
+            try:
+                process = subprocess.run(
+                    args,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                    env=self.get_environment(),
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired:
+                raise BuildTimeoutError(
+                    "Build of '{}' exceeded {}s".format(
+                        row.get("output_name"), timeout
+                    )
+                )
+
+            if not os.path.exists(result_path):
+                raise RuntimeError(
+                    "Worker exited with code {} without results:\n{}".format(
+                        process.returncode, process.stdout
+                    )
+                )
+            with open(result_path, "r") as fp:
+                return json.load(fp)
+        finally:
+            # the job folder is removed on timeout and worker errors too
+            for path in (job_path, result_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            os.rmdir(job_dir)
+
+
+class BatchScheduler(object):
+    """Schedules the configuration rows on a pool of executors.
+
+    Attributes:
+        executor: Object with a run(config, row, validate, passed_only,
+            timeout) method returning a row result.
+        workers (int): Number of rows built at the same time.
+        timeout (float): Per row timeout in seconds. None to disable.
+        retries (int): Number of extra attempts for a failed row.
+    """
+
+    def __init__(self, executor, workers=4, timeout=None, retries=0):
+        self.executor = executor
+        self.workers = max(1, int(workers))
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+
+    def run_row(self, config, row, validate=True, passed_only=False):
+        """Builds a row, retrying on failure.
+
+        Any exception is caught, so a failed row never stops the batch.
+
+        Returns:
+            dict: row result
+        """
+        attempts = 0
+        error = None
+        start = time.time()
+        while attempts <= self.retries:
+            attempts += 1
+            try:
+                result = self.executor.run(
+                    config,
+                    row,
+                    validate=validate,
+                    passed_only=passed_only,
+                    timeout=self.timeout,
+                )
+            except BuildTimeoutError as e:
+                error = str(e)
+                continue
+            except Exception:
+                error = traceback.format_exc()
+                continue
+
+            if result.get("success", True):
+                result["attempts"] = attempts
+                result["duration"] = time.time() - start
+                return result
+            error = result.get("error")
+
+        return make_result(
+            row,
+            success=False,
+            error=error,
+            valid=False,
+            attempts=attempts,
+            duration=time.time() - start,
+        )
+
+    def run(self, data, validate=True, passed_only=False, callback=None):
+        """Builds all the rows of a configuration.
+
+        Args:
+            data (dict): Rig Builder configuration.
+            validate (bool, optional): Option to run Pyblish validators
+            passed_only (bool, optional): Option to publish only rigs that
+                pass validation
+            callback (callable, optional): Called with each row result as
+                soon as it is completed.
+
+        Returns:
+            list: row results, in the configuration row order
+        """
+        config = {k: v for k, v in data.items() if k != "rows"}
+        rows = [r for r in data.get("rows", []) if r.get("file_path")]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(self.run_row, config, row, validate, passed_only)
+                for row in rows
+            ]
+            if callback:
+                for future in futures:
+                    future.add_done_callback(
+                        lambda f: callback(f.result())
+                    )
+            return [future.result() for future in futures]
@@ -8,6 +8,7 @@ import pymel.core as pm
 
 from mgear.shifter import io
 from mgear.shifter import guide_manager
+from mgear.shifter.rig_builder import batch
 
 try:
     import pyblish.api
@@ -101,7 +102,16 @@ class RigBuilder(object):
         report_string = "\n".join(results)
         return valid, report_string
 
-    def execute_build_logic(self, json_data, validate=True, passed_only=False):
+    def execute_build_logic(
+        self,
+        json_data,
+        validate=True,
+        passed_only=False,
+        workers=0,
+        timeout=None,
+        retries=0,
+        executor=None,
+    ):
         """
         Executes the rig building logic based on the provided JSON data.
         Optionally runs Pyblish validators on the builds.
@@ -110,6 +120,12 @@ class RigBuilder(object):
             json_data (str): A JSON string containing the necessary data
             validate (bool): Option to run Pyblish validators
             passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Number of parallel mayapy workers. If 0 the rigs
+                are built one after another in the current session.
+            timeout (float): Per rig build timeout in seconds (parallel only)
+            retries (int): Extra attempts for failed builds (parallel only)
+            executor: Custom executor for the parallel mode. Defaults to
+                batch.MayapyExecutor
         """
         if type(json_data) is str:
             data = json.loads(json_data)
@@ -119,68 +135,148 @@ class RigBuilder(object):
         data_rows = data.get("rows")
         if not data_rows:
             return
+
+        if workers or executor:
+            return self.execute_parallel_build_logic(
+                data,
+                validate=validate,
+                passed_only=passed_only,
+                workers=workers or 1,
+                timeout=timeout,
+                retries=retries,
+                executor=executor,
+            )
+
+        report_string = self.format_report_header()
         for row in data_rows:
             # Continue with the logic only if file_path is provided
-            file_path = row.get("file_path")
-            if not file_path:
+            if not row.get("file_path"):
                 return
 
-            output_folder = data.get("output_folder")
-            if not output_folder:
-                output_folder = os.path.dirname(file_path)
-            
-            custom_output_path = row.get("custom_output_path")
-            
-            # if row has a custom path, override output folder with custom path
-            if custom_output_path:
-                print(f"custom output{custom_output_path}")
-                output_folder = custom_output_path
-                
-
-            output_name = row.get("output_name")
-            maya_file_name = "{}.ma".format(output_name)
-            maya_file_path = os.path.join(output_folder, maya_file_name)
-
-            pre_script_path = data.get("pre_script")
-            if pre_script_path:
-                io.import_guide_template(file_path)
-                guide_root = cmds.ls("*.ismodel", objectsOnly=True, long=True)
-                if guide_root:
-                    guide_root = guide_root[0]
-                    pm.displayInfo(
-                        "Updating the guide with pre-script: {}".format(pre_script_path)
+            saved, valid, report = self.build_row(
+                data, row, validate, passed_only
+            )
+
+            if PYBLISH_READY and validate:
+                report_string += "{}\n".format(report)
+                report_string += "{}\n".format(" -" * 35)
+
+        if validate:
+            pm.displayInfo(report_string)
+
+        return self.results_dict
+
+    def execute_parallel_build_logic(
+        self,
+        data,
+        validate=True,
+        passed_only=False,
+        workers=4,
+        timeout=None,
+        retries=0,
+        executor=None,
+    ):
+        """Builds the configuration rows in parallel worker processes.
+
+        Each worker builds, validates and saves its rig. The serialized
+        validator results are collected back in self.results_dict and the
+        report is generated the same way as the serial build.
+
+        Args:
+            data (dict): Rig Builder configuration data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Number of parallel workers
+            timeout (float): Per rig build timeout in seconds
+            retries (int): Extra attempts for failed builds
+            executor: Custom executor. Defaults to batch.MayapyExecutor
+
+        Returns:
+            dict: validator results { rig_name: { check_name: { results } } }
+        """
+        if executor is None:
+            executor = batch.MayapyExecutor()
+        scheduler = batch.BatchScheduler(
+            executor, workers=workers, timeout=timeout, retries=retries
+        )
+
+        pm.displayInfo(
+            "Building {} rigs with {} workers...".format(
+                len(data.get("rows", [])), scheduler.workers
+            )
+        )
+        row_results = scheduler.run(
+            data, validate=validate and PYBLISH_READY, passed_only=passed_only
+        )
+
+        report_string = self.format_report_header()
+        for row_result in row_results:
+            output_name = row_result.get("output_name")
+            checks = dict(row_result.get("results") or {})
+            if not row_result.get("success"):
+                pm.displayError(
+                    "Build failed for '{}':\n{}".format(
+                        output_name, row_result.get("error")
                     )
-                    with open(pre_script_path, "r") as file:
-                        try:
-                            exec(file.read())
-                        except Exception as e:
-                            error_message = str(e)
-                            full_traceback = traceback.format_exc()
-                            pm.displayWarning(
-                                "Update script failed, check error log"
-                            )
-                            pm.displayError(
-                                "Exception message:", error_message
-                            )
-                            pm.displayError("Full traceback:", full_traceback)
-
-                    pm.select(guide_root, r=True)
-                    pm.displayInfo("Building rig '{}'...".format(output_name))
-                    guide_manager.build_from_selection()
-                    pm.delete(guide_root)
-                else:
-                    pm.displayWarning("Guide not found.")
-            else:
-                pm.displayInfo("Building rig '{}'...".format(output_name))
-                io.build_from_file(file_path)
+                )
+                checks[batch.BUILD_PROCESS_CHECK] = {
+                    "instance": output_name,
+                    "success": False,
+                    "error": row_result.get("error"),
+                }
+            self.results_dict[output_name] = checks
+
+            if checks:
+                valid, report = self.generate_instance_report(output_name)
+                report_string += "{}\n".format(report)
+                report_string += "{}\n".format(" -" * 35)
+
+        if validate:
+            pm.displayInfo(report_string)
+
+        return self.results_dict
+
+    def build_row(self, data, row, validate=True, passed_only=False):
+        """Builds, validates and saves the rig of a single configuration row.
+
+        Args:
+            data (dict): Rig Builder configuration data
+            row (dict): Configuration row to build
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
 
-            post_script_path = data.get("post_script")
-            
-            if post_script_path:
+        Returns:
+            bool, bool, str: True if the build was saved, True if the
+                validation passed and the validation report. The report is
+                empty without validation
+        """
+        file_path = row.get("file_path")
+
+        output_folder = data.get("output_folder")
+        if not output_folder:
+            output_folder = os.path.dirname(file_path)
+
+        custom_output_path = row.get("custom_output_path")
+
+        # if row has a custom path, override output folder with custom path
+        if custom_output_path:
+            print(f"custom output{custom_output_path}")
+            output_folder = custom_output_path
+
+        output_name = row.get("output_name")
+        maya_file_name = "{}.ma".format(output_name)
+        maya_file_path = os.path.join(output_folder, maya_file_name)
+
+        pre_script_path = data.get("pre_script")
+        if pre_script_path:
+            io.import_guide_template(file_path)
+            guide_root = cmds.ls("*.ismodel", objectsOnly=True, long=True)
+            if guide_root:
+                guide_root = guide_root[0]
                 pm.displayInfo(
-                        "Updating the guide with post-script: {}".format(post_script_path)
-                    )
-                with open(post_script_path, "r") as file:
+                    "Updating the guide with pre-script: {}".format(pre_script_path)
+                )
+                with open(pre_script_path, "r") as file:
                     try:
                         exec(file.read())
                     except Exception as e:
@@ -194,33 +290,58 @@ class RigBuilder(object):
                         )
                         pm.displayError("Full traceback:", full_traceback)
 
-            context = None
-            save_build = True
-            report_string = self.format_report_header()
+                pm.select(guide_root, r=True)
+                pm.displayInfo("Building rig '{}'...".format(output_name))
+                guide_manager.build_from_selection()
+                pm.delete(guide_root)
+            else:
+                pm.displayWarning("Guide not found.")
+        else:
+            pm.displayInfo("Building rig '{}'...".format(output_name))
+            io.build_from_file(file_path)
 
-            if PYBLISH_READY and validate:
-                pm.displayInfo("Validating rig '{}'...\n".format(output_name))
-                context = self.run_validators()
-                self.build_results_dict(output_name, context)
-                valid, report = self.generate_instance_report(output_name)
+        post_script_path = data.get("post_script")
 
-                report_string += "{}\n".format(report)
-                if passed_only and not valid:
-                    save_build = False
-                    pm.displayInfo(
-                        "Found errors, please fix and rebuild the rig."
+        if post_script_path:
+            pm.displayInfo(
+                    "Updating the guide with post-script: {}".format(post_script_path)
+                )
+            with open(post_script_path, "r") as file:
+                try:
+                    exec(file.read())
+                except Exception as e:
+                    error_message = str(e)
+                    full_traceback = traceback.format_exc()
+                    pm.displayWarning(
+                        "Update script failed, check error log"
+                    )
+                    pm.displayError(
+                        "Exception message:", error_message
                     )
+                    pm.displayError("Full traceback:", full_traceback)
 
-                report_string += "{}\n".format(" -" * 35)
+        context = None
+        save_build = True
+        valid = True
+        report = ""
 
-            cmds.file(rename=maya_file_path)
-            cmds.file(save=save_build, type="mayaAscii")
-            cmds.file(new=True, force=True)
+        if PYBLISH_READY and validate:
+            pm.displayInfo("Validating rig '{}'...\n".format(output_name))
+            context = self.run_validators()
+            self.build_results_dict(output_name, context)
+            valid, report = self.generate_instance_report(output_name)
 
-        if validate:
-            pm.displayInfo(report_string)
+            if passed_only and not valid:
+                save_build = False
+                pm.displayInfo(
+                    "Found errors, please fix and rebuild the rig."
+                )
 
-        return self.results_dict
+        cmds.file(rename=maya_file_path)
+        cmds.file(save=save_build, type="mayaAscii")
+        cmds.file(new=True, force=True)
+
+        return save_build, valid, report
 
     def build_from_file(self, file_path):
         json_data = self.load_config_data_from_file(file_path)
@@ -83,6 +83,17 @@ class RigBuilderUI(
             "Publish Passed Rigs Only"
         )
         run_validators_layout.addWidget(self.publish_passed_checkbox)
+        run_validators_layout.addStretch()
+
+        # Parallel build workers. 0 builds in the current Maya session
+        self.workers_spinbox = QtWidgets.QSpinBox()
+        self.workers_spinbox.setRange(0, 32)
+        self.workers_spinbox.setToolTip(
+            "Number of headless mayapy processes building rigs in parallel.\n"
+            "0 builds the rigs one by one in the current session."
+        )
+        run_validators_layout.addWidget(QtWidgets.QLabel("Parallel Workers"))
+        run_validators_layout.addWidget(self.workers_spinbox)
 
         if not builder.PYBLISH_READY:
             self.run_validators_checkbox.setEnabled(False)
@@ -230,7 +241,10 @@ class RigBuilderUI(
         validate = self.run_validators_checkbox.isChecked()
         passed_rigs_only = self.publish_passed_checkbox.isChecked()
         results_dict = self.builder.execute_build_logic(
-            data, validate=validate, passed_only=passed_rigs_only
+            data,
+            validate=validate,
+            passed_only=passed_rigs_only,
+            workers=self.workers_spinbox.value(),
         )
         if (
             self.run_validators_checkbox.isChecked()
@@ -0,0 +1,72 @@
+"""
+Rig Builder Worker
+
+Headless mayapy entry point used by batch.MayapyExecutor.
+
+Usage:
+    mayapy worker.py <job.json>
+
+The job file contains the configuration, the row to build and the
+result_path where the serialized row result is written.
+"""
+import json
+import sys
+import time
+import traceback
+
+
+def build_job(job):
+    """Builds a single Rig Builder row in the current Maya session.
+
+    Args:
+        job (dict): job data written by batch.MayapyExecutor
+
+    Returns:
+        dict: row result
+    """
+    from mgear.shifter.rig_builder import batch
+    from mgear.shifter.rig_builder import builder
+
+    row = job["row"]
+    start = time.time()
+    rig_builder = builder.RigBuilder()
+    saved, valid, _ = rig_builder.build_row(
+        job["config"],
+        row,
+        validate=job.get("validate", True),
+        passed_only=job.get("passed_only", False),
+    )
+    checks = rig_builder.results_dict.get(row.get("output_name"), {})
+    return batch.make_result(
+        row,
+        results=batch.serialize_checks(checks),
+        valid=valid,
+        saved=bool(saved),
+        duration=time.time() - start,
+    )
+
+
+def main(job_path):
+    with open(job_path, "r") as fp:
+        job = json.load(fp)
+
+    import maya.standalone
+
+    maya.standalone.initialize(name="python")
+    try:
+        result = build_job(job)
+    except Exception:
+        from mgear.shifter.rig_builder import batch
+
+        result = batch.make_result(
+            job["row"], success=False, error=traceback.format_exc()
+        )
+
+    with open(job["result_path"], "w") as fp:
+        json.dump(result, fp)
+
+    maya.standalone.uninitialize()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
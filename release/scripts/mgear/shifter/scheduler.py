@@ -0,0 +1,162 @@
+"""Shifter component build scheduling.
+
+Derive the dependency graph of the rig components from the guide and get
+a build order where each component is processed after the components it
+depends on, in each build step.
+
+A component depends on its parent component and on the components
+referenced in its settings, by component name (i.e: masterChainA) or by
+guide name (i.e: ikrefarray, ui_host).
+"""
+import heapq
+
+import mgear
+from mgear.shifter import incremental
+
+
+def get_dependencies(guide):
+    """Get the dependencies of each component
+
+    Args:
+        guide (guide.Rig): the rig guide
+
+    Returns:
+        dict: {component fullName: set of component fullNames}
+    """
+    names = list(guide.componentsIndex)
+    dependencies = {}
+    for name in names:
+        comp_guide = guide.components[name]
+        depends = set()
+        if comp_guide.parentComponent is not None:
+            depends.add(comp_guide.parentComponent.fullName)
+        components, relatives = incremental.get_references(
+            comp_guide.values, names
+        )
+        depends |= components | relatives
+        depends.discard(name)
+        dependencies[name] = depends
+    return dependencies
+
+
+def get_cycles(names, dependencies):
+    """Get the components in a dependency cycle
+
+    The cycles are the strongly connected components of the dependency
+    graph with more than one component (Tarjan's algorithm).
+
+    Args:
+        names (list): components fullName
+        dependencies (dict): {component fullName: set of fullNames}
+
+    Returns:
+        set: components fullName in a cycle
+    """
+    names_set = set(names)
+    edges = dict(
+        (name, [d for d in dependencies.get(name, ()) if d in names_set])
+        for name in names
+    )
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    cycles = set()
+
+    for root in names:
+        if root in index:
+            continue
+        # iterative depth first search of (node, next edge index)
+        work = [(root, 0)]
+        while work:
+            name, i = work.pop()
+            if i == 0:
+                index[name] = lowlink[name] = len(index)
+                stack.append(name)
+                on_stack.add(name)
+            if i < len(edges[name]):
+                work.append((name, i + 1))
+                depend = edges[name][i]
+                if depend not in index:
+                    work.append((depend, 0))
+                elif depend in on_stack:
+                    lowlink[name] = min(lowlink[name], index[depend])
+                continue
+
+            if lowlink[name] == index[name]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == name:
+                        break
+                if len(component) > 1:
+                    cycles.update(component)
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[name])
+
+    return cycles
+
+
+def get_build_order(names, dependencies):
+    """Sort the components so the dependencies are processed first
+
+    The declaration order is kept when there is no dependency between
+    components. Components in a dependency cycle, and the components
+    depending on them, keep the declaration order after the others.
+
+    Args:
+        names (list): components fullName in declaration order
+        dependencies (dict): {component fullName: set of fullNames}
+
+    Returns:
+        list, list: components in build order and components in a cycle
+    """
+    index = dict((name, i) for i, name in enumerate(names))
+    pending = {}
+    dependents = dict((name, []) for name in names)
+    for name in names:
+        depends = [d for d in dependencies.get(name, ()) if d in index]
+        pending[name] = len(depends)
+        for d in depends:
+            dependents[d].append(name)
+
+    heap = [index[name] for name in names if not pending[name]]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        name = names[heapq.heappop(heap)]
+        order.append(name)
+        for dependent in dependents[name]:
+            pending[dependent] -= 1
+            if not pending[dependent]:
+                heapq.heappush(heap, index[dependent])
+
+    blocked = [name for name in names if pending[name]]
+    cycles = get_cycles(blocked, dependencies)
+    return order + blocked, [name for name in blocked if name in cycles]
+
+
+def schedule(guide):
+    """Get the components build order from the guide
+
+    Args:
+        guide (guide.Rig): the rig guide
+
+    Returns:
+        list: components fullName in build order
+    """
+    order, cycle = get_build_order(
+        list(guide.componentsIndex), get_dependencies(guide)
+    )
+    if cycle:
+        mgear.log(
+            "Components dependency cycle: "
+            + ", ".join(cycle)
+            + ". These components and the components depending on them "
+            "use the declaration order.",
+            mgear.sev_warning,
+        )
+    return order
@@ -3,6 +3,7 @@ import traceback
 
 # dcc
 import pymel.core as pm
+from maya import cmds
 
 # mgear
 import mgear
@@ -50,6 +51,16 @@ class MainSynopticTab(QtWidgets.QDialog):
         klass.connectSignals()
         klass.connectMaya()
         self._buttonGeometry = {}  # for cachinig
+        self._selectButtons = None  # for caching
+        self._buttonTable = {}  # control name -> buttons, for the model
+        self._buttonTableModel = None
+        self._selection = None  # selected names at last repaint
+
+        # coalesces selection callback bursts in one repaint per loop tick
+        self._selectTimer = QtCore.QTimer(self)
+        self._selectTimer.setSingleShot(True)
+        self._selectTimer.setInterval(0)
+        self._selectTimer.timeout.connect(self.updateSelection)
 
         # This is necessary for not to be zombie job on close.
         # Qt does not actually destroy the object by just pressing
@@ -95,9 +106,15 @@ class MainSynopticTab(QtWidgets.QDialog):
         self.cbManager = callbackManager.CallbackManager()
 
     def selectChanged(self, *args):
+        # type: (*object) -> None
+        # the repaint is deferred, so a burst of callbacks repaints once
+        self._selectTimer.start()
+
+    def updateSelection(self):
+        # type: () -> None
         # wrap to catch exception guaranteeing core does not stop at this
         try:
-            self.__selectChanged(*args)
+            self.__selectChanged()
 
         except Exception as e:
             mes = traceback.format_exc()
@@ -112,10 +129,7 @@ class MainSynopticTab(QtWidgets.QDialog):
             except RuntimeError:
                 pass
 
-    def __selectChanged(self, *args):
-
-        sels = []
-        [sels.append(x.name()) for x in pm.ls(sl=True)]
+    def __selectChanged(self):
 
         oModel = utils.getModel(self)
         if not oModel:
@@ -129,27 +143,59 @@ class MainSynopticTab(QtWidgets.QDialog):
 
             return
 
-        nameSpace = utils.getNamespace(oModel.name())
+        buttonTable = self._getButtonTable(oModel.name())
+        sels = set(cmds.ls(sl=True))
 
-        selButtons = self.findChildren(widgets.SelectButton)
-        selButtonsStyled = self.findChildren(widgets.SelectButtonStyleSheet)
+        # only repaints the buttons whose selection state changed
+        if self._selection is None:
+            changed = buttonTable.keys()
+        else:
+            changed = sels.symmetric_difference(self._selection)
+        self._selection = sels
+
+        for checkName in changed:
+            for selB in buttonTable.get(checkName, []):
+                selB.paintSelected(checkName in sels)
+
+    def _getSelectButtons(self):
+        # type: () -> list
+
+        if self._selectButtons is not None:
+            return self._selectButtons
 
         buttons = []
-        buttons.extend(selButtons)
-        buttons.extend(selButtonsStyled)
+        buttons.extend(self.findChildren(widgets.SelectButton))
+        buttons.extend(self.findChildren(widgets.SelectButtonStyleSheet))
+        self._selectButtons = buttons
+
+        return buttons
 
-        for selB in buttons:
+    def _getButtonTable(self, modelName):
+        # type: (str) -> dict
+
+        if self._buttonTableModel == modelName:
+            return self._buttonTable
+
+        nameSpace = utils.getNamespace(modelName)
+
+        # full control name -> buttons with that single control
+        buttonTable = {}
+        for selB in self._getSelectButtons():
             obj = str(selB.property("object")).split(",")
             if len(obj) == 1:
                 if nameSpace:
                     checkName = ":".join([nameSpace, obj[0]])
                 else:
                     checkName = obj[0]
+                buttonTable.setdefault(checkName, []).append(selB)
 
-                if checkName in sels:
-                    selB.paintSelected(True)
-                else:
-                    selB.paintSelected(False)
+        self._buttonTable = buttonTable
+        self._buttonTableModel = modelName
+
+        # new model, all the buttons are repainted
+        self._selection = None
+
+        return buttonTable
 
     def _getButtonAbsoluteGeometry(self, button):
         # type: (widgets.SelectButton) -> QtCore.QSize
@@ -186,14 +232,7 @@ class MainSynopticTab(QtWidgets.QDialog):
         selected = []
         rect = QtCore.QRect(self.origin, event.pos()).normalized()
 
-        selButtons = self.findChildren(widgets.SelectButton)
-        selButtonsStyled = self.findChildren(widgets.SelectButtonStyleSheet)
-
-        buttons = []
-        buttons.extend(selButtons)
-        buttons.extend(selButtonsStyled)
-
-        for child in buttons:
+        for child in self._getSelectButtons():
             # if rect.intersects(child.geometry()):
             if rect.intersects(self._getButtonAbsoluteGeometry(child)):
                 selected.append(child)
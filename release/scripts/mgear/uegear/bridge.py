@@ -7,20 +7,179 @@ ueGear Client to interact with ueGear Commands within Unreal Engine.
 
 from __future__ import print_function, division, absolute_import
 
+import ast
 import json
 import pprint
+import socket
+import threading
+import time
 
-from mgear.core.six.moves import urllib
-
-# from urllib.request import urlopen, Request
-
-Request = urllib.request.Request
-urlopen = urllib.request.urlopen
+from mgear.core.six import string_types
+from mgear.core.six.moves import http_client
+from mgear.core.six.moves import queue
 
 from mgear.uegear import log
 
 logger = log.uegear_logger
 
+CALL_URL = "/remote/object/call"
+BATCH_URL = "/remote/batch"
+
+# idle keep-alive connections kept for each server
+POOL_SIZE = 8
+
+# commands sent with each batch request
+BATCH_SIZE = 200
+
+_pools = dict()
+_pools_lock = threading.Lock()
+_executor = None
+
+
+def parse_return(value):
+    """
+    Converts a command return value sent as a string into a Python object, without evaluating it.
+
+    :param object value: return value coming from the Unreal Remote Server.
+    :return: JSON or Python literal value; the given value if it is not a string or can't be parsed.
+    :rtype: object
+    """
+
+    if not isinstance(value, string_types):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def _parse_response(response):
+    if isinstance(response, dict) and "return" in response:
+        return {"return": parse_return(response["return"])}
+    return response
+
+
+class ConnectionPool(object):
+    """
+    Keep-alive HTTP connections to an Unreal Remote Server, shared between threads.
+    """
+
+    def __init__(self, host_address, port, max_size=POOL_SIZE):
+        super(ConnectionPool, self).__init__()
+
+        self._host_address = host_address
+        self._port = port
+        self._max_size = max_size
+        self._idle = queue.LifoQueue()
+
+    def _acquire(self, timeout):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            connection = http_client.HTTPConnection(
+                self._host_address, self._port, timeout=timeout
+            )
+            connection.connect()
+            # small requests are sent without waiting for the previous ACK
+            connection.sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+            )
+            return connection, False
+
+    def _release(self, connection):
+        if self._idle.qsize() < self._max_size:
+            self._idle.put(connection)
+        else:
+            connection.close()
+
+    def request(self, method, url, body, headers, timeout):
+        """
+        Sends a request with an idle connection of the pool, or a new one if all of them are in use.
+
+        :param str method: HTTP method.
+        :param str url: request URL path.
+        :param bytes body: request body.
+        :param dict headers: request headers.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: response status and body.
+        :rtype: tuple(int, bytes)
+        """
+
+        while True:
+            connection, reused = self._acquire(timeout)
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request(method, url, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http_client.HTTPException, socket.error):
+                connection.close()
+                if reused:
+                    # the server closed the idle connection, retry with another one
+                    continue
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, data
+
+    def close(self):
+        """
+        Closes the idle connections.
+        """
+
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def get_pool(host_address, port):
+    """
+    Returns the connection pool of the given server.
+
+    :param str host_address: server host address.
+    :param int port: server port.
+    :return: connection pool.
+    :rtype: ConnectionPool
+    """
+
+    with _pools_lock:
+        pool = _pools.get((host_address, port))
+        if pool is None:
+            pool = _pools[(host_address, port)] = ConnectionPool(
+                host_address, port
+            )
+    return pool
+
+
+def close_connections():
+    """
+    Closes the idle connections of all the servers.
+    """
+
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _executor = ThreadPoolExecutor(max_workers=POOL_SIZE)
+    return _executor
+
 
 class UeGearBridge(object):
     """
@@ -35,11 +194,11 @@ class UeGearBridge(object):
         self._timeout = (
             1000  # connection to the server will time out after this value.
         )
-        self._echo_execution = True  # whether client should print the response coming from server.
-        self._echo_payload = True  # whether client should print the JSON payload it's sending to server.
-        self._is_executing = (
-            False  # whether client is still executing a command.
-        )
+        self._echo_execution = False  # whether client should print the response coming from server.
+        self._echo_payload = False  # whether client should print the JSON payload it's sending to server.
+        self._executing = 0  # number of commands the client is still executing.
+        self._executing_lock = threading.Lock()
+        self._batch_size = BATCH_SIZE
         self._commands_object_path = (
             "/Engine/PythonTypes.Default__PyUeGearCommands"
         )
@@ -62,7 +221,7 @@ class UeGearBridge(object):
 
     @property
     def is_executing(self):
-        return self._is_executing
+        return self._executing > 0
 
     @property
     def timeout(self):
@@ -88,6 +247,14 @@ class UeGearBridge(object):
     def echo_payload(self, value):
         self._echo_payload = value
 
+    @property
+    def batch_size(self):
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, value):
+        self._batch_size = max(1, int(value))
+
     @property
     def commands_object_path(self):
         return self._commands_object_path
@@ -100,6 +267,39 @@ class UeGearBridge(object):
     # BASE
     # =================================================================================================================
 
+    def _set_executing(self, value):
+        with self._executing_lock:
+            self._executing += 1 if value else -1
+
+    def _payload(self, command, parameters=None):
+        return {
+            "objectPath": self._commands_object_path,
+            "functionName": command,
+            "parameters": parameters or dict(),
+            "generateTransaction": True,
+        }
+
+    def _send(self, url, payload, timeout):
+        status, data = get_pool(self._host_address, self._port).request(
+            "PUT",
+            url,
+            json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+            self._headers,
+            timeout,
+        )
+        if status >= 400:
+            raise http_client.HTTPException(
+                "{} returned status {}".format(url, status)
+            )
+        return json.loads(data.decode("utf-8"))
+
+    def _echo(self, payload, response):
+        if self._echo_payload:
+            pprint.pprint(payload)
+
+        if self._echo_execution:
+            pprint.pprint(response)
+
     def execute(self, command, parameters=None, timeout=0):
         """
         Executes given command for this client. The server will look for this command in the modules it has loaded.
@@ -112,42 +312,163 @@ class UeGearBridge(object):
         :rtype: dict
         """
 
-        self._is_executing = True
-        timeout = timeout if timeout > 0 else self._timeout
-        parameters = parameters or dict()
+        self._set_executing(True)
+        try:
+            timeout = timeout if timeout > 0 else self._timeout
+            payload = self._payload(command, parameters)
+            try:
+                response = self._send(CALL_URL, payload, timeout)
+            except Exception:
+                response = {"return": False}
+            response = _parse_response(response)
+
+            self._echo(payload, response)
+        finally:
+            self._set_executing(False)
 
-        url = "http://{}:{}/remote/object/call".format(
-            self._host_address, self._port
-        )
-        payload = {
-            "objectPath": self._commands_object_path,
-            "functionName": command,
-            "parameters": parameters,
-            "generateTransaction": True,
-        }
+        return response
+
+    def execute_batch(self, commands, timeout=0):
+        """
+        Executes given commands for this client, sending batch_size commands with each request.
+
+        :param list(str or tuple(str, dict)) commands: command names, or command names and parameters.
+        :param float timeout: time in seconds after which each batch request will timeout.
+        :return: responses coming from the Unreal Remote Server, in the commands order. The response of a command
+            that failed is {"return": False}.
+        :rtype: list(dict)
+        """
+
+        self._set_executing(True)
         try:
-            request = Request(
-                url,
-                json.dumps(payload).encode("ascii"),
-                self._headers,
-                method="PUT",
-            )
-            with urlopen(request, timeout=timeout) as response:
-                response = json.load(response)
-        except Exception:
-            response = {"return": False}
+            timeout = timeout if timeout > 0 else self._timeout
+            payloads = [
+                self._payload(c)
+                if isinstance(c, string_types)
+                else self._payload(*c)
+                for c in commands
+            ]
+            responses = list()
+            for i in range(0, len(payloads), self._batch_size):
+                responses.extend(
+                    self._execute_batch_request(
+                        payloads[i : i + self._batch_size], timeout
+                    )
+                )
+        finally:
+            self._set_executing(False)
+
+        return responses
+
+    def _execute_batch_request(self, payloads, timeout):
+        requests = [
+            {"RequestId": i, "URL": CALL_URL, "Verb": "PUT", "Body": payload}
+            for i, payload in enumerate(payloads)
+        ]
         try:
-            evaluated_return = eval(response.get("return"))
-            response = {"return": evaluated_return}
+            result = self._send(BATCH_URL, {"Requests": requests}, timeout)
+            results = dict(
+                (r.get("RequestId"), r) for r in result.get("Responses", list())
+            )
         except Exception:
-            pass
+            results = dict()
+
+        responses = list()
+        for i, payload in enumerate(payloads):
+            result = results.get(i) or dict()
+            response = result.get("ResponseBody") or dict()
+            if isinstance(response, string_types):
+                try:
+                    response = json.loads(response)
+                except ValueError:
+                    response = {"return": response}
+            if not result or result.get("ResponseCode", 200) >= 400:
+                response = {"return": False}
+            response = _parse_response(response)
+            self._echo(payload, response)
+            responses.append(response)
+        return responses
+
+    def execute_async(self, command, parameters=None, timeout=0):
+        """
+        Executes given command for this client in a background thread.
 
-        if self._echo_payload:
-            pprint.pprint(payload)
+        :param str command:  The command name that you want to execute within PyUeGearCommands class.
+        :param dict parameters: arguments for the command to execute.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: future with the response coming from the Unreal Remote Server as result.
+        :rtype: concurrent.futures.Future
+        """
 
-        if self._echo_execution:
-            pprint.pprint(response)
+        return _get_executor().submit(
+            self.execute, command, parameters, timeout
+        )
 
-        self._is_executing = False
+    def execute_batch_async(self, commands, timeout=0):
+        """
+        Executes given commands for this client in a background thread, sending batch_size commands with each
+        request.
 
-        return response
+        :param list(str or tuple(str, dict)) commands: command names, or command names and parameters.
+        :param float timeout: time in seconds after which each batch request will timeout.
+        :return: future with the list of responses coming from the Unreal Remote Server as result.
+        :rtype: concurrent.futures.Future
+        """
+
+        return _get_executor().submit(
+            self.execute_batch, list(commands), timeout
+        )
+
+
+def benchmark(count=3000, port=None, host_address="127.0.0.1"):
+    """
+    Compares the throughput of the bridge execution modes.
+
+    :param int count: number of commands to execute with each mode.
+    :param int or None port: Unreal Remote Server port. If not given, a local stand-in server is used.
+    :param str host_address: Unreal Remote Server host address.
+    :return: commands per second of each execution mode.
+    :rtype: dict
+    """
+
+    from mgear.uegear import stand_in
+
+    server = None
+    if port is None:
+        server = stand_in.StandInServer()
+        server.start()
+        port = server.port
+
+    uegear_bridge = UeGearBridge(port=port, host_address=host_address)
+    commands = [
+        ("project_content_directory", dict()) for _ in range(count)
+    ]
+
+    def run_execute():
+        for command, parameters in commands:
+            uegear_bridge.execute(command, parameters)
+
+    def run_async():
+        futures = [uegear_bridge.execute_async(*c) for c in commands]
+        for future in futures:
+            future.result()
+
+    def run_batch():
+        uegear_bridge.execute_batch(commands)
+
+    result = dict()
+    try:
+        for name, func in (
+            ("execute", run_execute),
+            ("execute_async", run_async),
+            ("execute_batch", run_batch),
+        ):
+            start = time.time()
+            func()
+            result[name] = count / max(time.time() - start, 1e-9)
+    finally:
+        if server is not None:
+            server.stop()
+            get_pool(host_address, port).close()
+
+    return result
@@ -584,6 +584,7 @@ def update_selected_transforms():
         selected_node.setRotationOrder("XZY", True)
     try:
         objects = cmds.ls(sl=True, sn=True)
+        commands = list()
         for obj in objects:
             ue_world_transform = (
                 ueUtils.get_unreal_engine_transform_for_maya_node(obj)
@@ -595,16 +596,21 @@ def update_selected_transforms():
                 continue
             actor_guid = actor_guids[0]
 
-            result = uegear_bridge.execute(
-                "set_actor_world_transform",
-                parameters={
-                    "actor_guid": actor_guid,
-                    "translation": str(ue_world_transform["rotatePivot"]),
-                    "rotation": str(ue_world_transform["rotation"]),
-                    "scale": str(ue_world_transform["scale"]),
-                    "world_up": str(world_up),
-                },
+            commands.append(
+                (
+                    "set_actor_world_transform",
+                    {
+                        "actor_guid": actor_guid,
+                        "translation": str(ue_world_transform["rotatePivot"]),
+                        "rotation": str(ue_world_transform["rotation"]),
+                        "scale": str(ue_world_transform["scale"]),
+                        "world_up": str(world_up),
+                    },
+                )
             )
+
+        # all the actors are updated with a request per batch
+        uegear_bridge.execute_batch(commands)
     finally:
         for i, selected_node in enumerate(selected_nodes):
             selected_node.setRotationOrder(old_rotation_orders[i], True)
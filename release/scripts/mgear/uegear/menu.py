@@ -41,6 +41,11 @@ def install():
             "Update Unreal Assets from Maya Selection",
             str_update_unreal_Assets_from_Maya_Selection,
         ),
+        (
+            "Start Live Transform Sync from Maya Selection",
+            str_start_transform_stream,
+        ),
+        ("Stop Live Transform Sync", str_stop_transform_stream),
     )
 
     mgear.menu.install(menuID, commands, image="UE5.svg")
@@ -85,3 +90,13 @@ str_update_unreal_Assets_from_Maya_Selection = """
 from mgear.uegear import commands
 commands.update_selected_transforms()
 """
+
+str_start_transform_stream = """
+from mgear.uegear import stream
+stream.start_stream()
+"""
+
+str_stop_transform_stream = """
+from mgear.uegear import stream
+stream.stop_stream()
+"""
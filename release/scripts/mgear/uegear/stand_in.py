@@ -0,0 +1,165 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Stand-in for the Unreal Remote Control HTTP server, to test and benchmark the ueGear bridge without Unreal.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import json
+import threading
+
+from mgear.core.six.moves import BaseHTTPServer
+from mgear.core.six.moves import socketserver
+
+from mgear.uegear import bridge
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # keep-alive connections
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.server.stand_in._add_connection()
+
+    def log_message(self, *args):
+        pass
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length).decode("utf-8"))
+        stand_in = self.server.stand_in
+        stand_in._add_request(self.path)
+
+        if self.path == bridge.CALL_URL:
+            code, body = stand_in.call(payload)
+        elif self.path == bridge.BATCH_URL:
+            code, body = 200, stand_in.batch(payload)
+        else:
+            code, body = 404, {"errorMessage": "Unknown route"}
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandInServer(object):
+    """
+    Local HTTP server answering the Remote Control object call and batch requests with Python functions.
+
+    :param dict commands: functions called by command name, with the command parameters as keyword arguments. If
+        not given, any command returns its name.
+    :param str host_address: server host address.
+    :param int port: server port. If 0, a free port is used.
+    """
+
+    def __init__(self, commands=None, host_address="127.0.0.1", port=0):
+        super(StandInServer, self).__init__()
+
+        self._commands = commands
+        self._lock = threading.Lock()
+        self._thread = None
+        self._server = _Server((host_address, port), _Handler)
+        self._server.stand_in = self
+        self.connections = 0  # number of accepted connections.
+        self.requests = dict()  # number of requests by URL path.
+        self.calls = list()  # executed commands names and parameters.
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _add_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def _add_request(self, path):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+        """
+
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops serving and closes the server socket.
+        """
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def call(self, payload):
+        """
+        Executes an object call payload.
+
+        :param dict payload: object call payload.
+        :return: response code and body.
+        :rtype: tuple(int, dict)
+        """
+
+        command = payload.get("functionName")
+        parameters = payload.get("parameters") or dict()
+        with self._lock:
+            self.calls.append((command, parameters))
+        if self._commands is None:
+            return 200, {"ReturnValue": command}
+        func = self._commands.get(command)
+        if func is None:
+            return 400, {
+                "errorMessage": "Function {} not found".format(command)
+            }
+        try:
+            return 200, {"ReturnValue": func(**parameters)}
+        except Exception as e:
+            return 500, {"errorMessage": str(e)}
+
+    def batch(self, payload):
+        """
+        Executes the object calls of a batch payload.
+
+        :param dict payload: batch payload.
+        :return: batch response body.
+        :rtype: dict
+        """
+
+        responses = list()
+        for request in payload.get("Requests", list()):
+            if request.get("URL") == bridge.CALL_URL:
+                code, body = self.call(request.get("Body") or dict())
+            else:
+                code, body = 404, {"errorMessage": "Unknown route"}
+            responses.append(
+                {
+                    "RequestId": request.get("RequestId"),
+                    "ResponseCode": code,
+                    "ResponseBody": body,
+                }
+            )
+        return {"Responses": responses}
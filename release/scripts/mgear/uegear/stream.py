@@ -0,0 +1,259 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Live transform streaming from Maya to the Unreal actors.
+
+The world matrix changes of the streamed nodes and the time changes only mark the nodes as dirty. A timer,
+throttled to the stream rate, coalesces the dirty nodes, compares their Unreal transforms with the last ones sent
+and sends the changed actors with a single non-blocking batch request through the ueGear bridge keep-alive
+connections. While a request is in flight the changes keep being coalesced for the next tick.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import math
+import functools
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from mgear.core import callbackManager
+from mgear.uegear import log, tag, bridge
+
+logger = log.uegear_logger
+
+DEFAULT_RATE = 30.0  # maximum number of updates sent per second.
+DEFAULT_TOLERANCE = 1e-4  # minimum change of a transform value to send it.
+
+_stream = None
+
+
+def get_actor_transform(node):
+    """
+    Returns the Unreal actor transform values of the given Maya node, as update_selected_transforms sends them.
+
+    The rotation is computed in XZY rotation order without changing the rotation order of the node.
+
+    :param str node: name of the Maya transform node.
+    :return: translation, rotation and scale values.
+    :rtype: tuple(float)
+    """
+
+    sel = om.MSelectionList()
+    sel.add(node)
+    rotation = (
+        om.MTransformationMatrix(sel.getDagPath(0).inclusiveMatrix())
+        .rotation()
+        .reorder(om.MEulerRotation.kXZY)
+    )
+    translation = cmds.xform(node, q=True, ws=True, rp=True)
+    rotation = [math.degrees(rotation[i]) for i in range(3)]
+    scale = cmds.xform(node, q=True, ws=True, s=True)
+
+    values = list()
+    up_axis = cmds.upAxis(query=True, ax=True)
+    for xyz in (translation, rotation, scale):
+        if up_axis.lower() == "y":
+            xyz = [xyz[0], xyz[2], xyz[1]]
+        values.extend(xyz)
+
+    return tuple(values)
+
+
+def is_changed(previous, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Returns whether the transform values changed more than the given tolerance.
+
+    :param tuple(float) or None previous: values sent before.
+    :param tuple(float) current: current values.
+    :param float tolerance: minimum change of a value.
+    :return: True if the values changed; False otherwise.
+    :rtype: bool
+    """
+
+    if previous is None:
+        return True
+    return any(abs(a - b) > tolerance for a, b in zip(previous, current))
+
+
+class TransformStream(object):
+    """
+    Streams the transforms of ueGear tagged Maya nodes to their Unreal actors.
+
+    :param list(str) nodes: nodes to stream. Nodes without actor guid tag are skipped.
+    :param float rate: maximum number of updates sent per second.
+    :param float tolerance: minimum change of a transform value to send it.
+    :param bridge.UeGearBridge uegear_bridge: bridge used to send the updates.
+    """
+
+    def __init__(
+        self,
+        nodes,
+        rate=DEFAULT_RATE,
+        tolerance=DEFAULT_TOLERANCE,
+        uegear_bridge=None,
+    ):
+        super(TransformStream, self).__init__()
+
+        self._rate = rate
+        self._tolerance = tolerance
+        self._bridge = uegear_bridge or bridge.UeGearBridge()
+        self._manager = callbackManager.CallbackManager()
+        self._running = False
+
+        self._actors = dict()  # actor guid by node long name.
+        nodes = cmds.ls(nodes, long=True, type="transform") or list()
+        for node, guid in zip(
+            nodes, tag.tag_values(tag.TAG_ASSET_GUID_ATTR_NAME, nodes)
+        ):
+            if guid:
+                self._actors[node] = guid
+            else:
+                logger.warning("Could not find guid: {}".format(node))
+
+        self._dirty = set()
+        self._sent = dict()  # last transform values sent by node.
+        self._pending = list()  # nodes and values of the request in flight.
+        self._future = None
+
+    @property
+    def nodes(self):
+        return list(self._actors.keys())
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def start(self):
+        """
+        Registers the callbacks and sends the transforms of all the nodes with the first tick.
+        """
+
+        if self._running:
+            return
+        for i, node in enumerate(self._actors):
+            self._manager.worldMatrixModifiedCB(
+                "uegearStreamNode{}".format(i),
+                functools.partial(self.mark_dirty, node),
+                node,
+            )
+        self._manager.timeChangedCB("uegearStreamTime", self.mark_all_dirty)
+        self._manager.newSceneCB("uegearStreamNewScene", self._scene_changed)
+        self._manager.timerCB("uegearStreamTick", self.tick, 1.0 / self._rate)
+        self._running = True
+        self.mark_all_dirty()
+
+    def stop(self):
+        """
+        Removes the callbacks. The request in flight, if any, is not cancelled.
+        """
+
+        self._manager.removeAllManagedCB()
+        self._running = False
+
+    def _scene_changed(self, *args):
+        self.stop()
+
+    def mark_dirty(self, node, *args):
+        self._dirty.add(node)
+
+    def mark_all_dirty(self, *args):
+        self._dirty.update(self._actors)
+
+    def _collect_response(self):
+        try:
+            responses = self._future.result()
+        except Exception:
+            responses = [{"return": False}] * len(self._pending)
+        for (node, values), response in zip(self._pending, responses):
+            if response == {"return": False}:
+                # sent again with the next tick
+                self._dirty.add(node)
+            else:
+                self._sent[node] = values
+        self._pending = list()
+        self._future = None
+
+    def tick(self, *args):
+        """
+        Sends the changed transforms of the dirty nodes, unless the previous request is still in flight.
+
+        :return: number of actors sent.
+        :rtype: int
+        """
+
+        if self._future is not None:
+            if not self._future.done():
+                return 0
+            self._collect_response()
+        if not self._dirty:
+            return 0
+
+        world_up = str(cmds.optionVar(query="upAxisDirection"))
+        commands = list()
+        for node in self._dirty:
+            if not cmds.objExists(node):
+                continue
+            values = get_actor_transform(node)
+            if not is_changed(
+                self._sent.get(node), values, self._tolerance
+            ):
+                continue
+            self._pending.append((node, values))
+            commands.append(
+                (
+                    "set_actor_world_transform",
+                    {
+                        "actor_guid": self._actors[node],
+                        "translation": str(list(values[0:3])),
+                        "rotation": str(list(values[3:6])),
+                        "scale": str(list(values[6:9])),
+                        "world_up": world_up,
+                    },
+                )
+            )
+        self._dirty.clear()
+
+        if commands:
+            self._future = self._bridge.execute_batch_async(commands)
+        return len(commands)
+
+
+def start_stream(nodes=None, rate=DEFAULT_RATE):
+    """
+    Starts streaming the transforms of the given nodes (or selected nodes) to Unreal, replacing the current stream.
+
+    :param list(str) or None nodes: nodes to stream.
+    :param float rate: maximum number of updates sent per second.
+    :return: the transform stream.
+    :rtype: TransformStream
+    """
+
+    global _stream
+    stop_stream()
+    nodes = nodes or cmds.ls(sl=True, long=True)
+    _stream = TransformStream(nodes, rate=rate)
+    if not _stream.nodes:
+        logger.warning("No ueGear tagged nodes selected to stream")
+        return _stream
+    _stream.start()
+    logger.info(
+        "Streaming {} nodes transforms to Unreal".format(len(_stream.nodes))
+    )
+    return _stream
+
+
+def stop_stream():
+    """
+    Stops the current transform stream.
+    """
+
+    global _stream
+    if _stream is not None:
+        _stream.stop()
+        _stream = None
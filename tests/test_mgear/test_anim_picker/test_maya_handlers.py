@@ -0,0 +1,42 @@
+"""mgear.anim_picker.handlers.maya_handlers test"""
+
+
+def test_selection_check(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    from maya import cmds
+
+    # mGear imports
+    from mgear.anim_picker.handlers import maya_handlers
+
+    cmds.file(new=True, force=True)
+    for node in ("ctl_a", "ctl_b", "ctl_c"):
+        cmds.createNode("transform", name=node)
+
+    selection = maya_handlers.SelectionCheck()
+    selection.set_nodes(["ctl_a", "ctl_b", "ctl_c", "ctl_missing"])
+
+    # all indexed nodes are reported once
+    cmds.select(clear=True)
+    assert selection.update() == set(["ctl_a", "ctl_b", "ctl_c",
+                                      "ctl_missing"])
+    assert not selection.is_selected("ctl_a")
+
+    # only the nodes whose state changed are reported
+    cmds.select("ctl_a", "ctl_b")
+    assert selection.update() == set(["ctl_a", "ctl_b"])
+    assert selection.is_selected("ctl_a")
+
+    cmds.select("ctl_b", "ctl_c")
+    assert selection.update() == set(["ctl_a", "ctl_c"])
+    assert not selection.is_selected("ctl_a")
+    assert selection.is_selected("ctl_c")
+
+    cmds.select("ctl_b", "ctl_c")
+    assert selection.update() == set()
+
+    # node created after the index is resolved on selection
+    cmds.createNode("transform", name="ctl_missing")
+    cmds.select("ctl_missing")
+    assert selection.update() == set(["ctl_b", "ctl_c", "ctl_missing"])
+    assert selection.is_selected("ctl_missing")
+    assert not selection.is_selected("ctl_b")
@@ -0,0 +1,28 @@
+"""mgear.animbits.channel_master_utils test"""
+
+
+def test_get_key_state_from_keys(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.animbits import channel_master_utils as cmu
+
+    key_times = [1.0, 10.0, 24.0]
+
+    # channel without animation
+    assert cmu.get_key_state_from_keys(None, 10.0, 0.0, 0.0) == cmu.KEY_STATIC
+    assert cmu.get_key_state_from_keys([], 10.0, 0.0, 0.0) == cmu.KEY_STATIC
+
+    # key on the current frame
+    state = cmu.get_key_state_from_keys(key_times, 10.0, 2.5, 2.5)
+    assert state == cmu.KEY_ON_FRAME
+    state = cmu.get_key_state_from_keys(key_times, 24.00001, 2.5, 2.5)
+    assert state == cmu.KEY_ON_FRAME
+
+    # value from the animation between keys
+    state = cmu.get_key_state_from_keys(key_times, 12.0, 2.5, 2.5)
+    assert state == cmu.KEY_ANIMATED
+    state = cmu.get_key_state_from_keys(key_times, 30.0, 2.5, 2.5)
+    assert state == cmu.KEY_ANIMATED
+
+    # value changed from the animation
+    state = cmu.get_key_state_from_keys(key_times, 10.0, 3.0, 2.5)
+    assert state == cmu.KEY_CHANGED
@@ -0,0 +1,165 @@
+"""mgear.animbits.spring_manager.simulator test"""
+
+# springNode outputs for a goal moving from 0 to 1 at frame 1, with the
+# default damping and stiffness (0.5)
+RECORDED_GOALS = [0.0, 1.0, 1.0, 1.0, 1.0]
+RECORDED_OUTPUTS = {
+    1.0: [0.0, 0.5, 0.875, 1.03125, 1.0546875],
+    0.5: [0.0, 0.75, 0.9375, 1.015625, 1.02734375],
+}
+
+
+def _spring_node(goals, damping, stiffness, intensity):
+    """mgear_springNode::compute, one spring, stepped frame by frame"""
+    outputs = []
+    previous = current = goals[0]
+    for i, goal in enumerate(goals):
+        velocity = [
+            (c - p) * (1.0 - damping[i]) for c, p in zip(current, previous)
+        ]
+        position = [c + v for c, v in zip(current, velocity)]
+        position = [
+            p + (g - p) * stiffness[i] for p, g in zip(position, goal)
+        ]
+        previous, current = current, position
+        outputs.append(
+            [g + (p - g) * intensity[i] for p, g in zip(position, goal)]
+        )
+    return outputs
+
+
+def test_recorded_outputs(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.animbits.spring_manager import simulator
+
+    goals = np.zeros((len(RECORDED_GOALS), 1, 3))
+    goals[:, 0, 1] = RECORDED_GOALS
+    for intensity, recorded in RECORDED_OUTPUTS.items():
+        result = simulator.simulate(goals, 0.5, 0.5, intensity)
+        assert np.allclose(result[:, 0, 1], recorded)
+        assert np.allclose(result[:, 0, [0, 2]], 0.0)
+
+
+def test_simulate_parity(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.animbits.spring_manager import simulator
+
+    rng = np.random.RandomState(3)
+    frames, count = 40, 5
+    goals = np.cumsum(rng.uniform(-1, 1, (frames, count, 3)), axis=0)
+    damping = rng.uniform(0, 1, (frames, count))
+    stiffness = rng.uniform(0, 1, (frames, count))
+    intensity = rng.uniform(0, 1, (frames, count))
+
+    result = simulator.simulate(goals, damping, stiffness, intensity)
+    for i in range(count):
+        expected = _spring_node(
+            goals[:, i].tolist(),
+            damping[:, i],
+            stiffness[:, i],
+            intensity[:, i],
+        )
+        assert np.allclose(result[:, i], expected)
+
+    # a subset of springs stepped with the state of all of them
+    state = simulator.SpringState(count)
+    index = np.array([1, 3])
+    for f in range(frames):
+        if f == 0:
+            state.reset(goals[f, index], index)
+        output = state.step(
+            goals[f, index],
+            damping[f, index],
+            stiffness[f, index],
+            intensity[f, index],
+            index,
+        )
+    assert np.allclose(output, result[-1, index])
+
+
+def test_constraints(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.animbits.spring_manager import simulator
+
+    aim_dirs = np.array([[1.0, 2.0, -0.5], [0.0, 0.0, -3.0]])
+    up_dirs = np.array([[0.0, 1.0, 0.0], [0.0, 1.0, 0.2]])
+    aim_vectors = np.array([[-1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    up_vectors = np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]])
+    rotations = simulator.aim_rotations(
+        aim_dirs, up_dirs, aim_vectors, up_vectors
+    )
+    for i, r in enumerate(rotations):
+        assert np.allclose(np.dot(r, r.T), np.identity(3))
+        assert np.isclose(np.linalg.det(r), 1.0)
+        aim = np.dot(aim_vectors[i], r)
+        assert np.allclose(aim, aim_dirs[i] / np.linalg.norm(aim_dirs[i]))
+        # the up vector is in the aim and up plane, towards the up
+        up = np.dot(up_vectors[i], r)
+        assert np.isclose(np.dot(up, np.cross(aim_dirs[i], up_dirs[i])), 0)
+        assert np.dot(up, up_dirs[i]) > 0
+
+    parents = np.tile(np.identity(4), (2, 1, 1))
+    parents[:, :3, :3] = rotations[::-1] * 2.0
+    parents[:, 3, :3] = [[1, 2, 3], [-4, 0, 1]]
+    positions = np.array([[0.5, 0.0, 1.0], [2.0, 3.0, -1.0]])
+    scales = np.array([[1.0, 1.0, 1.0], [0.5, 2.0, 1.0]])
+    local = simulator.parent_constraint_locals(
+        positions, rotations, scales, parents
+    )
+    world = np.matmul(local, parents)
+    assert np.allclose(world[:, 3, :3], positions)
+    world_rotations = world[:, :3, :3] / np.linalg.norm(
+        world[:, :3, :3], axis=-1
+    )[:, :, None]
+    assert np.allclose(world_rotations, rotations)
+    assert np.allclose(np.linalg.norm(local[:, :3, :3], axis=-1), scales)
+
+
+def test_spring_setup_parity(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    from maya import cmds
+
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.animbits.spring_manager import setup
+    from mgear.animbits.spring_manager import simulator
+
+    cmds.file(new=True, force=True)
+    cmds.loadPlugin("mgear_solvers", quiet=True)
+    parent = cmds.createNode("transform", name="parent")
+    node = cmds.createNode("transform", name="node", parent=parent)
+    child = cmds.createNode("transform", name="child", parent=node)
+    cmds.setAttr(node + ".tx", 2)
+    cmds.setAttr(child + ".tx", 2)
+    for frame, value in ((1, 0), (5, 10), (10, -5), (20, 0)):
+        cmds.setKeyframe(parent, attribute="ty", time=frame, value=value)
+        cmds.setKeyframe(parent, attribute="rz", time=frame, value=value * 6)
+
+    for n in (node, child):
+        config = setup.init_config(n, "x", 2)
+        config["springTranslationalIntensity"] = 0.5
+        setup.create_spring(n, config)
+
+    frames = list(range(1, 31))
+    values = simulator.get_baked_channels([child, node], frames)
+
+    # springNode outputs, stepping the time
+    cmds.currentTime(frames[0] - 10)
+    for i, frame in enumerate(frames):
+        cmds.currentTime(frame)
+        for j, n in enumerate((child, node)):
+            expected = cmds.getAttr(n + ".translate")[0] + cmds.getAttr(
+                n + ".rotate"
+            )[0]
+            assert np.allclose(values[i, j, :6], expected, atol=1e-3)
@@ -0,0 +1,82 @@
+"""mgear.core.anim_bake test"""
+
+
+def _rotation(axis, angle):
+    # Third party imports
+    import numpy as np
+
+    # Maya row vector convention
+    c, s = np.cos(angle), np.sin(angle)
+    i, j = (axis + 1) % 3, (axis + 2) % 3
+    m = np.identity(3)
+    m[i, i] = c
+    m[j, j] = c
+    m[i, j] = s
+    m[j, i] = -s
+    return m
+
+
+def test_rotation_to_euler(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import anim_bake
+
+    angles = np.array([[0.3, -0.5, 1.2], [-1.2, 0.4, 0.1], [0.0, 0.0, 0.0]])
+    for order, axes in enumerate(anim_bake.ROTATE_ORDERS):
+        rotations = np.array(
+            [
+                np.linalg.multi_dot([_rotation(a, angle[a]) for a in axes])
+                for angle in angles
+            ]
+        )
+        result = anim_bake.rotation_to_euler(rotations, order)
+        assert np.allclose(result, angles), order
+
+
+def test_decompose(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import anim_bake
+
+    rotation = np.linalg.multi_dot(
+        [_rotation(0, 0.2), _rotation(1, -0.7), _rotation(2, 0.5)]
+    )
+    matrix = np.identity(4)
+    matrix[:3, :3] = np.matmul(np.diag([-2.0, 1.0, 0.5]), rotation)
+    matrix[3, :3] = [1.0, 2.0, 3.0]
+
+    values = anim_bake.decompose(np.array([matrix]))[0]
+    assert np.allclose(
+        values, [1.0, 2.0, 3.0, 0.2, -0.7, 0.5, -2.0, 1.0, 0.5]
+    )
+
+    # joint orient
+    joint_orient = _rotation(2, 0.5)
+    matrix[:3, :3] = np.linalg.multi_dot(
+        [_rotation(0, 0.2), _rotation(1, -0.7), joint_orient]
+    )
+    values = anim_bake.decompose(
+        np.array([matrix]), joint_orient=joint_orient
+    )[0]
+    assert np.allclose(values[3:], [0.2, -0.7, 0.0, 1.0, 1.0, 1.0])
+
+
+def test_pole_vectors(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import anim_bake
+
+    p1 = np.array([[0.0, 10.0, 0.0], [0.0, 10.0, 0.0]])
+    p2 = np.array([[0.0, 5.0, 1.0], [0.0, 5.0, 2.0]])
+    p3 = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    result = anim_bake.pole_vectors(p1, p2, p3)
+    # in front of the knee, at the average bone length
+    length = np.linalg.norm(p2 - p1, axis=-1)
+    assert np.allclose(result[:, :2], [[0.0, 5.0], [0.0, 5.0]])
+    assert np.allclose(result[:, 2], p2[:, 2] + length)
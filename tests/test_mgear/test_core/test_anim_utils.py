@@ -0,0 +1,52 @@
+"""mgear.core.anim_utils test"""
+
+
+def test_mirror_plugs(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.core import anim_utils
+
+    pairs = [
+        ["arm_L0_fk0_ctl", "arm_R0_fk0_ctl", [["tx", "tx", -1]]],
+        ["spine_C0_ik_ctl", "spine_C0_ik_ctl", [["ry", "ry", 1]]],
+    ]
+    assert anim_utils._getMirrorPlugs("ns", pairs) == [
+        ("ns:arm_L0_fk0_ctl.tx", "ns:arm_R0_fk0_ctl.tx", -1),
+        ("ns:spine_C0_ik_ctl.ry", "ns:spine_C0_ik_ctl.ry", 1),
+    ]
+    assert anim_utils._getMirrorPlugs("", pairs[:1]) == [
+        ("arm_L0_fk0_ctl.tx", "arm_R0_fk0_ctl.tx", -1)
+    ]
+
+
+def test_mirror_pose(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    import pymel.core as pm
+    from maya import cmds
+
+    # mGear imports
+    from mgear.core import anim_utils
+
+    cmds.file(new=True, force=True)
+    ctls = []
+    for side in "LR":
+        ctl = pm.createNode("transform", name="arm_{}0_fk0_ctl".format(side))
+        ctl.addAttr("invTx", at="bool", dv=True)
+        ctls.append(ctl)
+    left, right = ctls
+
+    left.tx.set(2)
+    left.ry.set(30)
+    anim_utils.mirrorPose(nodes=[left])
+    assert right.tx.get() == -2
+    assert right.ry.get() == 30
+
+    right.tx.set(5)
+    anim_utils.mirrorPose(flip=True, nodes=[right])
+    assert left.tx.get() == -5
+    assert right.tx.get() == -2
+
+    # keys in a frame range
+    pm.setKeyframe(left, at="tx", t=1, v=1)
+    pm.setKeyframe(left, at="tx", t=10, v=3)
+    anim_utils.mirrorPose(nodes=[left], frameRange=(1, 10))
+    assert pm.keyframe(right.tx, q=True, vc=True) == [-1, -3]
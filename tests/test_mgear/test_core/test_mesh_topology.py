@@ -0,0 +1,89 @@
+"""mgear.core.mesh_topology test"""
+
+
+def _grid(size):
+    """Quad grid topology of size x size faces, rows of size + 1 vertices"""
+    width = size + 1
+    edges = []
+    for y in range(width):
+        for x in range(size):
+            edges.append((y * width + x, y * width + x + 1))
+    for y in range(size):
+        for x in range(width):
+            edges.append((y * width + x, (y + 1) * width + x))
+    counts = []
+    connects = []
+    for y in range(size):
+        for x in range(size):
+            i = y * width + x
+            counts.append(4)
+            connects.extend([i, i + 1, i + width + 1, i + width])
+    return width * width, edges, counts, connects
+
+
+def test_topology_adjacency(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.core import mesh_topology
+
+    topology = mesh_topology.MeshTopology(*_grid(2))
+
+    assert topology.edge_count == 12
+    assert topology.face_count == 4
+    assert topology.get_neighbors([4]).tolist() == [1, 3, 5, 7]
+    assert topology.get_neighbors([0, 8]).tolist() == [1, 3, 5, 7]
+    assert topology.get_vertex_faces([4]).tolist() == [0, 1, 2, 3]
+    assert topology.get_face_vertices([3]).tolist() == [4, 5, 8, 7]
+    assert topology.get_vertex_edges([0]).tolist() == [0, 6]
+    assert topology.get_edges_vertices([0, 1, 6]).tolist() == [0, 1, 2, 3]
+    assert topology.get_neighbors([]).tolist() == []
+
+
+def test_concentric_loops(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.core import mesh_topology
+
+    # 4 x 4 faces grid, the center vertex is 12
+    topology = mesh_topology.MeshTopology(*_grid(4))
+
+    # new vertices follow the previous loop order
+    loops = topology.get_concentric_loops([12], 3)
+    assert [x.tolist() for x in loops] == [[12],
+                                           [7, 11, 13, 17],
+                                           [2, 6, 8, 10, 16, 14, 18, 22],
+                                           [1, 3, 5, 9, 15, 21, 19, 23]]
+
+    # each row walks outward from the first loop
+    rows = topology.get_vertex_rows(loops[1:3])
+    assert rows[0] == [7, 2, 6, 8]
+    assert rows[3] == [17, 16, 18, 22]
+
+
+def test_topology_cache(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    import pymel.core as pm
+    from maya import cmds
+
+    # mGear imports
+    from mgear.core import mesh_topology
+    from mgear.core import meshNavigation
+
+    cmds.file(new=True, force=True)
+    mesh = cmds.polyPlane(subdivisionsX=4, subdivisionsY=4,
+                          constructionHistory=False)[0]
+
+    topology = mesh_topology.get_topology(mesh)
+    assert mesh_topology.get_topology(mesh) is topology
+
+    # the loops match the PyMEL topology
+    shape = pm.PyNode(mesh).getShape()
+    loops = meshNavigation.getConcentricVertexLoop([shape.vtx[12]], 1)
+    expected = sorted(v.index() for v in shape.vtx[12].connectedVertices())
+    assert sorted(v.index() for v in loops[1]) == expected
+
+    extreme = meshNavigation.getExtremeVertexFromLoop(list(shape.e))
+    assert len(extreme[5]) == 25
+
+    # topology change rebuilds the index
+    cmds.polySubdivideFacet(mesh, divisions=1, constructionHistory=False)
+    assert mesh_topology.get_topology(mesh) is not topology
+    mesh_topology.clear_cache()
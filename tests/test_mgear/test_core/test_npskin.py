@@ -0,0 +1,61 @@
+"""mgear.core.npskin test"""
+
+
+def test_npskin_write_read(run_with_maya_pymel, setup_path, tmp_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import npskin
+
+    body = npskin.synthetic_data(1000, 20, 4, seed=0)
+    prop = npskin.synthetic_data(10, 3, 2, seed=1)
+    prop["objName"] = "prop"
+    file_path = str(tmp_path / "test.npSkin")
+    npskin.write(file_path, [body, prop])
+
+    assert npskin.get_objs(file_path) == ["synthetic_mesh", "prop"]
+
+    # only the requested object is read
+    objs_data = npskin.read(file_path, ["prop"])
+    assert len(objs_data) == 1
+    assert objs_data[0]["influences"] == prop["influences"]
+    assert np.allclose(npskin.get_weights_matrix(objs_data[0]),
+                       prop["weightsMatrix"])
+
+    # the weights are read as float32 CSR arrays, without a dense matrix
+    objs_data = npskin.read(file_path)
+    assert "weightsMatrix" not in objs_data[0]
+    indptr, indices, weights = objs_data[0]["weightsCSR"]
+    assert weights.dtype == np.float32
+    assert len(weights) == np.count_nonzero(body["weightsMatrix"])
+    assert np.allclose(npskin.get_weights_matrix(objs_data[0]),
+                       body["weightsMatrix"])
+    assert objs_data[0]["vertexCount"] == 1000
+
+    # read data can be written again
+    npskin.write(file_path, objs_data)
+    assert np.allclose(npskin.get_weights_matrix(npskin.read(file_path)[0]),
+                       body["weightsMatrix"])
+
+
+def test_npskin_pack_conversion(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import npskin
+
+    data = npskin.synthetic_data(50, 5, 2)
+    pack_data = npskin.to_pack_data([data])
+    assert pack_data["objs"] == ["synthetic_mesh"]
+    assert pack_data["objDDic"][0]["skinDataFormat"] == "compressed"
+
+    back = npskin.from_pack_data(pack_data)[0]
+    assert np.allclose(back["weightsMatrix"], data["weightsMatrix"])
+
+    # from the sparse arrays
+    csr_data = dict(data)
+    matrix = csr_data.pop("weightsMatrix")
+    csr_data["weightsCSR"] = npskin.weights_to_csr(matrix)
+    assert npskin.to_pack_data([csr_data]) == pack_data
@@ -0,0 +1,75 @@
+"""mgear.core.om_node test"""
+
+
+def test_om2_primitive(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    import pymel.core as pm
+    from maya import cmds
+
+    # mGear imports
+    from mgear.core import om_node
+    from mgear.core import primitive
+
+    cmds.file(new=True, force=True)
+    with primitive.om2Nodes():
+        parent = primitive.addTransformFromPos(None, "om_parent", (1, 2, 3))
+        child = primitive.addTransform(parent, "om_child")
+        loc = primitive.addLocator(parent, "om_loc", size=2)
+
+    # the nodes are still PyNodes and the switch is off after the block
+    assert isinstance(parent, pm.nodetypes.Transform)
+    assert not om_node.is_enabled()
+    assert child.getParent() == parent
+    assert child.longName() == "|om_parent|om_child"
+    # parenting keeps the world transformation
+    assert cmds.getAttr("om_child.translate")[0] == (-1.0, -2.0, -3.0)
+    assert cmds.getAttr("om_loc.localScaleX") == 2.0
+    assert loc.getShape().localScale.get() == (2.0, 2.0, 2.0)
+
+
+def test_om_node(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    from maya import cmds
+
+    # mGear imports
+    from mgear.core import om_node
+
+    cmds.file(new=True, force=True)
+    parent = om_node.create_node("transform", "om_parent")
+    child = om_node.create_node("transform", "om_child", parent)
+
+    assert str(child) == "om_child"
+    assert child.getParent() == parent
+    assert child.to_pynode().longName() == "|om_parent|om_child"
+
+    attr = parent.attr("visibility")
+    assert str(attr) == "om_parent.visibility"
+    attr.set(False)
+    assert not cmds.getAttr("om_parent.visibility")
+
+
+def test_om2_attribute_and_applyop(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    import pymel.core as pm
+    from maya import cmds
+
+    # mGear imports
+    from mgear.core import applyop
+    from mgear.core import attribute
+    from mgear.core import om_node
+    from mgear.core import primitive
+
+    cmds.file(new=True, force=True)
+    with primitive.om2Nodes():
+        parent = primitive.addTransform(None, "om_parent")
+        child = primitive.addTransform(None, "om_child")
+        attr = attribute.addAttribute(parent, "blend", "float", 0.5, 0, 1)
+        node = applyop.gear_mulmatrix_op(
+            parent.attr("worldMatrix"), pm.datatypes.Matrix(), child
+        )
+
+    assert isinstance(attr, pm.Attribute)
+    assert cmds.getAttr("om_parent.blend") == 0.5
+    assert node.type() == "mgear_mulMatrix"
+    assert cmds.listConnections("om_child.translate", source=True)
+    assert not om_node.is_enabled()
@@ -0,0 +1,93 @@
+"""mgear.core.pipeline test"""
+
+
+def test_run_writes_error_report(setup_path, tmp_path):
+    # mGear imports
+    from mgear.core import pipeline
+
+    def items():
+        for i in range(5):
+            yield "f{}".format(i), str(tmp_path / "f{}".format(i)), i
+
+    def write(path, data):
+        if data == 2:
+            raise IOError("disk full")
+        with open(path, "w") as fp:
+            fp.write(str(data))
+
+    progress = []
+    report = pipeline.run_writes(
+        items(), write, workers=2, progress_callback=lambda *a: progress.append(a)
+    )
+    assert list(report.keys()) == ["f0", "f1", "f2", "f3", "f4"]
+    assert "disk full" in report["f2"]
+    assert [e for e in report.values() if e] == [report["f2"]]
+    assert len(progress) == 5
+    assert (tmp_path / "f4").read_text() == "4"
+
+
+def test_run_reads_order(setup_path, tmp_path):
+    # mGear imports
+    from mgear.core import pipeline
+
+    files = []
+    for i in range(7):
+        path = tmp_path / "f{}".format(i)
+        if i != 3:
+            path.write_text(str(i))
+        files.append(("f{}".format(i), str(path)))
+
+    applied = []
+    report = pipeline.run_reads(
+        files,
+        lambda path: open(path).read(),
+        lambda name, data: applied.append(data),
+        workers=2,
+    )
+    assert applied == ["0", "1", "2", "4", "5", "6"]
+    assert report["f3"] is not None
+    assert report["f6"] is None
+
+
+def test_run_writes_collect_error_and_bound(setup_path, tmp_path):
+    # Stdlib imports
+    import time
+
+    # mGear imports
+    from mgear.core import pipeline
+
+    done = [0]
+    waiting = []
+
+    def items():
+        for i in range(8):
+            # collected items not written yet
+            waiting.append(i - done[0])
+            if i == 1:
+                try:
+                    raise ValueError("bad skin cluster")
+                except ValueError:
+                    yield "f1", None, pipeline.CollectError()
+                continue
+            yield "f{}".format(i), str(tmp_path / "f{}".format(i)), i
+
+    def write(path, data):
+        time.sleep(0.01)
+        with open(path, "w") as fp:
+            fp.write(str(data))
+
+    def progress(name, count, total, error):
+        done[0] = count
+
+    report = pipeline.run_writes(
+        items(), write, workers=1, progress_callback=progress, max_pending=2
+    )
+    assert list(report.keys()) == ["f{}".format(i) for i in range(8)]
+    assert report["f1"] == "ValueError: bad skin cluster"
+    assert [k for k, e in report.items() if e] == ["f1"]
+    assert (tmp_path / "f7").read_text() == "7"
+    assert max(waiting) <= 2
+
+    # no workers
+    report = pipeline.run_writes(items(), write, workers=0)
+    assert report["f1"] == "ValueError: bad skin cluster"
@@ -0,0 +1,64 @@
+"""mgear.core.skin_array test"""
+
+
+def test_weights_dict_round_trip(run_with_maya_pymel, setup_path):
+    # Stdlib imports
+    import json
+
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import skin_array
+
+    weights = np.array([[0.5, 0.5, 0.0],
+                        [0.0, 0.0, 1.0],
+                        [0.2, 0.0, 0.8]])
+    data = skin_array.weights_to_dict(weights, ["a", "b", "c"])
+    assert data == {"a": {0: 0.5, 2: 0.2}, "b": {0: 0.5}, "c": {1: 1.0, 2: 0.8}}
+
+    # jSkin stores the vertex keys as strings
+    json_data = json.loads(json.dumps(data))
+    matrix, influences = skin_array.dict_to_weights(json_data, 3)
+    assert influences == ["a", "b", "c"]
+    assert np.allclose(matrix, weights)
+
+
+def test_blend_weights_dict(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import skin_array
+
+    blend = np.array([0.0, 0.1234567, 0.0, 1.0])
+    data = skin_array.blend_weights_to_dict(blend)
+    assert data == {1: 0.123457, 3: 1.0}
+    assert np.allclose(
+        skin_array.dict_to_blend_weights(data, 4), [0.0, 0.123457, 0.0, 1.0]
+    )
+    assert np.allclose(
+        skin_array.dict_to_blend_weights([0.1, 0.2], 2, compressed=False),
+        [0.1, 0.2],
+    )
+
+
+def test_csr_block(run_with_maya_pymel, setup_path):
+    # Third party imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.core import npskin
+    from mgear.core import skin_array
+
+    matrix = np.array([[0.5, 0.0, 0.5],
+                       [0.0, 1.0, 0.0],
+                       [0.2, 0.3, 0.5],
+                       [0.0, 0.0, 1.0]])
+    indptr, indices, weights = npskin.weights_to_csr(matrix)
+
+    # the second file influence is not in the skinCluster
+    column_map = np.array([1, -1, 0])
+    block = skin_array.get_csr_block(indptr, indices, weights, 1, 4,
+                                     column_map, 2)
+    assert np.allclose(block, [[0.0, 0.0], [0.5, 0.2], [1.0, 0.0]])
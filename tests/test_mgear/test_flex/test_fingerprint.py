@@ -0,0 +1,95 @@
+"""mgear.flex.fingerprint test"""
+
+
+def test_get_changed_shapes(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.flex import fingerprint
+
+    def shape_fingerprint(points, uvs="uv"):
+        return {"type": "mesh", "count": 8, "bbox": ([0, 0, 0], [1, 1, 1]),
+                "topology": "topo", "points": points, "uvs": uvs}
+
+    matching_shapes = {"src:body": "|rig|body", "src:head": "|rig|head"}
+    source = {"src:body": shape_fingerprint("a"),
+              "src:head": shape_fingerprint("b")}
+    options = {"deformed": True}
+
+    # no cache nor target fingerprints, all shapes changed
+    changed = fingerprint.get_changed_shapes(source, matching_shapes, {})
+    assert sorted(changed) == ["src:body", "src:head"]
+
+    # compared to the target fingerprints
+    target = {"|rig|body": shape_fingerprint("a"),
+              "|rig|head": shape_fingerprint("b", uvs="other")}
+    changed = fingerprint.get_changed_shapes(source, matching_shapes, {},
+                                             target)
+    assert changed == ["src:head"]
+
+    # compared to the cached hashes before the target fingerprints
+    cache = {"options": options,
+             "shapes": {"body": fingerprint.get_hashes(source["src:body"]),
+                        "head": fingerprint.get_hashes(source["src:head"])}}
+    changed = fingerprint.get_changed_shapes(source, matching_shapes, cache,
+                                             target, options)
+    assert changed == []
+
+    # a changed point
+    source["src:body"] = shape_fingerprint("c")
+    changed = fingerprint.get_changed_shapes(source, matching_shapes, cache,
+                                             options=options)
+    assert changed == ["src:body"]
+
+    # different options update every shape
+    changed = fingerprint.get_changed_shapes(source, matching_shapes, cache,
+                                             options={"deformed": False})
+    assert sorted(changed) == ["src:body", "src:head"]
+
+
+def test_is_matching_bounding_box(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.flex import fingerprint
+
+    source = {"bbox": ([-1, 0, -1], [1, 2, 1])}
+    assert fingerprint.is_matching_bounding_box(
+        source, {"bbox": ([-1, 0, -1.01], [1, 2, 1])})
+    assert not fingerprint.is_matching_bounding_box(
+        source, {"bbox": ([-1, 0, -1], [1, 3, 1])})
+
+
+def test_update_rig_changed_only(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    from maya import cmds
+
+    # mGear imports
+    from mgear.flex import update
+
+    cmds.file(new=True, force=True)
+    target = cmds.createNode("transform", name="geo_grp")
+    cmds.polyCube(name="body", constructionHistory=False)
+    cmds.parent("body", target)
+
+    cmds.namespace(add="new")
+    source = cmds.createNode("transform", name="new:geo_grp")
+    cmds.polyCube(name="new:body", constructionHistory=False)
+    cmds.parent("new:body", source)
+
+    options = {"deformed": True,
+               "transformed": True,
+               "object_display": False,
+               "user_attributes": True,
+               "render_attributes": False,
+               "component_display": False,
+               "plugin_attributes": False,
+               "hold_transform_values": False,
+               "mismatched_topologies": False,
+               "changed_only": True}
+    update.update_rig(source, target, options)
+
+    # same geometry, only the transform and a user attribute change
+    cmds.setAttr("new:body.translateX", 5)
+    cmds.addAttr("new:bodyShape", longName="flexTest", attributeType="long")
+    cmds.setAttr("new:bodyShape.flexTest", 3)
+    update.update_rig(source, target, options)
+
+    assert cmds.getAttr("body.translateX") == 5
+    assert cmds.getAttr("bodyShape.flexTest") == 3
@@ -0,0 +1,115 @@
+"""mgear.flex.transfer test"""
+
+
+def test_kdtree_query(run_with_maya_pymel, setup_path):
+    # Stdlib imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.flex import transfer
+
+    rng = np.random.RandomState(0)
+    points = rng.uniform(-1, 1, (500, 3))
+    tree = transfer.KDTree(points, leaf_size=4)
+
+    for position in rng.uniform(-1.5, 1.5, (20, 3)):
+        distances, indices = tree.query(position, 5)
+        expected = np.argsort(((points - position) ** 2).sum(axis=1))[:5]
+        assert indices == expected.tolist()
+        assert np.allclose(distances,
+                           np.linalg.norm(points[expected] - position, axis=1))
+
+    assert tree.query_points(points[:3], 1)[:, 0].tolist() == [0, 1, 2]
+
+    # batched queries, with blocks of several leaves
+    positions = rng.uniform(-1.5, 1.5, (200, 3))
+    distances = ((points - positions[:, np.newaxis]) ** 2).sum(axis=2)
+    expected = np.argsort(distances, axis=1)[:, :5]
+    assert (tree.query_points(positions, 5) == expected).all()
+    # blocks smaller than the tree nodes
+    batch_leaf_size = transfer.BATCH_LEAF_SIZE
+    transfer.BATCH_LEAF_SIZE = 8
+    try:
+        assert (tree.query_points(positions, 5) == expected).all()
+    finally:
+        transfer.BATCH_LEAF_SIZE = batch_leaf_size
+
+    assert tree.query_points(positions, 0).shape == (200, 0)
+    assert tree.query_points(positions, 600).shape == (200, 500)
+
+
+def test_barycentric_coordinates(run_with_maya_pymel, setup_path):
+    # Stdlib imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.flex import transfer
+
+    points = np.array([[0.25, 0.25, 1.0],   # inside
+                       [-1.0, -1.0, 0.0],   # vertex a
+                       [2.0, -0.5, 0.0],    # vertex b
+                       [0.5, -1.0, 0.0],    # edge ab
+                       [1.0, 1.0, 0.0]])    # edge bc
+    count = len(points)
+    a = np.tile([0.0, 0.0, 0.0], (count, 1))
+    b = np.tile([1.0, 0.0, 0.0], (count, 1))
+    c = np.tile([0.0, 1.0, 0.0], (count, 1))
+
+    weights = transfer.get_barycentric_coordinates(points, a, b, c)
+
+    assert np.allclose(weights, [[0.5, 0.25, 0.25],
+                                 [1.0, 0.0, 0.0],
+                                 [0.0, 1.0, 0.0],
+                                 [0.5, 0.5, 0.0],
+                                 [0.0, 0.5, 0.5]])
+
+
+def test_point_correspondence(run_with_maya_pymel, setup_path):
+    # Stdlib imports
+    import numpy as np
+
+    # mGear imports
+    from mgear.flex import transfer
+
+    # previous topology: a 2 x 2 grid of quads in XY
+    points = np.array([[x, y, 0.0] for y in range(3) for x in range(3)],
+                      dtype=float)
+    triangles = []
+    for y in range(2):
+        for x in range(2):
+            i = y * 3 + x
+            triangles.extend([[i, i + 1, i + 4], [i, i + 4, i + 3]])
+
+    # new topology points, slightly off the surface
+    targets = np.array([[0.5, 0.25, 0.1], [2.0, 2.0, -0.1], [1.5, 1.0, 0.0]])
+    indices, weights = transfer.get_point_correspondence(points, triangles,
+                                                         targets)
+
+    # interpolating the positions gives back the projected points
+    projected = transfer.interpolate(points, indices, weights)
+    assert np.allclose(projected, targets * [1, 1, 0])
+
+    # a value linear on the surface is interpolated exactly
+    values = points[:, 0] * 2 + points[:, 1]
+    assert np.allclose(transfer.interpolate(values, indices, weights),
+                       targets[:, 0] * 2 + targets[:, 1])
+
+    # skin weights rows still sum to one
+    skin = np.random.RandomState(1).uniform(0, 1, (len(points), 4))
+    skin = transfer.normalize_weights(skin)
+    new_skin = transfer.normalize_weights(
+        transfer.interpolate(skin, indices, weights))
+    assert new_skin.shape == (3, 4)
+    assert np.allclose(new_skin.sum(axis=1), 1.0)
+
+
+def test_components_strings(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.flex import transfer
+
+    indices = [0, 1, 2, 5, 7, 8]
+    components = transfer.get_components_strings(indices)
+
+    assert components == ["vtx[0:2]", "vtx[5]", "vtx[7:8]"]
+    assert transfer.get_components_indices(components) == indices
+    assert transfer.get_components_strings([]) == []
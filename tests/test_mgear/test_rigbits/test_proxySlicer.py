@@ -0,0 +1,71 @@
+"""mgear.rigbits.proxySlicer test"""
+
+
+def test_dominant_influences(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.rigbits import proxySlicer
+
+    # a quad and a triangle sharing the vertices 1 and 2
+    counts = [4, 3]
+    connects = [0, 1, 2, 3, 1, 4, 2]
+    weights = [[1.0, 0.0, 0.0],
+               [0.5, 0.5, 0.0],
+               [0.5, 0.5, 0.0],
+               [0.6, 0.4, 0.0],
+               [0.0, 0.2, 0.8]]
+
+    assert proxySlicer.get_dominant_influences(weights, counts,
+                                               connects) == [0, 1]
+
+    # python path gives the same result, first influence on equal sums
+    numpy_available = proxySlicer.NUMPY_AVAILABLE
+    proxySlicer.NUMPY_AVAILABLE = False
+    try:
+        assert proxySlicer.get_dominant_influences(weights, counts,
+                                                   connects) == [0, 1]
+        assert proxySlicer.get_dominant_influences([[0.5, 0.5]] * 3, [3],
+                                                   [0, 1, 2]) == [0]
+    finally:
+        proxySlicer.NUMPY_AVAILABLE = numpy_available
+
+    # summed by blocks of influences
+    assert proxySlicer.get_dominant_influences(weights, counts, connects,
+                                               block_size=1) == [0, 1]
+    assert proxySlicer.get_dominant_influences(weights, counts, connects,
+                                               block_size=2) == [0, 1]
+    assert proxySlicer.get_dominant_influences([[0.5, 0.5]] * 3, [3],
+                                               [0, 1, 2], block_size=1) == [0]
+
+    assert proxySlicer.get_dominant_influences(weights, [], []) == []
+    assert proxySlicer.get_face_groups([0, 1, 0], 3) == [[0, 2], [1], []]
+
+
+def test_face_subset(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.rigbits import proxySlicer
+
+    counts = [4, 3, 3]
+    connects = [0, 1, 2, 3, 1, 4, 2, 4, 5, 2]
+
+    assert proxySlicer.get_face_starts(counts) == [0, 4, 7]
+
+    vertices, sub_counts, sub_connects = proxySlicer.get_face_subset(
+        counts, connects, [2, 1])
+    assert vertices == [4, 5, 2, 1]
+    assert sub_counts == [3, 3]
+    assert sub_connects == [0, 1, 2, 3, 0, 2]
+    assert [vertices[i] for i in sub_connects] == connects[7:] + connects[4:7]
+
+
+def test_shader_faces(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.rigbits import proxySlicer
+
+    face_shaders = [0, 1, 1, -1, 0, 1]
+    assert proxySlicer.get_shader_faces(face_shaders, [1, 2, 5, 3]) == {
+        1: [0, 1, 2], -1: [3]}
+    assert proxySlicer.get_shader_faces(face_shaders, []) == {}
+
+    assert proxySlicer.get_ranges([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5),
+                                                          (7, 8)]
+    assert proxySlicer.get_ranges([]) == []
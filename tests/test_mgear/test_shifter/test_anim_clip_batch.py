@@ -0,0 +1,22 @@
+"""mgear.shifter.game_tools_fbx.anim_clip_batch test"""
+
+
+def test_split_clips(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import anim_clip_batch
+
+    clips = [
+        {"title": "idle", "start_frame": 0, "end_frame": 99},
+        {"title": "walk", "start_frame": 0, "end_frame": 29},
+        {"title": "run", "start_frame": 10, "end_frame": 29},
+        {"title": "jump", "start_frame": 0, "end_frame": 59},
+        {"title": "land", "start_frame": 0, "end_frame": 39},
+    ]
+    groups = anim_clip_batch.split_clips(clips, 2)
+    assert groups == [[0, 1], [2, 3, 4]]
+    assert sorted(i for g in groups for i in g) == list(range(len(clips)))
+
+    # more workers than clips
+    assert anim_clip_batch.split_clips(clips[:2], 8) == [[0], [1]]
+    assert anim_clip_batch.split_clips(clips, 0) == [[0, 1, 2, 3, 4]]
+
@@ -0,0 +1,77 @@
+"""mgear.shifter.game_tools_fbx.batch_pool test"""
+
+
+def test_split_weights(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import batch_pool
+
+    groups = batch_pool.split_weights([100, 30, 20, 60, 40], 2)
+    assert groups == [[0, 1], [2, 3, 4]]
+    groups = batch_pool.split_weights([5, 5, 5, 5, 5, 5], 3)
+    assert groups == [[0, 3], [1, 4], [2, 5]]
+    assert batch_pool.split_weights([], 4) == []
+
+
+def test_read_report(run_with_maya_pymel, setup_path, tmp_path):
+    # Stdlib imports
+    import json
+
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import batch_pool
+
+    report_path = str(tmp_path / "report.jsonl")
+    assert batch_pool.read_report(report_path) == ([], 0)
+
+    entry = {"index": 0, "clip": "idle", "status": batch_pool.STARTED}
+    batch_pool.write_report_entry(report_path, entry)
+    entries, offset = batch_pool.read_report(report_path)
+    assert entries == [entry]
+
+    # incomplete line is read with the next call
+    done = dict(entry, status=batch_pool.DONE, path="idle.fbx")
+    line = json.dumps(done)
+    with open(report_path, "a") as f:
+        f.write(line[:10])
+    entries, offset = batch_pool.read_report(report_path, offset)
+    assert entries == []
+    with open(report_path, "a") as f:
+        f.write(line[10:] + "\n")
+    entries, offset = batch_pool.read_report(report_path, offset)
+    assert entries == [done]
+    assert batch_pool.read_report(report_path, offset) == ([], offset)
+
+
+def test_run_workers_timeout_and_cancel(
+    run_with_maya_pymel, setup_path, tmp_path, monkeypatch
+):
+    # Stdlib imports
+    import sys
+
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import batch_pool
+
+    # workers that never report
+    monkeypatch.setattr(
+        batch_pool,
+        "get_mayabatch_args",
+        lambda path: ([sys.executable, "-c", "import time; time.sleep(10)"],
+                      False),
+    )
+    monkeypatch.setattr(batch_pool, "POLL_INTERVAL", 0.01)
+
+    exited = []
+    returncodes = batch_pool.run_workers(
+        str(tmp_path), [{}, {}], "module.function", exited.append,
+        lambda worker, returncode: exited.append(worker["error"]),
+        timeout=0.2,
+    )
+    assert len(returncodes) == 2 and all(returncodes)
+    assert exited == ["Timed out after 0.2s"] * 2
+
+    exited = []
+    batch_pool.run_workers(
+        str(tmp_path), [{}], "module.function", exited.append,
+        lambda worker, returncode: exited.append(worker["error"]),
+        is_cancelled=lambda: True,
+    )
+    assert exited == ["Cancelled"]
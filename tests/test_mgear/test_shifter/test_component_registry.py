@@ -0,0 +1,89 @@
+"""mgear.shifter.component_registry test"""
+import os
+
+GUIDE = '''
+from mgear.shifter.component import guide
+
+TYPE = "{0}"
+NAME = "comp"
+AUTHOR = "mGear"
+VERSION = [1, 0, {1}]
+
+
+class Guide(guide.ComponentGuide):
+
+    def addParameters(self):
+        self.pIcon = self.addParam("icon", "string", "cube")
+        self.pBlend = self.addParam("blend", "double", 1, 0, 1)
+        for s in "xyz":
+            self.addParam("k_" + s, "bool", True)
+        self.pRot = self.addEnumParam("rotOrder", ["XYZ", "YZX"], 0)
+'''
+
+
+def _add_component(directory, comp_type, patch=0):
+    path = os.path.join(directory, comp_type)
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    with open(os.path.join(path, "__init__.py"), "w") as f:
+        f.write("")
+    with open(os.path.join(path, "guide.py"), "w") as f:
+        f.write(GUIDE.format(comp_type, patch))
+
+
+def test_parse_guide(run_with_maya_pymel, setup_path, tmp_path):
+    # mGear imports
+    from mgear.shifter import component_registry
+
+    _add_component(str(tmp_path), "control_01")
+    data = component_registry.parse_guide(
+        str(tmp_path / "control_01" / "guide.py")
+    )
+    assert data["info"]["TYPE"] == "control_01"
+    assert data["info"]["VERSION"] == [1, 0, 0]
+    assert data["params"] == [
+        {"name": "icon", "type": "string", "default": "cube"},
+        {"name": "blend", "type": "double", "default": 1},
+        {"name": "rotOrder", "type": "enum"},
+    ]
+
+
+def test_update_registry(run_with_maya_pymel, setup_path, tmp_path):
+    # mGear imports
+    from mgear.shifter import component_registry
+
+    default_dir = str(tmp_path / "default")
+    custom_dir = str(tmp_path / "custom")
+    _add_component(default_dir, "control_01")
+    _add_component(default_dir, "arm_01")
+    _add_component(custom_dir, "control_01")
+    _add_component(custom_dir, "leg_01")
+    os.makedirs(os.path.join(custom_dir, "not_a_component"))
+
+    registry = component_registry.update_registry(
+        [default_dir, custom_dir], None, [default_dir]
+    )
+    comps = registry["components"]
+    assert sorted(comps) == ["arm_01", "control_01", "leg_01"]
+    assert comps["control_01"]["base_path"] == default_dir
+    assert comps["control_01"]["default"]
+    assert not comps["leg_01"]["default"]
+    assert registry["duplicated"] == ["control_01"]
+
+    # persisted registry
+    path = str(tmp_path / "registry.json")
+    component_registry.save(registry, path)
+    loaded = component_registry.load(path)
+    assert loaded == registry
+
+    # unchanged entries are reused, changed ones are parsed again
+    _add_component(default_dir, "arm_01", patch=1)
+    mtime = os.path.getmtime(os.path.join(default_dir, "arm_01", "guide.py"))
+    os.utime(
+        os.path.join(default_dir, "arm_01", "guide.py"), (mtime + 5, mtime + 5)
+    )
+    updated = component_registry.update_registry(
+        [default_dir, custom_dir], loaded, [default_dir]
+    )
+    assert updated["components"]["arm_01"]["info"]["VERSION"] == [1, 0, 1]
+    assert updated["components"]["leg_01"] is loaded["components"]["leg_01"]
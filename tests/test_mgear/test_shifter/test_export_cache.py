@@ -0,0 +1,84 @@
+"""mgear.shifter.game_tools_fbx.export_cache test"""
+
+
+def test_export_cache(run_with_maya_pymel, setup_path, tmp_path):
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import export_cache
+
+    file_path = str(tmp_path)
+    cache = export_cache.ExportCache(file_path)
+    assert not cache.is_current("char_body.fbx", "a")
+
+    # the manifest entry is only current while the file exists
+    cache.update("char_body.fbx", "a")
+    cache.save()
+    cache = export_cache.ExportCache(file_path)
+    assert not cache.is_current("char_body.fbx", "a")
+    (tmp_path / "char_body.fbx").write_bytes(b"")
+    assert cache.is_current("char_body.fbx", "a")
+    assert not cache.is_current("char_body.fbx", "b")
+
+    # force
+    cache = export_cache.ExportCache(file_path, force=True)
+    assert not cache.is_current("char_body.fbx", "a")
+
+    # corrupted manifest
+    (tmp_path / export_cache.MANIFEST_NAME).write_text(u"{")
+    assert export_cache.ExportCache(file_path).entries == {}
+
+
+def test_file_names(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import export_cache
+
+    assert export_cache.get_fbx_file_name("char") == "char.fbx"
+    assert export_cache.get_fbx_file_name("char.fbx") == "char.fbx"
+    assert (
+        export_cache.get_partition_file_name("char", "body")
+        == "char_body.fbx"
+    )
+    assert (
+        export_cache.get_clip_file_name("char", {"title": "walk"})
+        == "char_walk.fbx"
+    )
+    assert export_cache.get_clip_file_name("char", {}) == "char.fbx"
+
+
+def test_hash_clip_keys(run_with_maya_pymel, setup_path):
+    # Stdlib imports
+    import hashlib
+
+    # mGear imports
+    from mgear.shifter.game_tools_fbx import export_cache
+
+    def curves_data(values, infinity=(0, 0)):
+        times = [0.0, 10.0, 20.0, 30.0, 40.0]
+        keys = [(t, v, 0.0, 0.0, 1.0, 1.0, "auto", "auto")
+                for t, v in zip(times, values)]
+        return {
+            "ctl_tx": {
+                "plugs": ["ctl.translateX"],
+                "times": times,
+                "keys": keys,
+                "infinity": list(infinity),
+            }
+        }
+
+    def digest(data, start_frame, end_frame):
+        hasher = hashlib.sha1()
+        export_cache.hash_clip_keys(hasher, data, start_frame, end_frame)
+        return hasher.hexdigest()
+
+    data = curves_data([0, 1, 2, 3, 4])
+    # a key change outside the range and its closest keys is ignored
+    assert digest(data, 0, 10) == digest(curves_data([0, 1, 2, 9, 4]), 0, 10)
+    # the closest key after the range changes the interpolation
+    assert digest(data, 0, 10) != digest(curves_data([0, 1, 9, 3, 4]), 0, 10)
+    # the closest key before the range
+    assert digest(data, 25, 30) != digest(curves_data([0, 1, 9, 3, 4]), 25, 30)
+    assert digest(data, 25, 30) == digest(curves_data([0, 9, 2, 3, 4]), 25, 30)
+    # every key of a cycled curve changes the range
+    cycle = (0, 3)
+    assert digest(curves_data([0, 1, 2, 3, 4], cycle), 0, 10) != digest(
+        curves_data([0, 1, 2, 9, 4], cycle), 0, 10
+    )
@@ -0,0 +1,69 @@
+"""mgear.shifter.guide_scanner test"""
+
+
+def test_parent_index(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter import guide_scanner
+
+    transforms = [
+        "|guide",
+        "|guide|controllers_org",
+        "|guide|spine_C0_root",
+        "|guide|spine_C0_root|spine_C0_eff",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root|arm_L0_elbow",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root|arm_L0_elbow"
+        "|arm_L0_wrist",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root|arm_L0_elbow"
+        "|arm_L0_wrist|finger_L0_root",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root|arm_L0_elbow"
+        "|arm_L0_wrist|finger_L0_root|finger_L0_0_loc",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root|arm_L0_elbow"
+        "|arm_L0_wrist|finger_L0_root|finger_L0_0_loc|tip_L0_root",
+        "|guide|spine_C0_root|spine_C0_eff|arm_L0_root|arm_L0_elbow"
+        "|arm_L0_wrist|finger_L0_root|finger_L0_0_loc|tip_L0_root"
+        "|tip_L0_eff",
+    ]
+    comp_nodes = set(t for t in transforms if t.endswith("_root"))
+    guide_nodes = set(transforms[2:])
+    spine, arm, finger, tip = [
+        t for t in transforms if t.endswith("_root")
+    ]
+
+    comp_roots = guide_scanner.get_component_roots(
+        transforms, comp_nodes, "|guide"
+    )
+    assert comp_roots == [spine, arm, finger, tip]
+    assert guide_scanner.get_component_roots(
+        transforms, comp_nodes, arm
+    ) == [arm, finger, tip]
+    assert guide_scanner.get_component_roots(
+        transforms, comp_nodes, arm, branch=False
+    ) == [arm]
+
+    index = guide_scanner.get_parent_index(comp_roots, guide_nodes)
+    assert index[spine] is None
+    assert index[arm] == (spine, "|guide|spine_C0_root|spine_C0_eff")
+    assert index[finger][0] == arm
+    assert index[tip][0] == finger
+
+    tip_parent = index[tip][1]
+    arm_parent = index[arm][1]
+    assert guide_scanner.get_local_name(tip_parent, "finger_L0") == "0_loc"
+    assert guide_scanner.get_local_name(arm_parent, "spine_C0") == "eff"
+    assert guide_scanner.get_local_name(arm_parent, "arm_L0") is None
+
+    # parent component not scanned
+    index = guide_scanner.get_parent_index([finger, tip], guide_nodes)
+    assert index[finger] is None
+    assert index[tip][0] == finger
+
+
+def test_cache_opt_in(run_with_maya_pymel, setup_path, monkeypatch):
+    # mGear imports
+    from mgear.shifter import guide_scanner
+
+    monkeypatch.delenv(guide_scanner.CACHE_ENV_KEY, raising=False)
+    assert not guide_scanner.is_cache_enabled()
+    monkeypatch.setenv(guide_scanner.CACHE_ENV_KEY, "1")
+    assert guide_scanner.is_cache_enabled()
@@ -0,0 +1,128 @@
+"""mgear.shifter.incremental test"""
+
+
+def _template():
+    def comp(parent=None, **params):
+        params.setdefault("comp_name", "x")
+        return {
+            "child_components": [],
+            "param_values": params,
+            "tra": [],
+            "parent_fullName": parent,
+        }
+
+    comps = {
+        "spine_C0": comp(),
+        "arm_L0": comp("spine_C0", ikrefarray="spine_C0_eff"),
+        "chain_L0": comp("arm_L0"),
+        "leg_L0": comp(),
+        "stack_L0": comp(masterChainA="leg_L0"),
+        "neck_C0": comp("spine_C0"),
+    }
+    comps["spine_C0"]["child_components"] = ["arm_L0", "neck_C0"]
+    return {
+        "guide_root": {"param_values": {"rig_name": "rig"}},
+        "components_list": list(comps.keys()),
+        "components_dict": comps,
+        "ctl_buffers_dict": None,
+    }
+
+
+def test_component_hashes(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter import incremental
+
+    template = _template()
+    hashes = incremental.get_component_hashes(template)
+    assert hashes == incremental.get_component_hashes(_template())
+
+    # a parent change changes the children hashes
+    template["components_dict"]["spine_C0"]["tra"] = [1.0]
+    new_hashes = incremental.get_component_hashes(template)
+    assert new_hashes["spine_C0"] != hashes["spine_C0"]
+    assert new_hashes["chain_L0"] != hashes["chain_L0"]
+    assert new_hashes["leg_L0"] == hashes["leg_L0"]
+    assert new_hashes[incremental.GLOBAL_KEY] == hashes[
+        incremental.GLOBAL_KEY
+    ]
+
+
+def test_dirty_components(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter import incremental
+
+    template = _template()
+    old_hashes = incremental.get_component_hashes(template)
+
+    dirty, removed = incremental.get_dirty_components(
+        template, old_hashes, old_hashes
+    )
+    assert dirty == []
+    assert removed == []
+
+    # referenced by a relative name in arm_L0 settings
+    template["components_dict"]["spine_C0"]["param_values"]["x"] = 1
+    hashes = incremental.get_component_hashes(template)
+    dirty, removed = incremental.get_dirty_components(
+        template, old_hashes, hashes
+    )
+    assert dirty == ["spine_C0", "arm_L0", "chain_L0", "neck_C0"]
+
+    # stack_L0 uses the leg_L0 component object, so both are rebuilt
+    template = _template()
+    template["components_dict"]["stack_L0"]["param_values"]["x"] = 1
+    hashes = incremental.get_component_hashes(template)
+    dirty, removed = incremental.get_dirty_components(
+        template, old_hashes, hashes
+    )
+    assert dirty == ["leg_L0", "stack_L0"]
+
+    # removed component
+    template = _template()
+    del template["components_dict"]["chain_L0"]
+    template["components_list"].remove("chain_L0")
+    hashes = incremental.get_component_hashes(template)
+    dirty, removed = incremental.get_dirty_components(
+        template, old_hashes, hashes
+    )
+    assert dirty == []
+    assert removed == ["chain_L0"]
+
+
+def test_host_attributes(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    from maya import cmds
+
+    # mGear imports
+    from mgear.shifter import incremental
+
+    cmds.file(new=True, force=True)
+    recorder = incremental.NodeRecorder()
+    recorder.start()
+    try:
+        recorder.current = "spine_C0"
+        host = cmds.createNode("transform", name="spine_C0_ctl")
+        cmds.addAttr(host, longName="spine_attr", attributeType="float")
+
+        # arm_L0 uses the spine control as UI host
+        recorder.current = "arm_L0"
+        arm = cmds.createNode("transform", name="arm_L0_ctl")
+        cmds.addAttr(arm, longName="arm_attr", attributeType="float")
+        cmds.addAttr(host, longName="id0_ctl_cnx", attributeType="message",
+                     multi=True)
+        cmds.addAttr(host, longName="blend", attributeType="float")
+        recorder.current = None
+    finally:
+        recorder.stop()
+
+    attributes = recorder.get_attributes()
+    assert attributes == {
+        "arm_L0": ["spine_C0_ctl.id0_ctl_cnx", "spine_C0_ctl.blend"]}
+
+    comps_data = {"arm_L0": {"nodes": recorder.nodes["arm_L0"],
+                             "attributes": attributes["arm_L0"]}}
+    incremental.delete_component_nodes(comps_data, ["arm_L0"])
+    assert not cmds.objExists("arm_L0_ctl")
+    assert not cmds.objExists("spine_C0_ctl.id0_ctl_cnx")
+    assert not cmds.objExists("spine_C0_ctl.blend")
+    assert cmds.objExists("spine_C0_ctl.spine_attr")
@@ -0,0 +1,26 @@
+"""mgear.shifter build with OpenMaya 2.0 primitives test"""
+
+
+def test_om2_primitives_build(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    import pymel.core as pm
+    from maya import cmds
+
+    # mGear imports
+    from mgear import shifter
+    from mgear.core import om_node
+    from mgear.shifter import guide
+
+    cmds.file(new=True, force=True)
+    guide.Rig().drawNewComponent(None, "control_01", showUI=False)
+    pm.setAttr("guide.om2_primitives", True)
+    pm.select("guide")
+
+    rig = shifter.Rig()
+    rig.buildFromSelection()
+
+    assert rig.options["om2_primitives"]
+    assert not om_node.is_enabled()
+    assert isinstance(rig.model, pm.nodetypes.Transform)
+    assert cmds.objExists("control_C0_ctl")
+    assert cmds.listRelatives("control_C0_ctl", allParents=True)
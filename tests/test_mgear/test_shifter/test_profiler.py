@@ -0,0 +1,100 @@
+"""mgear.shifter.profiler test"""
+import json
+
+
+def test_build_profiler(run_with_maya_pymel, setup_path, tmp_path):
+    # mGear imports
+    from mgear.shifter import profiler
+
+    prof = profiler.BuildProfiler(count_nodes=False)
+    for comp in ("arm_L0", "arm_R0"):
+        with prof.record(
+            "Objects",
+            profiler.COMPONENT_CATEGORY,
+            component=comp,
+            type="arm_2jnt_01",
+        ):
+            sorted(range(10))
+    with prof.record("rig_step", profiler.CUSTOM_STEP_CATEGORY):
+        pass
+
+    assert len(prof.events) == 3
+    assert prof.events[0]["calls"] >= 1
+    summary = profiler.summarize(prof.events)
+    assert summary["arm_2jnt_01 | Objects"]["count"] == 2
+    assert "custom_step | rig_step" in summary
+
+    paths = prof.save(str(tmp_path / "rig_build"))
+    trace = profiler.load(paths[1])
+    assert len(trace["traceEvents"]) == 3
+    assert trace["traceEvents"][0]["ph"] == "X"
+    assert trace["traceEvents"][0]["name"] == "Objects : arm_L0"
+
+    # disabled profiler
+    disabled = profiler.BuildProfiler(enabled=False)
+    with disabled.record("Objects", profiler.COMPONENT_CATEGORY):
+        pass
+    assert disabled.events == []
+
+
+def test_profiler_compare(run_with_maya_pymel, setup_path, tmp_path):
+    # mGear imports
+    from mgear.shifter import profiler
+
+    def profile(duration):
+        events = [
+            {"name": "Objects", "category": "component",
+             "type": "arm_2jnt_01", "duration": duration, "nodes": 10,
+             "calls": 100},
+            {"name": "Objects", "category": "component",
+             "type": "control_01", "duration": 0.5, "nodes": 2,
+             "calls": 10},
+        ]
+        return {"summary": profiler.summarize(events)}
+
+    rows = profiler.compare(profile(1.0), profile(2.0))
+    assert rows[0]["key"] == "arm_2jnt_01 | Objects"
+    assert rows[0]["regression"]
+    assert not rows[1]["regression"]
+
+    rows = profiler.compare(profile(1.0), profile(1.05))
+    assert not any(r["regression"] for r in rows)
+
+    for name, duration in (("a", 1.0), ("b", 2.0)):
+        with open(str(tmp_path / name), "w") as f:
+            f.write(json.dumps(profile(duration)))
+    report = profiler.compare_report(
+        str(tmp_path / "a"), str(tmp_path / "b")
+    )
+    assert "1 regression(s) found" in report
+
+
+def test_profiler_callbacks(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    from maya import cmds
+
+    # mGear imports
+    from mgear.shifter import profiler
+
+    cmds.file(new=True, force=True)
+    prof = profiler.BuildProfiler(count_calls=False)
+
+    # the callbacks are removed when the recorded code raises
+    try:
+        prof.start()
+        try:
+            with prof.record("Objects", profiler.COMPONENT_CATEGORY):
+                cmds.createNode("transform")
+                raise RuntimeError("build error")
+        finally:
+            prof.stop()
+    except RuntimeError:
+        pass
+    assert prof._callback_ids == []
+    assert prof.events[0]["nodes"] == 1
+
+    # and registered again by the next record, i.e: post custom steps
+    with prof.record("rig_step", profiler.CUSTOM_STEP_CATEGORY):
+        cmds.createNode("transform")
+    prof.stop()
+    assert prof.events[1]["nodes"] == 1
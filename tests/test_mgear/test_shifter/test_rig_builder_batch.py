@@ -0,0 +1,112 @@
+"""mgear.shifter.rig_builder.batch test"""
+
+
+def _config(count):
+    rows = [
+        {"file_path": "rig_{}.sgt".format(i), "output_name": "rig_{}".format(i)}
+        for i in range(count)
+    ]
+    return {"output_folder": "", "rows": rows}
+
+
+def test_batch_scheduler_order(setup_path):
+    # mGear imports
+    from mgear.shifter.rig_builder import batch
+
+    def build(config, row, validate, passed_only):
+        checks = {"CheckA": {"instance": row["output_name"],
+                             "success": True,
+                             "error": None}}
+        return batch.make_result(row, results=checks, saved=True)
+
+    scheduler = batch.BatchScheduler(batch.LocalExecutor(build), workers=3)
+    results = scheduler.run(_config(7))
+    assert [r["output_name"] for r in results] == [
+        "rig_{}".format(i) for i in range(7)
+    ]
+    assert all(r["success"] and r["saved"] for r in results)
+    assert results[0]["results"]["CheckA"]["instance"] == "rig_0"
+
+
+def test_batch_scheduler_failure_isolation(setup_path):
+    # mGear imports
+    from mgear.shifter.rig_builder import batch
+
+    attempts = {}
+
+    def build(config, row, validate, passed_only):
+        name = row["output_name"]
+        attempts[name] = attempts.get(name, 0) + 1
+        if name == "rig_1":
+            raise RuntimeError("broken guide")
+        if name == "rig_2" and attempts[name] == 1:
+            raise RuntimeError("flaky license")
+        return batch.make_result(row, saved=True)
+
+    scheduler = batch.BatchScheduler(
+        batch.LocalExecutor(build), workers=2, retries=1
+    )
+    results = scheduler.run(_config(4))
+    by_name = {r["output_name"]: r for r in results}
+
+    assert not by_name["rig_1"]["success"]
+    assert "broken guide" in by_name["rig_1"]["error"]
+    assert by_name["rig_1"]["attempts"] == 2
+    assert by_name["rig_2"]["success"]
+    assert by_name["rig_2"]["attempts"] == 2
+    assert by_name["rig_0"]["success"] and by_name["rig_3"]["success"]
+
+
+def test_batch_scheduler_timeout(setup_path):
+    # Stdlib imports
+    import time
+
+    # mGear imports
+    from mgear.shifter.rig_builder import batch
+
+    def build(config, row, validate, passed_only):
+        time.sleep(0.05)
+        return batch.make_result(row)
+
+    scheduler = batch.BatchScheduler(
+        batch.LocalExecutor(build), workers=2, timeout=0.01
+    )
+    results = scheduler.run(_config(2))
+    assert not any(r["success"] for r in results)
+    assert "exceeded" in results[0]["error"]
+
+
+
+def test_mayapy_executor_timeout_cleanup(setup_path, tmp_path, monkeypatch):
+    # Stdlib imports
+    import sys
+
+    # Third party imports
+    import pytest
+
+    # mGear imports
+    from mgear.shifter.rig_builder import batch
+
+    script = tmp_path / "sleep.py"
+    script.write_text(u"import time\ntime.sleep(10)\n")
+    job_dir = tmp_path / "job"
+    job_dir.mkdir()
+    monkeypatch.setattr(batch, "WORKER_SCRIPT", str(script))
+    monkeypatch.setattr(batch.tempfile, "mkdtemp", lambda **k: str(job_dir))
+
+    executor = batch.MayapyExecutor(sys.executable)
+    with pytest.raises(batch.BuildTimeoutError):
+        executor.run({}, {"output_name": "rig_0"}, timeout=0.5)
+    # the job folder doesn't leak on timeout
+    assert not job_dir.exists()
+
+def test_serialize_checks(setup_path):
+    # mGear imports
+    from mgear.shifter.rig_builder import batch
+
+    checks = {"Check": {"instance": object(),
+                        "success": False,
+                        "error": ValueError("bad")}}
+    serialized = batch.serialize_checks(checks)
+    assert serialized["Check"]["error"] == "bad"
+    assert isinstance(serialized["Check"]["instance"], str)
@@ -0,0 +1,43 @@
+"""mgear.shifter.scheduler test"""
+
+
+def test_build_order(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.shifter import scheduler
+
+    names = ["spine_C0", "arm_L0", "armUI_L0", "leg_L0", "stack_L0"]
+    dependencies = {
+        "arm_L0": {"spine_C0", "armUI_L0"},
+        "armUI_L0": {"spine_C0"},
+        "stack_L0": {"leg_L0", "missing_C0"},
+    }
+    order, cycle = scheduler.get_build_order(names, dependencies)
+    assert order == ["spine_C0", "armUI_L0", "arm_L0", "leg_L0", "stack_L0"]
+    assert cycle == []
+
+    # no dependencies keeps the declaration order
+    order, cycle = scheduler.get_build_order(names, {})
+    assert order == names
+
+    # cycle
+    dependencies = {"spine_C0": {"arm_L0"}, "arm_L0": {"spine_C0"}}
+    order, cycle = scheduler.get_build_order(names, dependencies)
+    assert order == ["armUI_L0", "leg_L0", "stack_L0", "spine_C0", "arm_L0"]
+    assert cycle == ["spine_C0", "arm_L0"]
+
+    # a component depending on a cycle is not reported in the cycle
+    dependencies = {"spine_C0": {"arm_L0"},
+                    "arm_L0": {"spine_C0"},
+                    "armUI_L0": {"arm_L0"},
+                    "leg_L0": {"armUI_L0"}}
+    order, cycle = scheduler.get_build_order(names, dependencies)
+    assert order == ["stack_L0", "spine_C0", "arm_L0", "armUI_L0", "leg_L0"]
+    assert cycle == ["spine_C0", "arm_L0"]
+
+    # two separate cycles
+    dependencies = {"spine_C0": {"arm_L0"},
+                    "arm_L0": {"armUI_L0"},
+                    "armUI_L0": {"spine_C0"},
+                    "leg_L0": {"stack_L0"},
+                    "stack_L0": {"leg_L0", "arm_L0"}}
+    assert scheduler.get_cycles(names, dependencies) == set(names)
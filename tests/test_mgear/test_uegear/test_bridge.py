@@ -0,0 +1,77 @@
+"""mgear.uegear.bridge test"""
+
+
+def test_parse_return(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.uegear import bridge
+
+    assert bridge.parse_return('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert bridge.parse_return("['a', True, None]") == ["a", True, None]
+    assert bridge.parse_return("/Game/") == "/Game/"
+    assert bridge.parse_return("__import__('os').getcwd()") == (
+        "__import__('os').getcwd()"
+    )
+    assert bridge.parse_return(False) is False
+
+
+def test_execute(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.uegear import bridge
+    from mgear.uegear import stand_in
+
+    commands = {
+        "add": lambda a, b: a + b,
+        "names": lambda: "['a', 'b']",
+    }
+    with stand_in.StandInServer(commands) as server:
+        uegear_bridge = bridge.UeGearBridge(port=server.port)
+        for i in range(5):
+            response = uegear_bridge.execute(
+                "add", parameters={"a": i, "b": 1}
+            )
+            assert response == {"ReturnValue": i + 1}
+        # legacy string returns
+        assert uegear_bridge.execute("names") == {"ReturnValue": "['a', 'b']"}
+        assert uegear_bridge.execute("missing") == {"return": False}
+        # keep-alive connection
+        assert server.connections == 1
+
+        futures = [
+            uegear_bridge.execute_async("add", {"a": i, "b": i})
+            for i in range(10)
+        ]
+        assert [f.result()["ReturnValue"] for f in futures] == [
+            i * 2 for i in range(10)
+        ]
+        assert not uegear_bridge.is_executing
+        assert server.connections <= 1 + bridge.POOL_SIZE
+
+    bridge.get_pool("127.0.0.1", server.port).close()
+
+
+def test_execute_batch(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.uegear import bridge
+    from mgear.uegear import stand_in
+
+    commands = {"add": lambda a, b: a + b, "fail": lambda: 1 / 0}
+    with stand_in.StandInServer(commands) as server:
+        uegear_bridge = bridge.UeGearBridge(port=server.port)
+        uegear_bridge.batch_size = 4
+        batch = [("add", {"a": i, "b": 1}) for i in range(10)]
+        batch.insert(3, "fail")
+        responses = uegear_bridge.execute_batch(batch)
+        assert len(responses) == 11
+        assert responses[3] == {"return": False}
+        del responses[3]
+        assert [r["ReturnValue"] for r in responses] == list(range(1, 11))
+        assert server.requests == {bridge.BATCH_URL: 3}
+        assert len(server.calls) == 11
+
+        future = uegear_bridge.execute_batch_async([("add", {"a": 1, "b": 2})])
+        assert future.result() == [{"ReturnValue": 3}]
+
+    bridge.get_pool("127.0.0.1", server.port).close()
+
+    # no server
+    assert uegear_bridge.execute_batch(["add"]) == [{"return": False}]
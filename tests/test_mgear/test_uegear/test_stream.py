@@ -0,0 +1,67 @@
+"""mgear.uegear.stream test"""
+
+
+def test_is_changed(run_with_maya_pymel, setup_path):
+    # mGear imports
+    from mgear.uegear import stream
+
+    values = (0.0, 1.0, 2.0, 0.0, 90.0, 0.0, 1.0, 1.0, 1.0)
+    assert stream.is_changed(None, values)
+    assert not stream.is_changed(values, values)
+    moved = (0.0, 1.0, 2.00001) + values[3:]
+    assert not stream.is_changed(values, moved)
+    assert stream.is_changed(values, moved, tolerance=1e-6)
+
+
+def test_tick(run_with_maya_standalone, setup_path):
+    # Stdlib imports
+    import ast
+
+    from maya import cmds
+
+    # mGear imports
+    from mgear.uegear import bridge
+    from mgear.uegear import stand_in
+    from mgear.uegear import stream
+    from mgear.uegear import tag
+
+    cmds.file(new=True, force=True)
+    nodes = []
+    for i in range(3):
+        node = cmds.createNode("transform", name="actor{}".format(i))
+        tag.apply_tag(node, tag.TAG_ASSET_GUID_ATTR_NAME, "guid{}".format(i))
+        nodes.append(node)
+    nodes.append(cmds.createNode("transform", name="untagged"))
+
+    commands = {"set_actor_world_transform": lambda **kwargs: True}
+    with stand_in.StandInServer(commands) as server:
+        uegear_bridge = bridge.UeGearBridge(port=server.port)
+        transform_stream = stream.TransformStream(
+            nodes, uegear_bridge=uegear_bridge
+        )
+        assert len(transform_stream.nodes) == 3
+
+        # first tick sends all the actors
+        transform_stream.mark_all_dirty()
+        assert transform_stream.tick() == 3
+        transform_stream._future.result()
+
+        # unchanged transforms are not sent
+        transform_stream.mark_all_dirty()
+        assert transform_stream.tick() == 0
+
+        cmds.setAttr("actor1.tx", 5)
+        cmds.setAttr("actor2.ry", 45)
+        transform_stream.mark_all_dirty()
+        assert transform_stream.tick() == 2
+        transform_stream._future.result()
+        transform_stream.tick()
+
+        calls = server.calls
+        assert len(calls) == 5
+        sent = dict((c[1]["actor_guid"], c[1]) for c in calls[3:])
+        assert sorted(sent) == ["guid1", "guid2"]
+        assert ast.literal_eval(sent["guid1"]["translation"])[0] == 5.0
+        assert round(ast.literal_eval(sent["guid2"]["rotation"])[2], 3) == 45.0
+
+    bridge.get_pool("127.0.0.1", server.port).close()